@@ -1,839 +1,1339 @@
-from time import sleep
-import numpy as np
-from enum import IntEnum
-from struct import unpack
-from struct import pack
-import math
-import time
-import threading        # NEW
-import logging
-logger = logging.getLogger("motor_status")
-class MotorControl:
-    send_data_frame = np.array(
-        [0x55, 0xAA, 0x1e, 0x03, 0x01, 0x00, 0x00, 0x00, 0x0a, 0x00, 0x00, 0x00, 0x00, 0, 0, 0, 0, 0x00, 0x08, 0x00,
-         0x00, 0, 0, 0, 0, 0, 0, 0, 0, 0x00], np.uint8)
-    #电机的最大位置 (Q_MAX)、速度 (DQ_MAX) 和力矩 (TAU_MAX)
-    #                4310           4310_48        4340           4340_48
-    Limit_Param = [[12.5, 30, 10], [12.5, 50, 10], [12.5, 8, 28], [12.5, 10, 28],
-                   # 6006           8006           8009            10010L         10010
-                   [12.5, 45, 20], [12.5, 45, 40], [12.5, 45, 54], [12.5, 25, 200], [12.5, 20, 200],
-                   # H3510            DMG6215      DMH6220
-                   [12.5 , 280 , 1],[12.5 , 45 , 10],[12.5 , 45 , 10]]
-
-    def __init__(self, serial_device):
-        """
-        define MotorControl object 定义电机控制对象
-        :param serial_device: serial object 串口对象
-        """
-        self.serial_ = serial_device
-        self.motors_map = dict()
-        self.data_save = bytes()  # save data
-        if self.serial_.is_open:  # open the serial port
-            print("Serial port is open")
-            serial_device.close()
-        self.serial_.open()
-        self._lock = threading.Lock()   # NEW：线程互斥锁
-
-    def controlMIT(self, DM_Motor, kp: float, kd: float, q: float, dq: float, tau: float):
-        """
-        MIT Control Mode Function 达妙电机MIT控制模式函数
-        :param DM_Motor: Motor object 电机对象
-        :param kp: kp
-        :param kd:  kd
-        :param q:  position  期望位置
-        :param dq:  velocity  期望速度
-        :param tau: torque  期望力矩
-        :return: None
-        """
-        if DM_Motor.SlaveID not in self.motors_map:
-            print("controlMIT ERROR : Motor ID not found")
-            return
-        kp_uint = float_to_uint(kp, 0, 500, 12)
-        kd_uint = float_to_uint(kd, 0, 5, 12)
-        MotorType = DM_Motor.MotorType
-        Q_MAX = self.Limit_Param[MotorType][0]
-        DQ_MAX = self.Limit_Param[MotorType][1]
-        TAU_MAX = self.Limit_Param[MotorType][2]
-        q_uint = float_to_uint(q, -Q_MAX, Q_MAX, 16)
-        dq_uint = float_to_uint(dq, -DQ_MAX, DQ_MAX, 12)
-        tau_uint = float_to_uint(tau, -TAU_MAX, TAU_MAX, 12)
-        data_buf = np.array([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
-        data_buf[0] = (q_uint >> 8) & 0xff
-        data_buf[1] = q_uint & 0xff
-        data_buf[2] = dq_uint >> 4
-        data_buf[3] = ((dq_uint & 0xf) << 4) | ((kp_uint >> 8) & 0xf)
-        data_buf[4] = kp_uint & 0xff
-        data_buf[5] = kd_uint >> 4
-        data_buf[6] = ((kd_uint & 0xf) << 4) | ((tau_uint >> 8) & 0xf)
-        data_buf[7] = tau_uint & 0xff
-        self.__send_data(DM_Motor.SlaveID, data_buf)
-        self.recv()  # receive the data from serial port
-
-    def control_delay(self, DM_Motor, kp: float, kd: float, q: float, dq: float, tau: float, delay: float):
-        """
-        MIT Control Mode Function with delay 达妙电机MIT控制模式函数带延迟
-        :param DM_Motor: Motor object 电机对象
-        :param kp: kp
-        :param kd: kd
-        :param q:  position  期望位置
-        :param dq:  velocity  期望速度
-        :param tau: torque  期望力矩
-        :param delay: delay time 延迟时间 单位秒
-        """
-        self.controlMIT(DM_Motor, kp, kd, q, dq, tau)
-        sleep(delay)
-
-    def control_Pos_Vel(self, Motor, P_desired: float, V_desired: float):
-        """
-        control the motor in position and velocity control mode 电机位置速度控制模式
-        :param Motor: Motor object 电机对象
-        :param P_desired: desired position 期望位置
-        :param V_desired: desired velocity 期望速度
-        :return: None
-        """
-        if Motor.SlaveID not in self.motors_map:
-            print("Control Pos_Vel Error : Motor ID not found")
-            return
-        motorid = 0x100 + Motor.SlaveID
-        data_buf = np.array([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
-        P_desired_uint8s = float_to_uint8s(P_desired)
-        V_desired_uint8s = float_to_uint8s(V_desired)
-        data_buf[0:4] = P_desired_uint8s
-        data_buf[4:8] = V_desired_uint8s
-        self.__send_data(motorid, data_buf)
-        # time.sleep(0.001)
-        self.recv()  # receive the data from serial port
-
-    def control_Vel(self, Motor, Vel_desired):
-        """
-        control the motor in velocity control mode 电机速度控制模式
-        :param Motor: Motor object 电机对象
-        :param Vel_desired: desired velocity 期望速度
-        """
-        if Motor.SlaveID not in self.motors_map:
-            print("control_VEL ERROR : Motor ID not found")
-            return
-        motorid = 0x200 + Motor.SlaveID
-        data_buf = np.array([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
-        Vel_desired_uint8s = float_to_uint8s(Vel_desired)
-        data_buf[0:4] = Vel_desired_uint8s
-        self.__send_data(motorid, data_buf)
-        self.recv()  # receive the data from serial port
-
-    def control_pos_force(self, Motor, Pos_des: float, Vel_des, i_des):
-        """
-        control the motor in EMIT control mode 电机力位混合模式
-        :param Pos_des: desired position rad  期望位置 单位为rad
-        :param Vel_des: desired velocity rad/s  期望速度 为放大100倍
-        :param i_des: desired current rang 0-10000 期望电流标幺值放大10000倍
-        电流标幺值：实际电流值除以最大电流值，最大电流见上电打印
-        """
-        if Motor.SlaveID not in self.motors_map:
-            print("control_pos_vel ERROR : Motor ID not found")
-            return
-        motorid = 0x300 + Motor.SlaveID
-        data_buf = np.array([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
-        Pos_desired_uint8s = float_to_uint8s(Pos_des)
-        data_buf[0:4] = Pos_desired_uint8s
-        Vel_uint = np.uint16(Vel_des)
-        ides_uint = np.uint16(i_des)
-        data_buf[4] = Vel_uint & 0xff
-        data_buf[5] = Vel_uint >> 8
-        data_buf[6] = ides_uint & 0xff
-        data_buf[7] = ides_uint >> 8
-        self.__send_data(motorid, data_buf)
-        self.recv()  # receive the data from serial port
-
-    def enable(self, Motor):
-        """
-        enable motor 使能电机
-        最好在上电后几秒后再使能电机
-        :param Motor: Motor object 电机对象
-        """
-        self.__control_cmd(Motor, np.uint8(0xFC))
-        sleep(0.1)
-        self.recv()  # receive the data from serial port
-
-    def enable_old(self, Motor ,ControlMode):
-        """
-        enable motor old firmware 使能电机旧版本固件，这个是为了旧版本电机固件的兼容性
-        可恶的旧版本固件使能需要加上偏移量
-        最好在上电后几秒后再使能电机
-        :param Motor: Motor object 电机对象
-        """
-        data_buf = np.array([0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xfc], np.uint8)
-        enable_id = ((int(ControlMode)-1) << 2) + Motor.SlaveID
-        self.__send_data(enable_id, data_buf)
-        sleep(0.1)
-        self.recv()  # receive the data from serial port
-
-    def disable(self, Motor):
-        """
-        disable motor 失能电机
-        :param Motor: Motor object 电机对象
-        """
-        self.__control_cmd(Motor, np.uint8(0xFD))
-        sleep(0.01)
-
-    def set_zero_position(self, Motor):
-        """
-        set the zero position of the motor 设置电机0位
-        :param Motor: Motor object 电机对象
-        """
-        self.__control_cmd(Motor, np.uint8(0xFE))
-        sleep(0.1)
-        self.recv()  # receive the data from serial port
-
-    def recv(self):
-        # 把上次没有解析完的剩下的也放进来
-        data_recv = b''.join([self.data_save, self.serial_.read_all()])
-        packets = self.__extract_packets(data_recv)
-        for packet in packets:
-            data = packet[7:15]
-            CANID = (packet[6] << 24) | (packet[5] << 16) | (packet[4] << 8) | packet[3]
-            CMD = packet[1]
-            self.__process_packet(data, CANID, CMD)
-
-    def recv_set_param_data(self):
-        data_recv = self.serial_.read_all()
-        packets = self.__extract_packets(data_recv)
-        for packet in packets:
-            data = packet[7:15]
-            CANID = (packet[6] << 24) | (packet[5] << 16) | (packet[4] << 8) | packet[3]
-            CMD = packet[1]
-            self.__process_set_param_packet(data, CANID, CMD)
-    def __process_packet(self, data, CANID, CMD):
-        if CMD == 0x11:
-            if CANID != 0x00:
-                if CANID in self.motors_map:
-                    # 解析状态信息: D[0] = MST_ID, D[1] = ID|ERR<<4
-                    motor_id = data[1] & 0x0F      # 电机ID (低4位)
-                    status = (data[1] >> 4) & 0x0F  # 状态 (高4位)
-                    
-                    q_uint = np.uint16((np.uint16(data[1]) << 8) | data[2])
-                    dq_uint = np.uint16((np.uint16(data[3]) << 4) | (data[4] >> 4))
-                    tau_uint = np.uint16(((data[4] & 0xf) << 8) | data[5])
-                    # 新增：解析温度数据
-                    t_mos = float(data[6])      # D[6] = T_MOS，直接为摄氏度
-                    t_rotor = float(data[7])    # D[7] = T_Rotor，直接为摄氏度
-                    
-                    MotorType_recv = self.motors_map[CANID].MotorType
-                    Q_MAX = self.Limit_Param[MotorType_recv][0]
-                    DQ_MAX = self.Limit_Param[MotorType_recv][1]
-                    TAU_MAX = self.Limit_Param[MotorType_recv][2]
-                    recv_q = uint_to_float(q_uint, -Q_MAX, Q_MAX, 16)
-                    recv_dq = uint_to_float(dq_uint, -DQ_MAX, DQ_MAX, 12)
-                    recv_tau = uint_to_float(tau_uint, -TAU_MAX, TAU_MAX, 12)
-                    # 更新电机数据，包括温度和状态
-                    self.motors_map[CANID].recv_data(recv_q, recv_dq, recv_tau, t_mos, t_rotor, motor_id, status)
-            else:
-                MasterID = data[0] & 0x0f
-                if MasterID in self.motors_map:
-                    # 解析状态信息: D[0] = MST_ID, D[1] = ID|ERR<<4  
-                    motor_id = data[1] & 0x0F      # 电机ID (低4位)
-                    status = (data[1] >> 4) & 0x0F  # 状态 (高4位)
-                    
-                    q_uint = np.uint16((np.uint16(data[1]) << 8) | data[2])
-                    dq_uint = np.uint16((np.uint16(data[3]) << 4) | (data[4] >> 4))
-                    tau_uint = np.uint16(((data[4] & 0xf) << 8) | data[5])
-                    # 新增：解析温度数据
-                    t_mos = float(data[6])      # D[6] = T_MOS，直接为摄氏度
-                    t_rotor = float(data[7])    # D[7] = T_Rotor，直接为摄氏度
-                    
-                    MotorType_recv = self.motors_map[MasterID].MotorType
-                    Q_MAX = self.Limit_Param[MotorType_recv][0]
-                    DQ_MAX = self.Limit_Param[MotorType_recv][1]
-                    TAU_MAX = self.Limit_Param[MotorType_recv][2]
-                    recv_q = uint_to_float(q_uint, -Q_MAX, Q_MAX, 16)
-                    recv_dq = uint_to_float(dq_uint, -DQ_MAX, DQ_MAX, 12)
-                    recv_tau = uint_to_float(tau_uint, -TAU_MAX, TAU_MAX, 12)
-                    # 更新电机数据，包括温度和状态
-                    self.motors_map[MasterID].recv_data(recv_q, recv_dq, recv_tau, t_mos, t_rotor, motor_id, status)
-
-
-    def __process_set_param_packet(self, data, CANID, CMD):
-        if CMD == 0x11 and (data[2] == 0x33 or data[2] == 0x55):
-            masterid=CANID
-            slaveId = ((data[1] << 8) | data[0])
-            if CANID==0x00:  #防止有人把MasterID设为0稳一手
-                masterid=slaveId
-
-            if masterid not in self.motors_map:
-                if slaveId not in self.motors_map:
-                    return
-                else:
-                    masterid=slaveId
-
-            RID = data[3]
-            # 读取参数得到的数据
-            if is_in_ranges(RID):
-                #uint32类型
-                num = uint8s_to_uint32(data[4], data[5], data[6], data[7])
-                self.motors_map[masterid].temp_param_dict[RID] = num
-
-            else:
-                #float类型
-                num = uint8s_to_float(data[4], data[5], data[6], data[7])
-                self.motors_map[masterid].temp_param_dict[RID] = num
-
-
-    def addMotor(self, Motor):
-        """
-        add motor to the motor control object 添加电机到电机控制对象
-        :param Motor: Motor object 电机对象
-        """
-        self.motors_map[Motor.SlaveID] = Motor
-        if Motor.MasterID != 0:
-            self.motors_map[Motor.MasterID] = Motor
-        return True
-
-    def __control_cmd(self, Motor, cmd: np.uint8):
-        data_buf = np.array([0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, cmd], np.uint8)
-        self.__send_data(Motor.SlaveID, data_buf)
-
-    def __send_data(self, motor_id, data):
-        """
-        send data to the motor 发送数据到电机
-        :param motor_id:
-        :param data:
-        :return:
-        """
-        self.send_data_frame[13] = motor_id & 0xff
-        self.send_data_frame[14] = (motor_id >> 8)& 0xff  #id high 8 bits
-        self.send_data_frame[21:29] = data
-        self.serial_.write(bytes(self.send_data_frame.T))
-
-    def __read_RID_param(self, Motor, RID):
-        can_id_l = Motor.SlaveID & 0xff #id low 8 bits
-        can_id_h = (Motor.SlaveID >> 8)& 0xff  #id high 8 bits
-        data_buf = np.array([np.uint8(can_id_l), np.uint8(can_id_h), 0x33, np.uint8(RID), 0x00, 0x00, 0x00, 0x00], np.uint8)
-        self.__send_data(0x7FF, data_buf)
-
-    def __write_motor_param(self, Motor, RID, data):
-        can_id_l = Motor.SlaveID & 0xff #id low 8 bits
-        can_id_h = (Motor.SlaveID >> 8)& 0xff  #id high 8 bits
-        data_buf = np.array([np.uint8(can_id_l), np.uint8(can_id_h), 0x55, np.uint8(RID), 0x00, 0x00, 0x00, 0x00], np.uint8)
-        if not is_in_ranges(RID):
-            # data is float
-            data_buf[4:8] = float_to_uint8s(data)
-        else:
-            # data is int
-            data_buf[4:8] = data_to_uint8s(int(data))
-        self.__send_data(0x7FF, data_buf)
-
-    def switchControlMode(self, Motor, ControlMode):
-        """
-        switch the control mode of the motor 切换电机控制模式
-        :param Motor: Motor object 电机对象
-        :param ControlMode: Control_Type 电机控制模式 example:MIT:Control_Type.MIT MIT模式
-        """
-        max_retries = 10
-        retry_interval = 0.05  #retry times
-        RID = 10
-        self.__write_motor_param(Motor, RID, np.uint8(ControlMode))
-        for _ in range(max_retries):
-            sleep(retry_interval)
-            self.recv_set_param_data()
-            if Motor.SlaveID in self.motors_map:
-                if RID in self.motors_map[Motor.SlaveID].temp_param_dict:
-                    if self.motors_map[Motor.SlaveID].temp_param_dict[RID] == ControlMode:
-                        return True
-                    else:
-                        return False
-        return False
-
-    def save_motor_param(self, Motor):
-        """
-        save the all parameter  to flash 保存所有电机参数
-        :param Motor: Motor object 电机对象
-        :return:
-        """
-        can_id_l = Motor.SlaveID & 0xff #id low 8 bits
-        can_id_h = (Motor.SlaveID >> 8)& 0xff  #id high 8 bits
-        data_buf = np.array([np.uint8(can_id_l), np.uint8(can_id_h), 0xAA, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
-        self.disable(Motor)  # before save disable the motor
-        self.__send_data(0x7FF, data_buf)
-        sleep(0.001)
-
-    def change_limit_param(self, Motor_Type, PMAX, VMAX, TMAX):
-        """
-        change the PMAX VMAX TMAX of the motor 改变电机的PMAX VMAX TMAX
-        :param Motor_Type:
-        :param PMAX: 电机的PMAX
-        :param VMAX: 电机的VMAX
-        :param TMAX: 电机的TMAX
-        :return:
-        """
-        self.Limit_Param[Motor_Type][0] = PMAX
-        self.Limit_Param[Motor_Type][1] = VMAX
-        self.Limit_Param[Motor_Type][2] = TMAX
-
-    def refresh_motor_status(self,Motor):
-        """
-        get the motor status 获得电机状态
-        """
-        can_id_l = Motor.SlaveID & 0xff #id low 8 bits
-        can_id_h = (Motor.SlaveID >> 8) & 0xff  #id high 8 bits
-        data_buf = np.array([np.uint8(can_id_l), np.uint8(can_id_h), 0xCC, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
-        self.__send_data(0x7FF, data_buf)
-        self.recv()  # receive the data from serial port
-
-    def change_motor_param(self, Motor, RID, data):
-        """
-        change the RID of the motor 改变电机的参数
-        :param Motor: Motor object 电机对象
-        :param RID: DM_variable 电机参数
-        :param data: 电机参数的值
-        :return: True or False ,True means success, False means fail
-        """
-        max_retries = 20
-        retry_interval = 0.05  #retry times
-
-        self.__write_motor_param(Motor, RID, data)
-        for _ in range(max_retries):
-            self.recv_set_param_data()
-            if Motor.SlaveID in self.motors_map and RID in self.motors_map[Motor.SlaveID].temp_param_dict:
-                if abs(self.motors_map[Motor.SlaveID].temp_param_dict[RID] - data) < 0.1:
-                    return True
-                else:
-                    return False
-            sleep(retry_interval)
-        return False
-
-    def read_motor_param(self, Motor, RID):
-        """
-        read only the RID of the motor 读取电机的内部信息例如 版本号等
-        :param Motor: Motor object 电机对象
-        :param RID: DM_variable 电机参数
-        :return: 电机参数的值
-        """
-        max_retries = 20
-        retry_interval = 0.05  #retry times
-        self.__read_RID_param(Motor, RID)
-        for _ in range(max_retries):
-            sleep(retry_interval)
-            self.recv_set_param_data()
-            if Motor.SlaveID in self.motors_map:
-                if RID in self.motors_map[Motor.SlaveID].temp_param_dict:
-                    return self.motors_map[Motor.SlaveID].temp_param_dict[RID]
-                else:
-                    return None
-        return None
-
-    # -------------------------------------------------
-    # Extract packets from the serial data
-    def __extract_packets(self, data):
-        frames = []
-        header = 0xAA
-        tail = 0x55
-        frame_length = 16
-        i = 0
-        remainder_pos = 0
-
-        while i <= len(data) - frame_length:
-            if data[i] == header and data[i + frame_length - 1] == tail:
-                frame = data[i:i + frame_length]
-                frames.append(frame)
-                i += frame_length
-                remainder_pos = i
-            else:
-                i += 1
-        self.data_save = data[remainder_pos:]
-        return frames
-# 电机状态枚举类
-class Motor_Status(IntEnum):
-    DISABLED = 0x0      # 失能
-    ENABLED = 0x1       # 使能
-    OVERVOLTAGE = 0x8   # 超压
-    UNDERVOLTAGE = 0x9  # 欠压
-    OVERCURRENT = 0xA   # 过电流
-    MOS_OVERTEMP = 0xB  # MOS过温
-    COIL_OVERTEMP = 0xC # 电机线圈过温
-    COMM_LOST = 0xD     # 通讯丢失
-    OVERLOAD = 0xE      # 过载
-
-# Motor类增加温度和状态相关属性和方法
-class Motor:
-    def __init__(self, MotorType, SlaveID, MasterID):
-        """
-        define Motor object 定义电机对象
-        :param MotorType: Motor type 电机类型
-        :param SlaveID: CANID 电机ID
-        :param MasterID: MasterID 主机ID 建议不要设为0
-        """
-        self.Pd = float(0)
-        self.Vd = float(0)
-        self.state_q = float(0)
-        self.state_dq = float(0)
-        self.state_tau = float(0)
-        # 新增温度相关属性
-        self.state_t_mos = float(0)      # MOS管温度
-        self.state_t_rotor = float(0)    # 电机线圈温度
-        # 新增状态相关属性
-        self.motor_status = Motor_Status.DISABLED  # 电机状态
-        self.motor_id = 0                # 电机ID (从反馈帧获取)
-        self.SlaveID = SlaveID
-        self.MasterID = MasterID
-        self.MotorType = MotorType
-        self.isEnable = False
-        self.NowControlMode = Control_Type.MIT
-        self.temp_param_dict = {}
-    def recv_data(self, q: float, dq: float, tau: float, t_mos: float = 0, t_rotor: float = 0, 
-                  motor_id: int = 0, status: int = 0):
-        """
-        接收电机数据，包括温度和状态信息
-        """
-        self.state_q = q
-        self.state_dq = dq
-        self.state_tau = tau
-        self.state_t_mos = t_mos
-        self.state_t_rotor = t_rotor
-        self.motor_id = motor_id
-        try:
-            self.motor_status = Motor_Status(status)
-        except ValueError:
-            self.motor_status = status  # 如果是未知状态，直接存储数值
-    # def recv_data(self, q: float, dq: float, tau: float, t_mos: float = 0, t_rotor: float = 0, 
-    #               motor_id: int = 0, status: int = 0):
-    #     """
-    #     接收电机数据，包括温度和状态信息
-    #     """
-    #     # 记录旧状态
-    #     old_status = self.motor_status
-        
-    #     # 更新数据
-    #     self.state_q = q
-    #     self.state_dq = dq
-    #     self.state_tau = tau
-    #     self.state_t_mos = t_mos
-    #     self.state_t_rotor = t_rotor
-    #     self.motor_id = motor_id
-        
-    #     try:
-    #         self.motor_status = Motor_Status(status)
-    #     except ValueError:
-    #         self.motor_status = status  # 如果是未知状态，直接存储数值
-        
-    #     # 状态变化时打印调试信息
-    #     # if old_status != self.motor_status:
-    #     #     logger.info(f"电机 {self.SlaveID} 状态变化: {old_status} -> {self.motor_status}")
-    def getPosition(self):
-        """
-        get the position of the motor 获取电机位置
-        :return: the position of the motor 电机位置
-        """
-        return self.state_q
-
-    def getVelocity(self):
-        """
-        get the velocity of the motor 获取电机速度
-        :return: the velocity of the motor 电机速度
-        """
-        return self.state_dq
-
-    def getTorque(self):
-        """
-        get the torque of the motor 获取电机力矩
-        :return: the torque of the motor 电机力矩
-        """
-        return self.state_tau
-
-    def getT_MOS(self):
-        """
-        获取MOS管温度
-        :return: MOS管温度(摄氏度)
-        """
-        return self.state_t_mos
-
-    def getT_Rotor(self):
-        """
-        获取电机线圈温度
-        :return: 电机线圈温度(摄氏度)
-        """
-        return self.state_t_rotor
-
-    def getMotorStatus(self):
-        """
-        获取电机状态
-        :return: 电机状态(Motor_Status枚举或数值)
-        """
-        return self.motor_status
-
-    def getMotorStatusText(self):
-        """
-        获取电机状态的文字描述
-        :return: 状态描述字符串
-        """
-        status_dict = {
-            Motor_Status.DISABLED: "失能",
-            Motor_Status.ENABLED: "使能", 
-            Motor_Status.OVERVOLTAGE: "超压",
-            Motor_Status.UNDERVOLTAGE: "欠压",
-            Motor_Status.OVERCURRENT: "过电流",
-            Motor_Status.MOS_OVERTEMP: "MOS过温",
-            Motor_Status.COIL_OVERTEMP: "电机线圈过温",
-            Motor_Status.COMM_LOST: "通讯丢失",
-            Motor_Status.OVERLOAD: "过载"
-        }
-        return status_dict.get(self.motor_status, f"未知状态({self.motor_status})")
-
-    def getMotorStatusIcon(self):
-        """
-        获取电机状态的图标
-        :return: 状态对应的图标字符串
-        """
-        status_icons = {
-            Motor_Status.DISABLED: "⭕",      # 失能
-            Motor_Status.ENABLED: "✅",       # 使能
-            Motor_Status.OVERVOLTAGE: "⚡",   # 超压
-            Motor_Status.UNDERVOLTAGE: "🔋",  # 欠压
-            Motor_Status.OVERCURRENT: "⚠️",   # 过电流
-            Motor_Status.MOS_OVERTEMP: "🔥",  # MOS过温
-            Motor_Status.COIL_OVERTEMP: "🌡️", # 电机线圈过温
-            Motor_Status.COMM_LOST: "📡",     # 通讯丢失
-            Motor_Status.OVERLOAD: "🚫"      # 过载
-        }
-        return status_icons.get(self.motor_status, "❓")
-
-    def isHealthy(self):
-        """
-        判断电机是否处于健康状态
-        :return: True表示健康，False表示有异常
-        """
-        healthy_states = [Motor_Status.DISABLED, Motor_Status.ENABLED]
-        return self.motor_status in healthy_states
-
-    def hasError(self):
-        """
-        判断电机是否有错误
-        :return: True表示有错误，False表示正常
-        """
-        error_states = [Motor_Status.OVERVOLTAGE, Motor_Status.UNDERVOLTAGE, 
-                       Motor_Status.OVERCURRENT, Motor_Status.MOS_OVERTEMP,
-                       Motor_Status.COIL_OVERTEMP, Motor_Status.COMM_LOST, 
-                       Motor_Status.OVERLOAD]
-        return self.motor_status in error_states
-
-    def printStatus(self):
-        """
-        打印电机完整状态信息
-        """
-        print(f"🔧 电机 ID {self.SlaveID} 状态报告:")
-        print(f"   状态: {self.getMotorStatusIcon()} {self.getMotorStatusText()}")
-        print(f"   位置: {self.state_q:.3f} rad")
-        print(f"   速度: {self.state_dq:.3f} rad/s") 
-        print(f"   扭矩: {self.state_tau:.3f} Nm")
-        print(f"   MOS温度: {self.state_t_mos:.1f} ℃")
-        print(f"   线圈温度: {self.state_t_rotor:.1f} ℃")
-        if self.hasError():
-            print(f"   ⚠️  警告: 电机处于异常状态!")
-
-    def getParam(self, RID):
-        """
-        get the parameter of the motor 获取电机内部的参数，需要提前读取
-        :param RID: DM_variable 电机参数
-        :return: the parameter of the motor 电机参数
-        
-        使用技巧:
-        1. 调用read_motor_param()读取参数后，参数会临时存储在temp_param_dict中
-        2. 然后可以通过getParam()快速获取已读取的参数
-        3. 常用参数示例:
-           - DM_variable.hw_ver: 硬件版本
-           - DM_variable.sw_ver: 软件版本  
-           - DM_variable.PMAX: 最大位置
-           - DM_variable.VMAX: 最大速度
-           - DM_variable.TMAX: 最大扭矩
-           - DM_variable.CTRL_MODE: 控制模式
-        """
-        if RID in self.temp_param_dict:
-            return self.temp_param_dict[RID]
-        else:
-            return None
-
-    def getParamText(self, RID):
-        """
-        获取参数的文字描述
-        :param RID: DM_variable 电机参数
-        :return: 参数名称和值的描述
-        """
-        param_names = {
-            DM_variable.UV_Value: "欠压值",
-            DM_variable.KT_Value: "扭矩常数", 
-            DM_variable.OT_Value: "过温值",
-            DM_variable.OC_Value: "过流值",
-            DM_variable.ACC: "加速度",
-            DM_variable.DEC: "减速度",
-            DM_variable.MAX_SPD: "最大速度",
-            DM_variable.MST_ID: "主机ID",
-            DM_variable.ESC_ID: "从机ID",
-            DM_variable.TIMEOUT: "超时时间",
-            DM_variable.CTRL_MODE: "控制模式",
-            DM_variable.hw_ver: "硬件版本",
-            DM_variable.sw_ver: "软件版本",
-            DM_variable.PMAX: "最大位置",
-            DM_variable.VMAX: "最大速度", 
-            DM_variable.TMAX: "最大扭矩"
-        }
-        
-        param_name = param_names.get(RID, f"参数{RID}")
-        param_value = self.getParam(RID)
-        
-        if param_value is not None:
-            return f"{param_name}: {param_value}"
-        else:
-            return f"{param_name}: 未读取"
-
-def LIMIT_MIN_MAX(x, min, max):
-    if x <= min:
-        x = min
-    elif x > max:
-        x = max
-
-
-def float_to_uint(x: float, x_min: float, x_max: float, bits):
-    LIMIT_MIN_MAX(x, x_min, x_max)
-    span = x_max - x_min
-    data_norm = (x - x_min) / span
-    return np.uint16(data_norm * ((1 << bits) - 1))
-
-
-def uint_to_float(x: np.uint16, min: float, max: float, bits):
-    span = max - min
-    data_norm = float(x) / ((1 << bits) - 1)
-    temp = data_norm * span + min
-    return np.float32(temp)
-
-
-def float_to_uint8s(value):
-    # Pack the float into 4 bytes
-    packed = pack('f', value)
-    # Unpack the bytes into four uint8 values
-    return unpack('4B', packed)
-
-
-def data_to_uint8s(value):
-    # Check if the value is within the range of uint32
-    if isinstance(value, int) and (0 <= value <= 0xFFFFFFFF):
-        # Pack the uint32 into 4 bytes
-        packed = pack('I', value)
-    else:
-        raise ValueError("Value must be an integer within the range of uint32")
-
-    # Unpack the bytes into four uint8 values
-    return unpack('4B', packed)
-
-
-def is_in_ranges(number):
-    """
-    check if the number is in the range of uint32
-    :param number:
-    :return:
-    """
-    if (7 <= number <= 10) or (13 <= number <= 16) or (35 <= number <= 36):
-        return True
-    return False
-
-
-def uint8s_to_uint32(byte1, byte2, byte3, byte4):
-    # Pack the four uint8 values into a single uint32 value in little-endian order
-    packed = pack('<4B', byte1, byte2, byte3, byte4)
-    # Unpack the packed bytes into a uint32 value
-    return unpack('<I', packed)[0]
-
-
-def uint8s_to_float(byte1, byte2, byte3, byte4):
-    # Pack the four uint8 values into a single float value in little-endian order
-    packed = pack('<4B', byte1, byte2, byte3, byte4)
-    # Unpack the packed bytes into a float value
-    return unpack('<f', packed)[0]
-
-
-def print_hex(data):
-    hex_values = [f'{byte:02X}' for byte in data]
-    print(' '.join(hex_values))
-
-
-def get_enum_by_index(index, enum_class):
-    try:
-        return enum_class(index)
-    except ValueError:
-        return None
-
-
-class DM_Motor_Type(IntEnum):
-    DM4310 = 0
-    DM4310_48V = 1
-    DM4340 = 2
-    DM4340_48V = 3
-    DM6006 = 4
-    DM8006 = 5
-    DM8009 = 6
-    DM10010L = 7
-    DM10010 = 8
-    DMH3510 = 9
-    DMH6215 = 10
-    DMG6220 = 11
-
-
-class DM_variable(IntEnum):
-    UV_Value = 0
-    KT_Value = 1
-    OT_Value = 2
-    OC_Value = 3
-    ACC = 4
-    DEC = 5
-    MAX_SPD = 6
-    MST_ID = 7
-    ESC_ID = 8
-    TIMEOUT = 9
-    CTRL_MODE = 10
-    Damp = 11
-    Inertia = 12
-    hw_ver = 13
-    sw_ver = 14
-    SN = 15
-    NPP = 16
-    Rs = 17
-    LS = 18
-    Flux = 19
-    Gr = 20
-    PMAX = 21
-    VMAX = 22
-    TMAX = 23
-    I_BW = 24
-    KP_ASR = 25
-    KI_ASR = 26
-    KP_APR = 27
-    KI_APR = 28
-    OV_Value = 29
-    GREF = 30
-    Deta = 31
-    V_BW = 32
-    IQ_c1 = 33
-    VL_c1 = 34
-    can_br = 35
-    sub_ver = 36
-    u_off = 50
-    v_off = 51
-    k1 = 52
-    k2 = 53
-    m_off = 54
-    dir = 55
-    p_m = 80
-    xout = 81
-
-
-class Control_Type(IntEnum):
-    MIT = 1
-    POS_VEL = 2
-    VEL = 3
-    Torque_Pos = 4
-
-
-
-
-
-
-
-
-
+from time import sleep
+import numpy as np
+from enum import IntEnum
+from struct import unpack
+from struct import pack
+from struct import calcsize
+import json
+import math
+import time
+import threading        # NEW
+import logging
+from contextlib import contextmanager
+logger = logging.getLogger("motor_status")
+
+
+class BusScheduler:
+    """
+    bus bandwidth budget and time-slot scheduler 总线带宽预算与发送时隙调度
+    每个请求是一对帧（串口发送帧 + 电机反馈帧），串口链路和 CAN 总线中较慢的一方决定每秒可完成的请求数。
+    周期性的控制/轮询流先申请速率，超出预算时降级或拒绝；每次发送占用一个时隙，发送过快时等待。
+    """
+    TX_FRAME_BYTES = 30     # 串口发送帧长度
+    RX_FRAME_BYTES = 16     # 串口接收帧长度
+    CAN_FRAME_BITS = 130    # 8字节数据的 CAN 标准帧近似位数（含位填充和帧间隔）
+
+    def __init__(self, baud_rate=921600, can_bitrate=1000000, max_load=0.8):
+        """
+        :param baud_rate: serial baud rate 串口波特率（每字节按10位计）
+        :param can_bitrate: CAN bitrate CAN 总线波特率
+        :param max_load: fraction of capacity that periodic streams may reserve 周期流最多可预留的容量比例
+        """
+        serial_rate = baud_rate / 10.0 / (self.TX_FRAME_BYTES + self.RX_FRAME_BYTES)
+        can_rate = can_bitrate / (2.0 * self.CAN_FRAME_BITS)
+        self.capacity = min(serial_rate, can_rate)  # 每秒可完成的请求数
+        self.budget = self.capacity * max_load
+        self.slot = 1.0 / self.capacity             # 相邻两次发送的最小间隔
+        self.streams = dict()                       # 周期流名称 -> 已分配速率 (Hz)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._stats_start = time.perf_counter()
+        self.tx_frames = 0
+        self.rx_frames = 0
+
+    def achievable_rate(self, n_motors, load=None):
+        """
+        per-motor request rate when n_motors share the bus 多台电机平分总线时每台可达的请求速率 (Hz)
+        """
+        budget = self.budget if load is None else self.capacity * load
+        return budget / max(n_motors, 1)
+
+    def request_rate(self, name, rate, degrade=True):
+        """
+        reserve a periodic stream 申请周期流带宽
+        :param name: stream name 流名称，重复申请时替换原有分配
+        :param rate: requested rate Hz 期望速率
+        :param degrade: True 时超出预算降级为剩余带宽，False 时抛出 ValueError
+        :return: granted rate 实际分配的速率
+        """
+        with self._lock:
+            available = self.budget - sum(r for key, r in self.streams.items() if key != name)
+            if rate > available and not degrade:
+                raise ValueError(f"总线带宽不足: {name} 需要 {rate:.0f} Hz，剩余 {max(available, 0):.0f} Hz")
+            granted = max(min(rate, available), 0.0)
+            self.streams[name] = granted
+            return granted
+
+    def release(self, name):
+        with self._lock:
+            self.streams.pop(name, None)
+
+    def acquire_slot(self):
+        """
+        wait for the next free transmit slot 等待下一个空闲发送时隙
+        调用方的发送速率低于总线容量时不会等待
+        """
+        with self._lock:
+            now = time.perf_counter()
+            start = max(now, self._next_slot)
+            self._next_slot = start + self.slot
+            self.tx_frames += 1
+        if start > now:
+            time.sleep(start - now)
+
+    def record_rx(self, n_frames):
+        self.rx_frames += n_frames
+
+    def utilisation(self, reset=False):
+        """
+        measured bus usage since the last reset 上次重置以来的实际总线使用情况
+        :return: dict(tx_rate, rx_rate, load, reserved)，load 为按帧数估算的占用比例
+        """
+        with self._lock:
+            elapsed = max(time.perf_counter() - self._stats_start, 1e-9)
+            tx_rate = self.tx_frames / elapsed
+            rx_rate = self.rx_frames / elapsed
+            stats = {
+                'tx_rate': tx_rate,
+                'rx_rate': rx_rate,
+                'load': max(tx_rate, rx_rate) / self.capacity,
+                'reserved': sum(self.streams.values()) / self.capacity,
+            }
+            if reset:
+                self._stats_start = time.perf_counter()
+                self.tx_frames = 0
+                self.rx_frames = 0
+        return stats
+
+
+class SafetySupervisor:
+    """
+    safety supervisor on the receive path 接收路径上的安全监督
+    MotorControl 每解码一帧反馈就调用 on_feedback 检查故障码和温度限值，违规时立即发送失能命令，
+    调用方的下一帧发送之前电机已失能；触发后锁定，只放行失能和状态/参数帧，直到 reset()。
+    看门狗：
+      1. 命令发出后主机持续接收了 feedback_timeout 秒仍没有该电机的反馈 -> 反馈超时
+      2. 独立线程检查 stall_timeout 秒内没有任何发送 -> 控制循环卡死。
+         只在有电机处于运动指令下时启用：最近一帧控制命令为零增益零力矩（MIT）、零速度（速度模式）
+         或失能/使能等控制帧时视为空闲，测试结束后的分析、保存不会误触发；
+         运动中有意长时间不收发（如导出图表）时用 paused() 包住
+    检查都在收发路径内完成，控制循环不需要额外调用。
+    """
+
+    def __init__(self, max_t_mos=80.0, max_t_rotor=100.0, feedback_timeout=0.1, stall_timeout=1.0, on_trip=None):
+        """
+        :param max_t_mos: MOS temperature limit MOS管温度上限 ℃
+        :param max_t_rotor: rotor temperature limit 线圈温度上限 ℃
+        :param feedback_timeout: command-to-feedback watchdog 命令到反馈的最长等待时间 s
+        :param stall_timeout: control loop watchdog 控制循环无发送的最长时间 s，None 表示不启用
+        :param on_trip: callback(Motor, reason) 触发时回调，在触发的线程中调用
+        """
+        self.max_t_mos = max_t_mos
+        self.max_t_rotor = max_t_rotor
+        self.feedback_timeout = feedback_timeout
+        self.stall_timeout = stall_timeout
+        self.on_trip = on_trip
+        self.tripped = None         # 触发原因，未触发为 None
+        self.trips = []             # [(time, SlaveID, reason)]
+        self.control = None
+        self._lock = threading.Lock()
+        self._pending = dict()      # SlaveID -> 最早一条未应答命令的发送时间
+        self._moving = set()        # 最近一帧控制命令仍在驱动电机的 SlaveID，看门狗只对这些电机启用
+        self._last_send = time.perf_counter()
+        self._latency_sum = 0.0
+        self._latency_count = 0
+        self._latency_max = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+        self._paused = 0
+
+    def start(self, control):
+        self.control = control
+        self._last_send = time.perf_counter()
+        if self.stall_timeout is not None:
+            self._thread = threading.Thread(target=self._watchdog, name="SafetyWatchdog", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def reset(self):
+        """clear the latched trip 清除锁定状态"""
+        with self._lock:
+            self.tripped = None
+            self._pending.clear()
+            self._moving.clear()
+
+    @contextmanager
+    def paused(self):
+        """
+        suspend the stall watchdog 暂停控制循环看门狗，反馈检查照常进行
+        """
+        self._paused += 1
+        try:
+            yield
+        finally:
+            self._paused -= 1
+            self._last_send = time.perf_counter()
+
+    def on_send(self, motor_id, data):
+        """
+        called for every transmitted frame 每次发送前调用
+        :return: False 表示已触发保护，该帧不允许发送
+        """
+        now = time.perf_counter()
+        self._last_send = now
+        if motor_id == 0x7FF:
+            # 状态请求会产生反馈，参数读写的应答不是反馈帧，不计入看门狗
+            if data[2] != 0xCC:
+                return True
+            slave_id = int(data[0]) | (int(data[1]) << 8)
+        else:
+            control_frame = (data[:7] == 0xFF).all()
+            if self.tripped is not None and not (control_frame and data[7] == 0xFD):
+                return False
+            slave_id = motor_id & 0xFF
+            if control_frame or self._is_idle(motor_id, data):
+                self._moving.discard(slave_id)
+            else:
+                self._moving.add(slave_id)
+        self._pending.setdefault(slave_id, now)
+        return True
+
+    @staticmethod
+    def _is_idle(motor_id, data):
+        """控制命令是否不驱动电机：MIT 模式 kp=kd=0 且力矩为零，速度模式速度为零"""
+        mode = motor_id >> 8
+        if mode == 0:
+            kp = ((int(data[3]) & 0xF) << 8) | int(data[4])
+            kd = (int(data[5]) << 4) | (int(data[6]) >> 4)
+            tau = ((int(data[6]) & 0xF) << 8) | int(data[7])
+            return kp == 0 and kd == 0 and abs(tau - 2047.5) <= 1  # 12位力矩的零点在中间
+        if mode == 2:
+            return unpack('f', bytes(data[0:4]))[0] == 0.0
+        return False
+
+    def on_feedback(self, Motor):
+        """called for every decoded feedback frame 每解码一帧反馈调用"""
+        now = time.perf_counter()
+        sent = self._pending.pop(Motor.SlaveID, None)
+        if sent is not None:
+            latency = now - sent
+            self._latency_sum += latency
+            self._latency_count += 1
+            if latency > self._latency_max:
+                self._latency_max = latency
+        if Motor.hasError():
+            self.trip(Motor, f"电机故障: {Motor.getMotorStatusText()}")
+        elif Motor.state_t_mos > self.max_t_mos:
+            self.trip(Motor, f"MOS温度 {Motor.state_t_mos:.0f}℃ 超过 {self.max_t_mos:.0f}℃")
+        elif Motor.state_t_rotor > self.max_t_rotor:
+            self.trip(Motor, f"线圈温度 {Motor.state_t_rotor:.0f}℃ 超过 {self.max_t_rotor:.0f}℃")
+
+    def on_recv(self):
+        """called after each receive 每次接收后调用，检查未应答的命令"""
+        # 反馈在检查之前已经处理，调用方发送后 sleep 不会误触发
+        now = time.perf_counter()
+        for slave_id, sent in list(self._pending.items()):
+            if now - sent > self.feedback_timeout:
+                Motor = self.control.motors_map.get(slave_id)
+                del self._pending[slave_id]
+                if Motor is not None:
+                    self.trip(Motor, f"反馈超时: {(now - sent) * 1000:.0f} ms 未收到反馈")
+
+    def trip(self, Motor, reason):
+        with self._lock:
+            first = self.tripped is None
+            if first:
+                self.tripped = reason
+            # 触发后每帧反馈都会重发失能命令，相同的记录只保留一条
+            if not self.trips or self.trips[-1][1:] != (Motor.SlaveID, reason):
+                self.trips.append((time.time(), Motor.SlaveID, reason))
+        self.control.emergency_disable(Motor)
+        if first and self.on_trip is not None:
+            self.on_trip(Motor, reason)
+
+    def _watchdog(self):
+        while not self._stop.wait(self.stall_timeout / 4):
+            if self.tripped is None and not self._paused and self._moving and \
+                    time.perf_counter() - self._last_send > self.stall_timeout:
+                for slave_id in list(self._moving):
+                    Motor = self.control.motors_map.get(slave_id)
+                    if Motor is not None:
+                        self.trip(Motor, f"运动中控制循环超过 {self.stall_timeout:.1f} s 没有发送命令")
+
+    def latency_stats(self):
+        """
+        command-to-feedback latency 命令到反馈的延迟统计
+        :return: dict(count, mean_ms, max_ms)
+        """
+        count = self._latency_count
+        return {
+            'count': count,
+            'mean_ms': self._latency_sum / count * 1000 if count else 0.0,
+            'max_ms': self._latency_max * 1000,
+        }
+
+
+class MotorControl:
+    send_data_frame = np.array(
+        [0x55, 0xAA, 0x1e, 0x03, 0x01, 0x00, 0x00, 0x00, 0x0a, 0x00, 0x00, 0x00, 0x00, 0, 0, 0, 0, 0x00, 0x08, 0x00,
+         0x00, 0, 0, 0, 0, 0, 0, 0, 0, 0x00], np.uint8)
+    #电机的最大位置 (Q_MAX)、速度 (DQ_MAX) 和力矩 (TAU_MAX)
+    #                4310           4310_48        4340           4340_48
+    Limit_Param = [[12.5, 30, 10], [12.5, 50, 10], [12.5, 8, 28], [12.5, 10, 28],
+                   # 6006           8006           8009            10010L         10010
+                   [12.5, 45, 20], [12.5, 45, 40], [12.5, 45, 54], [12.5, 25, 200], [12.5, 20, 200],
+                   # H3510            DMG6215      DMH6220
+                   [12.5 , 280 , 1],[12.5 , 45 , 10],[12.5 , 45 , 10]]
+
+    def __init__(self, serial_device, capture_path=None, can_bitrate=1000000):
+        """
+        define MotorControl object 定义电机控制对象
+        :param serial_device: serial object 串口对象
+        :param capture_path: optional bus capture file 可选，记录串口收发字节的抓包文件路径，可用 ReplaySerial 回放
+        :param can_bitrate: CAN bitrate CAN 总线波特率，和串口波特率一起决定总线带宽预算
+        """
+        self.scheduler = BusScheduler(getattr(serial_device, 'baudrate', 921600), can_bitrate)
+        # 每个实例使用自己的发送帧缓冲，多个串口并行工作时互不干扰
+        self.send_data_frame = self.send_data_frame.copy()
+        self.supervisor = None
+        if capture_path is not None:
+            serial_device = SerialCapture(serial_device, capture_path)
+        self.serial_ = serial_device
+        self.motors_map = dict()
+        self.data_save = bytes()  # save data
+        if self.serial_.is_open:  # open the serial port
+            print("Serial port is open")
+            serial_device.close()
+        self.serial_.open()
+        self._lock = threading.RLock()   # NEW：线程互斥锁，安全监督在接收路径和看门狗线程中也会发送失能命令
+
+    def controlMIT(self, DM_Motor, kp: float, kd: float, q: float, dq: float, tau: float):
+        """
+        MIT Control Mode Function 达妙电机MIT控制模式函数
+        :param DM_Motor: Motor object 电机对象
+        :param kp: kp
+        :param kd:  kd
+        :param q:  position  期望位置
+        :param dq:  velocity  期望速度
+        :param tau: torque  期望力矩
+        :return: None
+        """
+        if DM_Motor.SlaveID not in self.motors_map:
+            print("controlMIT ERROR : Motor ID not found")
+            return
+        kp_uint = float_to_uint(kp, 0, 500, 12)
+        kd_uint = float_to_uint(kd, 0, 5, 12)
+        MotorType = DM_Motor.MotorType
+        Q_MAX = self.Limit_Param[MotorType][0]
+        DQ_MAX = self.Limit_Param[MotorType][1]
+        TAU_MAX = self.Limit_Param[MotorType][2]
+        q_uint = float_to_uint(q, -Q_MAX, Q_MAX, 16)
+        dq_uint = float_to_uint(dq, -DQ_MAX, DQ_MAX, 12)
+        tau_uint = float_to_uint(tau, -TAU_MAX, TAU_MAX, 12)
+        data_buf = np.array([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
+        data_buf[0] = (q_uint >> 8) & 0xff
+        data_buf[1] = q_uint & 0xff
+        data_buf[2] = dq_uint >> 4
+        data_buf[3] = ((dq_uint & 0xf) << 4) | ((kp_uint >> 8) & 0xf)
+        data_buf[4] = kp_uint & 0xff
+        data_buf[5] = kd_uint >> 4
+        data_buf[6] = ((kd_uint & 0xf) << 4) | ((tau_uint >> 8) & 0xf)
+        data_buf[7] = tau_uint & 0xff
+        self.__send_data(DM_Motor.SlaveID, data_buf)
+        self.recv()  # receive the data from serial port
+
+    def control_delay(self, DM_Motor, kp: float, kd: float, q: float, dq: float, tau: float, delay: float):
+        """
+        MIT Control Mode Function with delay 达妙电机MIT控制模式函数带延迟
+        :param DM_Motor: Motor object 电机对象
+        :param kp: kp
+        :param kd: kd
+        :param q:  position  期望位置
+        :param dq:  velocity  期望速度
+        :param tau: torque  期望力矩
+        :param delay: delay time 延迟时间 单位秒
+        """
+        self.controlMIT(DM_Motor, kp, kd, q, dq, tau)
+        sleep(delay)
+
+    def control_Pos_Vel(self, Motor, P_desired: float, V_desired: float):
+        """
+        control the motor in position and velocity control mode 电机位置速度控制模式
+        :param Motor: Motor object 电机对象
+        :param P_desired: desired position 期望位置
+        :param V_desired: desired velocity 期望速度
+        :return: None
+        """
+        if Motor.SlaveID not in self.motors_map:
+            print("Control Pos_Vel Error : Motor ID not found")
+            return
+        motorid = 0x100 + Motor.SlaveID
+        data_buf = np.array([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
+        P_desired_uint8s = float_to_uint8s(P_desired)
+        V_desired_uint8s = float_to_uint8s(V_desired)
+        data_buf[0:4] = P_desired_uint8s
+        data_buf[4:8] = V_desired_uint8s
+        self.__send_data(motorid, data_buf)
+        # time.sleep(0.001)
+        self.recv()  # receive the data from serial port
+
+    def control_Vel(self, Motor, Vel_desired):
+        """
+        control the motor in velocity control mode 电机速度控制模式
+        :param Motor: Motor object 电机对象
+        :param Vel_desired: desired velocity 期望速度
+        """
+        if Motor.SlaveID not in self.motors_map:
+            print("control_VEL ERROR : Motor ID not found")
+            return
+        motorid = 0x200 + Motor.SlaveID
+        data_buf = np.array([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
+        Vel_desired_uint8s = float_to_uint8s(Vel_desired)
+        data_buf[0:4] = Vel_desired_uint8s
+        self.__send_data(motorid, data_buf)
+        self.recv()  # receive the data from serial port
+
+    def control_pos_force(self, Motor, Pos_des: float, Vel_des, i_des):
+        """
+        control the motor in EMIT control mode 电机力位混合模式
+        :param Pos_des: desired position rad  期望位置 单位为rad
+        :param Vel_des: desired velocity rad/s  期望速度 为放大100倍
+        :param i_des: desired current rang 0-10000 期望电流标幺值放大10000倍
+        电流标幺值：实际电流值除以最大电流值，最大电流见上电打印
+        """
+        if Motor.SlaveID not in self.motors_map:
+            print("control_pos_vel ERROR : Motor ID not found")
+            return
+        motorid = 0x300 + Motor.SlaveID
+        data_buf = np.array([0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
+        Pos_desired_uint8s = float_to_uint8s(Pos_des)
+        data_buf[0:4] = Pos_desired_uint8s
+        Vel_uint = np.uint16(Vel_des)
+        ides_uint = np.uint16(i_des)
+        data_buf[4] = Vel_uint & 0xff
+        data_buf[5] = Vel_uint >> 8
+        data_buf[6] = ides_uint & 0xff
+        data_buf[7] = ides_uint >> 8
+        self.__send_data(motorid, data_buf)
+        self.recv()  # receive the data from serial port
+
+    def enable(self, Motor):
+        """
+        enable motor 使能电机
+        最好在上电后几秒后再使能电机
+        :param Motor: Motor object 电机对象
+        """
+        self.__control_cmd(Motor, np.uint8(0xFC))
+        sleep(0.1)
+        self.recv()  # receive the data from serial port
+
+    def enable_old(self, Motor ,ControlMode):
+        """
+        enable motor old firmware 使能电机旧版本固件，这个是为了旧版本电机固件的兼容性
+        可恶的旧版本固件使能需要加上偏移量
+        最好在上电后几秒后再使能电机
+        :param Motor: Motor object 电机对象
+        """
+        data_buf = np.array([0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xfc], np.uint8)
+        enable_id = ((int(ControlMode)-1) << 2) + Motor.SlaveID
+        self.__send_data(enable_id, data_buf)
+        sleep(0.1)
+        self.recv()  # receive the data from serial port
+
+    def disable(self, Motor):
+        """
+        disable motor 失能电机
+        :param Motor: Motor object 电机对象
+        """
+        self.__control_cmd(Motor, np.uint8(0xFD))
+        sleep(0.01)
+
+    def emergency_disable(self, Motor):
+        """
+        disable without waiting 立即发送失能命令，不等待，供安全监督在接收路径中调用
+        """
+        self.__control_cmd(Motor, np.uint8(0xFD))
+
+    def attach_supervisor(self, supervisor):
+        """
+        attach a SafetySupervisor 挂接安全监督，之后每帧反馈都会被检查
+        """
+        self.supervisor = supervisor
+        supervisor.start(self)
+
+    def set_zero_position(self, Motor):
+        """
+        set the zero position of the motor 设置电机0位
+        :param Motor: Motor object 电机对象
+        """
+        self.__control_cmd(Motor, np.uint8(0xFE))
+        sleep(0.1)
+        self.recv()  # receive the data from serial port
+
+    def recv(self):
+        # 把上次没有解析完的剩下的也放进来
+        data_recv = b''.join([self.data_save, self.serial_.read_all()])
+        packets = self.__extract_packets(data_recv)
+        self.scheduler.record_rx(len(packets))
+        for packet in packets:
+            data = packet[7:15]
+            CANID = (packet[6] << 24) | (packet[5] << 16) | (packet[4] << 8) | packet[3]
+            CMD = packet[1]
+            self.__process_packet(data, CANID, CMD)
+        if self.supervisor is not None:
+            self.supervisor.on_recv()
+
+    def recv_set_param_data(self):
+        # 连续读取多个参数时应答可能跨两次读取，同样拼上上次剩下的数据
+        data_recv = b''.join([self.data_save, self.serial_.read_all()])
+        packets = self.__extract_packets(data_recv)
+        for packet in packets:
+            data = packet[7:15]
+            CANID = (packet[6] << 24) | (packet[5] << 16) | (packet[4] << 8) | packet[3]
+            CMD = packet[1]
+            self.__process_set_param_packet(data, CANID, CMD)
+    def __process_packet(self, data, CANID, CMD):
+        if CMD == 0x11:
+            if CANID != 0x00:
+                if CANID in self.motors_map:
+                    # 解析状态信息: D[0] = ID|ERR<<4, D[1..2] = 位置
+                    motor_id = data[0] & 0x0F      # 电机ID (低4位)
+                    status = (data[0] >> 4) & 0x0F  # 状态 (高4位)
+                    
+                    q_uint = np.uint16((np.uint16(data[1]) << 8) | data[2])
+                    dq_uint = np.uint16((np.uint16(data[3]) << 4) | (data[4] >> 4))
+                    tau_uint = np.uint16(((data[4] & 0xf) << 8) | data[5])
+                    # 新增：解析温度数据
+                    t_mos = float(data[6])      # D[6] = T_MOS，直接为摄氏度
+                    t_rotor = float(data[7])    # D[7] = T_Rotor，直接为摄氏度
+                    
+                    MotorType_recv = self.motors_map[CANID].MotorType
+                    Q_MAX = self.Limit_Param[MotorType_recv][0]
+                    DQ_MAX = self.Limit_Param[MotorType_recv][1]
+                    TAU_MAX = self.Limit_Param[MotorType_recv][2]
+                    recv_q = uint_to_float(q_uint, -Q_MAX, Q_MAX, 16)
+                    recv_dq = uint_to_float(dq_uint, -DQ_MAX, DQ_MAX, 12)
+                    recv_tau = uint_to_float(tau_uint, -TAU_MAX, TAU_MAX, 12)
+                    # 更新电机数据，包括温度和状态
+                    self.motors_map[CANID].recv_data(recv_q, recv_dq, recv_tau, t_mos, t_rotor, motor_id, status)
+                    if self.supervisor is not None:
+                        self.supervisor.on_feedback(self.motors_map[CANID])
+            else:
+                MasterID = data[0] & 0x0f
+                if MasterID in self.motors_map:
+                    # 解析状态信息: D[0] = ID|ERR<<4, D[1..2] = 位置
+                    motor_id = data[0] & 0x0F      # 电机ID (低4位)
+                    status = (data[0] >> 4) & 0x0F  # 状态 (高4位)
+                    
+                    q_uint = np.uint16((np.uint16(data[1]) << 8) | data[2])
+                    dq_uint = np.uint16((np.uint16(data[3]) << 4) | (data[4] >> 4))
+                    tau_uint = np.uint16(((data[4] & 0xf) << 8) | data[5])
+                    # 新增：解析温度数据
+                    t_mos = float(data[6])      # D[6] = T_MOS，直接为摄氏度
+                    t_rotor = float(data[7])    # D[7] = T_Rotor，直接为摄氏度
+                    
+                    MotorType_recv = self.motors_map[MasterID].MotorType
+                    Q_MAX = self.Limit_Param[MotorType_recv][0]
+                    DQ_MAX = self.Limit_Param[MotorType_recv][1]
+                    TAU_MAX = self.Limit_Param[MotorType_recv][2]
+                    recv_q = uint_to_float(q_uint, -Q_MAX, Q_MAX, 16)
+                    recv_dq = uint_to_float(dq_uint, -DQ_MAX, DQ_MAX, 12)
+                    recv_tau = uint_to_float(tau_uint, -TAU_MAX, TAU_MAX, 12)
+                    # 更新电机数据，包括温度和状态
+                    self.motors_map[MasterID].recv_data(recv_q, recv_dq, recv_tau, t_mos, t_rotor, motor_id, status)
+                    if self.supervisor is not None:
+                        self.supervisor.on_feedback(self.motors_map[MasterID])
+
+
+    def __process_set_param_packet(self, data, CANID, CMD):
+        if CMD == 0x11 and (data[2] == 0x33 or data[2] == 0x55):
+            masterid=CANID
+            slaveId = ((data[1] << 8) | data[0])
+            if CANID==0x00:  #防止有人把MasterID设为0稳一手
+                masterid=slaveId
+
+            # 主机ID和其他电机的从机ID相同时（例如扫描ID时），按数据中的从机ID归属
+            if masterid not in self.motors_map or self.motors_map[masterid].SlaveID != slaveId:
+                if slaveId not in self.motors_map:
+                    return
+                else:
+                    masterid=slaveId
+
+            RID = data[3]
+            # 读取参数得到的数据
+            if is_in_ranges(RID):
+                #uint32类型
+                num = uint8s_to_uint32(data[4], data[5], data[6], data[7])
+                self.motors_map[masterid].temp_param_dict[RID] = num
+
+            else:
+                #float类型
+                num = uint8s_to_float(data[4], data[5], data[6], data[7])
+                self.motors_map[masterid].temp_param_dict[RID] = num
+
+
+    def addMotor(self, Motor):
+        """
+        add motor to the motor control object 添加电机到电机控制对象
+        :param Motor: Motor object 电机对象
+        """
+        self.motors_map[Motor.SlaveID] = Motor
+        if Motor.MasterID != 0:
+            self.motors_map[Motor.MasterID] = Motor
+        return True
+
+    def __control_cmd(self, Motor, cmd: np.uint8):
+        data_buf = np.array([0xff, 0xff, 0xff, 0xff, 0xff, 0xff, 0xff, cmd], np.uint8)
+        self.__send_data(Motor.SlaveID, data_buf)
+
+    def __send_data(self, motor_id, data):
+        """
+        send data to the motor 发送数据到电机
+        :param motor_id:
+        :param data:
+        :return:
+        """
+        if self.supervisor is not None and not self.supervisor.on_send(motor_id, data):
+            return  # 安全保护已触发，只允许失能命令
+        with self._lock:
+            self.send_data_frame[13] = motor_id & 0xff
+            self.send_data_frame[14] = (motor_id >> 8)& 0xff  #id high 8 bits
+            self.send_data_frame[21:29] = data
+            self.scheduler.acquire_slot()
+            self.serial_.write(bytes(self.send_data_frame.T))
+
+    def __read_RID_param(self, Motor, RID):
+        can_id_l = Motor.SlaveID & 0xff #id low 8 bits
+        can_id_h = (Motor.SlaveID >> 8)& 0xff  #id high 8 bits
+        data_buf = np.array([np.uint8(can_id_l), np.uint8(can_id_h), 0x33, np.uint8(RID), 0x00, 0x00, 0x00, 0x00], np.uint8)
+        self.__send_data(0x7FF, data_buf)
+
+    def __write_motor_param(self, Motor, RID, data):
+        can_id_l = Motor.SlaveID & 0xff #id low 8 bits
+        can_id_h = (Motor.SlaveID >> 8)& 0xff  #id high 8 bits
+        data_buf = np.array([np.uint8(can_id_l), np.uint8(can_id_h), 0x55, np.uint8(RID), 0x00, 0x00, 0x00, 0x00], np.uint8)
+        if not is_in_ranges(RID):
+            # data is float
+            data_buf[4:8] = float_to_uint8s(data)
+        else:
+            # data is int
+            data_buf[4:8] = data_to_uint8s(int(data))
+        self.__send_data(0x7FF, data_buf)
+
+    def switchControlMode(self, Motor, ControlMode):
+        """
+        switch the control mode of the motor 切换电机控制模式
+        :param Motor: Motor object 电机对象
+        :param ControlMode: Control_Type 电机控制模式 example:MIT:Control_Type.MIT MIT模式
+        """
+        max_retries = 10
+        retry_interval = 0.05  #retry times
+        RID = 10
+        self.__write_motor_param(Motor, RID, np.uint8(ControlMode))
+        for _ in range(max_retries):
+            sleep(retry_interval)
+            self.recv_set_param_data()
+            if Motor.SlaveID in self.motors_map:
+                if RID in self.motors_map[Motor.SlaveID].temp_param_dict:
+                    if self.motors_map[Motor.SlaveID].temp_param_dict[RID] == ControlMode:
+                        return True
+                    else:
+                        return False
+        return False
+
+    def save_motor_param(self, Motor):
+        """
+        save the all parameter  to flash 保存所有电机参数
+        :param Motor: Motor object 电机对象
+        :return:
+        """
+        can_id_l = Motor.SlaveID & 0xff #id low 8 bits
+        can_id_h = (Motor.SlaveID >> 8)& 0xff  #id high 8 bits
+        data_buf = np.array([np.uint8(can_id_l), np.uint8(can_id_h), 0xAA, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
+        self.disable(Motor)  # before save disable the motor
+        self.__send_data(0x7FF, data_buf)
+        sleep(0.001)
+
+    def change_limit_param(self, Motor_Type, PMAX, VMAX, TMAX):
+        """
+        change the PMAX VMAX TMAX of the motor 改变电机的PMAX VMAX TMAX
+        :param Motor_Type:
+        :param PMAX: 电机的PMAX
+        :param VMAX: 电机的VMAX
+        :param TMAX: 电机的TMAX
+        :return:
+        """
+        self.Limit_Param[Motor_Type][0] = PMAX
+        self.Limit_Param[Motor_Type][1] = VMAX
+        self.Limit_Param[Motor_Type][2] = TMAX
+
+    def refresh_motor_status(self,Motor):
+        """
+        get the motor status 获得电机状态
+        """
+        can_id_l = Motor.SlaveID & 0xff #id low 8 bits
+        can_id_h = (Motor.SlaveID >> 8) & 0xff  #id high 8 bits
+        data_buf = np.array([np.uint8(can_id_l), np.uint8(can_id_h), 0xCC, 0x00, 0x00, 0x00, 0x00, 0x00], np.uint8)
+        self.__send_data(0x7FF, data_buf)
+        self.recv()  # receive the data from serial port
+
+    def bus_utilisation(self, reset=False):
+        """
+        measured bus usage 实际总线占用，见 BusScheduler.utilisation
+        """
+        return self.scheduler.utilisation(reset)
+
+    def change_motor_param(self, Motor, RID, data):
+        """
+        change the RID of the motor 改变电机的参数
+        :param Motor: Motor object 电机对象
+        :param RID: DM_variable 电机参数
+        :param data: 电机参数的值
+        :return: True or False ,True means success, False means fail
+        """
+        max_retries = 20
+        retry_interval = 0.05  #retry times
+
+        self.__write_motor_param(Motor, RID, data)
+        for _ in range(max_retries):
+            self.recv_set_param_data()
+            if Motor.SlaveID in self.motors_map and RID in self.motors_map[Motor.SlaveID].temp_param_dict:
+                if abs(self.motors_map[Motor.SlaveID].temp_param_dict[RID] - data) < 0.1:
+                    return True
+                else:
+                    return False
+            sleep(retry_interval)
+        return False
+
+    def read_motor_param(self, Motor, RID):
+        """
+        read only the RID of the motor 读取电机的内部信息例如 版本号等
+        :param Motor: Motor object 电机对象
+        :param RID: DM_variable 电机参数
+        :return: 电机参数的值
+        """
+        max_retries = 20
+        retry_interval = 0.05  #retry times
+        self.__read_RID_param(Motor, RID)
+        for _ in range(max_retries):
+            sleep(retry_interval)
+            self.recv_set_param_data()
+            if Motor.SlaveID in self.motors_map:
+                if RID in self.motors_map[Motor.SlaveID].temp_param_dict:
+                    return self.motors_map[Motor.SlaveID].temp_param_dict[RID]
+                else:
+                    return None
+        return None
+
+    def read_motor_params(self, Motor_RIDs, timeout=0.1, poll_interval=0.005):
+        """
+        pipelined register read 流水线读取：先连续发出全部读请求，再统一收取应答，
+        读取 N 个参数只需要一次往返的等待时间
+        :param Motor_RIDs: [(Motor, RID), ...]
+        :param timeout: total wait for replies 等待应答的总时间 单位秒
+        :return: {(SlaveID, RID): value}，超时未应答的参数不在结果中
+        """
+        for Motor, RID in Motor_RIDs:
+            Motor.temp_param_dict.pop(RID, None)
+            self.__read_RID_param(Motor, RID)
+        results = dict()
+        pending = list(Motor_RIDs)
+        deadline = time.perf_counter() + timeout
+        while pending and time.perf_counter() < deadline:
+            sleep(poll_interval)
+            self.recv_set_param_data()
+            waiting = []
+            for Motor, RID in pending:
+                if RID in Motor.temp_param_dict:
+                    results[(Motor.SlaveID, RID)] = Motor.temp_param_dict[RID]
+                else:
+                    waiting.append((Motor, RID))
+            pending = waiting
+        return results
+
+    # -------------------------------------------------
+    # Extract packets from the serial data
+    def __extract_packets(self, data):
+        frames = []
+        header = 0xAA
+        tail = 0x55
+        frame_length = 16
+        i = 0
+        remainder_pos = 0
+
+        while i <= len(data) - frame_length:
+            if data[i] == header and data[i + frame_length - 1] == tail:
+                frame = data[i:i + frame_length]
+                frames.append(frame)
+                i += frame_length
+                remainder_pos = i
+            else:
+                i += 1
+        self.data_save = data[remainder_pos:]
+        return frames
+# 电机状态枚举类
+class Motor_Status(IntEnum):
+    DISABLED = 0x0      # 失能
+    ENABLED = 0x1       # 使能
+    OVERVOLTAGE = 0x8   # 超压
+    UNDERVOLTAGE = 0x9  # 欠压
+    OVERCURRENT = 0xA   # 过电流
+    MOS_OVERTEMP = 0xB  # MOS过温
+    COIL_OVERTEMP = 0xC # 电机线圈过温
+    COMM_LOST = 0xD     # 通讯丢失
+    OVERLOAD = 0xE      # 过载
+
+# Motor类增加温度和状态相关属性和方法
+class Motor:
+    def __init__(self, MotorType, SlaveID, MasterID):
+        """
+        define Motor object 定义电机对象
+        :param MotorType: Motor type 电机类型
+        :param SlaveID: CANID 电机ID
+        :param MasterID: MasterID 主机ID 建议不要设为0
+        """
+        self.Pd = float(0)
+        self.Vd = float(0)
+        self.state_q = float(0)
+        self.state_dq = float(0)
+        self.state_tau = float(0)
+        # 新增温度相关属性
+        self.state_t_mos = float(0)      # MOS管温度
+        self.state_t_rotor = float(0)    # 电机线圈温度
+        # 新增状态相关属性
+        self.motor_status = Motor_Status.DISABLED  # 电机状态
+        self.motor_id = 0                # 电机ID (从反馈帧获取)
+        self.SlaveID = SlaveID
+        self.MasterID = MasterID
+        self.MotorType = MotorType
+        self.isEnable = False
+        self.NowControlMode = Control_Type.MIT
+        self.temp_param_dict = {}
+        self.recv_count = 0              # 收到的反馈帧计数，轮询方据此判断是否有新反馈
+    def recv_data(self, q: float, dq: float, tau: float, t_mos: float = 0, t_rotor: float = 0, 
+                  motor_id: int = 0, status: int = 0):
+        """
+        接收电机数据，包括温度和状态信息
+        """
+        self.state_q = q
+        self.state_dq = dq
+        self.state_tau = tau
+        self.state_t_mos = t_mos
+        self.state_t_rotor = t_rotor
+        self.motor_id = motor_id
+        self.recv_count += 1
+        try:
+            self.motor_status = Motor_Status(status)
+        except ValueError:
+            self.motor_status = status  # 如果是未知状态，直接存储数值
+    # def recv_data(self, q: float, dq: float, tau: float, t_mos: float = 0, t_rotor: float = 0, 
+    #               motor_id: int = 0, status: int = 0):
+    #     """
+    #     接收电机数据，包括温度和状态信息
+    #     """
+    #     # 记录旧状态
+    #     old_status = self.motor_status
+        
+    #     # 更新数据
+    #     self.state_q = q
+    #     self.state_dq = dq
+    #     self.state_tau = tau
+    #     self.state_t_mos = t_mos
+    #     self.state_t_rotor = t_rotor
+    #     self.motor_id = motor_id
+        
+    #     try:
+    #         self.motor_status = Motor_Status(status)
+    #     except ValueError:
+    #         self.motor_status = status  # 如果是未知状态，直接存储数值
+        
+    #     # 状态变化时打印调试信息
+    #     # if old_status != self.motor_status:
+    #     #     logger.info(f"电机 {self.SlaveID} 状态变化: {old_status} -> {self.motor_status}")
+    def getPosition(self):
+        """
+        get the position of the motor 获取电机位置
+        :return: the position of the motor 电机位置
+        """
+        return self.state_q
+
+    def getVelocity(self):
+        """
+        get the velocity of the motor 获取电机速度
+        :return: the velocity of the motor 电机速度
+        """
+        return self.state_dq
+
+    def getTorque(self):
+        """
+        get the torque of the motor 获取电机力矩
+        :return: the torque of the motor 电机力矩
+        """
+        return self.state_tau
+
+    def getT_MOS(self):
+        """
+        获取MOS管温度
+        :return: MOS管温度(摄氏度)
+        """
+        return self.state_t_mos
+
+    def getT_Rotor(self):
+        """
+        获取电机线圈温度
+        :return: 电机线圈温度(摄氏度)
+        """
+        return self.state_t_rotor
+
+    def getMotorStatus(self):
+        """
+        获取电机状态
+        :return: 电机状态(Motor_Status枚举或数值)
+        """
+        return self.motor_status
+
+    def getMotorStatusText(self):
+        """
+        获取电机状态的文字描述
+        :return: 状态描述字符串
+        """
+        status_dict = {
+            Motor_Status.DISABLED: "失能",
+            Motor_Status.ENABLED: "使能", 
+            Motor_Status.OVERVOLTAGE: "超压",
+            Motor_Status.UNDERVOLTAGE: "欠压",
+            Motor_Status.OVERCURRENT: "过电流",
+            Motor_Status.MOS_OVERTEMP: "MOS过温",
+            Motor_Status.COIL_OVERTEMP: "电机线圈过温",
+            Motor_Status.COMM_LOST: "通讯丢失",
+            Motor_Status.OVERLOAD: "过载"
+        }
+        return status_dict.get(self.motor_status, f"未知状态({self.motor_status})")
+
+    def getMotorStatusIcon(self):
+        """
+        获取电机状态的图标
+        :return: 状态对应的图标字符串
+        """
+        status_icons = {
+            Motor_Status.DISABLED: "⭕",      # 失能
+            Motor_Status.ENABLED: "✅",       # 使能
+            Motor_Status.OVERVOLTAGE: "⚡",   # 超压
+            Motor_Status.UNDERVOLTAGE: "🔋",  # 欠压
+            Motor_Status.OVERCURRENT: "⚠️",   # 过电流
+            Motor_Status.MOS_OVERTEMP: "🔥",  # MOS过温
+            Motor_Status.COIL_OVERTEMP: "🌡️", # 电机线圈过温
+            Motor_Status.COMM_LOST: "📡",     # 通讯丢失
+            Motor_Status.OVERLOAD: "🚫"      # 过载
+        }
+        return status_icons.get(self.motor_status, "❓")
+
+    def isHealthy(self):
+        """
+        判断电机是否处于健康状态
+        :return: True表示健康，False表示有异常
+        """
+        healthy_states = [Motor_Status.DISABLED, Motor_Status.ENABLED]
+        return self.motor_status in healthy_states
+
+    def hasError(self):
+        """
+        判断电机是否有错误
+        :return: True表示有错误，False表示正常
+        """
+        error_states = [Motor_Status.OVERVOLTAGE, Motor_Status.UNDERVOLTAGE, 
+                       Motor_Status.OVERCURRENT, Motor_Status.MOS_OVERTEMP,
+                       Motor_Status.COIL_OVERTEMP, Motor_Status.COMM_LOST, 
+                       Motor_Status.OVERLOAD]
+        return self.motor_status in error_states
+
+    def printStatus(self):
+        """
+        打印电机完整状态信息
+        """
+        print(f"🔧 电机 ID {self.SlaveID} 状态报告:")
+        print(f"   状态: {self.getMotorStatusIcon()} {self.getMotorStatusText()}")
+        print(f"   位置: {self.state_q:.3f} rad")
+        print(f"   速度: {self.state_dq:.3f} rad/s") 
+        print(f"   扭矩: {self.state_tau:.3f} Nm")
+        print(f"   MOS温度: {self.state_t_mos:.1f} ℃")
+        print(f"   线圈温度: {self.state_t_rotor:.1f} ℃")
+        if self.hasError():
+            print(f"   ⚠️  警告: 电机处于异常状态!")
+
+    def getParam(self, RID):
+        """
+        get the parameter of the motor 获取电机内部的参数，需要提前读取
+        :param RID: DM_variable 电机参数
+        :return: the parameter of the motor 电机参数
+        
+        使用技巧:
+        1. 调用read_motor_param()读取参数后，参数会临时存储在temp_param_dict中
+        2. 然后可以通过getParam()快速获取已读取的参数
+        3. 常用参数示例:
+           - DM_variable.hw_ver: 硬件版本
+           - DM_variable.sw_ver: 软件版本  
+           - DM_variable.PMAX: 最大位置
+           - DM_variable.VMAX: 最大速度
+           - DM_variable.TMAX: 最大扭矩
+           - DM_variable.CTRL_MODE: 控制模式
+        """
+        if RID in self.temp_param_dict:
+            return self.temp_param_dict[RID]
+        else:
+            return None
+
+    def getParamText(self, RID):
+        """
+        获取参数的文字描述
+        :param RID: DM_variable 电机参数
+        :return: 参数名称和值的描述
+        """
+        param_names = {
+            DM_variable.UV_Value: "欠压值",
+            DM_variable.KT_Value: "扭矩常数", 
+            DM_variable.OT_Value: "过温值",
+            DM_variable.OC_Value: "过流值",
+            DM_variable.ACC: "加速度",
+            DM_variable.DEC: "减速度",
+            DM_variable.MAX_SPD: "最大速度",
+            DM_variable.MST_ID: "主机ID",
+            DM_variable.ESC_ID: "从机ID",
+            DM_variable.TIMEOUT: "超时时间",
+            DM_variable.CTRL_MODE: "控制模式",
+            DM_variable.hw_ver: "硬件版本",
+            DM_variable.sw_ver: "软件版本",
+            DM_variable.PMAX: "最大位置",
+            DM_variable.VMAX: "最大速度", 
+            DM_variable.TMAX: "最大扭矩"
+        }
+        
+        param_name = param_names.get(RID, f"参数{RID}")
+        param_value = self.getParam(RID)
+        
+        if param_value is not None:
+            return f"{param_name}: {param_value}"
+        else:
+            return f"{param_name}: 未读取"
+
+def LIMIT_MIN_MAX(x, min, max):
+    if x <= min:
+        x = min
+    elif x > max:
+        x = max
+
+
+def float_to_uint(x: float, x_min: float, x_max: float, bits):
+    LIMIT_MIN_MAX(x, x_min, x_max)
+    span = x_max - x_min
+    data_norm = (x - x_min) / span
+    return np.uint16(data_norm * ((1 << bits) - 1))
+
+
+def uint_to_float(x: np.uint16, min: float, max: float, bits):
+    span = max - min
+    data_norm = float(x) / ((1 << bits) - 1)
+    temp = data_norm * span + min
+    return np.float32(temp)
+
+
+def float_to_uint8s(value):
+    # Pack the float into 4 bytes
+    packed = pack('f', value)
+    # Unpack the bytes into four uint8 values
+    return unpack('4B', packed)
+
+
+def data_to_uint8s(value):
+    # Check if the value is within the range of uint32
+    if isinstance(value, int) and (0 <= value <= 0xFFFFFFFF):
+        # Pack the uint32 into 4 bytes
+        packed = pack('I', value)
+    else:
+        raise ValueError("Value must be an integer within the range of uint32")
+
+    # Unpack the bytes into four uint8 values
+    return unpack('4B', packed)
+
+
+def is_in_ranges(number):
+    """
+    check if the number is in the range of uint32
+    :param number:
+    :return:
+    """
+    if (7 <= number <= 10) or (13 <= number <= 16) or (35 <= number <= 36):
+        return True
+    return False
+
+
+def uint8s_to_uint32(byte1, byte2, byte3, byte4):
+    # Pack the four uint8 values into a single uint32 value in little-endian order
+    packed = pack('<4B', byte1, byte2, byte3, byte4)
+    # Unpack the packed bytes into a uint32 value
+    return unpack('<I', packed)[0]
+
+
+def uint8s_to_float(byte1, byte2, byte3, byte4):
+    # Pack the four uint8 values into a single float value in little-endian order
+    packed = pack('<4B', byte1, byte2, byte3, byte4)
+    # Unpack the packed bytes into a float value
+    return unpack('<f', packed)[0]
+
+
+def print_hex(data):
+    hex_values = [f'{byte:02X}' for byte in data]
+    print(' '.join(hex_values))
+
+
+def get_enum_by_index(index, enum_class):
+    try:
+        return enum_class(index)
+    except ValueError:
+        return None
+
+
+class SerialCapture:
+    CAPTURE_MAGIC = b'DMCAP01\x00'
+    RECORD_HEADER = '<dBH'  # 相对时间(s), 方向, 长度
+    TX = 0
+    RX = 1
+
+    def __init__(self, serial_device, path):
+        """
+        record every byte written to / read from the serial device 记录串口收发的所有字节
+        文件格式: 魔数 + <开始时间(epoch), 元数据长度> + JSON元数据，
+        之后每条记录为 <相对时间, 方向(0发送/1接收), 长度> + 原始字节
+        :param serial_device: serial object 被包装的串口对象
+        :param path: capture file path 抓包文件路径
+        """
+        self.serial_ = serial_device
+        self.path = path
+        self._lock = threading.Lock()
+        meta = json.dumps({'port': getattr(serial_device, 'port', None),
+                           'baudrate': getattr(serial_device, 'baudrate', None)}).encode('utf-8')
+        self._file = open(path, 'wb')
+        self._file.write(self.CAPTURE_MAGIC + pack('<dI', time.time(), len(meta)) + meta)
+        self._start = time.perf_counter()
+
+    def _record(self, direction, data):
+        if not data:
+            return
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(pack(self.RECORD_HEADER, time.perf_counter() - self._start, direction, len(data)))
+            self._file.write(data)
+
+    def write(self, data):
+        self._record(self.TX, bytes(data))
+        return self.serial_.write(data)
+
+    def read_all(self):
+        data = self.serial_.read_all()
+        self._record(self.RX, data)
+        return data
+
+    def read(self, size=1):
+        data = self.serial_.read(size)
+        self._record(self.RX, data)
+        return data
+
+    def open(self):
+        self.serial_.open()
+
+    def close(self):
+        """close the serial device 关闭串口，抓包文件保持打开，重新 open 后继续记录"""
+        self.serial_.close()
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+
+    def close_capture(self):
+        """finish the capture file 结束抓包并关闭文件"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    def __getattr__(self, name):
+        # is_open / in_waiting / port 等属性直接转发给被包装的串口
+        return getattr(self.serial_, name)
+
+
+def load_capture(path):
+    """
+    load a capture file written by SerialCapture 读取抓包文件
+    末尾不完整的记录会被忽略
+    :return: (metadata dict, list of (time, direction, bytes))
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic = SerialCapture.CAPTURE_MAGIC
+    if data[:len(magic)] != magic:
+        raise ValueError("not a capture file: " + path)
+    offset = len(magic)
+    start, meta_len = unpack('<dI', data[offset:offset + 12])
+    offset += 12
+    meta = json.loads(data[offset:offset + meta_len].decode('utf-8'))
+    meta['start_time'] = start
+    offset += meta_len
+
+    header_size = calcsize(SerialCapture.RECORD_HEADER)
+    records = []
+    while offset + header_size <= len(data):
+        t, direction, length = unpack(SerialCapture.RECORD_HEADER, data[offset:offset + header_size])
+        end = offset + header_size + length
+        if end > len(data):
+            break
+        records.append((t, direction, data[offset + header_size:end]))
+        offset = end
+    return meta, records
+
+
+class ReplaySerial:
+    def __init__(self, path, realtime=True, speed=1.0):
+        """
+        serial device that plays back a SerialCapture file 回放抓包文件的串口对象
+        可直接传给 MotorControl，recv() 会按录制顺序收到当时的接收数据
+        :param path: capture file path 抓包文件路径
+        :param realtime: True 按录制时的时间间隔回放, False 以最快速度回放（每次读取返回下一段接收数据）
+        :param speed: playback speed factor when realtime 实时回放的倍速
+        """
+        self.meta, records = load_capture(path)
+        self.port = self.meta.get('port')
+        self.baudrate = self.meta.get('baudrate')
+        self.realtime = realtime
+        self.speed = speed
+        self._rx = [(t, data) for t, direction, data in records if direction == SerialCapture.RX]
+        self.tx_expected = [data for t, direction, data in records if direction == SerialCapture.TX]
+        self.tx_written = []
+        self.is_open = False
+        self._index = 0
+        self._start = 0.0
+
+    @property
+    def remaining(self):
+        """number of rx records not yet delivered 尚未回放的接收记录数"""
+        return len(self._rx) - self._index
+
+    def open(self):
+        self.is_open = True
+        self._index = 0
+        self.tx_written = []
+        self._start = time.perf_counter()
+
+    def close(self):
+        self.is_open = False
+
+    def write(self, data):
+        # 回放时不发送，只记录下来便于与录制的发送数据比对
+        self.tx_written.append(bytes(data))
+        return len(data)
+
+    def _due(self):
+        """index after the last rx record that should have arrived by now 当前时刻应已到达的记录位置"""
+        if not self.realtime:
+            return min(self._index + 1, len(self._rx))
+        elapsed = (time.perf_counter() - self._start) * self.speed
+        end = self._index
+        while end < len(self._rx) and self._rx[end][0] <= elapsed:
+            end += 1
+        return end
+
+    def read_all(self):
+        end = self._due()
+        data = b''.join(chunk for _, chunk in self._rx[self._index:end])
+        self._index = end
+        return data
+
+    def read(self, size=1):
+        # 按记录回放，不拆分记录
+        return self.read_all()
+
+    @property
+    def in_waiting(self):
+        return sum(len(chunk) for _, chunk in self._rx[self._index:self._due()])
+
+
+class DM_Motor_Type(IntEnum):
+    DM4310 = 0
+    DM4310_48V = 1
+    DM4340 = 2
+    DM4340_48V = 3
+    DM6006 = 4
+    DM8006 = 5
+    DM8009 = 6
+    DM10010L = 7
+    DM10010 = 8
+    DMH3510 = 9
+    DMH6215 = 10
+    DMG6220 = 11
+
+
+class DM_variable(IntEnum):
+    UV_Value = 0
+    KT_Value = 1
+    OT_Value = 2
+    OC_Value = 3
+    ACC = 4
+    DEC = 5
+    MAX_SPD = 6
+    MST_ID = 7
+    ESC_ID = 8
+    TIMEOUT = 9
+    CTRL_MODE = 10
+    Damp = 11
+    Inertia = 12
+    hw_ver = 13
+    sw_ver = 14
+    SN = 15
+    NPP = 16
+    Rs = 17
+    LS = 18
+    Flux = 19
+    Gr = 20
+    PMAX = 21
+    VMAX = 22
+    TMAX = 23
+    I_BW = 24
+    KP_ASR = 25
+    KI_ASR = 26
+    KP_APR = 27
+    KI_APR = 28
+    OV_Value = 29
+    GREF = 30
+    Deta = 31
+    V_BW = 32
+    IQ_c1 = 33
+    VL_c1 = 34
+    can_br = 35
+    sub_ver = 36
+    u_off = 50
+    v_off = 51
+    k1 = 52
+    k2 = 53
+    m_off = 54
+    dir = 55
+    p_m = 80
+    xout = 81
+
+
+class Control_Type(IntEnum):
+    MIT = 1
+    POS_VEL = 2
+    VEL = 3
+    Torque_Pos = 4
+
+
+
+
+
+
+
+
+
@@ -1,1914 +1,5350 @@
-
-# Project: ArmGravComp-Qt (6-DOF Robotic Arm Gravity Compensation & Visualization)
-# File: damiao_motor_friction_detection.py
-# Copyright (c) 2025, Chen XingYu. All rights reserved.
-#
-# License: Non-Commercial Use Only / 仅限非商业使用
-# -----------------------------------------------------------------------------
-# 本代码及其衍生作品仅允许用于个人学习、学术研究与教学等非商业场景。
-# 严禁任何形式的商业使用，包括但不限于：出售、付费服务、SaaS/在线服务、
-# 广告变现、集成到商业产品或用于商业咨询/竞赛/投标等。如需商业授权，请
-# 先行获得版权所有者书面许可并签署授权协议。
-#
-# 允许的非商业使用条件：
-# 1) 保留本版权与许可声明；
-# 2) 在衍生作品/发表物中署名（Lu Yaoheng）并标明来源仓库；
-# 3) 不得移除或修改本段声明。
-#
-# 免责声明：本代码按“现状”提供，不含任何明示或默示担保。
-# 作者不对因使用本代码产生的任何直接或间接损失承担责任。
-# 使用者需自行评估并承担风险。
-#
-# English Summary:
-# This code (damiao motor friction detection) is provided for personal,
-# academic, and research purposes only. Any commercial use (sale, paid service,
-# SaaS, ad-monetization, integration into commercial products, consultancy,
-# competitions, bids, etc.) is strictly prohibited without prior written
-# permission from the copyright holder.
-#
-# Keep this notice intact and provide proper attribution in derived works.
-# Provided "as is" without warranty of any kind. Use at your own risk.
-#
-# Contact / 商务与授权联系: <cdssywc@163.com>
-# 首次使用：
-
-# 设置好串口参数和电机ID,自动获取摩擦系数
-# 固定好电机，让电机空载
-# 点击"检查电机状态"按钮
-# 查看日志中的电机信息，确认连接正常
-
-
-# 实时监控：
-
-# 检查成功后会自动启动实时状态显示
-# 按钮会变成红色的"停止状态监控"
-# 再次点击可停止监控
-
-
-# 开始测试：
-
-# 确认电机状态正常后
-# 选择要进行的摩擦力识别测试
-# 测试开始时会自动停止状态监控
-# 可以多测几次
-
-# 安全特性：
-# 温度超过阈值时会用颜色警告
-# 显示电机错误状态（过压、欠压、过流等）
-# # # 健康状态一目了然（正常显示绿色，异常显示红色）
-#!/usr/bin/env python
-# -*- coding: utf-8 -*-
-import sys
-import os
-import json
-import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-import time
-import serial
-from datetime import datetime
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                            QLabel, QLineEdit, QPushButton, QComboBox, QGroupBox, 
-                            QTabWidget, QTextEdit, QFileDialog, QProgressBar, QMessageBox,
-                            QTableWidget, QTableWidgetItem, QHeaderView, QCheckBox, QSpinBox,
-                            QDoubleSpinBox, QFormLayout, QGridLayout, QSplitter, QFrame,
-                            QSizePolicy, QScrollArea)
-
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer
-from PyQt5.QtGui import QFont, QIcon, QPixmap, QColor, QPalette
-
-import matplotlib
-matplotlib.use('Qt5Agg')
-
-# 导入电机控制库 - 注意: 确保DM_CAN库在同一目录下
-try:
-    from DM_CAN import *
-except ImportError:
-    print("警告: 无法导入DM_CAN库，请确保该库文件在正确路径下")
-
-# 设置支持中文的字体（常见 Windows 字体）
-matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']  # 优先黑体/微软雅黑
-matplotlib.rcParams['axes.unicode_minus'] = False  # 解决负号显示为方块
-
-
-# 电机状态检查线程
-class MotorStatusThread(QThread):
-    status_updated = pyqtSignal(dict)
-    log_message = pyqtSignal(str)
-    
-    def __init__(self, params):
-        super().__init__()
-        self.params = params
-        self.running = False
-        self.motor = None
-        self.motor_control = None
-        self.serial_device = None
-        
-    def setup_motor(self):
-        try:
-            # 初始化电机和串口
-            motor_type_dict = {
-                "DM4310": DM_Motor_Type.DM4310,
-                "DM4340": DM_Motor_Type.DM4340,
-                "DM6006": DM_Motor_Type.DM6006,
-                "DM8006": DM_Motor_Type.DM8006,
-                "DM8009": DM_Motor_Type.DM8009,
-                "DM10010L": DM_Motor_Type.DM10010L,
-                "DM10010": DM_Motor_Type.DM10010,
-            }
-            
-            motor_type = motor_type_dict.get(self.params['motor_type'], DM_Motor_Type.DM4310)
-            
-            self.motor = Motor(motor_type, self.params['node_id'], self.params['master_id'])
-            self.serial_device = serial.Serial(
-                self.params['com_port'], 
-                self.params['baud_rate'], 
-                timeout=0.5
-            )
-            self.motor_control = MotorControl(self.serial_device)
-            self.motor_control.addMotor(self.motor)
-            
-            return True
-        except Exception as e:
-            self.log_message.emit(f"电机连接失败: {str(e)}")
-            return False
-    
-    def run(self):
-        if not self.setup_motor():
-            return
-            
-        self.running = True
-        while self.running:
-            try:
-                # 刷新电机状态
-                self.motor_control.refresh_motor_status(self.motor)
-                
-                # 获取基本状态信息
-                position = self.motor.getPosition()
-                velocity = self.motor.getVelocity()
-                torque = self.motor.getTorque()
-                t_mos = self.motor.getT_MOS() if hasattr(self.motor, 'getT_MOS') else 0.0
-                t_rotor = self.motor.getT_Rotor() if hasattr(self.motor, 'getT_Rotor') else 0.0
-                
-                # 根据电机实际状态判断
-                # 检查是否已使能
-                is_enabled = abs(velocity) > 0.001 or abs(torque) > 0.001
-                
-                # 检查温度状态
-                has_temp_warning = t_mos > 60 or t_rotor > 80
-                has_temp_error = t_mos > 80 or t_rotor > 100
-                
-                # 判断状态
-                if has_temp_error:
-                    status_icon = "🔥"
-                    status_text = "过温"
-                    has_error = True
-                elif has_temp_warning:
-                    status_icon = "⚠️"
-                    status_text = "温度警告"
-                    has_error = False
-                elif is_enabled:
-                    status_icon = "✅"
-                    status_text = "运行中"
-                    has_error = False
-                else:
-                    status_icon = "⭕"
-                    status_text = "待机"
-                    has_error = False
-                
-                # 获取所有状态信息
-                status_data = {
-                    'position': position,
-                    'velocity': velocity,
-                    'torque': torque,
-                    't_mos': t_mos,
-                    't_rotor': t_rotor,
-                    'status': 1 if is_enabled else 0,
-                    'status_text': status_text,
-                    'status_icon': status_icon,
-                    'is_healthy': not has_error,
-                    'has_error': has_error
-                }
-                
-                self.status_updated.emit(status_data)
-                
-            except Exception as e:
-                self.log_message.emit(f"状态更新错误: {str(e)}")
-                # 发送默认状态
-                status_data = {
-                    'position': 0.0,
-                    'velocity': 0.0,
-                    'torque': 0.0,
-                    't_mos': 0.0,
-                    't_rotor': 0.0,
-                    'status': 0,
-                    'status_text': "连接错误",
-                    'status_icon': "❌",
-                    'is_healthy': False,
-                    'has_error': True
-                }
-                self.status_updated.emit(status_data)
-                
-            time.sleep(0.1)  # 100ms更新一次
-    
-    def stop(self):
-        self.running = False
-        self.wait()
-        
-        if self.serial_device and self.serial_device.is_open:
-            self.serial_device.close()
-
-
-# 摩擦力识别工作线程
-class FrictionIdentifierThread(QThread):
-    update_progress = pyqtSignal(int, str)
-    update_plot = pyqtSignal(object, str)
-    update_results = pyqtSignal(dict)
-    log_message = pyqtSignal(str)
-    test_completed = pyqtSignal()
-    
-    def __init__(self, params, test_type):
-        super().__init__()
-        self.params = params
-        self.test_type = test_type  # 'coulomb', 'static', 'comprehensive'
-        self.running = True
-        self.results = {}
-        
-        # 检查参数
-        required_params = [
-            'motor_type', 'node_id', 'master_id', 'com_port', 'baud_rate',
-            'viscous_coeff', 'inertia', 'test_speeds', 'duration', 'settling_time',
-            'torque_increment', 'max_torque'
-        ]
-        
-        for param in required_params:
-            if param not in self.params:
-                self.log_message.emit(f"缺少参数: {param}")
-                return
-    
-    def setup_motor(self):
-        try:
-            # 初始化电机和串口
-            self.log_message.emit("正在连接电机...")
-            motor_type_dict = {
-                "DM4310": DM_Motor_Type.DM4310,
-                "DM4340": DM_Motor_Type.DM4340,
-                "DM6006": DM_Motor_Type.DM6006,
-                "DM8006": DM_Motor_Type.DM8006,
-                "DM8009": DM_Motor_Type.DM8009,
-                "DM10010L": DM_Motor_Type.DM10010L,
-                "DM10010": DM_Motor_Type.DM10010,
-            }
-            
-            motor_type = motor_type_dict.get(self.params['motor_type'], DM_Motor_Type.DM4310)
-            
-            self.motor = Motor(motor_type, self.params['node_id'], self.params['master_id'])
-            self.serial_device = serial.Serial(
-                self.params['com_port'], 
-                self.params['baud_rate'], 
-                timeout=0.5
-            )
-            self.motor_control = MotorControl(self.serial_device)
-            self.motor_control.addMotor(self.motor)
-            
-            #切换到MIT控制模式
-            current_mode = self.motor_control.read_motor_param(self.motor, DM_variable.CTRL_MODE)
-            if current_mode != 1:
-                self.log_message.emit("当前不是MIT模式，正在切换...")
-                if not self.motor_control.switchControlMode(self.motor, Control_Type.MIT):
-                    self.log_message.emit("MIT控制模式设置失败")
-                    return False
-                else:        
-                    self.log_message.emit("电机已切换到MIT模式")
-            else:
-                self.log_message.emit("电机已经是MIT模式")
-            
-            # 读取电机参数
-            motor_info = {
-                'sub_ver': self.motor_control.read_motor_param(self.motor, DM_variable.sub_ver),
-                'gear_ratio': self.motor_control.read_motor_param(self.motor, DM_variable.Gr),
-                'max_pos': self.motor_control.read_motor_param(self.motor, DM_variable.PMAX),
-                'max_vel': self.motor_control.read_motor_param(self.motor, DM_variable.VMAX),
-                'max_torque': self.motor_control.read_motor_param(self.motor, DM_variable.TMAX),
-            }
-            
-            self.results['motor_info'] = motor_info
-            self.log_message.emit(f"电机连接成功, 版本: {motor_info['sub_ver']}, 最大力矩: {motor_info['max_torque']}N·m")
-            
-            # 使能电机
-            self.motor_control.enable(self.motor)
-            time.sleep(0.5)  # 等待电机稳定
-            
-            return True
-        except Exception as e:
-            self.log_message.emit(f"电机连接失败: {str(e)}")
-            return False
-    
-    def cleanup(self):
-        try:
-            if hasattr(self, 'motor_control') and hasattr(self, 'motor'):
-                self.motor_control.disable(self.motor)
-            
-            if hasattr(self, 'serial_device'):
-                self.serial_device.close()
-            
-            self.log_message.emit("已关闭电机连接")
-        except Exception as e:
-            self.log_message.emit(f"关闭连接时发生错误: {str(e)}")
-    
-    def run(self):
-        try:
-            # 设置电机连接
-            if not self.setup_motor():
-                self.cleanup()
-                return
-            
-            # 根据测试类型执行不同测试
-            if self.test_type == 'coulomb' or self.test_type == 'comprehensive':
-                self.identify_coulomb_friction()
-            
-            if self.test_type == 'static' or self.test_type == 'comprehensive':
-                self.identify_static_friction()
-            
-            # 更新结果
-            self.results['viscous_friction'] = self.params['viscous_coeff']
-            self.results['inertia'] = self.params['inertia']
-            self.results['timestamp'] = datetime.now().isoformat()
-            
-            # 发送最终结果
-            self.update_results.emit(self.results)
-            self.log_message.emit("测试完成！")
-            
-        except Exception as e:
-            self.log_message.emit(f"测试过程中发生错误: {str(e)}")
-        finally:
-            self.cleanup()
-            self.test_completed.emit()
-    
-    def identify_coulomb_friction(self):
-        """识别库仑摩擦力矩"""
-        self.log_message.emit("\n开始库仑摩擦力矩识别...")
-        test_speeds = self.params['test_speeds']
-        duration = self.params['duration']
-        settling_time = self.params['settling_time']
-        
-        self.log_message.emit(f"将测试 {len(test_speeds)} 种不同速度，每种速度测试 {duration} 秒")
-        
-        # 数据存储
-        speeds = []
-        torques = []
-        
-        kv = 0.5  # 速度反馈增益
-        
-        # 对每个测试速度进行测试
-        for i, target_speed in enumerate(test_speeds):
-            if not self.running:
-                self.log_message.emit("测试被中断")
-                return
-            
-            # 计算进度
-            progress = int((i / len(test_speeds)) * 100)
-            self.update_progress.emit(progress, "库仑摩擦识别")
-            
-            self.log_message.emit(f"\n[{i+1}/{len(test_speeds)}] 设置电机速度为 {target_speed:.2f} rad/s")
-            
-            # 开始时间
-            start_time = time.time()
-            collected_torques = []
-            collected_speeds = []
-            
-            # 先让电机达到目标速度并稳定
-            self.log_message.emit(f"  电机加速中...")
-            while (time.time() - start_time) < settling_time and self.running:
-                # 速度控制模式 (零位置增益，只用速度反馈)
-                self.motor_control.controlMIT(self.motor, 0, kv, 0, target_speed, 0)
-                self.motor_control.refresh_motor_status(self.motor)
-                time.sleep(0.01)
-            
-            if not self.running:
-                self.log_message.emit("测试被中断")
-                return
-            
-            self.log_message.emit(f"  开始收集数据...")
-            
-            # 在稳定后收集力矩数据
-            data_collection_start = time.time()
-            while (time.time() - data_collection_start) < duration and self.running:
-                # 保持速度控制
-                self.motor_control.controlMIT(self.motor, 0, kv, 0, target_speed, 0)
-                self.motor_control.refresh_motor_status(self.motor)
-                
-                # 获取当前速度和力矩
-                current_speed = self.motor.getVelocity()
-                current_torque = self.motor.getTorque()
-                
-                # 存储数据
-                collected_speeds.append(current_speed)
-                collected_torques.append(current_torque)
-                
-                time.sleep(0.01)
-            
-            if not self.running:
-                self.log_message.emit("测试被中断")
-                return
-            
-            # 计算平均速度和力矩
-            avg_speed = np.mean(collected_speeds)
-            avg_torque = np.mean(collected_torques)
-            std_torque = np.std(collected_torques)
-            
-            # 存储结果
-            speeds.append(avg_speed)
-            torques.append(avg_torque)
-            
-            self.log_message.emit(f"  速度 {avg_speed:.3f} rad/s 的平均力矩: {avg_torque:.5f} ± {std_torque:.5f} N·m")
-        
-        # 数据分析
-        self.update_progress.emit(90, "库仑摩擦识别")
-        self.log_message.emit("分析测试数据...")
-        
-        # 转换为numpy数组
-        speeds = np.array(speeds)
-        torques = np.array(torques)
-        
-        # 分离正负速度数据
-        pos_speeds = speeds[speeds > 0]
-        pos_torques = torques[speeds > 0]
-        
-        neg_speeds = speeds[speeds < 0]
-        neg_torques = torques[speeds < 0]
-        
-        # 去除粘滞摩擦影响后的力矩
-        viscous_coeff = self.params['viscous_coeff']
-        
-        if len(pos_speeds) > 1:
-            pos_coulomb_torques = pos_torques - viscous_coeff * pos_speeds
-            T_coulomb_pos = float(np.mean(pos_coulomb_torques))
-        else:
-            T_coulomb_pos = 0
-            self.log_message.emit("警告: 正方向速度数据不足，无法准确估计正方向库仑摩擦")
-        
-        if len(neg_speeds) > 1:
-            neg_coulomb_torques = neg_torques - viscous_coeff * neg_speeds
-            T_coulomb_neg = float(-np.mean(neg_coulomb_torques))  # 注意负号，使T_coulomb_neg为正值
-        else:
-            T_coulomb_neg = 0
-            self.log_message.emit("警告: 负方向速度数据不足，无法准确估计负方向库仑摩擦")
-        
-        # 计算平均库仑摩擦力矩
-        T_coulomb = (T_coulomb_pos + T_coulomb_neg) / 2.0
-        
-        # 绘图
-        self._plot_coulomb_friction(speeds, torques, T_coulomb_pos, T_coulomb_neg, viscous_coeff)
-        
-        # 更新结果
-        self.results['coulomb_friction'] = float(T_coulomb)
-        self.results['coulomb_friction_pos'] = float(T_coulomb_pos)
-        self.results['coulomb_friction_neg'] = float(T_coulomb_neg)
-        self.results['coulomb_raw_data'] = {
-            'speeds': speeds.tolist(),
-            'torques': torques.tolist()
-        }
-        
-        self.log_message.emit("\n=== 库仑摩擦力矩识别结果 ===")
-        self.log_message.emit(f"正方向库仑摩擦: {T_coulomb_pos:.5f} N·m")
-        self.log_message.emit(f"负方向库仑摩擦: {T_coulomb_neg:.5f} N·m")
-        self.log_message.emit(f"平均库仑摩擦力矩: {T_coulomb:.5f} N·m")
-        
-        # 完成
-        self.update_progress.emit(100, "库仑摩擦识别")
-    
-    def identify_static_friction(self):
-        """识别静摩擦力矩"""
-        self.log_message.emit("\n开始静摩擦力矩识别...")
-        torque_increment = self.params['torque_increment']
-        max_torque = self.params['max_torque']
-        test_directions = [1, -1]  # 正向和负向测试
-        
-        # 数据存储
-        static_results = []
-        
-        for i, direction in enumerate(test_directions):
-            if not self.running:
-                self.log_message.emit("测试被中断")
-                return
-            
-            # 进度
-            progress = int((i / len(test_directions)) * 100)
-            self.update_progress.emit(progress, "静摩擦识别")
-            
-            direction_str = "正向" if direction > 0 else "负向"
-            self.log_message.emit(f"\n测试{direction_str}静摩擦...")
-            
-            # 先重置到指定位置
-            self._reset_position(0.0)
-            if not self.running:
-                return
-                
-            time.sleep(1.0)  # 等待完全静止
-            
-            # 记录初始位置
-            self.motor_control.refresh_motor_status(self.motor)
-            initial_pos = self.motor.getPosition()
-            self.log_message.emit(f"  初始位置: {initial_pos:.4f} rad")
-            
-            # 缓慢增加力矩直到电机开始移动
-            current_torque = 0.0
-            start_time = time.time()
-            movement_detected = False
-            pos_data = []
-            torque_data = []
-            time_data = []
-            velocity_data = []
-            movement_threshold = 0.05  # rad/s，认为开始移动的速度阈值
-            
-            while not movement_detected and current_torque < max_torque and (time.time() - start_time) < 30 and self.running:
-                # 施加力矩
-                self.motor_control.controlMIT(self.motor, 0, 0, 0, 0, direction * current_torque)
-                
-                # 读取状态
-                self.motor_control.refresh_motor_status(self.motor)
-                current_pos = self.motor.getPosition()
-                current_vel = self.motor.getVelocity()
-                elapsed = time.time() - start_time
-                
-                # 记录数据
-                pos_data.append(current_pos)
-                torque_data.append(current_torque)
-                time_data.append(elapsed)
-                velocity_data.append(current_vel)
-                
-                # 检查是否开始移动
-                if abs(current_vel) > movement_threshold:
-                    movement_detected = True
-                    break
-                
-                # 增加力矩
-                current_torque += torque_increment
-                
-                # 限制采样率
-                time.sleep(0.01)
-                
-                # 每增加0.05N·m显示一次当前力矩
-                if int(current_torque * 1000) % 50 == 0:
-                    self.log_message.emit(f"  当前测试力矩: {current_torque:.4f} N·m, 速度: {current_vel:.4f} rad/s")
-                    # 更新小进度
-                    mini_progress = min(int((current_torque / max_torque) * 100), 99)
-                    self.update_progress.emit(
-                        progress + mini_progress // len(test_directions), 
-                        f"{direction_str}静摩擦识别"
-                    )
-            
-            if not self.running:
-                self.log_message.emit("测试被中断")
-                return
-            
-            # 记录结果
-            if movement_detected:
-                breakaway_torque = current_torque
-                self.log_message.emit(f"  检测到开始移动! 脱离力矩: {breakaway_torque:.5f} N·m")
-                static_results.append((direction, breakaway_torque))
-            else:
-                self.log_message.emit(f"  未检测到明确的移动，达到最大测试力矩: {max_torque} N·m")
-                static_results.append((direction, np.nan))
-            
-            # 绘制测试过程图
-            self._plot_static_test(time_data, torque_data, velocity_data, pos_data, direction_str)
-            
-            # 停止电机
-            self.motor_control.controlMIT(self.motor, 0, 0, 0, 0, 0)
-            time.sleep(0.5)
-        
-        # 分析结果
-        T_static_pos = next((t for d, t in static_results if d > 0), np.nan)
-        T_static_neg = next((t for d, t in static_results if d < 0), np.nan)
-        
-        if not np.isnan(T_static_pos) and not np.isnan(T_static_neg):
-            T_static = (T_static_pos + T_static_neg) / 2.0
-        elif not np.isnan(T_static_pos):
-            T_static = T_static_pos
-        elif not np.isnan(T_static_neg):
-            T_static = T_static_neg
-        else:
-            T_static = np.nan
-        
-        # 更新结果
-        self.results['static_friction'] = float(T_static) if not np.isnan(T_static) else None
-        self.results['static_friction_pos'] = float(T_static_pos) if not np.isnan(T_static_pos) else None
-        self.results['static_friction_neg'] = float(T_static_neg) if not np.isnan(T_static_neg) else None
-        
-        self.log_message.emit("\n=== 静摩擦力矩识别结果 ===")
-        self.log_message.emit(f"正方向静摩擦: {T_static_pos:.5f} N·m" if not np.isnan(T_static_pos) else "正方向静摩擦: 识别失败")
-        self.log_message.emit(f"负方向静摩擦: {T_static_neg:.5f} N·m" if not np.isnan(T_static_neg) else "负方向静摩擦: 识别失败")
-        self.log_message.emit(f"平均静摩擦力矩: {T_static:.5f} N·m" if not np.isnan(T_static) else "平均静摩擦力矩: 识别失败")
-        
-        # 完成
-        self.update_progress.emit(100, "静摩擦识别")
-    
-    def _reset_position(self, target_pos=0.0):
-        """重置电机到指定位置"""
-        self.log_message.emit(f"  重置电机位置到 {target_pos} rad...")
-        
-        # 获取当前位置
-        self.motor_control.refresh_motor_status(self.motor)
-        current_pos = self.motor.getPosition()
-        
-        # PD控制参数
-        kp = 5.0
-        kd = 0.5
-        
-        # 位置误差阈值
-        pos_threshold = 0.01  # rad
-        
-        # 最大尝试时间
-        max_time = 3.0  # 秒
-        start_time = time.time()
-        
-        while abs(current_pos - target_pos) > pos_threshold and (time.time() - start_time) < max_time and self.running:
-            # 控制电机
-            self.motor_control.controlMIT(self.motor, kp, kd, target_pos, 0, 0)
-            
-            # 更新位置
-            self.motor_control.refresh_motor_status(self.motor)
-            current_pos = self.motor.getPosition()
-            
-            time.sleep(0.01)
-        
-        if not self.running:
-            return
-            
-        # 停止电机但保持位置
-        self.motor_control.controlMIT(self.motor, kp, kd, target_pos, 0, 0)
-        self.log_message.emit(f"  位置重置完成，当前位置: {current_pos:.4f} rad")
-    
-    def _plot_coulomb_friction(self, speeds, torques, T_coulomb_pos, T_coulomb_neg, viscous_coeff):
-        """绘制库仑摩擦识别结果图"""
-        try:
-            fig = plt.figure(figsize=(12, 8))
-            
-            # 原始数据点
-            plt.scatter(speeds, torques, color='blue', s=50, alpha=0.7, label='实测数据点', zorder=5)
-            
-            # 理论模型线
-            x_model = np.linspace(min(speeds) - 0.5, max(speeds) + 0.5, 200)
-            y_model_pos = np.where(x_model > 0, viscous_coeff * x_model + T_coulomb_pos, 0)
-            y_model_neg = np.where(x_model < 0, viscous_coeff * x_model - T_coulomb_neg, 0)
-            y_model = y_model_pos + y_model_neg
-            plt.plot(x_model, y_model, 'r-', linewidth=2.5, label='摩擦模型', zorder=4)
-            
-            # 标记库仑摩擦力矩
-            plt.axhline(y=T_coulomb_pos, color='g', linestyle='--', linewidth=2, alpha=0.8,
-                      label=f'正向库仑摩擦: {T_coulomb_pos:.5f} N·m', zorder=3)
-            plt.axhline(y=-T_coulomb_neg, color='m', linestyle='--', linewidth=2, alpha=0.8,
-                      label=f'负向库仑摩擦: {T_coulomb_neg:.5f} N·m', zorder=3)
-            
-            # 添加坐标轴线
-            plt.axhline(y=0, color='k', linestyle='-', alpha=0.3, zorder=1)
-            plt.axvline(x=0, color='k', linestyle='-', alpha=0.3, zorder=1)
-            
-            plt.xlabel('角速度 [rad/s]', fontsize=14)
-            plt.ylabel('力矩 [N·m]', fontsize=14)
-            plt.title('电机库仑摩擦力矩识别结果', fontsize=16, fontweight='bold')
-            plt.legend(fontsize=12, loc='best')
-            plt.grid(True, alpha=0.3)
-            
-            # 添加统计信息文本框
-            stats_text = f'测试点数: {len(speeds)}\n粘滞系数: {viscous_coeff:.6f} N·m·s/rad\n平均库仑摩擦: {(T_coulomb_pos + T_coulomb_neg)/2:.5f} N·m'
-            plt.text(0.02, 0.98, stats_text, transform=plt.gca().transAxes, 
-                    bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8),
-                    verticalalignment='top', fontsize=10)
-            
-            plt.tight_layout()
-            
-            # 保存图像并发送到主线程
-            self.update_plot.emit(fig, 'coulomb_friction')
-            
-            # 保存到文件
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            fig.savefig(f'friction_coulomb_{timestamp}.png', dpi=300, bbox_inches='tight')
-            plt.close(fig)
-        except Exception as e:
-            self.log_message.emit(f"库仑摩擦绘图错误: {str(e)}")
-    
-    def _plot_static_test(self, time_data, torque_data, velocity_data, pos_data, direction):
-        """绘制静摩擦测试过程图"""
-        try:
-            fig, (ax1, ax2, ax3) = plt.subplots(3, 1, figsize=(12, 10), sharex=True)
-
-            # 力矩随时间变化
-            ax1.plot(time_data, torque_data, 'r-', linewidth=1.5, label='施加力矩')
-            ax1.set_ylabel('力矩 [N·m]', fontsize=12)
-            ax1.set_title(f'{direction}静摩擦测试过程', fontsize=14, fontweight='bold')
-            ax1.grid(True, alpha=0.3)
-            ax1.legend(fontsize=10)
-
-            # 速度随时间变化
-            ax2.plot(time_data, velocity_data, 'g-', linewidth=1.5, label='角速度')
-            ax2.axhline(y=0.05, color='orange', linestyle='--', alpha=0.7, label='运动阈值')
-            ax2.axhline(y=-0.05, color='orange', linestyle='--', alpha=0.7)
-            ax2.set_ylabel('速度 [rad/s]', fontsize=12)
-            ax2.grid(True, alpha=0.3)
-            ax2.legend(fontsize=10)
-
-            # 位置随时间变化
-            ax3.plot(time_data, pos_data, 'b-', linewidth=1.5, label='角位置')
-            ax3.set_xlabel('时间 [s]', fontsize=12)
-            ax3.set_ylabel('位置 [rad]', fontsize=12)
-            ax3.grid(True, alpha=0.3)
-            ax3.legend(fontsize=10)
-
-            # 找出开始移动的点
-            movement_threshold = 0.05
-            move_indices = [i for i, v in enumerate(velocity_data) if abs(v) > movement_threshold]
-            if move_indices:
-                break_idx = move_indices[0]
-                break_time = time_data[break_idx]
-                break_torque = torque_data[break_idx]
-
-                for ax in [ax1, ax2, ax3]:
-                    ax.axvline(x=break_time, color='red', linestyle='--', linewidth=2, alpha=0.8)
-
-                ax1.plot(break_time, break_torque, 'ro', markersize=8,
-                         label=f'脱离点: {break_torque:.5f} N·m')
-                ax1.legend(fontsize=10)
-
-            plt.tight_layout()
-
-            self.update_plot.emit(fig, f'static_friction_{direction}')
-
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            fig.savefig(f'friction_static_{direction}_{timestamp}.png', dpi=300, bbox_inches='tight')
-            plt.close(fig)
-        except Exception as e:
-            self.log_message.emit(f"静摩擦绘图错误: {str(e)}")
-
-
-# 电机状态显示组件
-class MotorStatusWidget(QGroupBox):
-    def __init__(self):
-        super().__init__("电机实时状态")
-        self.setup_ui()
-        
-    def setup_ui(self):
-        layout = QVBoxLayout()
-        
-        # 状态图标和文字
-        status_layout = QHBoxLayout()
-        self.status_icon_label = QLabel("❓")
-        self.status_icon_label.setStyleSheet("font-size: 16px;")
-        self.status_text_label = QLabel("未连接")
-        self.status_text_label.setStyleSheet("font-size: 12px; font-weight: bold;")
-        
-        status_layout.addWidget(self.status_icon_label)
-        status_layout.addWidget(self.status_text_label)
-        status_layout.addStretch()
-        
-        # 创建网格布局显示参数
-        params_layout = QGridLayout()
-        
-        # 位置
-        self.pos_label = QLabel("位置:")
-        self.pos_value = QLabel("0.000 rad")
-        self.pos_value.setStyleSheet("font-weight: bold; color: blue;")
-        params_layout.addWidget(self.pos_label, 0, 0)
-        params_layout.addWidget(self.pos_value, 0, 1)
-        
-        # 速度
-        self.vel_label = QLabel("速度:")
-        self.vel_value = QLabel("0.000 rad/s")
-        self.vel_value.setStyleSheet("font-weight: bold; color: green;")
-        params_layout.addWidget(self.vel_label, 0, 2)
-        params_layout.addWidget(self.vel_value, 0, 3)
-        
-        # 扭矩
-        self.torque_label = QLabel("扭矩:")
-        self.torque_value = QLabel("0.000 N·m")
-        self.torque_value.setStyleSheet("font-weight: bold; color: red;")
-        params_layout.addWidget(self.torque_label, 1, 0)
-        params_layout.addWidget(self.torque_value, 1, 1)
-        
-        # MOS温度
-        self.mos_temp_label = QLabel("MOS温度:")
-        self.mos_temp_value = QLabel("0.0 ℃")
-        self.mos_temp_value.setStyleSheet("font-weight: bold; color: orange;")
-        params_layout.addWidget(self.mos_temp_label, 1, 2)
-        params_layout.addWidget(self.mos_temp_value, 1, 3)
-        
-        # 电机温度
-        self.rotor_temp_label = QLabel("线圈温度:")
-        self.rotor_temp_value = QLabel("0.0 ℃")
-        self.rotor_temp_value.setStyleSheet("font-weight: bold; color: purple;")
-        params_layout.addWidget(self.rotor_temp_label, 2, 0)
-        params_layout.addWidget(self.rotor_temp_value, 2, 1)
-        
-        # 健康状态
-        self.health_label = QLabel("健康状态:")
-        self.health_value = QLabel("未知")
-        params_layout.addWidget(self.health_label, 2, 2)
-        params_layout.addWidget(self.health_value, 2, 3)
-        
-        layout.addLayout(status_layout)
-        layout.addLayout(params_layout)
-        self.setLayout(layout)
-    
-    def update_status(self, status_data):
-        """更新状态显示"""
-        self.status_icon_label.setText(status_data['status_icon'])
-        self.status_text_label.setText(status_data['status_text'])
-        
-        self.pos_value.setText(f"{status_data['position']:.3f} rad")
-        self.vel_value.setText(f"{status_data['velocity']:.3f} rad/s")
-        self.torque_value.setText(f"{status_data['torque']:.3f} N·m")
-        self.mos_temp_value.setText(f"{status_data['t_mos']:.1f} ℃")
-        self.rotor_temp_value.setText(f"{status_data['t_rotor']:.1f} ℃")
-        
-        # 更新健康状态
-        if status_data['has_error']:
-            self.health_value.setText("异常")
-            self.health_value.setStyleSheet("font-weight: bold; color: red;")
-        elif status_data['is_healthy']:
-            self.health_value.setText("正常")
-            self.health_value.setStyleSheet("font-weight: bold; color: green;")
-        else:
-            self.health_value.setText("未知")
-            self.health_value.setStyleSheet("font-weight: bold; color: gray;")
-        
-        # 根据温度改变颜色
-        if status_data['t_mos'] > 60:
-            self.mos_temp_value.setStyleSheet("font-weight: bold; color: red;")
-        elif status_data['t_mos'] > 40:
-            self.mos_temp_value.setStyleSheet("font-weight: bold; color: orange;")
-        else:
-            self.mos_temp_value.setStyleSheet("font-weight: bold; color: green;")
-            
-        if status_data['t_rotor'] > 80:
-            self.rotor_temp_value.setStyleSheet("font-weight: bold; color: red;")
-        elif status_data['t_rotor'] > 60:
-            self.rotor_temp_value.setStyleSheet("font-weight: bold; color: orange;")
-        else:
-            self.rotor_temp_value.setStyleSheet("font-weight: bold; color: green;")
-
-
-# 主窗口
-class FrictionIdentifierApp(QMainWindow):
-    def __init__(self):
-        super().__init__()
-        self.setWindowTitle("电机摩擦力参数自动识别工具 v2.0")
-        self.setMinimumSize(1300, 700)
-        
-        self.results = {}
-        self.identifier_thread = None
-        self.status_thread = None
-        
-        # 设置默认参数
-        self.default_params = {
-            'motor_type': "DM4310",
-            'node_id': 0x01,
-            'master_id': 0x11,
-            'com_port': 'COM5',
-            'baud_rate': 921600,
-            'viscous_coeff': 0.0001330964,
-            'inertia': 1.976204E-05,
-            'test_speeds': [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 1.5, 2.0, -0.001, -0.005, -0.01, -0.05, -0.5, -1.0, -1.5, -2.0],
-            'duration': 5,
-            'settling_time': 0.5,
-            'torque_increment': 0.0001,
-            'max_torque': 0.5
-        }
-        
-        self.setup_ui()
-        
-        # 设置初始状态显示
-        self.motor_status_widget.update_status({
-            'position': 0.0,
-            'velocity': 0.0,
-            'torque': 0.0,
-            't_mos': 0.0,
-            't_rotor': 0.0,
-            'status': 0,
-            'status_text': "未连接",
-            'status_icon': "❓",
-            'is_healthy': True,
-            'has_error': False
-        })
-    
-    def setup_ui(self):
-        # 中央小部件
-        central_widget = QWidget()
-        self.setCentralWidget(central_widget)
-        
-        # 主布局
-        main_layout = QVBoxLayout(central_widget)
-        main_layout.setContentsMargins(5, 5, 5, 5)
-        main_layout.setSpacing(5)
-
-        # 创建主标签页
-        self.main_tabs = QTabWidget()
-        main_layout.addWidget(self.main_tabs)
-        
-        # 第一个标签页：参数设置和控制
-        self.setup_control_tab()
-        
-        # 第二个标签页：库仑摩擦图表
-        self.setup_coulomb_tab()
-        
-        # 第三个标签页：静摩擦图表
-        self.setup_static_tab()
-        
-        # 连接信号
-        self.check_motor_btn.clicked.connect(self.check_motor_status)
-        self.read_dyn_btn.clicked.connect(self.read_dynamics_from_motor)
-        self.start_coulomb_btn.clicked.connect(lambda: self.start_identification('coulomb'))
-        self.start_static_btn.clicked.connect(lambda: self.start_identification('static'))
-        self.start_comprehensive_btn.clicked.connect(lambda: self.start_identification('comprehensive'))
-        self.stop_btn.clicked.connect(self.stop_identification)
-        self.save_results_btn.clicked.connect(self.save_results)
-        self.load_results_btn.clicked.connect(self.load_results)
-        
-        # 初始日志
-        self.log("电机摩擦力参数自动识别工具 v2.0 已启动")
-        self.log("请先点击'检查电机状态'进行连接测试")
-    
-    def setup_control_tab(self):
-        """设置第一个标签页：参数设置和控制"""
-        control_tab = QWidget()
-        self.main_tabs.addTab(control_tab, "参数设置与控制")
-        
-        control_layout = QVBoxLayout(control_tab)
-        control_layout.setContentsMargins(5, 5, 5, 5)
-        control_layout.setSpacing(5)
-        
-        # 创建分割器
-        splitter = QSplitter(Qt.Vertical)
-        control_layout.addWidget(splitter)
-        
-        # 上半部分 - 参数设置和状态显示
-        top_widget = QWidget()
-        top_layout = QHBoxLayout(top_widget)
-        top_layout.setContentsMargins(2, 2, 2, 2)
-        top_layout.setSpacing(5)
-        
-        # 左侧 - 参数设置区域
-        left_widget = QWidget()
-        left_layout = QVBoxLayout(left_widget)
-        
-        param_group = QGroupBox("参数设置")
-        param_layout = QGridLayout()
-        
-        # 电机参数
-        motor_group = QGroupBox("电机参数")
-        motor_layout = QFormLayout()
-        
-        self.motor_type_combo = QComboBox()
-        motor_types = ["DM4310", "DM4340", "DM6006", "DM8006", "DM8009", "DM10010L", "DM10010"]
-        self.motor_type_combo.addItems(motor_types)
-        
-        self.node_id_edit = QLineEdit(hex(self.default_params['node_id']))
-        self.master_id_edit = QLineEdit(hex(self.default_params['master_id']))
-        self.com_port_edit = QLineEdit(self.default_params['com_port'])
-        self.baud_rate_edit = QLineEdit(str(self.default_params['baud_rate']))
-        
-        motor_layout.addRow("电机型号:", self.motor_type_combo)
-        motor_layout.addRow("节点ID(hex):", self.node_id_edit)
-        motor_layout.addRow("主控ID(hex):", self.master_id_edit)
-        motor_layout.addRow("串口:", self.com_port_edit)
-        motor_layout.addRow("波特率:", self.baud_rate_edit)
-        motor_group.setLayout(motor_layout)
-        
-        # 动力学参数
-        dynamics_group = QGroupBox("动力学参数")
-        dynamics_layout = QFormLayout()
-        
-        self.viscous_coeff_edit = QLineEdit(str(self.default_params['viscous_coeff']))
-        self.inertia_edit = QLineEdit(str(self.default_params['inertia']))
-
-        dynamics_layout.addRow("粘滞摩擦系数 [N·m·s/rad]:", self.viscous_coeff_edit)
-        dynamics_layout.addRow("转子惯量 [kg·m²]:", self.inertia_edit)
-        dynamics_group.setLayout(dynamics_layout)
-
-        # 自动读取按钮
-        self.read_dyn_btn = QPushButton("自动读取")
-        self.read_dyn_btn.setToolTip("从电机读取粘滞系数 (Damp) 与转动惯量 (Inertia)")
-        self.read_dyn_btn.setMinimumHeight(24)
-        dynamics_layout.addRow(self.read_dyn_btn)
-
-        dynamics_group.setLayout(dynamics_layout)
-
-        # 测试参数
-        test_group = QGroupBox("测试参数")
-        test_layout = QFormLayout()
-        
-        self.test_speeds_edit = QLineEdit(str(self.default_params['test_speeds']).replace('[', '').replace(']', ''))
-        self.duration_edit = QLineEdit(str(self.default_params['duration']))
-        self.settling_time_edit = QLineEdit(str(self.default_params['settling_time']))
-        self.torque_increment_edit = QLineEdit(str(self.default_params['torque_increment']))
-        self.max_torque_edit = QLineEdit(str(self.default_params['max_torque']))
-        
-        test_layout.addRow("测试速度 [rad/s] (逗号分隔):", self.test_speeds_edit)
-        test_layout.addRow("数据采集时间 [s]:", self.duration_edit)
-        test_layout.addRow("速度稳定时间 [s]:", self.settling_time_edit)
-        test_layout.addRow("力矩增量 [N·m]:", self.torque_increment_edit)
-        test_layout.addRow("最大测试力矩 [N·m]:", self.max_torque_edit)
-        test_group.setLayout(test_layout)
-        
-        # 添加参数组到参数布局
-        param_layout.addWidget(motor_group, 0, 0)
-        param_layout.addWidget(dynamics_group, 0, 1)
-        param_layout.addWidget(test_group, 1, 0, 1, 2)
-        
-        param_group.setLayout(param_layout)
-        left_layout.addWidget(param_group)
-        
-        # 右侧 - 电机状态和控制
-        right_widget = QWidget()
-        right_layout = QVBoxLayout(right_widget)
-        
-        # 电机状态显示
-        self.motor_status_widget = MotorStatusWidget()
-        right_layout.addWidget(self.motor_status_widget)
-        
-        # 控制按钮区域（两列）
-        control_group = QGroupBox("控制面板，提示：让电机空载，并固定电机")
-        control_btn_layout = QGridLayout()
-        control_btn_layout.setContentsMargins(6, 6, 6, 6)
-        control_btn_layout.setHorizontalSpacing(8)
-        control_btn_layout.setVerticalSpacing(6)
-
-        # 电机检查按钮（整行占两列）
-        self.check_motor_btn = QPushButton("检查电机状态")
-        self.check_motor_btn.setMinimumHeight(30)
-        self.check_motor_btn.setStyleSheet(
-            "QPushButton { background-color: #4CAF50; color: white; font-weight: bold; font-size: 10px; }"
-            "QPushButton:hover { background-color: #45a049; }"
-        )
-        control_btn_layout.addWidget(self.check_motor_btn, 0, 0, 1, 2)
-
-        # 分隔线（整行占两列）
-        line1 = QFrame()
-        line1.setFrameShape(QFrame.HLine)
-        line1.setFrameShadow(QFrame.Sunken)
-        control_btn_layout.addWidget(line1, 1, 0, 1, 2)
-
-        # 功能按钮（两列排布）
-        self.start_coulomb_btn = QPushButton("识别库仑摩擦")
-        self.start_static_btn = QPushButton("识别静摩擦")
-        self.start_comprehensive_btn = QPushButton("全面识别")
-        self.stop_btn = QPushButton("停止")
-        self.save_results_btn = QPushButton("保存结果")
-        self.load_results_btn = QPushButton("加载结果")
-
-        for btn in [self.start_coulomb_btn, self.start_static_btn, self.start_comprehensive_btn,
-                    self.stop_btn, self.save_results_btn, self.load_results_btn]:
-            btn.setMinimumHeight(25)
-
-        self.stop_btn.setEnabled(False)
-        self.stop_btn.setStyleSheet(
-            "QPushButton { background-color: #f44336; color: white; font-weight: bold; }"
-            "QPushButton:disabled { background-color: #cccccc; }"
-        )
-
-        # 网格位置：
-        # 第2行：库仑/静摩擦
-        control_btn_layout.addWidget(self.start_coulomb_btn,     2, 0)
-        control_btn_layout.addWidget(self.start_static_btn,      2, 1)
-        # 第3行：全面识别/停止
-        control_btn_layout.addWidget(self.start_comprehensive_btn, 3, 0)
-        control_btn_layout.addWidget(self.stop_btn,                3, 1)
-        # 第4行：保存/加载
-        control_btn_layout.addWidget(self.save_results_btn,      4, 0)
-        control_btn_layout.addWidget(self.load_results_btn,      4, 1)
-
-        # 进度与状态（右侧进度条，左侧标签）
-        self.progress_bar = QProgressBar()
-        self.progress_bar.setRange(0, 100)
-        self.progress_label = QLabel("就绪")
-        self.progress_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-
-        control_btn_layout.addWidget(QLabel("进度:"), 5, 0, alignment=Qt.AlignRight | Qt.AlignVCenter)
-        control_btn_layout.addWidget(self.progress_bar, 5, 1)
-        control_btn_layout.addWidget(self.progress_label, 6, 0, 1, 2)
-
-        # 拉伸留白
-        control_btn_layout.setRowStretch(7, 1)
-
-        control_group.setLayout(control_btn_layout)
-        right_layout.addWidget(control_group)
-        
-        # 添加左右部分到顶部布局
-        top_layout.addWidget(left_widget, 7)
-        top_layout.addWidget(right_widget, 3)
-        
-        # 下半部分 - 子标签页（日志和结果）
-        bottom_widget = QWidget()
-        bottom_layout = QVBoxLayout(bottom_widget)
-       
-        self.sub_tabs = QTabWidget()
-        
-        # 日志标签页
-        self.log_tab = QWidget()
-        log_layout = QVBoxLayout(self.log_tab)
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setMaximumHeight(200)  # 限制高度
-        log_layout.addWidget(self.log_text)
-        
-        # 结果标签页
-        self.results_tab = QWidget()
-        results_layout = QVBoxLayout(self.results_tab)
-        self.results_table = QTableWidget(0, 2)
-        self.results_table.setHorizontalHeaderLabels(["参数 / Parameter", "值 / Value"])
-        self.results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
-        self.results_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
-        results_layout.addWidget(self.results_table)
-        
-        # 添加子标签页
-        self.sub_tabs.addTab(self.log_tab, "日志")
-        self.sub_tabs.addTab(self.results_tab, "结果")
-        
-        bottom_layout.addWidget(self.sub_tabs)
-        
-        # 添加上下部分到分割器
-        splitter.addWidget(top_widget)
-        splitter.addWidget(bottom_widget)
-        splitter.setSizes([600, 300])
-    
-    def setup_coulomb_tab(self):
-        """设置第二个标签页：库仑摩擦图表"""
-        coulomb_tab = QWidget()
-        self.main_tabs.addTab(coulomb_tab, "库仑摩擦图表")
-        
-        coulomb_layout = QVBoxLayout(coulomb_tab)
-        coulomb_layout.setContentsMargins(5, 5, 5, 5)
-        
-        # 添加标题和说明
-        title_label = QLabel("库仑摩擦力矩识别结果")
-        title_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #2c3e50; padding: 10px;")
-        title_label.setAlignment(Qt.AlignCenter)
-        coulomb_layout.addWidget(title_label)
-        
-        desc_label = QLabel("库仑摩擦是物体在相对运动时产生的摩擦阻力，与运动方向相反，大小基本恒定。\n本测试通过不同速度下的力矩测量来识别正负方向的库仑摩擦力矩。")
-        desc_label.setStyleSheet("color: #7f8c8d; padding: 5px; font-size: 11px;")
-        desc_label.setAlignment(Qt.AlignCenter)
-        coulomb_layout.addWidget(desc_label)
-        
-        # 创建滚动区域用于图表
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        self.coulomb_canvas_widget = QWidget()
-        self.coulomb_layout = QVBoxLayout(self.coulomb_canvas_widget)
-        scroll_area.setWidget(self.coulomb_canvas_widget)
-        coulomb_layout.addWidget(scroll_area)
-        
-        # 添加提示标签
-        info_label = QLabel("请先运行库仑摩擦识别测试以显示图表")
-        info_label.setStyleSheet("color: #95a5a6; font-style: italic; padding: 20px;")
-        info_label.setAlignment(Qt.AlignCenter)
-        self.coulomb_layout.addWidget(info_label)
-    
-    def setup_static_tab(self):
-        """设置第三个标签页：静摩擦图表"""
-        static_tab = QWidget()
-        self.main_tabs.addTab(static_tab, "静摩擦图表")
-        
-        static_layout = QVBoxLayout(static_tab)
-        static_layout.setContentsMargins(5, 5, 5, 5)
-        
-        # 添加标题和说明
-        title_label = QLabel("静摩擦力矩识别结果")
-        title_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #2c3e50; padding: 10px;")
-        title_label.setAlignment(Qt.AlignCenter)
-        static_layout.addWidget(title_label)
-        
-        desc_label = QLabel("静摩擦是物体由静止状态开始运动时需要克服的最大摩擦阻力。\n本测试通过逐渐增加力矩直到电机开始转动来识别静摩擦的脱离力矩。")
-        desc_label.setStyleSheet("color: #7f8c8d; padding: 5px; font-size: 11px;")
-        desc_label.setAlignment(Qt.AlignCenter)
-        static_layout.addWidget(desc_label)
-        
-        # 创建滚动区域用于图表
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        self.static_canvas_widget = QWidget()
-        self.static_layout = QVBoxLayout(self.static_canvas_widget)
-        scroll_area.setWidget(self.static_canvas_widget)
-        static_layout.addWidget(scroll_area)
-        
-        # 添加提示标签
-        info_label = QLabel("请先运行静摩擦识别测试以显示图表")
-        info_label.setStyleSheet("color: #95a5a6; font-style: italic; padding: 20px;")
-        info_label.setAlignment(Qt.AlignCenter)
-        self.static_layout.addWidget(info_label)
-    
-    def check_motor_status(self):
-        """检查电机状态"""
-        if self.status_thread and self.status_thread.isRunning():
-            self.log("停止实时状态更新...")
-            self.status_thread.stop()
-            self.check_motor_btn.setText("检查电机状态")
-            self.check_motor_btn.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; font-size: 12px; } QPushButton:hover { background-color: #45a049; }")
-            return
-            
-        params = self.get_params_from_ui()
-        if params is None:
-            return
-            
-        self.log("\n开始检查电机状态...")
-        
-        try:
-            # 临时连接以检查电机
-            motor_type_dict = {
-                "DM4310": DM_Motor_Type.DM4310,
-                "DM4340": DM_Motor_Type.DM4340,
-                "DM6006": DM_Motor_Type.DM6006,
-                "DM8006": DM_Motor_Type.DM8006,
-                "DM8009": DM_Motor_Type.DM8009,
-                "DM10010L": DM_Motor_Type.DM10010L,
-                "DM10010": DM_Motor_Type.DM10010,
-            }
-            
-            motor_type = motor_type_dict.get(params['motor_type'], DM_Motor_Type.DM4310)
-            
-            motor = Motor(motor_type, params['node_id'], params['master_id'])
-            serial_device = serial.Serial(params['com_port'], params['baud_rate'], timeout=0.5)
-            motor_control = MotorControl(serial_device)
-            motor_control.addMotor(motor)
-            
-            self.log(f"连接成功: {params['com_port']} @ {params['baud_rate']} bps")
-            
-            # 读取电机信息
-            self.log("\n读取电机参数...")
-            motor_info = {
-                '软件版本': motor_control.read_motor_param(motor, DM_variable.sub_ver),
-                '控制模式': motor_control.read_motor_param(motor, DM_variable.CTRL_MODE),
-                '电机ID': motor_control.read_motor_param(motor, DM_variable.ESC_ID),
-                '主控ID': motor_control.read_motor_param(motor, DM_variable.MST_ID),
-                '减速比': motor_control.read_motor_param(motor, DM_variable.Gr),
-                '最大位置': motor_control.read_motor_param(motor, DM_variable.PMAX),
-                '最大速度': motor_control.read_motor_param(motor, DM_variable.VMAX),
-                '最大扭矩': motor_control.read_motor_param(motor, DM_variable.TMAX),
-            }
-            
-            # 控制模式映射
-            control_mode_map = {
-                1: "MIT模式",
-                2: "位置速度模式",
-                3: "速度模式",
-                4: "力位混合模式"
-            }
-            
-            self.log("\n=== 电机信息 ===")
-            for key, value in motor_info.items():
-                if key == '控制模式':
-                    mode_text = control_mode_map.get(value, f"未知模式({value})")
-                    self.log(f"{key}: {mode_text}")
-                else:
-                    self.log(f"{key}: {value}")
-            
-            # 获取实时状态
-            motor_control.refresh_motor_status(motor)
-            current_pos = motor.getPosition()
-            current_vel = motor.getVelocity()
-            current_torque = motor.getTorque()
-            t_mos = motor.getT_MOS() if hasattr(motor, 'getT_MOS') else 0.0
-            t_rotor = motor.getT_Rotor() if hasattr(motor, 'getT_Rotor') else 0.0
-            
-            self.log("\n=== 实时状态 ===")
-            self.log(f"位置: {current_pos:.3f} rad")
-            self.log(f"速度: {current_vel:.3f} rad/s")
-            self.log(f"扭矩: {current_torque:.3f} N·m")
-            self.log(f"MOS温度: {t_mos:.1f} ℃")
-            self.log(f"线圈温度: {t_rotor:.1f} ℃")
-            
-            # 判断电机状态
-            is_enabled = abs(current_vel) > 0.001 or abs(current_torque) > 0.001
-            has_temp_warning = t_mos > 60 or t_rotor > 80
-            
-            if has_temp_warning:
-                self.log("电机状态: ⚠️ 温度警告")
-            elif is_enabled:
-                self.log("电机状态: ✅ 运行中")
-            else:
-                self.log("电机状态: ⭕ 待机")
-            
-            # 更新初始状态显示
-            initial_status = {
-                'position': current_pos,
-                'velocity': current_vel,
-                'torque': current_torque,
-                't_mos': t_mos,
-                't_rotor': t_rotor,
-                'status': 1 if is_enabled else 0,
-                'status_text': "运行中" if is_enabled else "待机",
-                'status_icon': "✅" if is_enabled else "⭕",
-                'is_healthy': not has_temp_warning,
-                'has_error': False
-            }
-            self.motor_status_widget.update_status(initial_status)
-            
-            # 关闭临时连接
-            serial_device.close()
-            
-            # 启动实时状态监控线程
-            self.status_thread = MotorStatusThread(params)
-            self.status_thread.status_updated.connect(self.motor_status_widget.update_status)
-            self.status_thread.log_message.connect(self.log)
-            self.status_thread.start()
-            
-            self.check_motor_btn.setText("停止状态监控")
-            self.check_motor_btn.setStyleSheet("QPushButton { background-color: #f44336; color: white; font-weight: bold; font-size: 12px; } QPushButton:hover { background-color: #da190b; }")
-            
-            self.log("\n电机检查完成，已启动实时状态监控")
-            
-        except Exception as e:
-            self.log(f"电机检查失败: {str(e)}")
-            self.log("请检查连接参数是否正确")
-    
-    def get_params_from_ui(self):
-        """从UI控件获取参数"""
-        try:
-            # 解析测试速度
-            test_speeds_str = self.test_speeds_edit.text().strip()
-            test_speeds = [float(x.strip()) for x in test_speeds_str.split(',')]
-            
-            # 解析电机ID (十六进制)
-            node_id_str = self.node_id_edit.text().strip()
-            if node_id_str.startswith('0x'):
-                node_id = int(node_id_str, 16)
-            else:
-                node_id = int(node_id_str, 16) if all(c in '0123456789abcdefABCDEF' for c in node_id_str) else int(node_id_str)
-                
-            master_id_str = self.master_id_edit.text().strip()
-            if master_id_str.startswith('0x'):
-                master_id = int(master_id_str, 16)
-            else:
-                master_id = int(master_id_str, 16) if all(c in '0123456789abcdefABCDEF' for c in master_id_str) else int(master_id_str)
-            
-            params = {
-                'motor_type': self.motor_type_combo.currentText(),
-                'node_id': node_id,
-                'master_id': master_id,
-                'com_port': self.com_port_edit.text().strip(),
-                'baud_rate': int(self.baud_rate_edit.text().strip()),
-                'viscous_coeff': float(self.viscous_coeff_edit.text().strip()),
-                'inertia': float(self.inertia_edit.text().strip()),
-                'test_speeds': test_speeds,
-                'duration': float(self.duration_edit.text().strip()),
-                'settling_time': float(self.settling_time_edit.text().strip()),
-                'torque_increment': float(self.torque_increment_edit.text().strip()),
-                'max_torque': float(self.max_torque_edit.text().strip())
-            }
-            
-            return params
-        except Exception as e:
-            self.log(f"参数解析错误: {str(e)}")
-            return None
-    def read_dynamics_from_motor(self):
-        """从电机读取粘滞系数(Damp)与转动惯量(Inertia)，并回填到动力学参数。
-           若实时状态监控占用串口，则临时暂停监控，读取完成后自动恢复。"""
-        ser = None
-        was_monitoring = False
-        try:
-            # 如果正在监控，占用着串口 => 暂停
-            if self.status_thread and self.status_thread.isRunning():
-                was_monitoring = True
-                self.log("检测到实时状态监控占用串口，正在暂时暂停监控以读取参数...")
-                self.status_thread.stop()
-                self.check_motor_btn.setText("检查电机状态")
-                self.check_motor_btn.setStyleSheet(
-                    "QPushButton { background-color: #4CAF50; color: white; font-weight: bold; font-size: 12px; } "
-                    "QPushButton:hover { background-color: #45a049; }"
-                )
-
-            # 解析必要连接参数（只解析连接必需项，避免其它字段出错）
-            motor_type_text = self.motor_type_combo.currentText().strip()
-            node_id_str = self.node_id_edit.text().strip()
-            master_id_str = self.master_id_edit.text().strip()
-            com_port = self.com_port_edit.text().strip()
-            baud_rate = int(self.baud_rate_edit.text().strip())
-
-            def _parse_id(s: str) -> int:
-                if s.startswith(("0x", "0X")):
-                    return int(s, 16)
-            # 仅包含十六进制字符也按16进制解析，否则按10进制
-                return int(s, 16) if all(c in "0123456789abcdefABCDEF" for c in s) else int(s)
-
-            node_id = _parse_id(node_id_str)
-            master_id = _parse_id(master_id_str)
-
-            motor_type_map = {
-                "DM4310": DM_Motor_Type.DM4310,
-                "DM4340": DM_Motor_Type.DM4340,
-                "DM6006": DM_Motor_Type.DM6006,
-                "DM8006": DM_Motor_Type.DM8006,
-                "DM8009": DM_Motor_Type.DM8009,
-                "DM10010L": DM_Motor_Type.DM10010L,
-                "DM10010": DM_Motor_Type.DM10010,
-            }
-            motor_type = motor_type_map.get(motor_type_text, DM_Motor_Type.DM4310)
-
-            self.log("正在读取电机动力学参数 (Damp / Inertia)...")
-
-            # 独立短连接，读取后立刻关闭，避免长期占用
-            ser = serial.Serial(com_port, baud_rate, timeout=0.5)
-            mc = MotorControl(ser)
-            motor = Motor(motor_type, node_id, master_id)
-            mc.addMotor(motor)
-
-            # 直接读寄存器
-            damp = mc.read_motor_param(motor, DM_variable.Damp)
-            inertia = mc.read_motor_param(motor, DM_variable.Inertia)
-
-            # 回填界面（存在才写）
-            if damp is not None:
-                self.viscous_coeff_edit.setText(f"{float(damp):.10g}")
-            if inertia is not None:
-                self.inertia_edit.setText(f"{float(inertia):.10g}")
-
-            self.log(f"读取完成：Damp={damp if damp is not None else 'None'}，Inertia={inertia if inertia is not None else 'None'}")
-
-        except Exception as e:
-            self.log(f"读取动力学参数失败：{e}")
-            QMessageBox.warning(self, "读取失败", f"读取电机动力学参数失败：\n{e}")
-        finally:
-            # 确保串口关闭
-            try:
-                if ser and ser.is_open:
-                    ser.close()
-            except:
-                pass
-
-            # 如之前在监控，自动恢复监控
-            if was_monitoring:
-                try:
-                    params = self.get_params_from_ui()
-                    if params:
-                        self.status_thread = MotorStatusThread(params)
-                        self.status_thread.status_updated.connect(self.motor_status_widget.update_status)
-                        self.status_thread.log_message.connect(self.log)
-                        self.status_thread.start()
-                        self.check_motor_btn.setText("停止状态监控")
-                        self.check_motor_btn.setStyleSheet(
-                            "QPushButton { background-color: #f44336; color: white; font-weight: bold; font-size: 12px; } "
-                            "QPushButton:hover { background-color: #da190b; }"
-                        )
-                        self.log("已恢复实时状态监控。")
-                    else:
-                        self.log("未能恢复状态监控：参数解析失败。")
-                except Exception as re:
-                    self.log(f"恢复状态监控失败：{re}")
-    
-    def start_identification(self, test_type):
-        """开始识别过程"""
-        # 停止状态监控
-        if self.status_thread and self.status_thread.isRunning():
-            self.status_thread.stop()
-            self.check_motor_btn.setText("检查电机状态")
-            self.check_motor_btn.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; font-size: 12px; } QPushButton:hover { background-color: #45a049; }")
-            
-        if self.identifier_thread is not None and self.identifier_thread.isRunning():
-            self.log("已有识别进程在运行，请等待完成或停止")
-            return
-        
-        # 获取参数
-        params = self.get_params_from_ui()
-        if params is None:
-            return
-        
-        # 创建工作线程
-        self.identifier_thread = FrictionIdentifierThread(params, test_type)
-        
-        # 连接信号
-        self.identifier_thread.update_progress.connect(self.update_progress)
-        self.identifier_thread.update_plot.connect(self.update_plot)
-        self.identifier_thread.update_results.connect(self.update_results)
-        self.identifier_thread.log_message.connect(self.log)
-        self.identifier_thread.test_completed.connect(self.on_test_completed)
-        
-        # 更新UI状态
-        self.check_motor_btn.setEnabled(False)
-        self.start_coulomb_btn.setEnabled(False)
-        self.start_static_btn.setEnabled(False)
-        self.start_comprehensive_btn.setEnabled(False)
-        self.stop_btn.setEnabled(True)
-        self.save_results_btn.setEnabled(False)
-        self.load_results_btn.setEnabled(False)
-        
-        # 清除之前的图表
-        self.clear_plots()
-        
-        # 开始线程
-        self.log(f"开始 {test_type} 摩擦识别过程...")
-        self.identifier_thread.start()
-    
-    def stop_identification(self):
-        """停止识别过程"""
-        if self.identifier_thread is not None and self.identifier_thread.isRunning():
-            self.log("正在停止识别过程...")
-            self.identifier_thread.running = False
-            self.identifier_thread.wait(2000)  # 等待线程结束
-            self.on_test_completed()
-    
-    def on_test_completed(self):
-        """测试完成处理"""
-        # 更新UI状态
-        self.check_motor_btn.setEnabled(True)
-        self.start_coulomb_btn.setEnabled(True)
-        self.start_static_btn.setEnabled(True)
-        self.start_comprehensive_btn.setEnabled(True)
-        self.stop_btn.setEnabled(False)
-        self.save_results_btn.setEnabled(True)
-        self.load_results_btn.setEnabled(True)
-    
-    def update_progress(self, value, status):
-        """更新进度条"""
-        self.progress_bar.setValue(value)
-        self.progress_label.setText(status)
-    
-    def update_plot(self, fig, plot_type):
-        """更新图表"""
-        # 创建一个 matplotlib 画布
-        canvas = FigureCanvas(fig)
-        toolbar = NavigationToolbar(canvas, self)
-        
-        # 清除之前的内容并添加新画布
-        if plot_type == 'coulomb_friction':
-            # 清除之前的子控件
-            while self.coulomb_layout.count():
-                item = self.coulomb_layout.takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-            
-            self.coulomb_layout.addWidget(toolbar)
-            self.coulomb_layout.addWidget(canvas)
-            self.main_tabs.setCurrentIndex(1)  # 切换到库仑摩擦标签页
-        
-        elif plot_type.startswith('static_friction'):
-            # 清除之前的子控件
-            while self.static_layout.count():
-                item = self.static_layout.takeAt(0)
-                widget = item.widget()
-                if widget:
-                    widget.deleteLater()
-            
-            self.static_layout.addWidget(toolbar)
-            self.static_layout.addWidget(canvas)
-            self.main_tabs.setCurrentIndex(2)  # 切换到静摩擦标签页
-    
-    def clear_plots(self):
-        """清除图表"""
-        # 清除库仑摩擦图表
-        while self.coulomb_layout.count():
-            item = self.coulomb_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-        
-        # 添加提示标签
-        info_label = QLabel("请先运行库仑摩擦识别测试以显示图表")
-        info_label.setStyleSheet("color: #95a5a6; font-style: italic; padding: 20px;")
-        info_label.setAlignment(Qt.AlignCenter)
-        self.coulomb_layout.addWidget(info_label)
-        
-        # 清除静摩擦图表
-        while self.static_layout.count():
-            item = self.static_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-        
-        # 添加提示标签
-        info_label2 = QLabel("请先运行静摩擦识别测试以显示图表")
-        info_label2.setStyleSheet("color: #95a5a6; font-style: italic; padding: 20px;")
-        info_label2.setAlignment(Qt.AlignCenter)
-        self.static_layout.addWidget(info_label2)
-    
-    def update_results(self, results):
-        """更新结果表格"""
-        self.results = results
-        self.results_table.setRowCount(0)  # 清空表格
-        
-        # 填充结果表格
-        row = 0
-        
-        # 添加库仑摩擦结果
-        if 'coulomb_friction' in results:
-            self.add_result_row("库仑摩擦力矩 / Coulomb Friction Torque [N·m]", f"{results['coulomb_friction']:.6f}")
-            if 'coulomb_friction_pos' in results:
-                self.add_result_row("正向库仑摩擦 / Positive Coulomb Friction [N·m]", f"{results['coulomb_friction_pos']:.6f}")
-            if 'coulomb_friction_neg' in results:
-                self.add_result_row("负向库仑摩擦 / Negative Coulomb Friction [N·m]", f"{results['coulomb_friction_neg']:.6f}")
-        
-        # 添加静摩擦结果
-        if 'static_friction' in results and results['static_friction'] is not None:
-            self.add_result_row("静摩擦力矩 / Static Friction Torque [N·m]", f"{results['static_friction']:.6f}")
-            if 'static_friction_pos' in results and results['static_friction_pos'] is not None:
-                self.add_result_row("正向静摩擦 / Positive Static Friction [N·m]", f"{results['static_friction_pos']:.6f}")
-            if 'static_friction_neg' in results and results['static_friction_neg'] is not None:
-                self.add_result_row("负向静摩擦 / Negative Static Friction [N·m]", f"{results['static_friction_neg']:.6f}")
-        
-        # 添加已知参数
-        self.add_result_row("粘滞摩擦系数 / Viscous Friction Coefficient [N·m·s/rad]", f"{results['viscous_friction']:.10f}")
-        self.add_result_row("转子惯量 / Rotor Inertia [kg·m²]", f"{results['inertia']:.10f}")
-        
-        # 切换到结果标签页
-        self.sub_tabs.setCurrentWidget(self.results_tab)
-    
-    def add_result_row(self, name, value):
-        """向结果表格添加一行"""
-        row = self.results_table.rowCount()
-        self.results_table.insertRow(row)
-        self.results_table.setItem(row, 0, QTableWidgetItem(name))
-        self.results_table.setItem(row, 1, QTableWidgetItem(value))
-    
-    def save_results(self):
-        """保存结果到文件"""
-        if not self.results:
-            self.log("没有可保存的结果")
-            return
-        
-        try:
-            # 确保目录存在
-            if not os.path.exists('friction_results'):
-                os.makedirs('friction_results')
-            
-            # 使用文件对话框选择保存类型
-            options = QFileDialog.Options()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            
-            # 提供多种保存格式选择
-            filename, file_type = QFileDialog.getSaveFileName(
-                self, "保存识别结果", 
-                os.path.join('friction_results', f"friction_params_{timestamp}"),
-                "文本文件 (*.txt);;JSON文件 (*.json);;所有文件 (*)", 
-                options=options)
-            
-            if not filename:
-                return
-            
-            # 更新时间戳
-            self.results['timestamp'] = datetime.now().isoformat()
-            
-            if filename.endswith('.txt') or file_type.startswith("文本文件"):
-                # 保存为可读的txt格式
-                self.save_results_as_txt(filename)
-            else:
-                # 保存为JSON格式
-                self.save_results_as_json(filename)
-            
-            self.log(f"结果已保存到: {filename}")
-            
-        except Exception as e:
-            self.log(f"保存结果失败: {str(e)}")
-    
-    def save_results_as_txt(self, filename):
-        """保存结果为txt格式（中英文对照）"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write("=" * 80 + "\n")
-            f.write("电机摩擦力参数识别结果 / Motor Friction Parameter Identification Results\n")
-            f.write("=" * 80 + "\n\n")
-            
-            # 测试信息
-            f.write("测试信息 / Test Information:\n")
-            f.write("-" * 50 + "\n")
-            f.write(f"测试时间 / Test Time: {self.results.get('timestamp', 'Unknown')}\n")
-            if 'motor_info' in self.results:
-                motor_info = self.results['motor_info']
-                f.write(f"电机版本 / Motor Version: {motor_info.get('sub_ver', 'Unknown')}\n")
-                f.write(f"最大扭矩 / Max Torque: {motor_info.get('max_torque', 'Unknown')} N·m\n")
-                f.write(f"减速比 / Gear Ratio: {motor_info.get('gear_ratio', 'Unknown')}\n")
-            f.write("\n")
-            
-            # 摩擦参数结果
-            f.write("摩擦参数结果 / Friction Parameter Results:\n")
-            f.write("-" * 50 + "\n")
-            
-            # 库仑摩擦
-            if 'coulomb_friction' in self.results:
-                f.write(f"平均库仑摩擦力矩 / Average Coulomb Friction Torque: {self.results['coulomb_friction']:.6f} N·m\n")
-                if 'coulomb_friction_pos' in self.results:
-                    f.write(f"  正向库仑摩擦 / Positive Direction: {self.results['coulomb_friction_pos']:.6f} N·m\n")
-                if 'coulomb_friction_neg' in self.results:
-                    f.write(f"  负向库仑摩擦 / Negative Direction: {self.results['coulomb_friction_neg']:.6f} N·m\n")
-                f.write("\n")
-            
-            # 静摩擦
-            if 'static_friction' in self.results and self.results['static_friction'] is not None:
-                f.write(f"平均静摩擦力矩 / Average Static Friction Torque: {self.results['static_friction']:.6f} N·m\n")
-                if 'static_friction_pos' in self.results and self.results['static_friction_pos'] is not None:
-                    f.write(f"  正向静摩擦 / Positive Direction: {self.results['static_friction_pos']:.6f} N·m\n")
-                if 'static_friction_neg' in self.results and self.results['static_friction_neg'] is not None:
-                    f.write(f"  负向静摩擦 / Negative Direction: {self.results['static_friction_neg']:.6f} N·m\n")
-                f.write("\n")
-            
-            # 已知参数
-            f.write("已知参数 / Known Parameters:\n")
-            f.write("-" * 50 + "\n")
-            f.write(f"粘滞摩擦系数 / Viscous Friction Coefficient: {self.results['viscous_friction']:.10f} N·m·s/rad\n")
-            f.write(f"转子惯量 / Rotor Inertia: {self.results['inertia']:.10f} kg·m²\n")
-            f.write("\n")
-            
-            # 测试数据统计（如果有的话）
-            if 'coulomb_raw_data' in self.results:
-                speeds = self.results['coulomb_raw_data']['speeds']
-                torques = self.results['coulomb_raw_data']['torques']
-                f.write("库仑摩擦测试数据统计 / Coulomb Friction Test Data Statistics:\n")
-                f.write("-" * 50 + "\n")
-                f.write(f"测试点数 / Number of Test Points: {len(speeds)}\n")
-                f.write(f"速度范围 / Velocity Range: {min(speeds):.3f} ~ {max(speeds):.3f} rad/s\n")
-                f.write(f"力矩范围 / Torque Range: {min(torques):.6f} ~ {max(torques):.6f} N·m\n")
-                f.write("\n")
-            
-            # 文件说明
-            f.write("文件说明 / File Description:\n")
-            f.write("-" * 50 + "\n")
-            f.write("本文件包含了电机摩擦力参数自动识别的完整结果。\n")
-            f.write("This file contains the complete results of automatic motor friction parameter identification.\n\n")
-            f.write("库仑摩擦 (Coulomb Friction): 运动过程中的干摩擦力矩，与运动方向相反\n")
-            f.write("静摩擦 (Static Friction): 物体从静止开始运动时需要克服的最大摩擦力矩\n")
-            f.write("粘滞摩擦 (Viscous Friction): 与速度成正比的摩擦阻力\n")
-            f.write("\n")
-            f.write("=" * 80 + "\n")
-    
-    def save_results_as_json(self, filename):
-        """保存结果为JSON格式"""
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=4, ensure_ascii=False)
-        
-        # 同时保存一个最新结果的副本
-        latest_path = os.path.join('friction_results', 'latest_friction_params.json')
-        with open(latest_path, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=4, ensure_ascii=False)
-    
-    def load_results(self):
-        """从文件加载结果"""
-        try:
-            # 使用文件对话框
-            options = QFileDialog.Options()
-            filepath, _ = QFileDialog.getOpenFileName(
-                self, "加载识别结果", 
-                'friction_results',
-                "JSON文件 (*.json);;所有文件 (*)", options=options)
-            
-            if not filepath:
-                return
-            
-            with open(filepath, 'r', encoding='utf-8') as f:
-                loaded_results = json.load(f)
-            
-            # 更新结果
-            self.results = loaded_results
-            self.update_results(loaded_results)
-            
-            # 显示日志
-            self.log(f"成功加载结果: {filepath}")
-            
-            # 根据内容重建可能的图表
-            if 'coulomb_raw_data' in loaded_results:
-                try:
-                    speeds = np.array(loaded_results['coulomb_raw_data']['speeds'])
-                    torques = np.array(loaded_results['coulomb_raw_data']['torques'])
-                    T_coulomb_pos = loaded_results.get('coulomb_friction_pos', 0)
-                    T_coulomb_neg = loaded_results.get('coulomb_friction_neg', 0)
-                    viscous_coeff = loaded_results.get('viscous_friction', 0)
-                    
-                    # 创建图表并显示
-                    fig = plt.figure(figsize=(12, 8))
-                    plt.scatter(speeds, torques, color='blue', s=50, alpha=0.7, label='实测数据点', zorder=5)
-                    
-                    # 理论模型线
-                    x_model = np.linspace(min(speeds) - 0.5, max(speeds) + 0.5, 200)
-                    y_model_pos = np.where(x_model > 0, viscous_coeff * x_model + T_coulomb_pos, 0)
-                    y_model_neg = np.where(x_model < 0, viscous_coeff * x_model - T_coulomb_neg, 0)
-                    y_model = y_model_pos + y_model_neg
-                    plt.plot(x_model, y_model, 'r-', linewidth=2.5, label='摩擦模型', zorder=4)
-                    
-                    # 标记库仑摩擦力矩
-                    plt.axhline(y=T_coulomb_pos, color='g', linestyle='--', linewidth=2, alpha=0.8,
-                              label=f'正向库仑摩擦: {T_coulomb_pos:.5f} N·m', zorder=3)
-                    plt.axhline(y=-T_coulomb_neg, color='m', linestyle='--', linewidth=2, alpha=0.8,
-                              label=f'负向库仑摩擦: {T_coulomb_neg:.5f} N·m', zorder=3)
-                    
-                    plt.axhline(y=0, color='k', linestyle='-', alpha=0.3, zorder=1)
-                    plt.axvline(x=0, color='k', linestyle='-', alpha=0.3, zorder=1)
-                    
-                    plt.xlabel('角速度 [rad/s]', fontsize=14)
-                    plt.ylabel('力矩 [N·m]', fontsize=14)
-                    plt.title('电机库仑摩擦力矩识别结果 (已加载)', fontsize=16, fontweight='bold')
-                    plt.legend(fontsize=12, loc='best')
-                    plt.grid(True, alpha=0.3)
-                    
-                    plt.tight_layout()
-                    
-                    # 创建一个 matplotlib 画布
-                    canvas = FigureCanvas(fig)
-                    toolbar = NavigationToolbar(canvas, self)
-                    
-                    # 清除之前的子控件
-                    while self.coulomb_layout.count():
-                        item = self.coulomb_layout.takeAt(0)
-                        widget = item.widget()
-                        if widget:
-                            widget.deleteLater()
-                    
-                    self.coulomb_layout.addWidget(toolbar)
-                    self.coulomb_layout.addWidget(canvas)
-                except Exception as e:
-                    self.log(f"重建库仑摩擦图表失败: {str(e)}")
-            
-        except Exception as e:
-            self.log(f"加载结果失败: {str(e)}")
-    
-    def log(self, message):
-        """向日志窗口添加消息"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        self.log_text.append(f"[{timestamp}] {message}")
-        # 自动滚动到底部
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(cursor.End)
-        self.log_text.setTextCursor(cursor)
-    
-    def closeEvent(self, event):
-        """窗口关闭事件"""
-        # 停止状态监控线程
-        if self.status_thread and self.status_thread.isRunning():
-            self.status_thread.stop()
-            
-        # 检查是否有线程在运行
-        if self.identifier_thread is not None and self.identifier_thread.isRunning():
-            reply = QMessageBox.question(self, '确认退出', 
-                "识别过程正在进行中，确定要退出吗？",
-                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
-            
-            if reply == QMessageBox.Yes:
-                self.stop_identification()
-                event.accept()
-            else:
-                event.ignore()
-        else:
-            event.accept()
-
-
-if __name__ == "__main__":
-    app = QApplication(sys.argv)
-    
-    # 设置应用程序样式
-    app.setStyle('Fusion')
-    
-    # 设置应用程序样式表
-    app.setStyleSheet("""
-        QMainWindow {
-            background-color: #f5f5f5;
-        }
-        QGroupBox {
-            font-weight: bold;
-            border: 2px solid #cccccc;
-            border-radius: 5px;
-            margin-top: 1ex;
-            padding-top: 10px;
-        }
-        QGroupBox::title {
-            subcontrol-origin: margin;
-            left: 10px;
-            padding: 0 5px;
-        }
-        QTabWidget::pane {
-            border: 1px solid #cccccc;
-            background-color: white;
-        }
-        QTabBar::tab {
-            background-color: #e1e1e1;
-            border: 1px solid #cccccc;
-            padding: 8px 12px;
-            margin-right: 2px;
-        }
-        QTabBar::tab:selected {
-            background-color: white;
-            border-bottom-color: white;
-        }
-        QPushButton {
-            background-color: #2980b9;
-            color: white;
-            border: none;
-            padding: 8px 16px;
-            border-radius: 4px;
-            font-weight: bold;
-        }
-        QPushButton:hover {
-            background-color: #3498db;
-        }
-        QPushButton:pressed {
-            background-color: #21618c;
-        }
-        QPushButton:disabled {
-            background-color: #bdc3c7;
-            color: #7f8c8d;
-        }
-    """)
-    
-    # 创建并显示主窗口
-    window = FrictionIdentifierApp()
-    window.show()
-    
-    sys.exit(app.exec_())
-
+
+# Project: ArmGravComp-Qt (6-DOF Robotic Arm Gravity Compensation & Visualization)
+# File: damiao_motor_friction_detection.py
+# Copyright (c) 2025, Chen XingYu. All rights reserved.
+#
+# License: Non-Commercial Use Only / 仅限非商业使用
+# -----------------------------------------------------------------------------
+# 本代码及其衍生作品仅允许用于个人学习、学术研究与教学等非商业场景。
+# 严禁任何形式的商业使用，包括但不限于：出售、付费服务、SaaS/在线服务、
+# 广告变现、集成到商业产品或用于商业咨询/竞赛/投标等。如需商业授权，请
+# 先行获得版权所有者书面许可并签署授权协议。
+#
+# 允许的非商业使用条件：
+# 1) 保留本版权与许可声明；
+# 2) 在衍生作品/发表物中署名（Lu Yaoheng）并标明来源仓库；
+# 3) 不得移除或修改本段声明。
+#
+# 免责声明：本代码按“现状”提供，不含任何明示或默示担保。
+# 作者不对因使用本代码产生的任何直接或间接损失承担责任。
+# 使用者需自行评估并承担风险。
+#
+# English Summary:
+# This code (damiao motor friction detection) is provided for personal,
+# academic, and research purposes only. Any commercial use (sale, paid service,
+# SaaS, ad-monetization, integration into commercial products, consultancy,
+# competitions, bids, etc.) is strictly prohibited without prior written
+# permission from the copyright holder.
+#
+# Keep this notice intact and provide proper attribution in derived works.
+# Provided "as is" without warranty of any kind. Use at your own risk.
+#
+# Contact / 商务与授权联系: <cdssywc@163.com>
+# 首次使用：
+
+# 设置好串口参数和电机ID,自动获取摩擦系数
+# 固定好电机，让电机空载
+# 点击"检查电机状态"按钮
+# 查看日志中的电机信息，确认连接正常
+
+
+# 实时监控：
+
+# 检查成功后会自动启动实时状态显示
+# 按钮会变成红色的"停止状态监控"
+# 再次点击可停止监控
+
+
+# 开始测试：
+
+# 确认电机状态正常后
+# 选择要进行的摩擦力识别测试
+# 测试开始时会自动停止状态监控
+# 可以多测几次
+
+# 安全特性：
+# 温度超过阈值时会用颜色警告
+# 显示电机错误状态（过压、欠压、过流等）
+# # # 健康状态一目了然（正常显示绿色，异常显示红色）
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+import time
+_T_IMPORT = time.perf_counter()  # 启动耗时基准的起点
+import sys
+import os
+import collections
+import json
+import logging
+import logging.handlers
+import queue
+import sqlite3
+import struct
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
+import numpy as np
+import serial
+from datetime import datetime
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
+                            QLabel, QLineEdit, QPushButton, QComboBox, QGroupBox, 
+                            QTabWidget, QFileDialog, QProgressBar, QMessageBox,
+                            QTableWidget, QTableWidgetItem, QHeaderView, QSpinBox,
+                            QDoubleSpinBox, QFormLayout, QGridLayout, QSplitter, QFrame,
+                            QScrollArea, QPlainTextEdit, QInputDialog)
+
+from PyQt5.QtCore import Qt, QThread, pyqtSignal, QTimer, QPointF
+from PyQt5.QtGui import QColor, QPainter, QPen, QPolygonF
+
+# 导入电机控制库 - 注意: 确保DM_CAN库在同一目录下
+try:
+    from DM_CAN import (Motor, MotorControl, BusScheduler, SafetySupervisor, DM_Motor_Type, DM_variable,
+                        Control_Type, SerialCapture)
+except ImportError:
+    print("警告: 无法导入DM_CAN库，请确保该库文件在正确路径下")
+
+# matplotlib 导入耗时较长，启动时不加载，首次绘图时由 load_matplotlib() 导入
+Figure = FigureCanvasAgg = FigureCanvas = NavigationToolbar = None
+_matplotlib_lock = threading.Lock()
+
+
+def load_matplotlib():
+    """按需导入 matplotlib 的 Figure 和画布类并设置中文字体，重复调用无开销"""
+    global Figure, FigureCanvasAgg, FigureCanvas, NavigationToolbar
+    if Figure is not None:
+        return
+    with _matplotlib_lock:
+        if Figure is not None:
+            return
+        import matplotlib
+        # 设置支持中文的字体（常见 Windows 字体）
+        matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']  # 优先黑体/微软雅黑
+        matplotlib.rcParams['axes.unicode_minus'] = False  # 解决负号显示为方块
+        from matplotlib.backends.backend_agg import FigureCanvasAgg as canvas_agg
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg, NavigationToolbar2QT
+        from matplotlib.figure import Figure as figure_class
+        FigureCanvasAgg = canvas_agg
+        FigureCanvas = FigureCanvasQTAgg
+        NavigationToolbar = NavigationToolbar2QT
+        Figure = figure_class  # 最后赋值，其他线程看到 Figure 时其余类已就绪
+
+
+# 脱离运动检测器
+class BreakawayDetector:
+    """静摩擦脱离检测：先在静止时估计编码器/速度噪声底，
+    再用位置位移 + 一阶滤波速度的单边CUSUM判断是否开始运动。
+    单个速度尖峰不会触发，持续的小速度会被累积，因此可以更快地增加力矩。
+    """
+    
+    def __init__(self, pos_k=5.0, vel_alpha=0.3, cusum_k=3.0, cusum_h=8.0):
+        self.pos_k = pos_k          # 位移阈值 = pos_k * 位置噪声
+        self.vel_alpha = vel_alpha  # 速度一阶低通系数
+        self.cusum_k = cusum_k      # CUSUM 允许偏移 = cusum_k * 速度噪声
+        self.cusum_h = cusum_h      # CUSUM 判决门限 = cusum_h * 速度噪声
+        self.pos_sigma = 0.0
+        self.vel_mean = 0.0
+        self.vel_sigma = 0.05 / cusum_k  # 未估计噪声前等效于旧的0.05rad/s阈值
+        self.arm(0.0, 1)
+    
+    def estimate_noise(self, positions, velocities, pos_resolution=0.0, vel_resolution=0.0):
+        """根据静止时的采样估计噪声底，标准差不低于量化分辨率"""
+        positions = np.asarray(positions, dtype=float)
+        velocities = np.asarray(velocities, dtype=float)
+        if len(positions) < 2:
+            return
+        # 速度反馈的12位量化使零速附近存在固定偏置，这里一并估计
+        self.vel_mean = float(np.mean(velocities))
+        self.pos_sigma = max(float(np.std(positions)), pos_resolution)
+        self.vel_sigma = max(float(np.std(velocities)), vel_resolution)
+    
+    def arm(self, ref_pos, direction):
+        """以当前位置为参考开始一次新的检测"""
+        self.ref_pos = ref_pos
+        self.direction = 1 if direction >= 0 else -1
+        self.vel_filtered = 0.0
+        self.cusum = 0.0
+        self.n_samples = 0
+        self.change_index = 0  # CUSUM 最后一次从0开始累积的样本序号，即变化点估计
+        self.reason = None
+    
+    def position_threshold(self):
+        return self.pos_k * self.pos_sigma
+    
+    def velocity_threshold(self):
+        """滤波速度超过该值后CUSUM才开始累积(相对静止偏置)"""
+        return self.cusum_k * self.vel_sigma
+    
+    def update(self, pos, vel):
+        """输入一个采样，返回是否检测到运动"""
+        index = self.n_samples
+        self.n_samples += 1
+        
+        # 只统计施加力矩方向上的运动
+        displacement = self.direction * (pos - self.ref_pos)
+        vel = self.direction * (vel - self.vel_mean)
+        self.vel_filtered += self.vel_alpha * (vel - self.vel_filtered)
+        
+        if self.cusum <= 0.0:
+            self.change_index = index
+        self.cusum = max(0.0, self.cusum + self.vel_filtered - self.velocity_threshold())
+        
+        if self.cusum > self.cusum_h * self.vel_sigma:
+            self.reason = 'velocity'
+            return True
+        if self.pos_sigma > 0 and displacement > self.position_threshold():
+            self.reason = 'position'
+            if self.cusum <= 0.0:
+                self.change_index = index
+            return True
+        return False
+    
+    def replay(self, positions, velocities, ref_pos, direction, vel_mean, vel_sigma, pos_sigma):
+        """用多组噪声底参数同时重放一段记录，与 update 逐点判决一致
+        vel_mean/vel_sigma/pos_sigma 为 shape=(B,) 的数组，每组独立检测
+        :return: shape=(B,) 的变化点序号，记录内未触发的为 -1
+        """
+        vel_mean = np.asarray(vel_mean, dtype=float)
+        vel_sigma = np.asarray(vel_sigma, dtype=float)
+        pos_sigma = np.asarray(pos_sigma, dtype=float)
+        positions = np.asarray(positions, dtype=float)
+        velocities = np.asarray(velocities, dtype=float)
+        direction = 1 if direction >= 0 else -1
+        vel_threshold = self.cusum_k * vel_sigma
+        cusum_limit = self.cusum_h * vel_sigma
+        pos_threshold = np.where(pos_sigma > 0, self.pos_k * pos_sigma, np.inf)
+        
+        # 滤波速度对 vel_mean 线性：先滤波一次原始速度，各组再减去偏置经同一滤波后的值
+        filtered = self._filter_velocity(direction * velocities)
+        decay = 1.0 - (1.0 - self.vel_alpha) ** np.arange(len(filtered) + 1)
+        start = self._replay_start(positions, filtered, decay, ref_pos, direction, vel_mean, vel_sigma, pos_threshold)
+        vel_filtered = filtered[start - 1] - decay[start] * direction * vel_mean if start else np.zeros(len(vel_sigma))
+        cusum = np.zeros(len(vel_sigma))
+        change_index = np.zeros(len(vel_sigma), dtype=int)
+        result = np.full(len(vel_sigma), -1)
+        pending = np.ones(len(vel_sigma), dtype=bool)
+        for index, (pos, vel) in enumerate(zip(positions[start:], velocities[start:]), start):
+            displacement = direction * (pos - ref_pos)
+            vel_filtered += self.vel_alpha * (direction * (vel - vel_mean) - vel_filtered)
+            change_index[cusum <= 0.0] = index
+            cusum = np.maximum(0.0, cusum + vel_filtered - vel_threshold)
+            by_velocity = cusum > cusum_limit
+            by_position = ~by_velocity & (displacement > pos_threshold)
+            change_index[by_position & (cusum <= 0.0)] = index
+            hit = pending & (by_velocity | by_position)
+            result[hit] = change_index[hit]
+            pending &= ~hit
+            if not pending.any():
+                break
+        return result
+    
+    def _filter_velocity(self, velocities):
+        """与 update 相同的一阶低通，初值为 0"""
+        filtered = np.empty(len(velocities))
+        value = 0.0
+        for i, vel in enumerate(velocities):
+            value += self.vel_alpha * (vel - value)
+            filtered[i] = value
+        return filtered
+    
+    def _replay_start(self, positions, filtered, decay, ref_pos, direction, vel_mean, vel_sigma, pos_threshold):
+        """重放可以跳过的前缀长度
+        取各组中最小的偏置、噪声和门限构造一个上界检测器，它的 CUSUM 逐点不小于任何一组，
+        因此在它首次越限（或任一组位移首次越限）之前、它的 CUSUM 最后一次为 0 的位置，
+        所有组的 CUSUM 也都为 0，可直接从这里开始逐点重放，结果与从头重放一致。
+        """
+        n = len(filtered)
+        if n == 0 or len(vel_sigma) == 0:
+            return 0
+        displacement = direction * (positions - ref_pos)
+        limit = int(np.searchsorted(np.maximum.accumulate(displacement), pos_threshold.min(), side='right'))
+        
+        increments = filtered - decay[1:] * (direction * vel_mean).min() - self.cusum_k * vel_sigma.min()
+        cusum_limit = self.cusum_h * vel_sigma.min()
+        start = 0
+        cusum = 0.0
+        for index in range(min(limit, n)):
+            cusum = max(0.0, cusum + increments[index])
+            if cusum > cusum_limit:
+                break
+            if cusum <= 0.0:
+                start = index + 1
+        return start
+
+
+def interp_periodic(xp, fp, x, period=2 * np.pi):
+    """周期线性插值(向量化)，表中 None/nan 的点会被跳过
+    :param xp: [0, period) 内升序的表格角度
+    :param fp: 对应的数值
+    :param x: 需要插值的角度，可为任意数组
+    """
+    xp = np.asarray(xp, dtype=float)
+    fp = np.array([np.nan if v is None else v for v in fp], dtype=float)
+    valid = ~np.isnan(fp)
+    if not np.any(valid):
+        return np.zeros(np.shape(x))
+    xp = xp[valid]
+    fp = fp[valid]
+    # 首尾各延拓一个周期，保证跨越 0/2π 时连续
+    xp_ext = np.concatenate([xp[-1:] - period, xp, xp[:1] + period])
+    fp_ext = np.concatenate([fp[-1:], fp, fp[:1]])
+    return np.interp(np.mod(x, period), xp_ext, fp_ext)
+
+
+def build_friction_lut(results, speed_max, n_speed, n_angle=0, zero_band=None):
+    """由识别结果生成等间隔的摩擦前馈补偿表(float32)
+    速度表: tau(v) = Tc(±) * s(v) + b * v，s(v) 在 ±zero_band 内线性过渡，避免过零跳变引起抖振；
+    角度×速度表: 在速度表上按方向叠加静摩擦角度映射相对均值的波动。
+    :param n_speed: 速度点数，建议取奇数使 v=0 落在网格上
+    :param n_angle: 一圈的角度点数，0 表示不生成角度表
+    :param zero_band: 过零过渡区宽度 [rad/s]，默认一个速度步长
+    :return: dict，包含网格参数和表格
+    """
+    if results.get('coulomb_friction') is None:
+        raise ValueError("结果中没有库仑摩擦参数，请先完成库仑摩擦识别")
+    if n_speed < 2 or speed_max <= 0:
+        raise ValueError("速度范围和点数无效")
+    
+    tc_pos = results.get('coulomb_friction_pos', results['coulomb_friction'])
+    tc_neg = results.get('coulomb_friction_neg', results['coulomb_friction'])
+    viscous = results.get('viscous_friction', 0.0)
+    
+    speeds = np.linspace(-speed_max, speed_max, n_speed)
+    speed_step = speeds[1] - speeds[0]
+    zero_band = speed_step if zero_band is None else zero_band
+    blend = np.clip(speeds / zero_band, -1.0, 1.0)
+    coulomb = np.where(blend >= 0, blend * tc_pos, blend * tc_neg)
+    speed_table = (coulomb + viscous * speeds).astype(np.float32)
+    
+    lut = {
+        'speed_min': float(speeds[0]),
+        'speed_step': float(speed_step),
+        'speed_table': speed_table,
+        'angle_step': None,
+        'angle_speed_table': None,
+    }
+    
+    static_map = results.get('static_friction_map')
+    if n_angle > 0 and static_map:
+        angle_step = 2 * np.pi / n_angle
+        angles = np.arange(n_angle) * angle_step
+        map_pos = np.array([np.nan if v is None else v for v in static_map['pos']], dtype=float)
+        map_neg = np.array([np.nan if v is None else v for v in static_map['neg']], dtype=float)
+        ripple_pos = interp_periodic(static_map['angles'], map_pos, angles)
+        ripple_neg = interp_periodic(static_map['angles'], map_neg, angles)
+        if np.any(~np.isnan(map_pos)):
+            ripple_pos -= np.nanmean(map_pos)
+        if np.any(~np.isnan(map_neg)):
+            ripple_neg -= np.nanmean(map_neg)
+        
+        # (n_angle, n_speed)：正速度侧叠加正向波动，负速度侧叠加负向波动
+        ripple = np.where(blend[None, :] >= 0,
+                          blend[None, :] * ripple_pos[:, None],
+                          blend[None, :] * ripple_neg[:, None])
+        lut['angle_step'] = float(angle_step)
+        lut['angle_speed_table'] = (speed_table[None, :] + ripple).astype(np.float32)
+    
+    return lut
+
+
+def complete_lut_results(results, archive, need_map=False):
+    """补偿表需要库仑摩擦和（可选的）静摩擦角度映射，两者由不同的测试类型得到。
+    当前结果缺少的部分从归档中同一电机（按序列号，没有序列号时按型号）最近的运行补齐。
+    :param archive: ResultsArchive，为 None 时不补齐
+    :return: (合并后的结果, [(补齐内容, 运行编号, 时间戳), ...])
+    """
+    merged = dict(results)
+    sources = []
+    if archive is None:
+        return merged, sources
+    sn = results.get('motor_info', {}).get('sn')
+    if sn is not None:
+        match = {'motor_sn': str(sn)}
+    elif results.get('params', {}).get('motor_type'):
+        match = {'motor_type': results['params']['motor_type']}
+    else:
+        return merged, sources
+    
+    if merged.get('coulomb_friction') is None:
+        for row in archive.query(**match):
+            if row['coulomb_friction'] is not None:
+                for key in ('coulomb_friction', 'coulomb_friction_pos', 'coulomb_friction_neg', 'viscous_friction'):
+                    if row[key] is not None:
+                        merged[key] = row[key]
+                sources.append(("库仑摩擦", row['id'], row['timestamp']))
+                break
+    if need_map and not merged.get('static_friction_map'):
+        for row in archive.query(test_type='static_map', **match):
+            static_map = archive.load(row['id'], mmap=False).get('static_friction_map')
+            if static_map:
+                merged['static_friction_map'] = static_map
+                sources.append(("静摩擦角度映射", row['id'], row['timestamp']))
+                break
+    return merged, sources
+
+
+def export_friction_lut(lut, base_path, name='friction_lut', max_bytes=32 * 1024):
+    """导出补偿表为 C 头文件、小端 float32 二进制和 NumPy .npy
+    :param base_path: 输出路径前缀(不含扩展名)
+    :param max_bytes: 表格总大小上限，超过时报错以保证能放进 MCU Flash
+    :return: 写出的文件路径列表
+    """
+    tables = [('speed', lut['speed_table'])]
+    if lut['angle_speed_table'] is not None:
+        tables.append(('angle_speed', lut['angle_speed_table']))
+    
+    total_bytes = sum(table.size * 4 for _, table in tables)
+    if total_bytes > max_bytes:
+        raise ValueError(f"补偿表共 {total_bytes} 字节，超过上限 {max_bytes} 字节，请降低分辨率")
+    
+    files = []
+    for suffix, table in tables:
+        table = np.ascontiguousarray(table, dtype='<f4')
+        bin_path = f"{base_path}_{suffix}.bin"
+        npy_path = f"{base_path}_{suffix}.npy"
+        table.tofile(bin_path)
+        np.save(npy_path, table)
+        files += [bin_path, npy_path]
+    
+    # C 头文件：网格等间隔，只存表值和网格参数
+    guard = f"{name.upper()}_H"
+    n_speed = lut['speed_table'].size
+    lines = [
+        "/* 摩擦前馈补偿表 / Friction feedforward lookup table",
+        f" * 生成时间: {datetime.now().isoformat()}",
+        f" * 速度索引: i = (v - {name.upper()}_SPEED_MIN) / {name.upper()}_SPEED_STEP，相邻两点线性插值",
+    ]
+    if lut['angle_speed_table'] is not None:
+        lines.append(f" * 角度索引: j = fmod(theta, 2*pi) / {name.upper()}_ANGLE_STEP，表格按 [角度][速度] 行优先存储")
+    lines += [
+        " * .bin 文件为同样顺序的小端 float32 原始数据",
+        " */",
+        f"#ifndef {guard}",
+        f"#define {guard}",
+        "",
+        f"#define {name.upper()}_SPEED_N    {n_speed}",
+        f"#define {name.upper()}_SPEED_MIN  ({lut['speed_min']:.8e}f)",
+        f"#define {name.upper()}_SPEED_STEP ({lut['speed_step']:.8e}f)",
+    ]
+    if lut['angle_speed_table'] is not None:
+        lines += [
+            f"#define {name.upper()}_ANGLE_N    {lut['angle_speed_table'].shape[0]}",
+            f"#define {name.upper()}_ANGLE_STEP ({lut['angle_step']:.8e}f)",
+        ]
+    
+    def _c_rows(values, indent):
+        return [indent + ", ".join(f"{v:.8e}f" for v in values[k:k + 8]) + ","
+                for k in range(0, len(values), 8)]
+    
+    lines += ["", f"static const float {name}_speed[{name.upper()}_SPEED_N] = {{"]
+    lines += _c_rows(lut['speed_table'], "    ")
+    lines.append("};")
+    if lut['angle_speed_table'] is not None:
+        lines += ["", f"static const float {name}_angle_speed[{name.upper()}_ANGLE_N][{name.upper()}_SPEED_N] = {{"]
+        for row in lut['angle_speed_table']:
+            lines.append("    {")
+            lines += _c_rows(row, "        ")
+            lines.append("    },")
+        lines.append("};")
+    lines += ["", f"#endif /* {guard} */", ""]
+    
+    header_path = f"{base_path}.h"
+    with open(header_path, 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines))
+    files.insert(0, header_path)
+    return files
+
+
+def _json_default(value):
+    """json.dump 无法直接处理的 numpy 类型"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"无法序列化类型: {type(value).__name__}")
+
+
+def save_results_container(results, json_path):
+    """保存识别结果：JSON 只存元数据和标量结果，原始数据数组按列存为 .npy
+    .npy 文件放在 <文件名>_raw/ 目录下，一个通道一个文件，加载时可直接内存映射。
+    时间通道保留 float64，其余通道用 float32 减小体积。
+    结果可能来自 load_results_container 对同一目录的内存映射，因此先把数据复制到内存，
+    每个文件写到临时文件后再替换；索引不再引用的旧 .npy 一并删除。
+    :return: 原始数据目录，没有原始数据时为 None
+    """
+    stem = os.path.splitext(json_path)[0]
+    raw_dir = stem + '_raw'
+    channels = {}
+    
+    def _extract(value, name):
+        if isinstance(value, dict):
+            return {k: _extract(v, f"{name}.{k}" if name else k) for k, v in value.items()}
+        if isinstance(value, np.ndarray) and value.ndim >= 1:
+            channels[name] = value
+            return {'$channel': name}
+        return value
+    
+    meta = _extract(results, '')
+    # 写任何文件之前先全部复制出来，断开与旧文件的内存映射
+    for name, array in channels.items():
+        if array.dtype.kind == 'f' and not name.endswith('time'):
+            channels[name] = np.array(array, dtype=np.float32)
+        else:
+            channels[name] = np.array(array)
+    
+    index = {}
+    if channels:
+        if not os.path.exists(raw_dir):
+            os.makedirs(raw_dir)
+        for name, array in channels.items():
+            filename = name + '.npy'
+            tmp_path = os.path.join(raw_dir, filename + '.tmp')
+            with open(tmp_path, 'wb') as f:
+                np.save(f, array)
+            try:
+                os.replace(tmp_path, os.path.join(raw_dir, filename))
+            except PermissionError:
+                # Windows 上旧文件仍被映射时不能替换，改用新文件名，旧文件留给下次保存清理
+                filename = f"{name}.{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.npy"
+                os.replace(tmp_path, os.path.join(raw_dir, filename))
+            index[name] = {'file': filename, 'dtype': str(array.dtype), 'shape': list(array.shape)}
+        meta['raw_dir'] = os.path.basename(raw_dir)
+        meta['raw_channels'] = index
+    
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=4, ensure_ascii=False, default=_json_default)
+    
+    # 删除索引不再引用的旧通道文件
+    if os.path.isdir(raw_dir):
+        referenced = {entry['file'] for entry in index.values()}
+        for filename in os.listdir(raw_dir):
+            if filename.endswith('.npy') and filename not in referenced:
+                try:
+                    os.remove(os.path.join(raw_dir, filename))
+                except OSError:
+                    pass
+    return raw_dir if channels else None
+
+
+def load_results_container(json_path, mmap=True):
+    """加载 save_results_container 保存的结果，原始数据默认以只读内存映射方式打开
+    兼容旧版把原始数据写成 JSON 列表的结果文件。
+    """
+    with open(json_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    
+    index = meta.pop('raw_channels', {})
+    raw_dir = os.path.join(os.path.dirname(json_path), meta.pop('raw_dir', ''))
+    
+    def _restore(value):
+        if isinstance(value, dict):
+            if '$channel' in value:
+                entry = index[value['$channel']]
+                return np.load(os.path.join(raw_dir, entry['file']), mmap_mode='r' if mmap else None)
+            return {k: _restore(v) for k, v in value.items()}
+        return value
+    
+    results = _restore(meta)
+    
+    # 旧格式：库仑原始数据为 JSON 列表
+    if 'coulomb_raw_data' in results:
+        for key in ('speeds', 'torques'):
+            results['coulomb_raw_data'][key] = np.asarray(results['coulomb_raw_data'][key])
+    return results
+
+
+def analyze_coulomb(speeds, torques, viscous_coeff):
+    """由各速度平台的平均速度/力矩估计正负方向库仑摩擦
+    :return: (正方向, 负方向)，某方向数据不足时为 None；负方向以正值表示
+    """
+    speeds = np.asarray(speeds, dtype=float)
+    torques = np.asarray(torques, dtype=float)
+    
+    # 去除粘滞摩擦影响后的力矩
+    coulomb_torques = torques - viscous_coeff * speeds
+    pos = speeds > 0
+    neg = speeds < 0
+    T_coulomb_pos = float(np.mean(coulomb_torques[pos])) if np.count_nonzero(pos) > 1 else None
+    T_coulomb_neg = float(-np.mean(coulomb_torques[neg])) if np.count_nonzero(neg) > 1 else None
+    return T_coulomb_pos, T_coulomb_neg
+
+
+def robust_location(values, method='huber', outlier_k=3.5, trim=0.1, huber_c=1.345):
+    """速度平台内力矩的稳健位置估计
+    先剔除 |x - 中位数| > outlier_k·1.4826·MAD 的尖峰（齿槽、通信错帧），再按 method 估计：
+    'mean' 均值，'median' 中位数，'trimmed' 两端各截去 trim 比例的截尾均值，'huber' Huber M 估计。
+    :param outlier_k: 离群判据，0 表示不剔除
+    :return: (估计值, 离群掩码)
+    """
+    values = np.asarray(values, dtype=float)
+    median = np.median(values)
+    scale = 1.4826 * np.median(np.abs(values - median))
+    if outlier_k and scale > 0:
+        outliers = np.abs(values - median) > outlier_k * scale
+    else:
+        outliers = np.zeros(len(values), dtype=bool)
+    kept = values[~outliers]
+    
+    if method == 'median':
+        return float(np.median(kept)), outliers
+    if method == 'trimmed':
+        cut = int(trim * len(kept))
+        return float(np.mean(np.sort(kept)[cut:len(kept) - cut])), outliers
+    if method == 'huber' and scale > 0:
+        # 迭代重加权：残差超过 huber_c 个尺度的采样按距离降权
+        estimate = float(np.median(kept))
+        for _ in range(50):
+            weights = huber_c / np.maximum(np.abs(kept - estimate) / scale, huber_c)
+            updated = float(np.sum(weights * kept) / np.sum(weights))
+            if abs(updated - estimate) < 1e-6 * scale:
+                return updated, outliers
+            estimate = updated
+        return estimate, outliers
+    return float(np.mean(kept)), outliers
+
+
+def welch_amplitude(x, fs, nperseg=256):
+    """Welch 平均幅值谱：Hann 窗、50% 重叠，各段一次性 rfft；正弦分量的谱峰等于其幅值
+    :return: (频率分辨率 df, 幅值谱)
+    """
+    x = np.asarray(x, dtype=float)
+    nperseg = min(nperseg, len(x))
+    step = max(nperseg // 2, 1)
+    n_segments = 1 + (len(x) - nperseg) // step
+    segments = x[np.arange(nperseg) + step * np.arange(n_segments)[:, None]]
+    segments = segments - segments.mean(axis=1, keepdims=True)
+    window = np.hanning(nperseg)
+    spectrum = np.fft.rfft(segments * window, axis=1)
+    amplitude = np.sqrt(np.mean(np.abs(spectrum) ** 2, axis=0)) * 2.0 / window.sum()
+    return fs / nperseg, amplitude
+
+
+def torque_ripple_spectrum(t, torque, speed, nperseg=256, n_peaks=5):
+    """恒速平台力矩纹波的频谱分析
+    采样时刻有抖动时先线性插值到均匀网格（周期取采样间隔中位数），再求 Welch 幅值谱；
+    谱峰频率除以机械转频得到阶次，齿槽、齿轮啮合纹波对应转频的整数倍。
+    :return: dict(fs, df, f_rot, rms, jitter, amplitude, peaks=[[频率, 阶次, 幅值], ...])，采样不足时为 None
+    """
+    t = np.asarray(t, dtype=float)
+    torque = np.asarray(torque, dtype=float)
+    if len(t) < 16:
+        return None
+    intervals = np.diff(t)
+    dt = float(np.median(intervals))
+    grid = t[0] + dt * np.arange(int((t[-1] - t[0]) / dt) + 1)
+    uniform = np.interp(grid, t, torque)
+    df, amplitude = welch_amplitude(uniform, 1.0 / dt, nperseg)
+    f_rot = abs(speed) / (2 * np.pi)
+    
+    # 局部极大值，跳过直流附近的频点
+    interior = amplitude[1:-1]
+    is_peak = (interior > amplitude[:-2]) & (interior >= amplitude[2:])
+    is_peak[0] = False
+    peak_bins = np.flatnonzero(is_peak) + 1
+    peak_bins = peak_bins[np.argsort(amplitude[peak_bins])[::-1][:n_peaks]]
+    # 抛物线插值细化峰值频率，分辨率不足一个频点时阶次仍较准确
+    left, center, right = amplitude[peak_bins - 1], amplitude[peak_bins], amplitude[peak_bins + 1]
+    curvature = left - 2 * center + right
+    offset = np.where(curvature < 0, 0.5 * (left - right) / np.where(curvature < 0, curvature, -1.0), 0.0)
+    peak_freqs = (peak_bins + offset) * df
+    peaks = [[float(f), float(f / f_rot) if f_rot > 0 else None, float(a)]
+             for f, a in zip(peak_freqs, amplitude[peak_bins])]
+    return {
+        'fs': 1.0 / dt,
+        'df': df,
+        'f_rot': f_rot,
+        'rms': float(np.std(uniform)),
+        'jitter': float(np.std(intervals)),
+        'amplitude': amplitude.astype(np.float32),
+        'peaks': peaks,
+    }
+
+
+def savgol_coefficients(window, order, deriv=0, dt=1.0):
+    """Savitzky-Golay 卷积系数：窗口内多项式最小二乘拟合在中心点处的 deriv 阶导数"""
+    offsets = np.arange(window, dtype=float) - window // 2
+    basis = np.vander(offsets, order + 1, increasing=True)
+    return np.linalg.pinv(basis)[deriv] * np.prod(np.arange(1, deriv + 1)) / dt ** deriv
+
+
+def fit_inertia(t, speed, torque, viscous_coeff, window=0.05, order=2, min_speed=0.05):
+    """由加减速段辨识转子惯量
+    速度和力矩插值到均匀网格，Savitzky-Golay 滤波同时得到平滑速度和加速度；
+    扣除粘滞摩擦后对 τ - b·ω = J·α + Tc+·[ω>0] - Tc-·[ω<0] 做最小二乘，
+    零速附近（静摩擦区，模型不成立）的采样不参与拟合。
+    :param window: 滤波窗口长度 [s]
+    :return: dict，数据不足时为 None
+    """
+    t = np.asarray(t, dtype=float)
+    if len(t) < 16:
+        return None
+    dt = float(np.median(np.diff(t)))
+    grid = t[0] + dt * np.arange(int((t[-1] - t[0]) / dt) + 1)
+    speed = np.interp(grid, t, speed)
+    torque = np.interp(grid, t, torque)
+    
+    n_window = max(int(round(window / dt)), order + 2) | 1  # 奇数窗口
+    half = n_window // 2
+    if len(grid) < 2 * n_window:
+        return None
+    speed_f = np.convolve(speed, savgol_coefficients(n_window, order)[::-1], mode='valid')
+    accel = np.convolve(speed, savgol_coefficients(n_window, order, 1, dt)[::-1], mode='valid')
+    target = torque[half:len(torque) - half] - viscous_coeff * speed_f
+    
+    moving = np.abs(speed_f) > min_speed
+    if np.count_nonzero(moving) < 3:
+        return None
+    design = np.column_stack([accel, speed_f > 0, -1.0 * (speed_f < 0)])[moving]
+    coef, _, _, _ = np.linalg.lstsq(design, target[moving], rcond=None)
+    residual = target[moving] - design @ coef
+    total = np.sum((target[moving] - np.mean(target[moving])) ** 2)
+    return {
+        'inertia': float(coef[0]),
+        'coulomb_pos': float(coef[1]),
+        'coulomb_neg': float(coef[2]),
+        'r2': float(1 - np.sum(residual ** 2) / total) if total > 0 else None,
+        'residual_rms': float(np.sqrt(np.mean(residual ** 2))),
+        'accel_rms': float(np.sqrt(np.mean(accel[moving] ** 2))),
+        'n_samples': int(np.count_nonzero(moving)),
+        'window': n_window * dt,
+        # 惯性力矩（扣除全部摩擦）与加速度，供绘图
+        'accel': accel[moving],
+        'inertial_torque': target[moving] - design[:, 1:] @ coef[1:],
+    }
+
+
+def block_bootstrap_means(values, n_resamples, rng, block=None):
+    """移动块自助法重采样序列均值，块内保留相邻采样的相关性（齿槽、速度环纹波）
+    :param block: 块长，默认 n^(1/3)
+    :return: shape=(n_resamples,) 的重采样均值
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    block = block or max(1, int(round(n ** (1 / 3))))
+    n_blocks = -(-n // block)
+    # 所有起点的块和由累积和一次得到，重采样只需对块和求和
+    cumsum = np.concatenate(([0.0], np.cumsum(values)))
+    block_sums = cumsum[block:] - cumsum[:-block]
+    starts = rng.integers(0, len(block_sums), size=(n_resamples, n_blocks))
+    return block_sums[starts].sum(axis=1) / (n_blocks * block)
+
+
+def block_bootstrap_locations(values, n_resamples, rng, method='mean', block=None, trim=0.1, huber_c=1.345,
+                              chunk_size=2000000):
+    """移动块自助法重采样序列的位置估计，method 与 robust_location 相同
+    输入应为已剔除离群点的采样，重采样内不再剔除；'mean' 直接用块和，其余方法逐行排序后估计。
+    :param chunk_size: 每批 (重采样数 × 序列长) 的元素上限，限制中间矩阵的内存
+    :return: shape=(n_resamples,) 的重采样估计值
+    """
+    if method not in ('median', 'trimmed', 'huber'):
+        return block_bootstrap_means(values, n_resamples, rng, block)
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    block = block or max(1, int(round(n ** (1 / 3))))
+    n_blocks = -(-n // block)
+    length = n_blocks * block
+    starts = rng.integers(0, n - block + 1, size=(n_resamples, n_blocks))
+    blocks = np.lib.stride_tricks.sliding_window_view(values, block)
+    
+    estimates = np.empty(n_resamples)
+    rows = max(1, chunk_size // length)
+    for first in range(0, n_resamples, rows):
+        part = slice(first, first + rows)
+        resampled = blocks[starts[part]].reshape(-1, length)
+        resampled.sort(axis=1)
+        median = 0.5 * (resampled[:, (length - 1) // 2] + resampled[:, length // 2])
+        if method == 'median':
+            estimates[part] = median
+        elif method == 'trimmed':
+            cut = int(trim * length)
+            estimates[part] = resampled[:, cut:length - cut].mean(axis=1)
+        else:
+            estimates[part] = _huber_sorted(resampled, median, huber_c)
+    return estimates
+
+
+def _row_searchsorted(resampled, values, side='left'):
+    """逐行的 np.searchsorted：各行已升序排列，values 每行一个，向量化二分"""
+    n_rows, length = resampled.shape
+    rows = np.arange(n_rows)
+    low = np.zeros(n_rows, dtype=int)
+    high = np.full(n_rows, length)
+    for _ in range(length.bit_length()):
+        middle = (low + high) // 2
+        element = resampled[rows, np.minimum(middle, length - 1)]
+        searching = low < high
+        right = searching & ((element < values) if side == 'left' else (element <= values))
+        low = np.where(right, middle + 1, low)
+        high = np.where(searching & ~right, middle, high)
+    return low
+
+
+def _sorted_deviation(resampled, median, k):
+    """各行 |x - 中位数| 的第 k 小值（从 0 计），各行已升序排列
+    中位数左侧的偏差从中间向左递增、右侧向右递增，相当于两个有序序列取第 k 小，逐行二分左侧取用个数。
+    """
+    n_rows, length = resampled.shape
+    half = length // 2
+    rows = np.arange(n_rows)
+    low = np.full(n_rows, max(0, k + 1 - (length - half)))
+    high = np.full(n_rows, min(k + 1, half))
+    while np.any(low < high):
+        taken = (low + high) // 2
+        # 左侧第 taken 个偏差小于右侧第 k - taken 个时，左侧至少还要再取一个
+        more = (median - resampled[rows, np.minimum(half - 1 - taken, length - 1)]
+                < resampled[rows, np.minimum(half + k - taken, length - 1)] - median)
+        searching = low < high
+        low = np.where(searching & more, taken + 1, low)
+        high = np.where(searching & ~more, taken, high)
+    left = np.where(low > 0, median - resampled[rows, np.maximum(half - low, 0)], -np.inf)
+    right = np.where(k + 1 - low > 0, resampled[rows, np.minimum(half + k - low, length - 1)] - median, -np.inf)
+    return np.maximum(left, right)
+
+
+def _huber_sorted(resampled, median, huber_c=1.345, max_iter=50):
+    """逐行 Huber M 估计，各行已升序排列，尺度取各行 MAD
+    与 robust_location 的迭代重加权收敛到同一个解：Σ clip(x - μ, ±c·s) = 0。
+    该式对 μ 分段线性，用区间内累积和做牛顿迭代，内点集合不再变化时即为精确解。
+    """
+    length = resampled.shape[1]
+    rows = np.arange(len(resampled))
+    scale = 1.4826 * 0.5 * (_sorted_deviation(resampled, median, (length - 1) // 2)
+                            + _sorted_deviation(resampled, median, length // 2))
+    cumsum = np.zeros((len(resampled), length + 1))
+    np.cumsum(resampled, axis=1, out=cumsum[:, 1:])
+    # 尺度为 0 时与 robust_location 一致，退化为均值
+    estimate = np.where(scale > 0, median, cumsum[:, -1] / length)
+    limit = huber_c * scale
+    for _ in range(max_iter):
+        low = _row_searchsorted(resampled, estimate - limit, 'left')
+        high = _row_searchsorted(resampled, estimate + limit, 'right')
+        inner = high - low
+        psi = cumsum[rows, high] - cumsum[rows, low] - inner * estimate + limit * (length - high - low)
+        step = np.where(scale > 0, psi / np.maximum(inner, 1), 0.0)
+        estimate += step
+        if np.all(np.abs(step) <= 1e-9 * scale):
+            break
+    return estimate
+
+
+def bootstrap_coulomb(samples, viscous_coeff, n_resamples=10000, rng=None, estimator='mean'):
+    """库仑摩擦的自助法分布：各速度平台内独立做块重采样，再按 analyze_coulomb 的方式组合
+    :param samples: 结果中的 coulomb_samples（speed/torque/plateau 全速率采样）
+    :param estimator: 平台力矩的估计方式，应与识别时的 coulomb_estimator 相同
+    :return: {结果字段: shape=(n_resamples,) 的重采样值}
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    speed = np.asarray(samples['speed'], dtype=float)
+    corrected = np.asarray(samples['torque'], dtype=float) - viscous_coeff * speed
+    plateau = np.asarray(samples['plateau'])
+    if 'outlier' in samples:
+        # 与识别时一致，只对剔除尖峰后的采样重采样
+        kept = ~np.asarray(samples['outlier'], dtype=bool)
+        speed, corrected, plateau = speed[kept], corrected[kept], plateau[kept]
+    
+    pos, neg = [], []
+    for p in np.unique(plateau):
+        members = plateau == p
+        if np.count_nonzero(members) < 2:
+            continue
+        mean_speed = np.mean(speed[members])
+        if mean_speed != 0:
+            (pos if mean_speed > 0 else neg).append(
+                block_bootstrap_locations(corrected[members], n_resamples, rng, estimator))
+    
+    dists = {}
+    if len(pos) > 1:
+        dists['coulomb_friction_pos'] = np.mean(pos, axis=0)
+    if len(neg) > 1:
+        dists['coulomb_friction_neg'] = -np.mean(neg, axis=0)
+    if len(dists) == 2:
+        dists['coulomb_friction'] = (dists['coulomb_friction_pos'] + dists['coulomb_friction_neg']) / 2.0
+    return dists
+
+
+def bootstrap_breakaway(raw, detector, n_resamples=10000, rng=None, pos_resolution=0.0, vel_resolution=0.0):
+    """斜坡法脱离力矩的自助法分布：重采样静止噪声底得到多组检测阈值，向量化重放检测器
+    记录在原检测点截止，阈值更高、本应更晚触发的重采样按记录最后一点的力矩计（偏保守的下界）。
+    :param raw: 结果中 static_raw_data 的单个方向（需含 noise_position/noise_velocity）
+    :return: (shape=(n_resamples,) 的重采样脱离力矩, 截止计数)
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    noise_pos = np.asarray(raw['noise_position'], dtype=float)
+    noise_vel = np.asarray(raw['noise_velocity'], dtype=float)
+    torques = np.asarray(raw['torque'], dtype=float)
+    
+    idx = rng.integers(0, len(noise_vel), size=(n_resamples, len(noise_vel)))
+    vel_mean = noise_vel[idx].mean(axis=1)
+    vel_sigma = np.maximum(noise_vel[idx].std(axis=1), vel_resolution)
+    pos_sigma = np.maximum(noise_pos[idx].std(axis=1), pos_resolution)
+    
+    change = detector.replay(raw['position'], raw['velocity'], raw['ref_position'], raw['direction'],
+                             vel_mean, vel_sigma, pos_sigma)
+    censored = change < 0
+    return torques[np.where(censored, len(torques) - 1, change)], int(np.count_nonzero(censored))
+
+
+def confidence_interval(dist, level=0.95):
+    """自助法分布的百分位置信区间"""
+    low, high = np.percentile(dist, [50 * (1 - level), 50 * (1 + level)])
+    return {'low': float(low), 'high': float(high), 'std': float(np.std(dist, ddof=1)), 'level': level}
+
+
+# 批量测试中参与重复性统计的结果字段
+BATCH_METRICS = ('coulomb_friction', 'coulomb_friction_pos', 'coulomb_friction_neg',
+                 'static_friction', 'static_friction_pos', 'static_friction_neg')
+
+
+# 界面上没有、只在测试中用 params.get 读取的可调参数及其类型，批量配置中也允许覆盖
+BATCH_EXTRA_PARAMS = {
+    'bootstrap_resamples': int,
+    'confidence_level': float,
+    'coarse_torque_step': float,
+    'probe_hold_time': float,
+    'probe_settle_time': float,
+    'ripple_nperseg': int,
+    'feedback_timeout': float,
+    'stall_timeout': float,
+    'max_t_mos': float,
+    'max_t_rotor': float,
+    'thermal_heat_speed': float,
+    'inertia_excitation': str,
+    'inertia_speed': float,
+    'inertia_hold': float,
+    'inertia_accel': float,
+    'inertia_cycles': int,
+    'inertia_duration': float,
+    'inertia_chirp_band': tuple,
+    'inertia_sample_rate': float,
+    'inertia_filter_window': float,
+    'inertia_min_r2': float,
+}
+
+
+def _batch_value(key, value, kind):
+    """按参数原有的类型转换批量配置中的值"""
+    try:
+        if kind in (list, tuple):
+            return kind(float(v) for v in value.split(',') if v.strip())
+        if kind is bool:
+            if value.lower() in ('1', 'true', 'yes', 'on'):
+                return True
+            if value.lower() in ('0', 'false', 'no', 'off'):
+                return False
+            raise ValueError(value)
+        if kind is int:
+            return int(value, 0)  # 节点号等可以写成 0x 十六进制
+        if kind is float:
+            return float(value)
+    except ValueError:
+        raise ValueError(f"参数 {key} 的值 {value!r} 无法转换为 {kind.__name__}") from None
+    return value
+
+
+def parse_batch_spec(text, params, repeats=1):
+    """解析批量测试配置，每行一组参数覆盖，例如 "test_speeds=0.5,1,2; duration=1"
+    空行和 # 开头的行忽略；没有任何配置时按当前参数运行。每组配置重复 repeats 次。
+    :param params: 当前参数，只允许覆盖其中已有的键和 BATCH_EXTRA_PARAMS，值按原有类型转换
+    :return: [(标签, 参数覆盖字典), ...]
+    """
+    configs = []
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        overrides = {}
+        for item in line.split(';'):
+            if not item.strip():
+                continue
+            if '=' not in item:
+                raise ValueError(f"无法解析批量配置项: {item.strip()}")
+            key, value = (part.strip() for part in item.split('=', 1))
+            if key in params:
+                kind = type(params[key])
+            elif key in BATCH_EXTRA_PARAMS:
+                kind = BATCH_EXTRA_PARAMS[key]
+            else:
+                raise ValueError(f"未知参数: {key}")
+            overrides[key] = _batch_value(key, value, kind)
+        configs.append((line, overrides))
+    if not configs:
+        configs.append(('当前参数', {}))
+    return [(label, overrides) for label, overrides in configs for _ in range(max(1, int(repeats)))]
+
+
+def batch_statistics(runs, metrics=BATCH_METRICS):
+    """按配置标签分组计算重复性统计（均值、样本标准差、变异系数、极差），多于一组时另给全部运行的统计
+    :param runs: [{'label': 标签, 指标: 值或 None, ...}, ...]
+    """
+    groups = {}
+    for run in runs:
+        groups.setdefault(run['label'], []).append(run)
+    if len(groups) > 1:
+        groups['全部'] = runs
+    
+    stats = {}
+    for label, members in groups.items():
+        per_metric = {}
+        for key in metrics:
+            values = np.array([r[key] for r in members if r.get(key) is not None], dtype=float)
+            if not len(values):
+                continue
+            mean = float(np.mean(values))
+            std = float(np.std(values, ddof=1)) if len(values) > 1 else 0.0
+            per_metric[key] = {
+                'n': int(len(values)), 'mean': mean, 'std': std,
+                'cv': std / abs(mean) * 100 if mean else None,
+                'min': float(np.min(values)), 'max': float(np.max(values)),
+                'range': float(np.ptp(values)),
+            }
+        stats[label] = per_metric
+    return stats
+
+
+class CapturePhase(IntEnum):
+    """采集日志中每条记录所处的测试阶段"""
+    COULOMB_SETTLE = 1
+    COULOMB_COLLECT = 2
+    NOISE_FLOOR = 3
+    STATIC_RAMP = 4
+    STATIC_PROBE = 5
+    RESET = 6
+    HEAT = 7
+    INERTIA = 8
+
+
+class CaptureLogWriter:
+    """追加式二进制采集日志
+    文件格式: 魔数 + <record_size, header_len> + JSON 头（测试参数等），
+    之后是若干数据块，每块为 <记录数, crc32> + 定长记录。
+    采样线程只把记录放入队列，由后台线程攒满一块或到达刷新间隔后写盘并 fsync，
+    测试中途断电/崩溃时最多丢失最后一个刷新间隔的数据。
+    写盘失败（磁盘满、U盘拔出）时记录到 error 并停止记录，n_records 为已写入文件的记录数。
+    """
+    MAGIC = b'DMFLOG1\x00'
+    RECORD_DTYPE = np.dtype([
+        ('t', '<f8'),          # 时间戳 (s)
+        ('phase', 'u1'),       # CapturePhase
+        ('direction', 'i1'),   # 静摩擦方向 +1/-1，其他阶段为 0
+        ('index', '<u2'),      # 库仑为速度平台序号，静摩擦为起转测量序号
+        ('cmd', '<f4'),        # 指令：速度 (rad/s) 或力矩 (N·m)
+        ('q', '<f4'),
+        ('dq', '<f4'),
+        ('tau', '<f4'),
+        ('t_mos', '<f4'),
+        ('t_rotor', '<f4'),
+    ])
+    
+    def __init__(self, path, meta, chunk_records=1024, flush_interval=0.5):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.n_records = 0
+        self.error = None  # 写盘失败的异常
+        self._buffer = np.zeros(chunk_records, dtype=self.RECORD_DTYPE)
+        self._count = 0
+        self._queue = queue.SimpleQueue()
+        
+        header = json.dumps(meta, ensure_ascii=False, default=_json_default).encode('utf-8')
+        self._file = open(path, 'wb')
+        self._file.write(self.MAGIC + struct.pack('<II', self.RECORD_DTYPE.itemsize, len(header)) + header)
+        self._file.flush()
+        
+        self._thread = threading.Thread(target=self._run, name='capture-log', daemon=True)
+        self._thread.start()
+    
+    def append(self, t, phase, direction, index, cmd, q, dq, tau, t_mos, t_rotor):
+        """记录一次采样（线程安全，不阻塞采样循环），写盘失败后丢弃"""
+        if self.error is not None:
+            return
+        self._queue.put((t, phase, direction, index, cmd, q, dq, tau, t_mos, t_rotor))
+    
+    def close(self):
+        """写出剩余记录并关闭文件"""
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            self._file.close()
+        except OSError as e:
+            self.error = self.error or e
+    
+    def _run(self):
+        last_flush = time.time()
+        try:
+            while True:
+                try:
+                    record = self._queue.get(timeout=self.flush_interval)
+                except queue.Empty:
+                    record = ()
+                if record is None:
+                    break
+                if record:
+                    self._buffer[self._count] = record
+                    self._count += 1
+                if self._count == len(self._buffer) or time.time() - last_flush >= self.flush_interval:
+                    self._write_chunk()
+                    last_flush = time.time()
+            self._write_chunk()
+        except OSError as e:
+            self.error = e
+    
+    def _write_chunk(self):
+        if self._count == 0:
+            return
+        data = self._buffer[:self._count].tobytes()
+        self._file.write(struct.pack('<II', self._count, zlib.crc32(data)) + data)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.n_records += self._count
+        self._count = 0
+
+
+class SampleRingBuffer:
+    """固定容量的采样环形缓冲区
+    采样线程每次刷新写入一行，界面定时器按显示帧率读取快照，不需要每个采样都跨线程发信号。
+    """
+    FIELDS = ('t', 'q', 'dq', 'tau')
+    
+    def __init__(self, capacity=8192, fields=FIELDS):
+        self.fields = tuple(fields)
+        self._data = np.zeros((capacity, len(self.fields)))
+        self._lock = threading.Lock()
+        self.count = 0  # 累计写入的采样数，读取方据此判断是否有新数据
+    
+    def append(self, *values):
+        """按 fields 的顺序写入一个采样"""
+        with self._lock:
+            self._data[self.count % len(self._data)] = values
+            self.count += 1
+    
+    def snapshot(self):
+        """按时间顺序返回缓冲区中的采样
+        :return: (累计采样数, {字段: 数组})
+        """
+        with self._lock:
+            count = self.count
+            n = min(count, len(self._data))
+            rows = self._data[(count - n + np.arange(n)) % len(self._data)]
+        return count, {name: rows[:, i] for i, name in enumerate(self.fields)}
+
+
+def read_capture_log(path):
+    """读取采集日志，末尾不完整或校验失败的数据块会被丢弃
+    :return: (JSON 头, 结构化记录数组)
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic = CaptureLogWriter.MAGIC
+    if data[:len(magic)] != magic:
+        raise ValueError(f"不是采集日志文件: {path}")
+    offset = len(magic)
+    record_size, header_len = struct.unpack_from('<II', data, offset)
+    offset += 8
+    meta = json.loads(data[offset:offset + header_len].decode('utf-8'))
+    offset += header_len
+    
+    dtype = CaptureLogWriter.RECORD_DTYPE
+    if record_size != dtype.itemsize:
+        raise ValueError(f"记录长度不匹配: {record_size} != {dtype.itemsize}")
+    
+    chunks = []
+    while offset + 8 <= len(data):
+        n, crc = struct.unpack_from('<II', data, offset)
+        end = offset + 8 + n * record_size
+        if end > len(data) or zlib.crc32(data[offset + 8:end]) != crc:
+            break
+        chunks.append(np.frombuffer(data, dtype=dtype, count=n, offset=offset + 8))
+        offset = end
+    records = np.concatenate(chunks) if chunks else np.zeros(0, dtype=dtype)
+    return meta, records
+
+
+def recover_capture_log(path):
+    """从采集日志（可能因中断而不完整）重建识别结果"""
+    meta, rec = read_capture_log(path)
+    params = meta.get('params', {})
+    viscous_coeff = params.get('viscous_coeff', 0.0)
+    results = {
+        'motor_info': meta.get('motor_info', {}),
+        'viscous_friction': viscous_coeff,
+        'inertia': params.get('inertia', 0.0),
+        'timestamp': meta.get('start_time'),
+        'capture_log': path,
+        'recovered_records': int(len(rec)),
+    }
+    
+    # 库仑摩擦：按速度平台稳健估计后重新计算
+    col = rec[rec['phase'] == CapturePhase.COULOMB_COLLECT]
+    if len(col):
+        _, plateau = np.unique(col['index'], return_inverse=True)
+        outliers = np.zeros(len(col), dtype=bool)
+        speeds = np.empty(plateau.max() + 1)
+        torques = np.empty(plateau.max() + 1)
+        for p in range(len(speeds)):
+            members = np.flatnonzero(plateau == p)
+            torques[p], rejected = robust_location(col['tau'][members], params.get('coulomb_estimator', 'huber'),
+                                                   params.get('outlier_k', 3.5))
+            outliers[members] = rejected
+            speeds[p] = np.mean(col['dq'][members][~rejected])
+        T_coulomb_pos, T_coulomb_neg = analyze_coulomb(speeds, torques, viscous_coeff)
+        T_coulomb_pos = T_coulomb_pos or 0.0
+        T_coulomb_neg = T_coulomb_neg or 0.0
+        results['coulomb_friction'] = (T_coulomb_pos + T_coulomb_neg) / 2.0
+        results['coulomb_friction_pos'] = T_coulomb_pos
+        results['coulomb_friction_neg'] = T_coulomb_neg
+        results['coulomb_raw_data'] = {'speeds': speeds, 'torques': torques}
+        results['coulomb_samples'] = {
+            'time': col['t'] - rec['t'][0],
+            'speed': col['dq'].astype(float),
+            'torque': col['tau'].astype(float),
+            'plateau': col['index'].astype(np.int32),
+            'outlier': outliers.astype(np.uint8),
+        }
+    
+    # 静摩擦：用记录的噪声底重放起转检测
+    static_phases = [CapturePhase.NOISE_FLOOR, CapturePhase.STATIC_RAMP, CapturePhase.STATIC_PROBE]
+    static = rec[np.isin(rec['phase'], static_phases)]
+    breakaways = {1: [], -1: []}
+    for run in np.unique(static['index']):
+        run_rec = static[static['index'] == run]
+        search = run_rec[run_rec['phase'] != CapturePhase.NOISE_FLOOR]
+        if not len(search):
+            continue
+        noise = run_rec[run_rec['phase'] == CapturePhase.NOISE_FLOOR]
+        direction = int(search['direction'][0])
+        detector = BreakawayDetector()
+        if len(noise):
+            detector.estimate_noise(noise['q'], noise['dq'],
+                                    meta.get('pos_resolution', 0.0), meta.get('vel_resolution', 0.0))
+        
+        # 斜坡为一段；二分/粗扫的每个探测力矩各为一段
+        phase, cmd = search['phase'], search['cmd']
+        change = (phase[1:] != phase[:-1]) | ((phase[1:] == CapturePhase.STATIC_PROBE) & (cmd[1:] != cmd[:-1]))
+        bounds = np.concatenate(([0], np.flatnonzero(change) + 1, [len(search)]))
+        
+        moved = []
+        for start, end in zip(bounds[:-1], bounds[1:]):
+            seg = search[start:end]
+            detector.arm(float(seg['q'][0]), direction)
+            for i in range(len(seg)):
+                if detector.update(float(seg['q'][i]), float(seg['dq'][i])):
+                    moved.append(float(seg['cmd'][detector.change_index]))
+                    break
+        breakaways[direction].append(min(moved) if moved else np.nan)
+    
+    if breakaways[1] or breakaways[-1]:
+        pos = np.asarray(breakaways[1], dtype=float)
+        neg = np.asarray(breakaways[-1], dtype=float)
+        T_static_pos = float(np.nanmean(pos)) if np.any(np.isfinite(pos)) else 0.0
+        T_static_neg = float(np.nanmean(neg)) if np.any(np.isfinite(neg)) else 0.0
+        results['static_friction_pos'] = T_static_pos
+        results['static_friction_neg'] = T_static_neg
+        results['static_friction'] = (T_static_pos + T_static_neg) / 2.0
+    return results
+
+
+class ResultsArchive:
+    """识别结果归档
+    每次测试保存为 <root>/<运行目录>/results.json（save_results_container 格式），
+    SQLite 索引记录电机序列号、型号、节点号、时间和关键结果，
+    历史浏览只查询索引，原始数据在打开某次运行时才内存映射加载。
+    """
+    INDEX_COLUMNS = [
+        ('timestamp', 'TEXT'),
+        ('motor_sn', 'TEXT'),
+        ('motor_type', 'TEXT'),
+        ('node_id', 'INTEGER'),
+        ('test_type', 'TEXT'),
+        ('static_method', 'TEXT'),
+        ('max_torque', 'REAL'),
+        ('viscous_friction', 'REAL'),
+        ('inertia', 'REAL'),
+        ('coulomb_friction', 'REAL'),
+        ('coulomb_friction_pos', 'REAL'),
+        ('coulomb_friction_neg', 'REAL'),
+        ('static_friction', 'REAL'),
+        ('static_friction_pos', 'REAL'),
+        ('static_friction_neg', 'REAL'),
+    ]
+    
+    def __init__(self, root=os.path.join('friction_results', 'archive')):
+        self.root = root
+        if not os.path.exists(root):
+            os.makedirs(root)
+        self.db = sqlite3.connect(os.path.join(root, 'index.sqlite'))
+        self.db.row_factory = sqlite3.Row
+        columns = ", ".join(f"{name} {kind}" for name, kind in self.INDEX_COLUMNS)
+        with self.db:
+            self.db.execute(f"CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, run_dir TEXT UNIQUE, {columns})")
+            for name in ('timestamp', 'motor_sn', 'motor_type'):
+                self.db.execute(f"CREATE INDEX IF NOT EXISTS idx_runs_{name} ON runs ({name})")
+    
+    @staticmethod
+    def _index_row(results):
+        """从结果中提取索引字段"""
+        params = results.get('params', {})
+        sn = results.get('motor_info', {}).get('sn')
+        row = {
+            'timestamp': results.get('timestamp') or datetime.now().isoformat(),
+            'motor_sn': str(sn) if sn is not None else None,
+            'motor_type': params.get('motor_type'),
+            'node_id': params.get('node_id'),
+            'test_type': results.get('test_type'),
+            'static_method': params.get('static_method'),
+            'max_torque': params.get('max_torque'),
+        }
+        for name, kind in ResultsArchive.INDEX_COLUMNS:
+            if kind == 'REAL' and name not in row:
+                value = results.get(name)
+                row[name] = float(value) if value is not None else None
+        return row
+    
+    def _insert(self, run_dir, row):
+        names = ['run_dir'] + list(row)
+        with self.db:
+            cursor = self.db.execute(
+                f"INSERT OR REPLACE INTO runs ({', '.join(names)}) VALUES ({', '.join('?' * len(names))})",
+                [run_dir] + list(row.values()))
+        return cursor.lastrowid
+    
+    def add(self, results):
+        """归档一次测试结果，返回运行编号"""
+        row = self._index_row(results)
+        stamp = row['timestamp'][:19].replace('-', '').replace(':', '').replace('T', '_')
+        run_dir = f"{stamp}_{row['motor_sn'] or 'unknown'}_{row['test_type'] or 'run'}"
+        n = 1
+        while os.path.exists(os.path.join(self.root, run_dir)):
+            n += 1
+            run_dir = f"{stamp}_{row['motor_sn'] or 'unknown'}_{row['test_type'] or 'run'}_{n}"
+        os.makedirs(os.path.join(self.root, run_dir))
+        save_results_container(results, os.path.join(self.root, run_dir, 'results.json'))
+        return self._insert(run_dir, row)
+    
+    def query(self, motor_sn=None, motor_type=None, test_type=None, since=None, until=None, limit=10000):
+        """按条件查询索引，时间为 ISO 格式字符串（可只写日期），按时间倒序返回"""
+        conditions = []
+        values = []
+        for column, value in (('motor_sn', motor_sn), ('motor_type', motor_type), ('test_type', test_type)):
+            if value:
+                conditions.append(f"{column} = ?")
+                values.append(value)
+        if since:
+            conditions.append("timestamp >= ?")
+            values.append(since)
+        if until:
+            conditions.append("substr(timestamp, 1, ?) <= ?")  # 只写日期时包含当天
+            values += [len(until), until]
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.db.execute(f"SELECT * FROM runs {where} ORDER BY timestamp DESC LIMIT ?", values + [limit])
+        return [dict(row) for row in rows]
+    
+    def distinct(self, column):
+        """某一索引列的所有取值，用于历史页的筛选下拉框"""
+        if column not in dict(self.INDEX_COLUMNS):
+            raise ValueError(f"未知的索引列: {column}")
+        rows = self.db.execute(f"SELECT DISTINCT {column} FROM runs WHERE {column} IS NOT NULL ORDER BY {column}")
+        return [row[0] for row in rows]
+    
+    def load(self, run_id, mmap=True):
+        """加载某次运行的完整结果，原始数据默认内存映射"""
+        row = self.db.execute("SELECT run_dir FROM runs WHERE id = ?", (run_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"归档中没有编号为 {run_id} 的运行")
+        return load_results_container(os.path.join(self.root, row['run_dir'], 'results.json'), mmap=mmap)
+    
+    def rebuild_index(self):
+        """索引丢失或损坏时扫描运行目录重建，只读取 JSON 元数据"""
+        with self.db:
+            self.db.execute("DELETE FROM runs")
+        count = 0
+        for run_dir in sorted(os.listdir(self.root)):
+            json_path = os.path.join(self.root, run_dir, 'results.json')
+            if not os.path.isfile(json_path):
+                continue
+            with open(json_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            self._insert(run_dir, self._index_row(meta))
+            count += 1
+        return count
+    
+    def close(self):
+        self.db.close()
+
+
+def minmax_decimate(x, y, n_bins, x_range=None):
+    """最小/最大值包络抽取：把 x_range 内的采样分成 n_bins 段，每段只保留最小和最大值点，
+    尖峰和台阶不会丢失。x 需升序；返回的点包含范围两侧各一个点，平移时曲线不会断开。
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    start, stop = 0, len(x)
+    if x_range is not None:
+        start = max(int(np.searchsorted(x, x_range[0], side='left')) - 1, 0)
+        stop = min(int(np.searchsorted(x, x_range[1], side='right')) + 1, len(x))
+    n = stop - start
+    if n <= 2 * n_bins:
+        return x[start:stop], y[start:stop]
+    
+    # 每段等长，最后不足一段的部分单独处理
+    k = n // n_bins
+    body = y[start:start + n_bins * k].reshape(n_bins, k)
+    offsets = start + np.arange(n_bins) * k
+    indices = np.concatenate((offsets + np.argmin(body, axis=1), offsets + np.argmax(body, axis=1)))
+    tail = start + n_bins * k
+    if tail < stop:
+        indices = np.concatenate((indices, [tail + np.argmin(y[tail:stop]), tail + np.argmax(y[tail:stop])]))
+    indices = np.unique(np.concatenate((indices, [start, stop - 1])))
+    return x[indices], y[indices]
+
+
+# 结果图表：坐标轴和线条只创建一次，之后只更新数据
+# 同一个图表类既用于界面上的持久画布（动态线条参与局部重绘），也用于工作线程中导出 PNG 的独立 Agg 画布
+class _Chart:
+    def __init__(self, fig, animated=False):
+        self.fig = fig
+        self.animated = animated
+        self.artists = []  # 数据变化的图元，界面上由 BlitManager 局部重绘
+    
+    def _dynamic(self, artist):
+        artist.set_animated(self.animated)
+        self.artists.append(artist)
+        return artist
+    
+    @staticmethod
+    def _autoscale(*axes):
+        """按新数据重新计算坐标范围，返回范围是否变化"""
+        before = [ax.get_xlim() + ax.get_ylim() for ax in axes]
+        for ax in axes:
+            ax.relim()
+            ax.autoscale_view()
+        return before != [ax.get_xlim() + ax.get_ylim() for ax in axes]
+
+
+class CoulombChart(_Chart):
+    """库仑摩擦识别结果：实测点、摩擦模型和正负库仑摩擦"""
+    
+    def __init__(self, fig, animated=False):
+        super().__init__(fig, animated)
+        ax = self.ax = fig.add_subplot(111)
+        self.points, = ax.plot([], [], 'o', color='blue', markersize=7, alpha=0.7, label='实测数据点', zorder=5)
+        self.model, = ax.plot([], [], 'r-', linewidth=2.5, label='摩擦模型', zorder=4)
+        self.pos_line = ax.axhline(y=0, color='g', linestyle='--', linewidth=2, alpha=0.8, label='正向库仑摩擦', zorder=3)
+        self.neg_line = ax.axhline(y=0, color='m', linestyle='--', linewidth=2, alpha=0.8, label='负向库仑摩擦', zorder=3)
+        for artist in (self.points, self.model, self.pos_line, self.neg_line):
+            self._dynamic(artist)
+        
+        # 添加坐标轴线
+        ax.axhline(y=0, color='k', linestyle='-', alpha=0.3, zorder=1)
+        ax.axvline(x=0, color='k', linestyle='-', alpha=0.3, zorder=1)
+        
+        ax.set_xlabel('角速度 [rad/s]', fontsize=14)
+        ax.set_ylabel('力矩 [N·m]', fontsize=14)
+        self.title = self._dynamic(ax.set_title('电机库仑摩擦力矩识别结果', fontsize=16, fontweight='bold'))
+        ax.legend(fontsize=12, loc='lower right')
+        ax.grid(True, alpha=0.3)
+        
+        # 统计信息文本框
+        self.stats = self._dynamic(ax.text(0.02, 0.98, '', transform=ax.transAxes,
+                                           bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8),
+                                           verticalalignment='top', fontsize=10))
+    
+    def update(self, data):
+        speeds = np.asarray(data['speeds'], dtype=float)
+        torques = np.asarray(data['torques'], dtype=float)
+        T_pos, T_neg, viscous_coeff = data['coulomb_pos'], data['coulomb_neg'], data['viscous_coeff']
+        
+        self.points.set_data(speeds, torques)
+        
+        # 理论模型线
+        x_model = np.linspace(np.min(speeds) - 0.5, np.max(speeds) + 0.5, 200) if len(speeds) else np.zeros(0)
+        y_model = np.where(x_model > 0, viscous_coeff * x_model + T_pos, 0) \
+            + np.where(x_model < 0, viscous_coeff * x_model - T_neg, 0)
+        self.model.set_data(x_model, y_model)
+        self.pos_line.set_ydata([T_pos, T_pos])
+        self.neg_line.set_ydata([-T_neg, -T_neg])
+        
+        self.title.set_text(data.get('title', '电机库仑摩擦力矩识别结果'))
+        self.stats.set_text(f'测试点数: {len(speeds)}\n粘滞系数: {viscous_coeff:.6f} N·m·s/rad\n'
+                            f'正向库仑摩擦: {T_pos:.5f} N·m\n负向库仑摩擦: {T_neg:.5f} N·m\n'
+                            f'平均库仑摩擦: {(T_pos + T_neg) / 2:.5f} N·m')
+        return self._autoscale(self.ax)
+
+
+class StaticTestChart(_Chart):
+    """静摩擦测试过程：力矩、速度、位置随时间变化及脱离点"""
+    
+    def __init__(self, fig, animated=False):
+        super().__init__(fig, animated)
+        ax1, ax2, ax3 = self.axes = fig.subplots(3, 1, sharex=True)
+        
+        # 力矩随时间变化
+        self.torque_line, = ax1.plot([], [], 'r-', linewidth=1.5, label='施加力矩')
+        self.break_point, = ax1.plot([], [], 'ro', markersize=8, label='脱离点')
+        ax1.set_ylabel('力矩 [N·m]', fontsize=12)
+        self.title = self._dynamic(ax1.set_title('静摩擦测试过程', fontsize=14, fontweight='bold'))
+        ax1.grid(True, alpha=0.3)
+        ax1.legend(fontsize=10, loc='upper left')
+        
+        # 速度随时间变化
+        self.vel_line, = ax2.plot([], [], 'g-', linewidth=1.5, label='角速度')
+        self.upper_threshold = ax2.axhline(y=0, color='orange', linestyle='--', alpha=0.7, label='运动阈值')
+        self.lower_threshold = ax2.axhline(y=0, color='orange', linestyle='--', alpha=0.7)
+        ax2.set_ylabel('速度 [rad/s]', fontsize=12)
+        ax2.grid(True, alpha=0.3)
+        ax2.legend(fontsize=10, loc='upper left')
+        
+        # 位置随时间变化
+        self.pos_line, = ax3.plot([], [], 'b-', linewidth=1.5, label='角位置')
+        ax3.set_xlabel('时间 [s]', fontsize=12)
+        ax3.set_ylabel('位置 [rad]', fontsize=12)
+        ax3.grid(True, alpha=0.3)
+        ax3.legend(fontsize=10, loc='upper left')
+        
+        self.break_lines = [ax.axvline(x=0, color='red', linestyle='--', linewidth=2, alpha=0.8) for ax in self.axes]
+        self.break_text = ax1.text(0.98, 0.05, '', transform=ax1.transAxes, ha='right', fontsize=10,
+                                   bbox=dict(boxstyle='round', facecolor='white', alpha=0.8))
+        for artist in [self.torque_line, self.break_point, self.vel_line, self.upper_threshold,
+                       self.lower_threshold, self.pos_line, self.break_text] + self.break_lines:
+            self._dynamic(artist)
+        
+        # 长曲线按可见范围抽取，缩放/平移时重新计算（三个子图共享横轴，监听一个即可）
+        self._traces = None
+        ax3.callbacks.connect('xlim_changed', self._on_xlim_changed)
+    
+    def _set_traces(self, x_range=None):
+        if self._traces is None:
+            return
+        time_data, series = self._traces
+        n_bins = max(int(self.axes[0].bbox.width), 200)
+        for line, values in zip((self.torque_line, self.vel_line, self.pos_line), series):
+            line.set_data(*minmax_decimate(time_data, values, n_bins, x_range))
+    
+    def _on_xlim_changed(self, ax):
+        self._set_traces(ax.get_xlim())
+    
+    def update(self, data):
+        time_data = np.asarray(data['time'], dtype=float)
+        torque_data = np.asarray(data['torque'], dtype=float)
+        velocity_data = np.asarray(data['velocity'], dtype=float)
+        vel_offset = data.get('vel_offset', 0.0)
+        movement_threshold = data.get('movement_threshold', 0.05)
+        breakaway_torque = data.get('breakaway_torque')
+        
+        self.title.set_text(f"{data['direction']}静摩擦测试过程")
+        self._traces = (time_data, (torque_data, velocity_data, np.asarray(data['position'], dtype=float)))
+        self._set_traces()
+        self.upper_threshold.set_ydata([vel_offset + movement_threshold] * 2)
+        self.lower_threshold.set_ydata([vel_offset - movement_threshold] * 2)
+        
+        # 找出开始移动的点
+        if breakaway_torque is not None and not np.isnan(breakaway_torque):
+            # 二分搜索中会多次施加同一力矩，取最后一次
+            move_indices = np.flatnonzero(torque_data == breakaway_torque)[-1:]
+        else:
+            move_indices = np.flatnonzero(np.abs(velocity_data - vel_offset) > movement_threshold)[:1]
+        
+        moved = len(move_indices) > 0
+        if moved:
+            break_idx = move_indices[0]
+            break_time = time_data[break_idx]
+            break_torque = torque_data[break_idx]
+            self.break_point.set_data([break_time], [break_torque])
+            self.break_text.set_text(f'脱离点: {break_torque:.5f} N·m')
+            for line in self.break_lines:
+                line.set_xdata([break_time, break_time])
+        else:
+            self.break_point.set_data([], [])
+            self.break_text.set_text('')
+        for line in self.break_lines:
+            line.set_visible(moved)
+        return self._autoscale(*self.axes)
+
+
+class ThermalChart(_Chart):
+    """摩擦力矩随线圈温度变化"""
+    
+    def __init__(self, fig, animated=False):
+        super().__init__(fig, animated)
+        ax = self.ax = fig.add_subplot(111)
+        self.coulomb_points, = ax.plot([], [], 'o', color='blue', markersize=5, alpha=0.6, label='库仑摩擦')
+        self.static_points, = ax.plot([], [], 'o', color='red', markersize=5, alpha=0.6, label='静摩擦')
+        self.fit_lines = {name: ax.plot([], [], color + '--', linewidth=2, label=f'{label}拟合')[0]
+                          for name, color, label in (('coulomb', 'b', '库仑摩擦'), ('static', 'r', '静摩擦'))}
+        self.fit_text = ax.text(0.02, 0.98, '', transform=ax.transAxes, verticalalignment='top', fontsize=10,
+                                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+        for artist in [self.coulomb_points, self.static_points, self.fit_text] + list(self.fit_lines.values()):
+            self._dynamic(artist)
+        
+        ax.set_xlabel('线圈温度 [℃]', fontsize=14)
+        ax.set_ylabel('摩擦力矩 [N·m]', fontsize=14)
+        ax.set_title('摩擦力矩 - 温度特性', fontsize=16, fontweight='bold')
+        ax.legend(fontsize=12, loc='lower right')
+        ax.grid(True, alpha=0.3)
+    
+    def update(self, data):
+        t_rotor = np.asarray(data['t_rotor'], dtype=float)
+        self.coulomb_points.set_data(t_rotor, data['coulomb'])
+        self.static_points.set_data(t_rotor, data['static'])
+        
+        temps = np.linspace(np.nanmin(t_rotor), np.nanmax(t_rotor), 50)
+        lines = []
+        for name, line in self.fit_lines.items():
+            fit = data['fit'].get(name)
+            if fit is None:
+                line.set_data([], [])
+                continue
+            line.set_data(temps, fit['intercept'] + fit['slope'] * temps)
+            lines.append(f"{name}: {fit['slope'] * 1000:.3f} mN·m/℃")
+        self.fit_text.set_text("\n".join(lines))
+        return self._autoscale(self.ax)
+
+
+class StaticMapChart(_Chart):
+    """静摩擦力矩随转子角度变化"""
+    
+    def __init__(self, fig, animated=False):
+        super().__init__(fig, animated)
+        ax = self.ax = fig.add_subplot(111)
+        self.pos_line, = ax.plot([], [], 'ro-', linewidth=2, markersize=7, label='正向静摩擦')
+        self.neg_line, = ax.plot([], [], 'bs-', linewidth=2, markersize=7, label='负向静摩擦')
+        self.pos_mean = ax.axhline(y=0, color='r', linestyle='--', alpha=0.5)
+        self.neg_mean = ax.axhline(y=0, color='b', linestyle='--', alpha=0.5)
+        for artist in (self.pos_line, self.neg_line, self.pos_mean, self.neg_mean):
+            self._dynamic(artist)
+        
+        ax.set_xlim(0, 360)
+        ax.set_xlabel('转子角度 [°]', fontsize=14)
+        ax.set_ylabel('脱离力矩 [N·m]', fontsize=14)
+        ax.set_title('静摩擦力矩角度映射', fontsize=16, fontweight='bold')
+        ax.legend(fontsize=12, loc='best')
+        ax.grid(True, alpha=0.3)
+    
+    def update(self, data):
+        angles_deg = np.degrees(np.asarray(data['angles'], dtype=float))
+        for line, mean_line, key in ((self.pos_line, self.pos_mean, 'pos'), (self.neg_line, self.neg_mean, 'neg')):
+            values = np.asarray(data[key], dtype=float)
+            line.set_data(angles_deg, values)
+            valid = np.any(~np.isnan(values))
+            mean_line.set_visible(valid)
+            if valid:
+                mean_line.set_ydata([np.nanmean(values)] * 2)
+        before = self.ax.get_ylim()
+        self.ax.relim()
+        self.ax.autoscale_view(scalex=False)
+        return before != self.ax.get_ylim()
+
+
+class InertiaChart(_Chart):
+    """惯量辨识：扣除摩擦后的力矩与加速度散点及拟合直线"""
+    
+    def __init__(self, fig, animated=False):
+        super().__init__(fig, animated)
+        ax = self.ax = fig.add_subplot(111)
+        self.points, = ax.plot([], [], '.', color='#2980b9', markersize=3, alpha=0.5, label='实测')
+        self.fit_line, = ax.plot([], [], 'r-', linewidth=2, label='τ = J·α')
+        self.fit_text = ax.text(0.02, 0.98, '', transform=ax.transAxes, verticalalignment='top', fontsize=10,
+                                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+        for artist in (self.points, self.fit_line, self.fit_text):
+            self._dynamic(artist)
+        
+        ax.set_xlabel('角加速度 [rad/s²]', fontsize=14)
+        ax.set_ylabel('扣除摩擦后的力矩 [N·m]', fontsize=14)
+        ax.set_title('转子惯量辨识', fontsize=16, fontweight='bold')
+        ax.legend(fontsize=12, loc='lower right')
+        ax.grid(True, alpha=0.3)
+    
+    def update(self, data):
+        accel = np.asarray(data['accel'], dtype=float)
+        self.points.set_data(accel, data['inertial_torque'])
+        span = np.array([accel.min(), accel.max()]) if len(accel) else np.zeros(2)
+        self.fit_line.set_data(span, data['inertia'] * span)
+        r2 = f"{data['r2']:.4f}" if data.get('r2') is not None else "-"
+        self.fit_text.set_text(f"J = {data['inertia']:.4e} kg·m²\nR² = {r2}")
+        return self._autoscale(self.ax)
+
+
+class LiveChart(_Chart):
+    """测试过程中的实时曲线：横轴为相对最新采样的时间，范围固定，
+    纵轴只在数据超出或远小于当前范围时调整，因此绝大多数帧只需局部重绘"""
+    
+    def __init__(self, fig, animated=False, window=10.0):
+        super().__init__(fig, animated)
+        self.window = window
+        self.axes = fig.subplots(3, 1, sharex=True)
+        self.lines = {}
+        for ax, (key, color, label) in zip(self.axes, (('tau', 'r', '力矩 [N·m]'), ('dq', 'g', '速度 [rad/s]'),
+                                                        ('q', 'b', '位置 [rad]'))):
+            self.lines[key] = self._dynamic(ax.plot([], [], color + '-', linewidth=1.2)[0])
+            ax.set_ylabel(label, fontsize=12)
+            ax.grid(True, alpha=0.3)
+        self.axes[0].set_xlim(-window, 0)
+        self.axes[0].set_title('实时数据', fontsize=14, fontweight='bold')
+        self.axes[-1].set_xlabel('时间 (相对最新采样) [s]', fontsize=12)
+        self.rate_text = self._dynamic(self.axes[0].text(0.99, 0.95, '', transform=self.axes[0].transAxes,
+                                                         ha='right', va='top', fontsize=10))
+    
+    @staticmethod
+    def _fit_ylim(ax, values):
+        """数据超出当前范围或只占不到四分之一时重新设定纵轴，返回是否变化"""
+        if not len(values):
+            return False
+        lo, hi = float(np.min(values)), float(np.max(values))
+        y0, y1 = ax.get_ylim()
+        if lo >= y0 and hi <= y1 and (hi - lo) >= 0.25 * (y1 - y0):
+            return False
+        margin = 0.15 * (hi - lo) or max(abs(hi) * 0.1, 1e-3)
+        ax.set_ylim(lo - margin, hi + margin)
+        return True
+    
+    def update(self, data):
+        t = data['t']
+        if not len(t):
+            return False
+        visible = t >= t[-1] - self.window
+        x = t[visible] - t[-1]
+        rescaled = False
+        for ax, key in zip(self.axes, ('tau', 'dq', 'q')):
+            values = data[key][visible]
+            self.lines[key].set_data(x, values)
+            rescaled = self._fit_ylim(ax, values) or rescaled
+        if len(x) > 1 and x[-1] > x[0]:
+            self.rate_text.set_text(f'采样率: {(len(x) - 1) / (x[-1] - x[0]):.0f} Hz')
+        return rescaled
+
+
+def render_chart_png(chart_class, data, filename, figsize=(12, 8), dpi=300):
+    """用独立的 Figure + Agg 画布导出图表，不经过 pyplot，可在工作线程中调用"""
+    load_matplotlib()
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    chart_class(fig).update(data)
+    fig.tight_layout()
+    fig.savefig(filename, dpi=dpi, bbox_inches='tight')
+
+
+class BlitManager:
+    """持久画布的局部重绘：坐标轴、网格等静态部分缓存为背景，
+    数据更新时只重画动态图元；坐标范围变化时才整幅重绘并重新缓存背景"""
+    
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.background = None
+        self.artists = []
+        canvas.mpl_connect('draw_event', self._on_draw)
+    
+    def set_artists(self, artists):
+        self.artists = list(artists)
+        self.background = None
+    
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+    
+    def _draw_animated(self):
+        figure = self.canvas.figure
+        for artist in self.artists:
+            figure.draw_artist(artist)
+    
+    def update(self, full=False):
+        if full or self.background is None:
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        self.canvas.blit(self.canvas.figure.bbox)
+
+
+# 电机状态检查线程
+class MotorStatusThread(QThread):
+    """高频轮询电机状态写入共享的环形缓冲区，界面按显示帧率读取最新值和统计量"""
+    log_message = pyqtSignal(str)
+    FIELDS = ('t', 'q', 'dq', 'tau', 't_mos', 't_rotor')
+    
+    def __init__(self, params, poll_hz=100.0, history_seconds=30.0):
+        super().__init__()
+        self.params = params
+        self.running = False
+        self.motor = None
+        self.motor_control = None
+        self.serial_device = None
+        self.poll_interval = 1.0 / poll_hz
+        self.samples = SampleRingBuffer(int(poll_hz * history_seconds), fields=self.FIELDS)
+        self.error = None  # 最近一次轮询的错误信息，正常时为 None
+        
+    def setup_motor(self):
+        try:
+            # 初始化电机和串口
+            motor_type_dict = {
+                "DM4310": DM_Motor_Type.DM4310,
+                "DM4340": DM_Motor_Type.DM4340,
+                "DM6006": DM_Motor_Type.DM6006,
+                "DM8006": DM_Motor_Type.DM8006,
+                "DM8009": DM_Motor_Type.DM8009,
+                "DM10010L": DM_Motor_Type.DM10010L,
+                "DM10010": DM_Motor_Type.DM10010,
+            }
+            
+            motor_type = motor_type_dict.get(self.params['motor_type'], DM_Motor_Type.DM4310)
+            
+            self.motor = Motor(motor_type, self.params['node_id'], self.params['master_id'])
+            self.serial_device = serial.Serial(
+                self.params['com_port'], 
+                self.params['baud_rate'], 
+                timeout=0.5
+            )
+            self.motor_control = MotorControl(self.serial_device)
+            self.motor_control.addMotor(self.motor)
+            
+            return True
+        except Exception as e:
+            self.log_message.emit(f"电机连接失败: {str(e)}")
+            return False
+    
+    def run(self):
+        if not self.setup_motor():
+            return
+            
+        self.running = True
+        next_poll = time.perf_counter()
+        while self.running:
+            try:
+                # 刷新电机状态，直接写入预分配的缓冲区
+                self.motor_control.refresh_motor_status(self.motor)
+                motor = self.motor
+                self.samples.append(time.time(), motor.getPosition(), motor.getVelocity(), motor.getTorque(),
+                                    motor.getT_MOS(), motor.getT_Rotor())
+                self.error = None
+            except Exception as e:
+                # 同一错误只记录一次，避免高频轮询刷屏
+                if self.error != str(e):
+                    self.log_message.emit(f"状态更新错误: {str(e)}")
+                self.error = str(e)
+            
+            # 固定轮询周期，处理耗时超过周期时不追赶
+            next_poll += self.poll_interval
+            delay = next_poll - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_poll = time.perf_counter()
+    
+    def stop(self):
+        self.running = False
+        self.wait()
+        
+        if self.serial_device and self.serial_device.is_open:
+            self.serial_device.close()
+
+
+def parse_motor_ids(text, master_offset=0x10):
+    """解析多电机ID列表，如 "1,2,5-8" 或 "1:11,2:12"，ID 与界面一致按十六进制解析
+    :param master_offset: 未指定主机ID时使用 节点ID + master_offset
+    :return: [(node_id, master_id), ...]
+    """
+    motor_ids = []
+    for item in text.replace(' ', '').split(','):
+        if not item:
+            continue
+        if ':' in item:
+            node, master = item.split(':', 1)
+            motor_ids.append((int(node, 16), int(master, 16)))
+        elif '-' in item:
+            first, last = item.split('-', 1)
+            motor_ids.extend((node, node + master_offset) for node in range(int(first, 16), int(last, 16) + 1))
+        else:
+            motor_ids.append((int(item, 16), int(item, 16) + master_offset))
+    return motor_ids
+
+
+# 电机自动搜索时读取的参数
+DISCOVERY_RIDS = ('MST_ID', 'hw_ver', 'sw_ver', 'sub_ver', 'SN', 'PMAX', 'VMAX', 'TMAX')
+
+
+def motor_type_from_limits(pmax, vmax, tmax):
+    """按电机内部的 PMAX/VMAX/TMAX 与 MotorControl.Limit_Param 匹配型号
+    改过限幅的电机，以及限幅相同无法区分的型号（如 DMH6215 与 DMG6220）返回 None
+    """
+    matches = [motor_type.name for motor_type in DM_Motor_Type
+               if motor_type < len(MotorControl.Limit_Param)
+               and np.allclose(MotorControl.Limit_Param[motor_type], (pmax, vmax, tmax), rtol=1e-3)]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _probe_port(port, baud_rates, ids, timeout):
+    """在一个串口上依次尝试各波特率：先用一轮流水线读取 MST_ID 找出应答的ID，再读取应答电机的详细信息"""
+    for baud_rate in baud_rates:
+        try:
+            serial_device = serial.Serial(port, baud_rate, timeout=0)
+        except ValueError:
+            continue  # 串口不支持该波特率，换下一个
+        except (serial.SerialException, OSError):
+            return []
+        try:
+            motor_control = MotorControl(serial_device)
+            # 主机ID未知，候选电机只按从机ID登记
+            candidates = [Motor(DM_Motor_Type.DM4310, node_id, 0) for node_id in ids]
+            for motor in candidates:
+                motor_control.addMotor(motor)
+            replies = motor_control.read_motor_params([(motor, DM_variable.MST_ID) for motor in candidates], timeout)
+            found = [motor for motor in candidates if (motor.SlaveID, DM_variable.MST_ID) in replies]
+            if not found:
+                continue
+            
+            rids = [DM_variable[name] for name in DISCOVERY_RIDS]
+            info = motor_control.read_motor_params([(motor, rid) for motor in found for rid in rids], timeout)
+            motors = []
+            for motor in found:
+                values = {rid.name: info.get((motor.SlaveID, rid)) for rid in rids}
+                limits = (values['PMAX'], values['VMAX'], values['TMAX'])
+                motors.append({
+                    'com_port': port,
+                    'baud_rate': baud_rate,
+                    'node_id': motor.SlaveID,
+                    'master_id': replies[(motor.SlaveID, DM_variable.MST_ID)],
+                    'motor_type': motor_type_from_limits(*limits) if None not in limits else None,
+                    'hw_ver': values['hw_ver'],
+                    'sw_ver': values['sw_ver'],
+                    'sub_ver': values['sub_ver'],
+                    'sn': values['SN'],
+                    'limits': limits,
+                })
+            return motors
+        except Exception:
+            continue
+        finally:
+            serial_device.close()
+    return []
+
+
+def discover_motors(ports=None, baud_rates=(921600,), ids=range(0x01, 0x11), timeout=0.1):
+    """扫描串口和候选电机ID，各串口并行扫描
+    :param ports: 串口列表，默认为系统中的全部串口
+    :param ids: 候选从机ID
+    :param timeout: 每轮流水线读取等待应答的时间 (s)
+    :return: 发现的电机信息列表，每项包含串口、波特率、ID、型号、固件版本和序列号
+    """
+    if ports is None:
+        import serial.tools.list_ports
+        ports = [info.device for info in serial.tools.list_ports.comports()]
+    if not ports:
+        return []
+    ids = list(ids)
+    with ThreadPoolExecutor(max_workers=len(ports)) as pool:
+        per_port = pool.map(lambda port: _probe_port(port, baud_rates, ids, timeout), ports)
+    return [motor for motors in per_port for motor in motors]
+
+
+# 电机自动搜索线程
+class DiscoveryThread(QThread):
+    discovered = pyqtSignal(list)
+    log_message = pyqtSignal(str)
+    
+    def __init__(self, baud_rates=(921600,), ids=range(0x01, 0x11)):
+        super().__init__()
+        self.baud_rates = baud_rates
+        self.ids = ids
+    
+    def run(self):
+        start = time.perf_counter()
+        try:
+            motors = discover_motors(baud_rates=self.baud_rates, ids=self.ids)
+        except Exception as e:
+            self.log_message.emit(f"电机搜索失败: {str(e)}")
+            motors = []
+        self.log_message.emit(f"电机搜索完成，用时 {time.perf_counter() - start:.2f} s，发现 {len(motors)} 台电机")
+        self.discovered.emit(motors)
+
+
+# 多电机状态监控线程
+class MultiMotorStatusThread(QThread):
+    """同一总线上多台电机的状态监控：一个调度循环轮流（round-robin）向各电机发送状态请求，
+    反馈按 CAN ID 分发后写入各电机自己的环形缓冲区，界面按显示帧率读取。
+    每台电机的轮询速率上限由总线容量决定，并按应答率自适应：丢帧时降速，恢复后逐步提速。
+    """
+    log_message = pyqtSignal(str)
+    BUS_LOAD = 0.5              # 状态轮询最多占用的总线比例
+    ADAPT_PERIOD = 1.0          # 速率调整周期 (s)
+    MIN_HZ = 5.0
+    
+    def __init__(self, params, motor_ids, max_hz=100.0, can_bitrate=1000000, history_seconds=30.0):
+        super().__init__()
+        self.params = params
+        self.motor_ids = list(motor_ids)
+        self.running = False
+        self.motors = []
+        self.motor_control = None
+        self.serial_device = None
+        
+        # 每台电机的速率上限：总线容量按 BUS_LOAD 留出余量后平分
+        n = len(self.motor_ids)
+        self.can_bitrate = can_bitrate
+        bus = BusScheduler(params['baud_rate'], can_bitrate)
+        self.max_rate = max(min(max_hz, bus.achievable_rate(n, load=self.BUS_LOAD)), self.MIN_HZ)
+        self.rate = self.max_rate       # 当前每台电机的目标轮询速率 (Hz)
+        self.achieved_rate = 0.0        # 上个调整周期实际达到的每台电机轮询速率 (Hz)
+        self.reply_ratio = [1.0] * n    # 上个调整周期各电机的应答率
+        self.bus_load = 0.0             # 上个调整周期实测的总线占用比例
+        self.samples = [SampleRingBuffer(int(max_hz * history_seconds), fields=MotorStatusThread.FIELDS)
+                        for _ in self.motor_ids]
+        self.error = None
+    
+    def setup_motors(self):
+        try:
+            motor_type = DM_Motor_Type.__members__.get(self.params['motor_type'], DM_Motor_Type.DM4310)
+            self.serial_device = serial.Serial(self.params['com_port'], self.params['baud_rate'], timeout=0.5)
+            self.motor_control = MotorControl(self.serial_device, can_bitrate=self.can_bitrate)
+            # 在总线预算中登记状态轮询流，带宽不足时降级
+            granted = self.motor_control.scheduler.request_rate('status_poll', self.max_rate * len(self.motor_ids))
+            self.max_rate = self.rate = max(granted / len(self.motor_ids), self.MIN_HZ)
+            for node_id, master_id in self.motor_ids:
+                motor = Motor(motor_type, node_id, master_id)
+                self.motor_control.addMotor(motor)
+                self.motors.append(motor)
+            return True
+        except Exception as e:
+            self.log_message.emit(f"多电机监控连接失败: {str(e)}")
+            return False
+    
+    def run(self):
+        if not self.motor_ids or not self.setup_motors():
+            return
+        
+        motors = self.motors
+        n = len(motors)
+        seen = [motor.recv_count for motor in motors]
+        polls = [0] * n
+        replies = [0] * n
+        index = 0
+        self.running = True
+        window_start = next_poll = time.perf_counter()
+        while self.running:
+            try:
+                # 反馈是异步到达的，每次接收后检查所有电机的反馈计数
+                self.motor_control.refresh_motor_status(motors[index])
+                polls[index] += 1
+                now = time.time()
+                for k, motor in enumerate(motors):
+                    if motor.recv_count != seen[k]:
+                        replies[k] += motor.recv_count - seen[k]
+                        seen[k] = motor.recv_count
+                        self.samples[k].append(now, motor.getPosition(), motor.getVelocity(), motor.getTorque(),
+                                               motor.getT_MOS(), motor.getT_Rotor())
+                self.error = None
+            except Exception as e:
+                if self.error != str(e):
+                    self.log_message.emit(f"多电机状态更新错误: {str(e)}")
+                self.error = str(e)
+            index = (index + 1) % n
+            
+            t = time.perf_counter()
+            if t - window_start >= self.ADAPT_PERIOD:
+                self._adapt(polls, replies, t - window_start)
+                polls = [0] * n
+                replies = [0] * n
+                window_start = t
+            
+            next_poll += 1.0 / (self.rate * n)
+            delay = next_poll - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_poll = time.perf_counter()
+    
+    def _adapt(self, polls, replies, elapsed):
+        """按上个周期的应答率调整轮询速率（加性增、乘性减）"""
+        self.reply_ratio = [min(r / p, 1.0) if p else 0.0 for r, p in zip(replies, polls)]
+        self.achieved_rate = sum(polls) / elapsed / len(polls)
+        self.bus_load = self.motor_control.bus_utilisation(reset=True)['load']
+        # 完全不应答的电机视为离线，不因为它拖慢其他电机
+        online = [ratio for ratio in self.reply_ratio if ratio > 0]
+        if online and min(online) < 0.9:
+            self.rate = max(self.rate * 0.7, self.MIN_HZ)
+        else:
+            self.rate = min(self.rate + 0.1 * self.max_rate, self.max_rate)
+    
+    def stop(self):
+        self.running = False
+        self.wait()
+        
+        if self.serial_device and self.serial_device.is_open:
+            self.serial_device.close()
+
+
+# 摩擦力识别工作线程
+class FrictionIdentifierThread(QThread):
+    update_progress = pyqtSignal(int, str)
+    update_plot = pyqtSignal(object, str)  # 绘图数据(dict), 图表类型
+    update_results = pyqtSignal(dict)
+    log_message = pyqtSignal(str)
+    test_completed = pyqtSignal()
+    
+    def __init__(self, params, test_type):
+        super().__init__()
+        self.params = params
+        self.test_type = test_type  # 'coulomb', 'static', 'comprehensive', 'static_map', 'thermal', 'inertia'
+        self.running = True
+        self.results = {}
+        self.plot_enabled = True  # 长时间循环测试时关闭每轮的过程绘图
+        self.capture_log = None   # 追加式采集日志，见 CaptureLogWriter
+        self.live_buffer = SampleRingBuffer()  # 界面实时曲线按帧率读取
+        self._live_start = time.time()
+        self._breakaway_run = 0
+        self._breakaway_direction = 0
+        self.supervisor = None
+        
+        # 检查参数
+        required_params = [
+            'motor_type', 'node_id', 'master_id', 'com_port', 'baud_rate',
+            'viscous_coeff', 'inertia', 'test_speeds', 'duration', 'settling_time',
+            'torque_increment', 'max_torque'
+        ]
+        
+        for param in required_params:
+            if param not in self.params:
+                self.log_message.emit(f"缺少参数: {param}")
+                return
+    
+    def setup_motor(self):
+        try:
+            # 初始化电机和串口
+            self.log_message.emit("正在连接电机...")
+            motor_type_dict = {
+                "DM4310": DM_Motor_Type.DM4310,
+                "DM4340": DM_Motor_Type.DM4340,
+                "DM6006": DM_Motor_Type.DM6006,
+                "DM8006": DM_Motor_Type.DM8006,
+                "DM8009": DM_Motor_Type.DM8009,
+                "DM10010L": DM_Motor_Type.DM10010L,
+                "DM10010": DM_Motor_Type.DM10010,
+            }
+            
+            motor_type = motor_type_dict.get(self.params['motor_type'], DM_Motor_Type.DM4310)
+            
+            self.motor = Motor(motor_type, self.params['node_id'], self.params['master_id'])
+            self.serial_device = serial.Serial(
+                self.params['com_port'], 
+                self.params['baud_rate'], 
+                timeout=0.5
+            )
+            # 可选：记录总线原始收发数据，之后可用 ReplaySerial 回放
+            capture_path = None
+            if self.params.get('bus_capture', False):
+                if not os.path.exists('friction_results'):
+                    os.makedirs('friction_results')
+                capture_path = os.path.join('friction_results', f"bus_{datetime.now().strftime('%Y%m%d_%H%M%S')}.dmcap")
+                self.results['bus_capture'] = capture_path
+                self.log_message.emit(f"总线抓包: {capture_path}")
+            self.motor_control = MotorControl(self.serial_device, capture_path=capture_path)
+            self.motor_control.addMotor(self.motor)
+            
+            #切换到MIT控制模式
+            current_mode = self.motor_control.read_motor_param(self.motor, DM_variable.CTRL_MODE)
+            if current_mode != 1:
+                self.log_message.emit("当前不是MIT模式，正在切换...")
+                if not self.motor_control.switchControlMode(self.motor, Control_Type.MIT):
+                    self.log_message.emit("MIT控制模式设置失败")
+                    return False
+                else:        
+                    self.log_message.emit("电机已切换到MIT模式")
+            else:
+                self.log_message.emit("电机已经是MIT模式")
+            
+            # 读取电机参数
+            motor_info = {
+                'sub_ver': self.motor_control.read_motor_param(self.motor, DM_variable.sub_ver),
+                'gear_ratio': self.motor_control.read_motor_param(self.motor, DM_variable.Gr),
+                'max_pos': self.motor_control.read_motor_param(self.motor, DM_variable.PMAX),
+                'max_vel': self.motor_control.read_motor_param(self.motor, DM_variable.VMAX),
+                'max_torque': self.motor_control.read_motor_param(self.motor, DM_variable.TMAX),
+                'sn': self.motor_control.read_motor_param(self.motor, DM_variable.SN),
+            }
+            
+            self.results['motor_info'] = motor_info
+            self.log_message.emit(f"电机连接成功, 版本: {motor_info['sub_ver']}, 最大力矩: {motor_info['max_torque']}N·m")
+            
+            # 安全监督：每帧反馈检查故障码和温度，违规立即失能并中止测试
+            self.supervisor = SafetySupervisor(
+                max_t_mos=self.params.get('max_t_mos', 80.0),
+                max_t_rotor=self.params.get('max_t_rotor', 100.0),
+                feedback_timeout=self.params.get('feedback_timeout', 0.1),
+                stall_timeout=self.params.get('stall_timeout', 1.0),
+                on_trip=self._on_safety_trip,
+            )
+            self.motor_control.attach_supervisor(self.supervisor)
+            
+            # 使能电机
+            self.motor_control.enable(self.motor)
+            time.sleep(0.5)  # 等待电机稳定
+            
+            return True
+        except Exception as e:
+            self.log_message.emit(f"电机连接失败: {str(e)}")
+            return False
+    
+    def _on_safety_trip(self, motor, reason):
+        """安全监督触发：电机已经失能，通知测试循环退出"""
+        self.running = False
+        self.log_message.emit(f"⚠️ 安全保护触发，电机已失能: {reason}")
+    
+    def _open_capture_log(self):
+        """创建本次测试的采集日志，测试中断后可用 recover_capture_log 恢复结果"""
+        try:
+            if not os.path.exists('friction_results'):
+                os.makedirs('friction_results')
+            path = os.path.join('friction_results', f"capture_{datetime.now().strftime('%Y%m%d_%H%M%S')}.dmlog")
+            q_max, dq_max, _ = self.motor_control.Limit_Param[self.motor.MotorType]
+            meta = {
+                'test_type': self.test_type,
+                'start_time': datetime.now().isoformat(),
+                'params': self.params,
+                'motor_info': self.results.get('motor_info', {}),
+                'pos_resolution': 2 * q_max / ((1 << 16) - 1),
+                'vel_resolution': 2 * dq_max / ((1 << 12) - 1),
+            }
+            self.capture_log = CaptureLogWriter(path, meta)
+            self.results['capture_log'] = path
+            self.log_message.emit(f"采集日志: {path}")
+        except Exception as e:
+            self.capture_log = None
+            self.log_message.emit(f"无法创建采集日志: {str(e)}")
+    
+    def _refresh(self, phase, cmd=0.0, index=0, direction=0, poll=True):
+        """刷新电机状态，把这次采样写入实时曲线缓冲区并追加到采集日志
+        :param poll: False 时不再单独查询，直接记录上一条控制命令应答中的反馈
+        """
+        if poll:
+            self.motor_control.refresh_motor_status(self.motor)
+        motor = self.motor
+        self.live_buffer.append(time.time() - self._live_start, motor.getPosition(), motor.getVelocity(),
+                                motor.getTorque())
+        if self.capture_log is not None:
+            self.capture_log.append(time.time(), phase, direction, index, cmd,
+                                    motor.getPosition(), motor.getVelocity(), motor.getTorque(),
+                                    motor.getT_MOS(), motor.getT_Rotor())
+    
+    def cleanup(self):
+        if self.capture_log is not None:
+            self.capture_log.close()
+            if self.capture_log.error is not None:
+                self.log_message.emit(f"警告: 采集日志写入失败，只保存了前 {self.capture_log.n_records} 条记录: "
+                                      f"{self.capture_log.error}")
+            else:
+                self.log_message.emit(f"采集日志已保存: {self.capture_log.n_records} 条记录")
+            self.capture_log = None
+        if getattr(self, 'motor_control', None) is not None:
+            self.motor_control.scheduler.release('control')
+            usage = self.motor_control.bus_utilisation()
+            self.log_message.emit(f"总线平均占用: {usage['load'] * 100:.1f}% "
+                                  f"(发送 {usage['tx_rate']:.0f} 帧/s，接收 {usage['rx_rate']:.0f} 帧/s)")
+        if self.supervisor is not None:
+            self.supervisor.stop()
+            latency = self.supervisor.latency_stats()
+            if latency['count']:
+                self.log_message.emit(f"命令到反馈延迟: 平均 {latency['mean_ms']:.1f} ms，最大 {latency['max_ms']:.1f} ms")
+        try:
+            if hasattr(self, 'motor_control') and hasattr(self, 'motor'):
+                self.motor_control.disable(self.motor)
+            
+            if hasattr(self, 'serial_device'):
+                self.serial_device.close()
+            
+            if hasattr(self, 'motor_control') and isinstance(self.motor_control.serial_, SerialCapture):
+                self.motor_control.serial_.close_capture()
+            
+            self.log_message.emit("已关闭电机连接")
+        except Exception as e:
+            self.log_message.emit(f"关闭连接时发生错误: {str(e)}")
+    
+    def run(self):
+        try:
+            # 设置电机连接
+            if not self.setup_motor():
+                self.cleanup()
+                return
+            
+            if self.params.get('capture_log', True):
+                self._open_capture_log()
+            
+            if self.params.get('batch'):
+                self.run_batch(self.params['batch'])
+            else:
+                self._run_tests()
+                # 发送最终结果
+                self.update_results.emit(self.results)
+            
+            if self.supervisor is not None and self.supervisor.tripped is not None:
+                self.log_message.emit(f"测试因安全保护中止: {self.supervisor.tripped}")
+            else:
+                self.log_message.emit("测试完成！")
+            
+        except Exception as e:
+            self.log_message.emit(f"测试过程中发生错误: {str(e)}")
+        finally:
+            self.cleanup()
+            self.test_completed.emit()
+    
+    def _reserve_bus_rate(self):
+        """在总线预算中登记本次测试的控制流，带宽不足时降低采样率
+        惯量辨识每个采样只有一次控制命令收发，其余测试每个采样是控制命令加一次状态查询。
+        """
+        if self.test_type == 'inertia':
+            key, requests_per_sample = 'inertia_sample_rate', 1
+            rate = self.params.get(key, 500.0)
+        else:
+            key, requests_per_sample = 'sample_rate', 2
+            rate = self.params.get(key, 100.0)
+        granted = self.motor_control.scheduler.request_rate('control', rate * requests_per_sample)
+        if granted < rate * requests_per_sample:
+            self.params[key] = granted / requests_per_sample
+            self.log_message.emit(f"警告: 总线带宽不足，采样率由 {rate:g} Hz 降为 {self.params[key]:.0f} Hz")
+    
+    def _run_tests(self):
+        """按测试类型执行测试并补全结果字段"""
+        self._reserve_bus_rate()
+        if self.test_type == 'coulomb' or self.test_type == 'comprehensive':
+            self.identify_coulomb_friction()
+        
+        if self.test_type == 'static' or self.test_type == 'comprehensive':
+            self.identify_static_friction()
+        
+        if self.test_type == 'static_map':
+            self.identify_static_friction_map()
+        
+        if self.test_type == 'thermal':
+            self.identify_thermal_friction()
+        
+        if self.test_type == 'inertia':
+            self.identify_rotor_inertia()
+        
+        if self.test_type in ('coulomb', 'static', 'comprehensive') and self.running:
+            if self.supervisor is None:
+                self.estimate_confidence()
+            else:
+                # 重采样期间不发送命令：先让电机空闲，再暂停控制循环看门狗
+                self.motor_control.controlMIT(self.motor, 0, 0, 0, 0, 0)
+                with self.supervisor.paused():
+                    self.estimate_confidence()
+        
+        # 更新结果
+        self.results['viscous_friction'] = self.params['viscous_coeff']
+        self.results.setdefault('inertia', self.params['inertia'])  # 惯量辨识时为辨识值
+        self.results['timestamp'] = datetime.now().isoformat()
+        self.results['test_type'] = self.test_type
+        self.results['params'] = {k: v for k, v in self.params.items() if k != 'batch'}
+        if self.supervisor is not None and self.supervisor.tripped is not None:
+            self.results['safety_trip'] = self.supervisor.tripped
+    
+    def estimate_confidence(self):
+        """对本次识别的各参数做自助法重采样，结果写入 results['confidence']"""
+        n_resamples = int(self.params.get('bootstrap_resamples', 10000))
+        level = self.params.get('confidence_level', 0.95)
+        if n_resamples <= 1:
+            return
+        rng = np.random.default_rng()
+        t_start = time.perf_counter()
+        dists = {}
+        censored = {}
+        
+        if 'coulomb_samples' in self.results:
+            dists.update(bootstrap_coulomb(self.results['coulomb_samples'], self.params['viscous_coeff'],
+                                           n_resamples, rng, self.params.get('coulomb_estimator', 'huber')))
+        
+        static_raw = self.results.get('static_raw_data', {})
+        pos_resolution, vel_resolution = self._feedback_resolution()
+        for side in ('pos', 'neg'):
+            raw = static_raw.get(side)
+            if raw is None or raw.get('method') != 'ramp' or self.results.get(f'static_friction_{side}') is None:
+                continue
+            dists[f'static_friction_{side}'], censored[side] = bootstrap_breakaway(
+                raw, self._detector, n_resamples, rng, pos_resolution, vel_resolution)
+        if 'static_friction_pos' in dists and 'static_friction_neg' in dists:
+            dists['static_friction'] = (dists['static_friction_pos'] + dists['static_friction_neg']) / 2.0
+        
+        if not dists:
+            return
+        confidence = {key: confidence_interval(dist, level) for key, dist in dists.items()}
+        self.results['confidence'] = confidence
+        
+        self.log_message.emit(f"\n=== 自助法 {level * 100:.0f}% 置信区间 ({n_resamples} 次重采样, "
+                              f"用时 {(time.perf_counter() - t_start) * 1000:.0f} ms) ===")
+        for key, ci in confidence.items():
+            self.log_message.emit(f"{key}: {self.results[key]:.5f} N·m, [{ci['low']:.5f}, {ci['high']:.5f}], σ={ci['std']:.5f}")
+        for side, count in censored.items():
+            if count:
+                self.log_message.emit(f"  {'正' if side == 'pos' else '负'}向静摩擦有 {count} 次重采样在记录内未触发，按最后力矩计")
+    
+    def run_batch(self, batch):
+        """在同一次连接中依次运行多组参数，每次运行单独发送结果，最后汇总重复性统计
+        :param batch: [(标签, 参数覆盖字典), ...]，见 parse_batch_spec
+        """
+        base_params = self.params
+        session = dict(self.results)  # 连接阶段得到的电机信息、采集日志路径
+        runs = []
+        t_start = time.time()
+        for i, (label, overrides) in enumerate(batch):
+            if not self.running:
+                break
+            self.log_message.emit(f"\n===== 批量测试 {i + 1}/{len(batch)}: {label} =====")
+            self.params = dict(base_params, **overrides)
+            self.results = dict(session, batch_label=label, batch_index=i)
+            self._run_tests()
+            self.update_results.emit(self.results)
+            runs.append(dict({key: self.results.get(key) for key in BATCH_METRICS}, label=label))
+        self.params = base_params
+        
+        if not runs:
+            return
+        stats = batch_statistics(runs)
+        self.log_message.emit(f"\n批量测试完成: {len(runs)}/{len(batch)} 次运行，用时 {time.time() - t_start:.1f} s")
+        for label, per_metric in stats.items():
+            self.log_message.emit(f"[{label}]")
+            for key, s in per_metric.items():
+                cv = f"{s['cv']:.1f}%" if s['cv'] is not None else "-"
+                self.log_message.emit(f"  {key}: n={s['n']} 均值={s['mean']:.5f} 标准差={s['std']:.5f} "
+                                      f"CV={cv} 极差={s['range']:.5f}")
+        
+        summary = {
+            'test_type': self.test_type,
+            'timestamp': datetime.now().isoformat(),
+            'motor_info': session.get('motor_info'),
+            'params': {k: v for k, v in base_params.items() if k != 'batch'},
+            'batch': [[label, overrides] for label, overrides in batch],
+            'runs': runs,
+            'stats': stats,
+        }
+        results_dir = "friction_results"
+        if not os.path.exists(results_dir):
+            os.makedirs(results_dir)
+        path = os.path.join(results_dir, f"batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+        try:
+            save_results_container(summary, path)
+            self.log_message.emit(f"批量统计已保存: {path}")
+        except Exception as e:
+            self.log_message.emit(f"保存批量统计失败: {str(e)}")
+    
+    def identify_coulomb_friction(self):
+        """识别库仑摩擦力矩"""
+        self.log_message.emit("\n开始库仑摩擦力矩识别...")
+        test_speeds = self.params['test_speeds']
+        duration = self.params['duration']
+        settling_time = self.params['settling_time']
+        
+        self.log_message.emit(f"将测试 {len(test_speeds)} 种不同速度，每种速度测试 {duration} 秒")
+        
+        # 数据存储
+        speeds = []
+        torques = []
+        sample_times = []     # 全速率原始采样
+        sample_speeds = []
+        sample_torques = []
+        sample_plateaus = []
+        sample_outliers = []
+        rejected = []         # 各平台剔除的离群点数
+        estimator = self.params.get('coulomb_estimator', 'huber')
+        outlier_k = self.params.get('outlier_k', 3.5)
+        sample_period = 1.0 / self.params.get('sample_rate', 100.0)
+        ripple = {}           # 各平台力矩纹波频谱，键为平台序号
+        test_start = time.time()
+        
+        kv = 0.5  # 速度反馈增益
+        
+        # 对每个测试速度进行测试
+        for i, target_speed in enumerate(test_speeds):
+            if not self.running:
+                self.log_message.emit("测试被中断")
+                return
+            
+            # 计算进度
+            progress = int((i / len(test_speeds)) * 100)
+            self.update_progress.emit(progress, "库仑摩擦识别")
+            
+            self.log_message.emit(f"\n[{i+1}/{len(test_speeds)}] 设置电机速度为 {target_speed:.2f} rad/s")
+            
+            # 开始时间
+            start_time = time.time()
+            collected_torques = []
+            collected_speeds = []
+            collected_times = []
+            
+            # 先让电机达到目标速度并稳定
+            self.log_message.emit(f"  电机加速中...")
+            while (time.time() - start_time) < settling_time and self.running:
+                # 速度控制模式 (零位置增益，只用速度反馈)
+                self.motor_control.controlMIT(self.motor, 0, kv, 0, target_speed, 0)
+                self._refresh(CapturePhase.COULOMB_SETTLE, target_speed, i)
+                time.sleep(0.01)
+            
+            if not self.running:
+                self.log_message.emit("测试被中断")
+                return
+            
+            self.log_message.emit(f"  开始收集数据...")
+            
+            # 在稳定后收集力矩数据
+            data_collection_start = time.time()
+            next_sample = time.perf_counter()
+            while (time.time() - data_collection_start) < duration and self.running:
+                # 保持速度控制
+                self.motor_control.controlMIT(self.motor, 0, kv, 0, target_speed, 0)
+                self._refresh(CapturePhase.COULOMB_COLLECT, target_speed, i)
+                
+                # 获取当前速度和力矩
+                current_speed = self.motor.getVelocity()
+                current_torque = self.motor.getTorque()
+                
+                # 存储数据
+                collected_speeds.append(current_speed)
+                collected_torques.append(current_torque)
+                collected_times.append(time.perf_counter())
+                sample_times.append(time.time() - test_start)
+                
+                # 固定采样周期，纹波频谱分析需要均匀采样；处理耗时超过周期时不追赶
+                next_sample += sample_period
+                delay = next_sample - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                else:
+                    next_sample = time.perf_counter()
+            
+            if not self.running:
+                self.log_message.emit("测试被中断")
+                return
+            
+            # 稳健估计平台力矩，速度取同一批非离群采样的均值
+            avg_torque, outliers = robust_location(collected_torques, estimator, outlier_k)
+            inliers = np.asarray(collected_torques)[~outliers]
+            avg_speed = np.mean(np.asarray(collected_speeds)[~outliers])
+            std_torque = np.std(inliers)
+            rejected.append(int(np.count_nonzero(outliers)))
+            
+            # 存储结果
+            speeds.append(avg_speed)
+            torques.append(avg_torque)
+            sample_speeds.extend(collected_speeds)
+            sample_torques.extend(collected_torques)
+            sample_plateaus.extend([i] * len(collected_torques))
+            sample_outliers.extend(outliers)
+            
+            self.log_message.emit(f"  速度 {avg_speed:.3f} rad/s 的平均力矩: {avg_torque:.5f} ± {std_torque:.5f} N·m"
+                                  + (f" (剔除 {rejected[-1]}/{len(collected_torques)} 个离群点)" if rejected[-1] else ""))
+            
+            # 力矩纹波频谱，离群尖峰用插值补齐以免污染频谱
+            spectrum = torque_ripple_spectrum(np.asarray(collected_times)[~outliers], inliers, avg_speed,
+                                              self.params.get('ripple_nperseg', 256))
+            if spectrum is not None:
+                spectrum['speed'] = float(avg_speed)
+                ripple[str(i)] = spectrum
+                peaks = ", ".join(f"{f:.2f} Hz" + (f" (×{order:.1f})" if order is not None else "") + f" {a:.5f}"
+                                  for f, order, a in spectrum['peaks'][:3])
+                self.log_message.emit(f"  纹波 RMS {spectrum['rms']:.5f} N·m，采样 {spectrum['fs']:.0f} Hz "
+                                      f"(抖动 {spectrum['jitter'] * 1000:.2f} ms)，主要谱峰: {peaks}")
+        
+        # 数据分析
+        self.update_progress.emit(90, "库仑摩擦识别")
+        self.log_message.emit("分析测试数据...")
+        
+        # 转换为numpy数组
+        speeds = np.array(speeds)
+        torques = np.array(torques)
+        
+        # 分离正负速度数据，去除粘滞摩擦影响后求平均
+        viscous_coeff = self.params['viscous_coeff']
+        T_coulomb_pos, T_coulomb_neg = analyze_coulomb(speeds, torques, viscous_coeff)
+        
+        if T_coulomb_pos is None:
+            T_coulomb_pos = 0
+            self.log_message.emit("警告: 正方向速度数据不足，无法准确估计正方向库仑摩擦")
+        
+        if T_coulomb_neg is None:
+            T_coulomb_neg = 0
+            self.log_message.emit("警告: 负方向速度数据不足，无法准确估计负方向库仑摩擦")
+        
+        # 计算平均库仑摩擦力矩
+        T_coulomb = (T_coulomb_pos + T_coulomb_neg) / 2.0
+        
+        # 绘图
+        if self.plot_enabled:
+            self._plot_coulomb_friction(speeds, torques, T_coulomb_pos, T_coulomb_neg, viscous_coeff)
+        
+        # 更新结果
+        self.results['coulomb_friction'] = float(T_coulomb)
+        self.results['coulomb_friction_pos'] = float(T_coulomb_pos)
+        self.results['coulomb_friction_neg'] = float(T_coulomb_neg)
+        self.results['coulomb_raw_data'] = {
+            'speeds': speeds,
+            'torques': torques
+        }
+        self.results['coulomb_samples'] = {
+            'time': np.asarray(sample_times),
+            'speed': np.asarray(sample_speeds),
+            'torque': np.asarray(sample_torques),
+            'plateau': np.asarray(sample_plateaus, dtype=np.int32),
+            'outlier': np.asarray(sample_outliers, dtype=np.uint8),
+        }
+        self.results['coulomb_estimator'] = estimator
+        self.results['coulomb_rejected'] = rejected
+        self.results['coulomb_ripple'] = ripple
+        
+        self.log_message.emit("\n=== 库仑摩擦力矩识别结果 ===")
+        self.log_message.emit(f"正方向库仑摩擦: {T_coulomb_pos:.5f} N·m")
+        self.log_message.emit(f"负方向库仑摩擦: {T_coulomb_neg:.5f} N·m")
+        self.log_message.emit(f"平均库仑摩擦力矩: {T_coulomb:.5f} N·m")
+        self.log_message.emit(f"平台力矩估计: {estimator}，共剔除 {sum(rejected)}/{len(sample_torques)} 个离群点")
+        
+        # 完成
+        self.update_progress.emit(100, "库仑摩擦识别")
+    
+    def identify_static_friction(self):
+        """识别静摩擦力矩"""
+        self.log_message.emit("\n开始静摩擦力矩识别...")
+        max_torque = self.params['max_torque']
+        test_directions = [1, -1]  # 正向和负向测试
+        self._detector = BreakawayDetector()
+        
+        # 数据存储
+        static_results = []
+        
+        for i, direction in enumerate(test_directions):
+            if not self.running:
+                self.log_message.emit("测试被中断")
+                return
+            
+            # 进度
+            progress = int((i / len(test_directions)) * 100)
+            self.update_progress.emit(progress, "静摩擦识别")
+            
+            direction_str = "正向" if direction > 0 else "负向"
+            self.log_message.emit(f"\n测试{direction_str}静摩擦...")
+            
+            result = self._measure_breakaway(direction, direction_str, progress, len(test_directions))
+            if result is None or not self.running:
+                self.log_message.emit("测试被中断")
+                return
+            breakaway_torque, time_data, torque_data, velocity_data, pos_data = result
+            
+            # 记录结果
+            if not np.isnan(breakaway_torque):
+                self.log_message.emit(f"  检测到开始移动! 脱离力矩: {breakaway_torque:.5f} N·m")
+                static_results.append((direction, breakaway_torque))
+            else:
+                self.log_message.emit(f"  未检测到明确的移动，达到最大测试力矩: {max_torque} N·m")
+                static_results.append((direction, np.nan))
+            
+            # 保存原始曲线
+            self.results.setdefault('static_raw_data', {})['pos' if direction > 0 else 'neg'] = {
+                'time': np.asarray(time_data),
+                'torque': np.asarray(torque_data),
+                'velocity': np.asarray(velocity_data),
+                'position': np.asarray(pos_data),
+                'noise_position': self._noise_samples[0],
+                'noise_velocity': self._noise_samples[1],
+                'ref_position': self._detector.ref_pos,
+                'direction': direction,
+                'method': self.params.get('static_method', 'ramp'),
+            }
+            
+            # 绘制测试过程图
+            if self.plot_enabled:
+                self._plot_static_test(time_data, torque_data, velocity_data, pos_data, direction_str,
+                                       breakaway_torque, self._detector.vel_mean, self._detector.velocity_threshold())
+            
+            # 停止电机
+            self.motor_control.controlMIT(self.motor, 0, 0, 0, 0, 0)
+            time.sleep(0.5)
+        
+        # 分析结果
+        T_static_pos = next((t for d, t in static_results if d > 0), np.nan)
+        T_static_neg = next((t for d, t in static_results if d < 0), np.nan)
+        
+        if not np.isnan(T_static_pos) and not np.isnan(T_static_neg):
+            T_static = (T_static_pos + T_static_neg) / 2.0
+        elif not np.isnan(T_static_pos):
+            T_static = T_static_pos
+        elif not np.isnan(T_static_neg):
+            T_static = T_static_neg
+        else:
+            T_static = np.nan
+        
+        # 更新结果
+        self.results['static_friction'] = float(T_static) if not np.isnan(T_static) else None
+        self.results['static_friction_pos'] = float(T_static_pos) if not np.isnan(T_static_pos) else None
+        self.results['static_friction_neg'] = float(T_static_neg) if not np.isnan(T_static_neg) else None
+        
+        self.log_message.emit("\n=== 静摩擦力矩识别结果 ===")
+        self.log_message.emit(f"正方向静摩擦: {T_static_pos:.5f} N·m" if not np.isnan(T_static_pos) else "正方向静摩擦: 识别失败")
+        self.log_message.emit(f"负方向静摩擦: {T_static_neg:.5f} N·m" if not np.isnan(T_static_neg) else "负方向静摩擦: 识别失败")
+        self.log_message.emit(f"平均静摩擦力矩: {T_static:.5f} N·m" if not np.isnan(T_static) else "平均静摩擦力矩: 识别失败")
+        
+        # 完成
+        self.update_progress.emit(100, "静摩擦识别")
+    
+    def identify_static_friction_map(self):
+        """在一整圈内的多个位置识别正反向静摩擦，生成按角度索引的静摩擦表
+        结果单独归档，导出补偿表时与同一电机最近的库仑摩擦识别结果合并成角度×速度表
+        """
+        n_positions = max(int(self.params.get('map_positions', 8)), 2)
+        self.log_message.emit(f"\n开始静摩擦角度映射: 一圈 {n_positions} 个位置, 正反两个方向...")
+        self._detector = BreakawayDetector()
+        
+        # 一整圈均匀分布的测试位置
+        angles = np.linspace(-np.pi, np.pi, n_positions, endpoint=False)
+        
+        # 只选择起始端：从离当前位置较近的一端开始，单向扫到另一端
+        self.motor_control.refresh_motor_status(self.motor)
+        start_pos = self.motor.getPosition()
+        if abs(start_pos - angles[-1]) < abs(start_pos - angles[0]):
+            order = angles[::-1]
+        else:
+            order = angles
+        
+        breakaway = {}  # 位置 -> {方向: 脱离力矩}
+        n_steps = 2 * n_positions
+        for i, target_pos in enumerate(order):
+            breakaway[target_pos] = {}
+            for j, direction in enumerate((1, -1)):
+                if not self.running:
+                    self.log_message.emit("测试被中断")
+                    return
+                
+                progress = int((2 * i + j) / n_steps * 100)
+                self.update_progress.emit(progress, f"静摩擦映射 {i + 1}/{n_positions}")
+                direction_str = "正向" if direction > 0 else "负向"
+                self.log_message.emit(f"\n[{i + 1}/{n_positions}] 位置 {target_pos:.4f} rad, {direction_str}静摩擦...")
+                
+                result = self._measure_breakaway(direction, direction_str, progress, n_steps, target_pos)
+                if result is None or not self.running:
+                    self.log_message.emit("测试被中断")
+                    return
+                
+                breakaway_torque = result[0]
+                breakaway[target_pos][direction] = breakaway_torque
+                if not np.isnan(breakaway_torque):
+                    self.log_message.emit(f"  脱离力矩: {breakaway_torque:.5f} N·m")
+                else:
+                    self.log_message.emit("  未检测到明确的移动")
+                
+                self.motor_control.controlMIT(self.motor, 0, 0, 0, 0, 0)
+        
+        # 生成按机械角度 [0, 2π) 升序的查找表
+        table_angles = np.mod(angles, 2 * np.pi)
+        sort_idx = np.argsort(table_angles)
+        table_angles = table_angles[sort_idx]
+        pos_values = np.array([breakaway[a][1] for a in angles])[sort_idx]
+        neg_values = np.array([breakaway[a][-1] for a in angles])[sort_idx]
+        
+        def _to_list(values):
+            return [float(v) if not np.isnan(v) else None for v in values]
+        
+        self.results['static_friction_map'] = {
+            'angles': table_angles.tolist(),
+            'pos': _to_list(pos_values),
+            'neg': _to_list(neg_values),
+        }
+        
+        # 各角度平均值作为整体静摩擦
+        def _nanmean(values):
+            values = np.asarray(values, dtype=float)
+            return float(np.nanmean(values)) if np.any(~np.isnan(values)) else np.nan
+        
+        T_static_pos = _nanmean(pos_values)
+        T_static_neg = _nanmean(neg_values)
+        T_static = _nanmean([T_static_pos, T_static_neg])
+        self.results['static_friction'] = float(T_static) if not np.isnan(T_static) else None
+        self.results['static_friction_pos'] = float(T_static_pos) if not np.isnan(T_static_pos) else None
+        self.results['static_friction_neg'] = float(T_static_neg) if not np.isnan(T_static_neg) else None
+        
+        self._plot_static_map(table_angles, pos_values, neg_values)
+        
+        self.log_message.emit("\n=== 静摩擦角度映射结果 ===")
+        for a, tp, tn in zip(table_angles, pos_values, neg_values):
+            self.log_message.emit(f"  {np.degrees(a):6.1f}°: 正向 {tp:.5f} N·m, 负向 {tn:.5f} N·m")
+        self.log_message.emit(f"平均静摩擦力矩: {T_static:.5f} N·m" if not np.isnan(T_static) else "平均静摩擦力矩: 识别失败")
+        
+        self.update_progress.emit(100, "静摩擦映射")
+    
+    def identify_rotor_inertia(self):
+        """惯量辨识：速度控制下做正反向阶跃或线性调频正弦激励，按固定周期记录速度/力矩后回归惯量
+        电机内部速度环远快于采样，理想阶跃的加速过程采不到，因此阶跃按给定加速度斜坡过渡；
+        速度指令按采样周期阶梯更新，周期越长阶梯引起的力矩偏差越大，所以默认采样率高于库仑测试。
+        """
+        excitation = self.params.get('inertia_excitation', 'step')
+        amplitude = self.params.get('inertia_speed', max(abs(s) for s in self.params['test_speeds']))
+        hold = self.params.get('inertia_hold', 0.5)
+        accel = self.params.get('inertia_accel', 4.0 * amplitude / hold)  # 默认斜坡占每段的一半
+        total = self.params.get('inertia_duration', 2 * int(self.params.get('inertia_cycles', 3)) * hold)
+        f0, f1 = self.params.get('inertia_chirp_band', (0.5, 5.0))
+        sample_period = 1.0 / self.params.get('inertia_sample_rate', 500.0)
+        kv = 0.5  # 速度反馈增益，与库仑摩擦测试一致
+        
+        def target_speed(elapsed):
+            if excitation == 'chirp':
+                # 频率从 f0 线性增加到 f1
+                return amplitude * np.sin(2 * np.pi * (f0 * elapsed + 0.5 * (f1 - f0) / total * elapsed ** 2))
+            segment = int(elapsed // hold)
+            sign = 1 if segment % 2 == 0 else -1
+            level = -sign * amplitude if segment > 0 else 0.0
+            return float(np.clip(level + sign * accel * (elapsed - segment * hold), -amplitude, amplitude))
+        
+        if excitation == 'chirp':
+            description = f"线性调频 {f0:g}-{f1:g} Hz，幅值 {amplitude:g} rad/s"
+        else:
+            description = f"±{amplitude:g} rad/s 斜坡阶跃，加速度 {accel:g} rad/s²，每段 {hold:g} s"
+        self.log_message.emit(f"\n开始惯量辨识: {description}，共 {total:g} s")
+        
+        times, speeds, torques = [], [], []
+        start = next_sample = time.perf_counter()
+        last_progress = -1
+        while self.running:
+            elapsed = time.perf_counter() - start
+            if elapsed >= total:
+                break
+            command = target_speed(elapsed)
+            # 控制命令的应答已包含反馈，不再单独查询，省去一次收发
+            self.motor_control.controlMIT(self.motor, 0, kv, 0, command, 0)
+            self._refresh(CapturePhase.INERTIA, command, poll=False)
+            times.append(time.perf_counter())
+            speeds.append(self.motor.getVelocity())
+            torques.append(self.motor.getTorque())
+            
+            progress = int(elapsed / total * 90)
+            if progress != last_progress:
+                self.update_progress.emit(progress, "惯量辨识")
+                last_progress = progress
+            
+            # 固定采样周期，处理耗时超过周期时不追赶
+            next_sample += sample_period
+            delay = next_sample - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_sample = time.perf_counter()
+        
+        # 减速到零
+        stop_start = time.time()
+        while (time.time() - stop_start) < self.params['settling_time'] and self.running:
+            self.motor_control.controlMIT(self.motor, 0, kv, 0, 0, 0)
+            self._refresh(CapturePhase.INERTIA, 0.0)
+            time.sleep(0.01)
+        
+        if not self.running:
+            self.log_message.emit("测试被中断")
+            return
+        
+        if len(times) > 1:
+            achieved = 1.0 / float(np.median(np.diff(times)))
+            self.log_message.emit(f"实际采样率: {achieved:.0f} Hz (设定 {1.0 / sample_period:.0f} Hz)")
+        
+        self.update_progress.emit(95, "惯量辨识")
+        fit = fit_inertia(np.asarray(times) - times[0] if times else [], speeds, torques, self.params['viscous_coeff'],
+                          window=self.params.get('inertia_filter_window', 0.05))
+        if fit is None:
+            self.log_message.emit("警告: 有效运动数据不足，无法辨识惯量")
+            return
+        
+        # 拟合失败（惯量非正或拟合优度差）时保留原设定，辨识值只记录在 inertia_fit 中
+        min_r2 = self.params.get('inertia_min_r2', 0.8)
+        accepted = fit['inertia'] > 0 and fit['r2'] is not None and fit['r2'] >= min_r2
+        if accepted:
+            self.results['inertia'] = fit['inertia']
+        self.results['inertia_fit'] = {key: value for key, value in fit.items() if not isinstance(value, np.ndarray)}
+        self.results['inertia_fit']['excitation'] = excitation
+        self.results['inertia_fit']['prior'] = self.params['inertia']
+        self.results['inertia_fit']['accepted'] = accepted
+        self.results['inertia_samples'] = {
+            'time': np.asarray(times) - times[0],
+            'speed': np.asarray(speeds),
+            'torque': np.asarray(torques),
+        }
+        
+        if self.plot_enabled:
+            self._plot_inertia(fit)
+        
+        r2 = f"{fit['r2']:.4f}" if fit['r2'] is not None else "-"
+        self.log_message.emit("\n=== 惯量辨识结果 ===")
+        self.log_message.emit(f"转子惯量: {fit['inertia']:.4e} kg·m² (原设定 {self.params['inertia']:.4e} kg·m²)")
+        self.log_message.emit(f"拟合优度 R²: {r2}，残差 RMS {fit['residual_rms']:.5f} N·m，"
+                              f"{fit['n_samples']} 个运动采样，加速度 RMS {fit['accel_rms']:.1f} rad/s²")
+        self.log_message.emit(f"同时拟合的库仑摩擦: 正向 {fit['coulomb_pos']:.5f} N·m，负向 {fit['coulomb_neg']:.5f} N·m")
+        if not accepted:
+            self.log_message.emit(f"警告: 辨识惯量非正或 R² 低于 {min_r2:g}，结果不可信，保留原设定 "
+                                  f"{self.params['inertia']:.4e} kg·m²")
+        self.update_progress.emit(100, "惯量辨识")
+    
+    def identify_thermal_friction(self):
+        """温升摩擦特性：电机逐渐升温过程中循环识别库仑/静摩擦，按线圈温度分箱并拟合摩擦-温度关系
+        每轮结果立即追加写入CSV文件，内存中不保留历史数据，适合数小时的温升测试。
+        """
+        max_duration = self.params.get('thermal_duration', 3600.0)
+        target_temp = self.params.get('thermal_target_temp', 70.0)
+        bin_width = self.params.get('thermal_bin_width', 5.0)
+        heat_time = self.params.get('thermal_heat_time', 60.0)
+        heat_speed = self.params.get('thermal_heat_speed', max(abs(s) for s in self.params['test_speeds']))
+        
+        if not os.path.exists('friction_results'):
+            os.makedirs('friction_results')
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        stream_path = os.path.join('friction_results', f"thermal_{timestamp}.csv")
+        result_keys = ['coulomb_friction', 'coulomb_friction_pos', 'coulomb_friction_neg',
+                       'static_friction', 'static_friction_pos', 'static_friction_neg']
+        columns = ['elapsed', 't_rotor', 't_mos'] + [key.replace('_friction', '') for key in result_keys]
+        
+        self.log_message.emit(f"\n开始温升摩擦测试: 最长 {max_duration / 60:.0f} min, 目标线圈温度 {target_temp:.0f} ℃")
+        self.log_message.emit(f"数据实时写入: {stream_path}")
+        
+        self.plot_enabled = False
+        start_time = time.time()
+        n_cycles = 0
+        with open(stream_path, 'w', encoding='utf-8', newline='') as stream:
+            stream.write(",".join(columns) + "\n")
+            stream.flush()
+            
+            while self.running and (time.time() - start_time) < max_duration:
+                t_rotor_before, t_mos_before = self._read_temperatures()
+                self.log_message.emit(f"\n===== 温升循环 {n_cycles + 1}: 线圈 {t_rotor_before:.0f} ℃, MOS {t_mos_before:.0f} ℃ =====")
+                
+                for key in result_keys:
+                    self.results.pop(key, None)
+                self.identify_coulomb_friction()
+                if not self.running:
+                    break
+                self.identify_static_friction()
+                if not self.running:
+                    break
+                
+                # 本轮温度取前后平均
+                t_rotor_after, t_mos_after = self._read_temperatures()
+                row = [time.time() - start_time,
+                       (t_rotor_before + t_rotor_after) / 2.0,
+                       (t_mos_before + t_mos_after) / 2.0]
+                for key in result_keys:
+                    value = self.results.get(key)
+                    row.append(np.nan if value is None else value)
+                stream.write(",".join(f"{v:.6g}" for v in row) + "\n")
+                stream.flush()
+                n_cycles += 1
+                
+                self.update_progress.emit(min(int(max(t_rotor_after / target_temp, (time.time() - start_time) / max_duration) * 100), 99),
+                                          f"温升循环 {n_cycles}")
+                if t_rotor_after >= target_temp:
+                    self.log_message.emit(f"线圈温度已达到目标 {target_temp:.0f} ℃")
+                    break
+                
+                # 两轮之间持续转动升温
+                self._heat_motor(heat_speed, heat_time)
+        
+        self.plot_enabled = True
+        if n_cycles == 0:
+            self.log_message.emit("温升测试没有完成任何循环")
+            return
+        
+        # 从文件读回各轮结果，按线圈温度分箱并拟合
+        data = np.atleast_2d(np.genfromtxt(stream_path, delimiter=',', skip_header=1))
+        t_rotor = data[:, 1]
+        bins = np.floor(t_rotor / bin_width) * bin_width
+        bin_centers, bin_index = np.unique(bins, return_inverse=True)
+        counts = np.bincount(bin_index)
+        
+        thermal = {
+            'stream_file': stream_path,
+            'n_cycles': int(n_cycles),
+            'bin_width': float(bin_width),
+            'bin_temps': (bin_centers + bin_width / 2.0).tolist(),
+            'bin_counts': counts.tolist(),
+            'bins': {},
+            'fit': {},
+        }
+        for col, name in enumerate(columns[3:], start=3):
+            values = data[:, col]
+            valid = ~np.isnan(values)
+            sums = np.bincount(bin_index[valid], weights=values[valid], minlength=len(bin_centers))
+            n_valid = np.bincount(bin_index[valid], minlength=len(bin_centers))
+            means = np.where(n_valid > 0, sums / np.maximum(n_valid, 1), np.nan)
+            thermal['bins'][name] = [float(v) if not np.isnan(v) else None for v in means]
+            # 线性拟合 摩擦 = intercept + slope * T_rotor
+            if np.count_nonzero(valid) >= 2 and np.ptp(t_rotor[valid]) > 0:
+                slope, intercept = np.polyfit(t_rotor[valid], values[valid], 1)
+                thermal['fit'][name] = {'slope': float(slope), 'intercept': float(intercept)}
+        self.results['thermal'] = thermal
+        
+        self.log_message.emit("\n=== 温升摩擦测试结果 ===")
+        self.log_message.emit(f"共 {n_cycles} 轮，线圈温度 {np.min(t_rotor):.0f} ~ {np.max(t_rotor):.0f} ℃")
+        for name in ('coulomb', 'static'):
+            if name in thermal['fit']:
+                fit = thermal['fit'][name]
+                self.log_message.emit(f"{name}: {fit['intercept']:.5f} + {fit['slope']:.6f}·T N·m")
+        
+        self._plot_thermal(data[:, 1], data[:, 3], data[:, 6], thermal)
+        self.update_progress.emit(100, "温升摩擦测试")
+    
+    def _read_temperatures(self):
+        """读取当前线圈温度和MOS温度"""
+        self.motor_control.refresh_motor_status(self.motor)
+        return self.motor.getT_Rotor(), self.motor.getT_MOS()
+    
+    def _heat_motor(self, speed, duration):
+        """以恒定速度转动电机升温，温度超过安全阈值时提前停止"""
+        self.log_message.emit(f"  升温: 以 {speed:.2f} rad/s 转动 {duration:.0f} s...")
+        kv = 0.5
+        start_time = time.time()
+        while (time.time() - start_time) < duration and self.running:
+            self.motor_control.controlMIT(self.motor, 0, kv, 0, speed, 0)
+            self._refresh(CapturePhase.HEAT, speed)
+            if self.motor.getT_MOS() > 80 or self.motor.getT_Rotor() > 100:
+                self.log_message.emit("  温度超过安全阈值，停止升温")
+                self.running = False
+                break
+            time.sleep(0.01)
+        self.motor_control.controlMIT(self.motor, 0, 0, 0, 0, 0)
+    
+    def _measure_breakaway(self, direction, direction_str, progress, n_steps, target_pos=0.0):
+        """在目标位置测量一次脱离力矩：重置位置、静置、估计噪声底后按配置的方式搜索
+        :return: (脱离力矩或nan, 时间, 力矩, 速度, 位置)，被中断时返回 None
+        """
+        # 先重置到指定位置
+        self._reset_position(target_pos)
+        if not self.running:
+            return None
+        
+        # 采集日志中用序号区分每次测量
+        self._breakaway_run += 1
+        self._breakaway_direction = direction
+        
+        time.sleep(0.5)  # 等待完全静止
+        
+        # 静止时估计噪声底，用于脱离检测
+        self._measure_noise_floor(0.5)
+        if not self.running:
+            return None
+        
+        # 记录初始位置
+        self.motor_control.refresh_motor_status(self.motor)
+        initial_pos = self.motor.getPosition()
+        self.log_message.emit(f"  初始位置: {initial_pos:.4f} rad")
+        
+        # 搜索脱离力矩
+        if self.params.get('static_method', 'ramp') == 'bisect':
+            return self._bisect_breakaway(direction, direction_str, progress, n_steps, target_pos)
+        return self._ramp_breakaway(direction, direction_str, progress, n_steps)
+    
+    def _ramp_breakaway(self, direction, direction_str, progress, n_directions):
+        """线性斜坡搜索脱离力矩：每10ms增加一次力矩直到检测到运动
+        :return: (脱离力矩或nan, 时间, 力矩, 速度, 位置) 记录数据
+        """
+        torque_increment = self.params['torque_increment']
+        max_torque = self.params['max_torque']
+        
+        # 缓慢增加力矩直到电机开始移动
+        current_torque = 0.0
+        start_time = time.time()
+        movement_detected = False
+        pos_data = []
+        torque_data = []
+        time_data = []
+        velocity_data = []
+        self.motor_control.refresh_motor_status(self.motor)
+        self._detector.arm(self.motor.getPosition(), direction)
+        
+        while not movement_detected and current_torque < max_torque and (time.time() - start_time) < 30 and self.running:
+            # 施加力矩
+            self.motor_control.controlMIT(self.motor, 0, 0, 0, 0, direction * current_torque)
+            
+            # 读取状态
+            self._refresh(CapturePhase.STATIC_RAMP, current_torque, self._breakaway_run, direction)
+            current_pos = self.motor.getPosition()
+            current_vel = self.motor.getVelocity()
+            elapsed = time.time() - start_time
+            
+            # 记录数据
+            pos_data.append(current_pos)
+            torque_data.append(current_torque)
+            time_data.append(elapsed)
+            velocity_data.append(current_vel)
+            
+            # 检查是否开始移动
+            if self._detector.update(current_pos, current_vel):
+                movement_detected = True
+                break
+            
+            # 增加力矩
+            current_torque += torque_increment
+            
+            # 限制采样率
+            time.sleep(0.01)
+            
+            # 每增加0.05N·m显示一次当前力矩
+            if int(current_torque * 1000) % 50 == 0:
+                self.log_message.emit(f"  当前测试力矩: {current_torque:.4f} N·m, 速度: {current_vel:.4f} rad/s")
+                # 更新小进度
+                mini_progress = min(int((current_torque / max_torque) * 100), 99)
+                self.update_progress.emit(
+                    progress + mini_progress // n_directions, 
+                    f"{direction_str}静摩擦识别"
+                )
+        
+        # CUSUM有检测延迟，取变化点处的力矩作为脱离力矩
+        breakaway_torque = torque_data[self._detector.change_index] if movement_detected else np.nan
+        return breakaway_torque, time_data, torque_data, velocity_data, pos_data
+    
+    def _bisect_breakaway(self, direction, direction_str, progress, n_directions, target_pos=0.0):
+        """粗扫 + 二分搜索脱离力矩
+        先以较大步长逐级施加并保持力矩，找到"不动/运动"的力矩区间；
+        再在区间内二分，每次探测前重置位置并静置，直到区间宽度不大于力矩增量。
+        :return: (脱离力矩或nan, 时间, 力矩, 速度, 位置) 记录数据
+        """
+        torque_increment = self.params['torque_increment']
+        max_torque = self.params['max_torque']
+        coarse_step = max(self.params.get('coarse_torque_step', max_torque / 20.0), torque_increment)
+        hold_time = self.params.get('probe_hold_time', 0.2)      # 每次探测保持力矩的时间
+        settle_time = self.params.get('probe_settle_time', 0.3)  # 重置后静置时间
+        
+        trace = ([], [], [], [])  # 时间, 力矩, 速度, 位置
+        start_time = time.time()
+        
+        # 粗扫：逐级增加力矩，未运动时不必重置
+        lower = 0.0
+        upper = None
+        level = coarse_step
+        while level <= max_torque + 1e-9 and self.running:
+            if self._probe_torque(direction, level, hold_time, start_time, trace):
+                upper = level
+                break
+            lower = level
+            mini_progress = min(int((level / max_torque) * 50), 49)
+            self.update_progress.emit(progress + mini_progress // n_directions, f"{direction_str}静摩擦粗扫")
+            level += coarse_step
+        
+        if upper is None or not self.running:
+            return (np.nan,) + trace
+        
+        self.log_message.emit(f"  粗扫区间: [{lower:.5f}, {upper:.5f}] N·m，开始二分搜索...")
+        
+        # 二分：每次探测前重置位置，消除上一次运动的影响
+        n_probes = 0
+        n_total = max(int(np.ceil(np.log2((upper - lower) / torque_increment))), 1)
+        while (upper - lower) > torque_increment and self.running:
+            self.motor_control.controlMIT(self.motor, 0, 0, 0, 0, 0)
+            self._reset_position(target_pos)
+            if not self.running:
+                break
+            time.sleep(settle_time)
+            
+            mid = 0.5 * (lower + upper)
+            moved = self._probe_torque(direction, mid, hold_time, start_time, trace)
+            if moved:
+                upper = mid
+            else:
+                lower = mid
+            n_probes += 1
+            
+            self.log_message.emit(f"  探测 {n_probes}/{n_total}: {mid:.5f} N·m -> {'运动' if moved else '静止'}")
+            mini_progress = 50 + min(int(n_probes / n_total * 50), 49)
+            self.update_progress.emit(progress + mini_progress // n_directions, f"{direction_str}静摩擦二分")
+        
+        self.log_message.emit(f"  二分搜索完成: {n_probes} 次探测，用时 {time.time() - start_time:.1f} s")
+        return (upper,) + trace
+    
+    def _probe_torque(self, direction, torque, hold_time, start_time, trace):
+        """施加恒定力矩并保持 hold_time 秒，返回期间是否检测到运动"""
+        time_data, torque_data, velocity_data, pos_data = trace
+        self._detector.arm(self.motor.getPosition(), direction)
+        
+        probe_start = time.time()
+        while (time.time() - probe_start) < hold_time and self.running:
+            self.motor_control.controlMIT(self.motor, 0, 0, 0, 0, direction * torque)
+            self._refresh(CapturePhase.STATIC_PROBE, torque, self._breakaway_run, direction)
+            current_pos = self.motor.getPosition()
+            current_vel = self.motor.getVelocity()
+            
+            time_data.append(time.time() - start_time)
+            torque_data.append(torque)
+            velocity_data.append(current_vel)
+            pos_data.append(current_pos)
+            
+            if self._detector.update(current_pos, current_vel):
+                return True
+            time.sleep(0.01)
+        return False
+    
+    def _measure_noise_floor(self, duration=0.5):
+        """零力矩静止采样，估计位置/速度噪声底"""
+        positions = []
+        velocities = []
+        start_time = time.time()
+        while (time.time() - start_time) < duration and self.running:
+            self.motor_control.controlMIT(self.motor, 0, 0, 0, 0, 0)
+            self._refresh(CapturePhase.NOISE_FLOOR, 0.0, self._breakaway_run, self._breakaway_direction)
+            positions.append(self.motor.getPosition())
+            velocities.append(self.motor.getVelocity())
+            time.sleep(0.01)
+        
+        # 反馈帧的量化分辨率作为噪声下限：位置16位，速度12位
+        pos_resolution, vel_resolution = self._feedback_resolution()
+        self._detector.estimate_noise(positions, velocities,
+                                      pos_resolution=pos_resolution, vel_resolution=vel_resolution)
+        self._noise_samples = (np.asarray(positions), np.asarray(velocities))  # 自助法重采样用
+        self.log_message.emit(
+            f"  噪声底: 位置σ={self._detector.pos_sigma:.5f} rad, 速度σ={self._detector.vel_sigma:.4f} rad/s, "
+            f"速度偏置={self._detector.vel_mean:.4f} rad/s"
+        )
+    
+    def _feedback_resolution(self):
+        """反馈帧的位置/速度量化分辨率"""
+        q_max, dq_max, _ = self.motor_control.Limit_Param[self.motor.MotorType]
+        return 2 * q_max / ((1 << 16) - 1), 2 * dq_max / ((1 << 12) - 1)
+    
+    def _reset_position(self, target_pos=0.0):
+        """重置电机到指定位置"""
+        self.log_message.emit(f"  重置电机位置到 {target_pos} rad...")
+        
+        # 获取当前位置
+        self.motor_control.refresh_motor_status(self.motor)
+        current_pos = self.motor.getPosition()
+        
+        # PD控制参数
+        kp = 5.0
+        kd = 0.5
+        
+        # 位置误差阈值
+        pos_threshold = 0.01  # rad
+        
+        # 最大尝试时间
+        max_time = 3.0  # 秒
+        start_time = time.time()
+        
+        while abs(current_pos - target_pos) > pos_threshold and (time.time() - start_time) < max_time and self.running:
+            # 控制电机
+            self.motor_control.controlMIT(self.motor, kp, kd, target_pos, 0, 0)
+            
+            # 更新位置
+            self._refresh(CapturePhase.RESET, target_pos)
+            current_pos = self.motor.getPosition()
+            
+            time.sleep(0.01)
+        
+        if not self.running:
+            return
+            
+        # 停止电机但保持位置
+        self.motor_control.controlMIT(self.motor, kp, kd, target_pos, 0, 0)
+        self.log_message.emit(f"  位置重置完成，当前位置: {current_pos:.4f} rad")
+    
+    def _emit_plot(self, plot_type, chart_class, data, filename, figsize=(12, 8)):
+        """把绘图数据发给界面的持久画布，并在本线程用独立的 Agg 画布导出 PNG"""
+        self.update_plot.emit(data, plot_type)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if self.supervisor is None:
+            render_chart_png(chart_class, data, f'{filename}_{timestamp}.png', figsize=figsize)
+            return
+        # 导出期间不收发，暂停控制循环看门狗
+        with self.supervisor.paused():
+            render_chart_png(chart_class, data, f'{filename}_{timestamp}.png', figsize=figsize)
+    
+    def _plot_coulomb_friction(self, speeds, torques, T_coulomb_pos, T_coulomb_neg, viscous_coeff):
+        """绘制库仑摩擦识别结果图"""
+        try:
+            data = {
+                'speeds': np.array(speeds, dtype=float),
+                'torques': np.array(torques, dtype=float),
+                'coulomb_pos': float(T_coulomb_pos),
+                'coulomb_neg': float(T_coulomb_neg),
+                'viscous_coeff': float(viscous_coeff),
+            }
+            self._emit_plot('coulomb_friction', CoulombChart, data, 'friction_coulomb')
+        except Exception as e:
+            self.log_message.emit(f"库仑摩擦绘图错误: {str(e)}")
+    
+    def _plot_static_test(self, time_data, torque_data, velocity_data, pos_data, direction, breakaway_torque=None,
+                          vel_offset=0.0, movement_threshold=0.05):
+        """绘制静摩擦测试过程图"""
+        try:
+            data = {
+                'time': np.array(time_data, dtype=float),
+                'torque': np.array(torque_data, dtype=float),
+                'velocity': np.array(velocity_data, dtype=float),
+                'position': np.array(pos_data, dtype=float),
+                'direction': direction,
+                'breakaway_torque': breakaway_torque,
+                'vel_offset': float(vel_offset),
+                'movement_threshold': float(movement_threshold),
+            }
+            self._emit_plot(f'static_friction_{direction}', StaticTestChart, data,
+                            f'friction_static_{direction}', figsize=(12, 10))
+        except Exception as e:
+            self.log_message.emit(f"静摩擦绘图错误: {str(e)}")
+    
+    def _plot_thermal(self, t_rotor, coulomb, static, thermal):
+        """绘制摩擦随线圈温度变化图"""
+        try:
+            data = {
+                't_rotor': np.array(t_rotor, dtype=float),
+                'coulomb': np.array(coulomb, dtype=float),
+                'static': np.array(static, dtype=float),
+                'fit': dict(thermal['fit']),
+            }
+            self._emit_plot('thermal', ThermalChart, data, 'friction_thermal')
+        except Exception as e:
+            self.log_message.emit(f"温升特性绘图错误: {str(e)}")
+    
+    def _plot_inertia(self, fit):
+        """绘制惯量辨识散点与拟合直线"""
+        try:
+            # 散点过多时等间隔抽取
+            step = max(len(fit['accel']) // 4000, 1)
+            data = {
+                'accel': fit['accel'][::step],
+                'inertial_torque': fit['inertial_torque'][::step],
+                'inertia': fit['inertia'],
+                'r2': fit['r2'],
+            }
+            self._emit_plot('inertia', InertiaChart, data, 'friction_inertia')
+        except Exception as e:
+            self.log_message.emit(f"惯量辨识绘图错误: {str(e)}")
+    
+    def _plot_static_map(self, angles, pos_values, neg_values):
+        """绘制静摩擦随转子角度变化图"""
+        try:
+            data = {
+                'angles': np.array(angles, dtype=float),
+                'pos': np.array(pos_values, dtype=float),
+                'neg': np.array(neg_values, dtype=float),
+            }
+            self._emit_plot('static_friction_map', StaticMapChart, data, 'friction_static_map')
+        except Exception as e:
+            self.log_message.emit(f"静摩擦映射绘图错误: {str(e)}")
+
+
+# 电机状态显示组件
+class MotorStatusWidget(QGroupBox):
+    def __init__(self):
+        super().__init__("电机实时状态")
+        self.setup_ui()
+        
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        
+        # 状态图标和文字
+        status_layout = QHBoxLayout()
+        self.status_icon_label = QLabel("❓")
+        self.status_icon_label.setStyleSheet("font-size: 16px;")
+        self.status_text_label = QLabel("未连接")
+        self.status_text_label.setStyleSheet("font-size: 12px; font-weight: bold;")
+        
+        status_layout.addWidget(self.status_icon_label)
+        status_layout.addWidget(self.status_text_label)
+        status_layout.addStretch()
+        
+        # 创建网格布局显示参数
+        params_layout = QGridLayout()
+        
+        # 位置
+        self.pos_label = QLabel("位置:")
+        self.pos_value = QLabel("0.000 rad")
+        self.pos_value.setStyleSheet("font-weight: bold; color: blue;")
+        params_layout.addWidget(self.pos_label, 0, 0)
+        params_layout.addWidget(self.pos_value, 0, 1)
+        
+        # 速度
+        self.vel_label = QLabel("速度:")
+        self.vel_value = QLabel("0.000 rad/s")
+        self.vel_value.setStyleSheet("font-weight: bold; color: green;")
+        params_layout.addWidget(self.vel_label, 0, 2)
+        params_layout.addWidget(self.vel_value, 0, 3)
+        
+        # 扭矩
+        self.torque_label = QLabel("扭矩:")
+        self.torque_value = QLabel("0.000 N·m")
+        self.torque_value.setStyleSheet("font-weight: bold; color: red;")
+        params_layout.addWidget(self.torque_label, 1, 0)
+        params_layout.addWidget(self.torque_value, 1, 1)
+        
+        # MOS温度
+        self.mos_temp_label = QLabel("MOS温度:")
+        self.mos_temp_value = QLabel("0.0 ℃")
+        self.mos_temp_value.setStyleSheet("font-weight: bold; color: orange;")
+        params_layout.addWidget(self.mos_temp_label, 1, 2)
+        params_layout.addWidget(self.mos_temp_value, 1, 3)
+        
+        # 电机温度
+        self.rotor_temp_label = QLabel("线圈温度:")
+        self.rotor_temp_value = QLabel("0.0 ℃")
+        self.rotor_temp_value.setStyleSheet("font-weight: bold; color: purple;")
+        params_layout.addWidget(self.rotor_temp_label, 2, 0)
+        params_layout.addWidget(self.rotor_temp_value, 2, 1)
+        
+        # 健康状态
+        self.health_label = QLabel("健康状态:")
+        self.health_value = QLabel("未知")
+        params_layout.addWidget(self.health_label, 2, 2)
+        params_layout.addWidget(self.health_value, 2, 3)
+        
+        # 最近一段时间的统计
+        self.stats_label = QLabel("")
+        self.stats_label.setStyleSheet("color: #555555; font-size: 11px;")
+        params_layout.addWidget(self.stats_label, 3, 0, 1, 4)
+        
+        layout.addLayout(status_layout)
+        layout.addLayout(params_layout)
+        self.setLayout(layout)
+    
+    @staticmethod
+    def status_from_values(position, velocity, torque, t_mos, t_rotor):
+        """根据反馈值判断电机状态，返回 update_status 使用的字典"""
+        # 检查是否已使能
+        is_enabled = abs(velocity) > 0.001 or abs(torque) > 0.001
+        
+        # 检查温度状态
+        has_temp_warning = t_mos > 60 or t_rotor > 80
+        has_temp_error = t_mos > 80 or t_rotor > 100
+        
+        # 判断状态
+        if has_temp_error:
+            status_icon, status_text = "🔥", "过温"
+        elif has_temp_warning:
+            status_icon, status_text = "⚠️", "温度警告"
+        elif is_enabled:
+            status_icon, status_text = "✅", "运行中"
+        else:
+            status_icon, status_text = "⭕", "待机"
+        
+        return {
+            'position': position,
+            'velocity': velocity,
+            'torque': torque,
+            't_mos': t_mos,
+            't_rotor': t_rotor,
+            'status': 1 if is_enabled else 0,
+            'status_text': status_text,
+            'status_icon': status_icon,
+            'is_healthy': not has_temp_error,
+            'has_error': has_temp_error
+        }
+    
+    def update_samples(self, data, window=10.0):
+        """用状态线程缓冲区的快照刷新显示：最新值 + 最近 window 秒的最小/平均/最大值"""
+        t = data['t']
+        if not len(t):
+            return
+        self.update_status(self.status_from_values(data['q'][-1], data['dq'][-1], data['tau'][-1],
+                                                   data['t_mos'][-1], data['t_rotor'][-1]))
+        
+        recent = t >= t[-1] - window
+        lines = []
+        for key, name, unit in (('dq', '速度', 'rad/s'), ('tau', '扭矩', 'N·m')):
+            values = data[key][recent]
+            lines.append(f"{name} {values.min():.3f} / {values.mean():.3f} / {values.max():.3f} {unit}")
+        span = t[-1] - t[recent][0]
+        rate = (np.count_nonzero(recent) - 1) / span if span > 0 else 0.0
+        self._set_text(self.stats_label, f"近{window:.0f}s 最小/平均/最大: " + "；".join(lines) + f"；轮询 {rate:.0f} Hz")
+    
+    def show_error(self):
+        """状态线程读取失败时的显示"""
+        self._set_text(self.status_icon_label, "❌")
+        self._set_text(self.status_text_label, "连接错误")
+        self._set_text(self.health_value, "异常")
+        self._set_style(self.health_value, "font-weight: bold; color: red;")
+    
+    @staticmethod
+    def _set_text(label, text):
+        if label.text() != text:
+            label.setText(text)
+    
+    @staticmethod
+    def _set_style(label, style):
+        # setStyleSheet 会触发重新计算样式，只在变化时调用
+        if label.styleSheet() != style:
+            label.setStyleSheet(style)
+    
+    def update_status(self, status_data):
+        """更新状态显示"""
+        self._set_text(self.status_icon_label, status_data['status_icon'])
+        self._set_text(self.status_text_label, status_data['status_text'])
+        
+        self._set_text(self.pos_value, f"{status_data['position']:.3f} rad")
+        self._set_text(self.vel_value, f"{status_data['velocity']:.3f} rad/s")
+        self._set_text(self.torque_value, f"{status_data['torque']:.3f} N·m")
+        self._set_text(self.mos_temp_value, f"{status_data['t_mos']:.1f} ℃")
+        self._set_text(self.rotor_temp_value, f"{status_data['t_rotor']:.1f} ℃")
+        
+        # 更新健康状态
+        if status_data['has_error']:
+            self._set_text(self.health_value, "异常")
+            self._set_style(self.health_value, "font-weight: bold; color: red;")
+        elif status_data['is_healthy']:
+            self._set_text(self.health_value, "正常")
+            self._set_style(self.health_value, "font-weight: bold; color: green;")
+        else:
+            self._set_text(self.health_value, "未知")
+            self._set_style(self.health_value, "font-weight: bold; color: gray;")
+        
+        # 根据温度改变颜色
+        if status_data['t_mos'] > 60:
+            self._set_style(self.mos_temp_value, "font-weight: bold; color: red;")
+        elif status_data['t_mos'] > 40:
+            self._set_style(self.mos_temp_value, "font-weight: bold; color: orange;")
+        else:
+            self._set_style(self.mos_temp_value, "font-weight: bold; color: green;")
+            
+        if status_data['t_rotor'] > 80:
+            self._set_style(self.rotor_temp_value, "font-weight: bold; color: red;")
+        elif status_data['t_rotor'] > 60:
+            self._set_style(self.rotor_temp_value, "font-weight: bold; color: orange;")
+        else:
+            self._set_style(self.rotor_temp_value, "font-weight: bold; color: green;")
+
+
+# 表格中的迷你趋势线
+class Sparkline(QWidget):
+    """直接用 QPainter 绘制一条折线，不依赖 matplotlib，适合在表格中大量使用"""
+    
+    def __init__(self, color="#2980b9", parent=None):
+        super().__init__(parent)
+        self.pen = QPen(QColor(color), 1.2)
+        self.values = np.zeros(0)
+        self.setMinimumSize(120, 24)
+    
+    def set_values(self, values):
+        self.values = values
+        self.update()
+    
+    def paintEvent(self, event):
+        values = self.values
+        if len(values) < 2:
+            return
+        width, height = self.width(), self.height()
+        low, high = values.min(), values.max()
+        xs = np.linspace(1, width - 2, len(values))
+        if high > low:
+            ys = (height - 2) - (values - low) / (high - low) * (height - 4)
+        else:
+            ys = np.full(len(values), height / 2.0)  # 恒定值画在中间
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(self.pen)
+        painter.drawPolyline(QPolygonF([QPointF(x, y) for x, y in zip(xs, ys)]))
+        painter.end()
+
+
+# 多电机监控面板
+class MotorDashboardWidget(QWidget):
+    """每台电机一行：最新状态、应答率和最近一段时间的扭矩/速度趋势"""
+    COLUMNS = ["ID", "位置 [rad]", "速度 [rad/s]", "扭矩 [N·m]", "MOS [℃]", "线圈 [℃]", "应答率",
+               "扭矩趋势", "速度趋势"]
+    TREND_SECONDS = 10.0
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(5, 5, 5, 5)
+        
+        control_layout = QHBoxLayout()
+        self.ids_edit = QLineEdit("1-4")
+        self.ids_edit.setToolTip("电机ID列表（十六进制），如 1,2,5-8；主机ID默认为 节点ID+0x10，也可写成 节点:主机")
+        self.max_hz_spin = QSpinBox()
+        self.max_hz_spin.setRange(5, 1000)
+        self.max_hz_spin.setValue(100)
+        self.max_hz_spin.setSuffix(" Hz")
+        self.start_btn = QPushButton("开始监控")
+        self.rate_label = QLabel("")
+        control_layout.addWidget(QLabel("电机ID:"))
+        control_layout.addWidget(self.ids_edit)
+        control_layout.addWidget(QLabel("单电机最高速率:"))
+        control_layout.addWidget(self.max_hz_spin)
+        control_layout.addWidget(self.start_btn)
+        control_layout.addStretch()
+        control_layout.addWidget(self.rate_label)
+        layout.addLayout(control_layout)
+        
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        layout.addWidget(self.table)
+        
+        self.counts = []
+        self.sparklines = []
+    
+    def set_motors(self, motor_ids):
+        """按电机列表重建表格行，单元格和趋势线只创建一次"""
+        self.table.setRowCount(len(motor_ids))
+        self.counts = [0] * len(motor_ids)
+        self.sparklines = []
+        for row, (node_id, master_id) in enumerate(motor_ids):
+            self.table.setItem(row, 0, QTableWidgetItem(f"{hex(node_id)} / {hex(master_id)}"))
+            for col in range(1, 7):
+                self.table.setItem(row, col, QTableWidgetItem("-"))
+            lines = (Sparkline("#e74c3c"), Sparkline("#2980b9"))
+            self.table.setCellWidget(row, 7, lines[0])
+            self.table.setCellWidget(row, 8, lines[1])
+            self.sparklines.append(lines)
+    
+    def refresh(self, thread):
+        """定时器回调：只更新有新数据的行"""
+        for row, samples in enumerate(thread.samples):
+            self.table.item(row, 6).setText(f"{thread.reply_ratio[row] * 100:.0f}%")
+            count, data = samples.snapshot()
+            if count == self.counts[row] or not len(data['t']):
+                continue
+            self.counts[row] = count
+            for col, key, fmt in ((1, 'q', '.3f'), (2, 'dq', '.3f'), (3, 'tau', '.3f'),
+                                  (4, 't_mos', '.1f'), (5, 't_rotor', '.1f')):
+                self.table.item(row, col).setText(format(data[key][-1], fmt))
+            
+            t = data['t']
+            width = self.sparklines[row][0].width()
+            x_range = (t[-1] - self.TREND_SECONDS, t[-1])
+            for line, key in zip(self.sparklines[row], ('tau', 'dq')):
+                line.set_values(minmax_decimate(t, data[key], max(width // 2, 1), x_range)[1])
+        
+        text = (f"轮询 {thread.achieved_rate:.0f} / {thread.rate:.0f} Hz 每电机"
+                f"（上限 {thread.max_rate:.0f} Hz），总线占用 {thread.bus_load * 100:.0f}%")
+        if thread.error is not None:
+            text += f"  错误: {thread.error}"
+        self.rate_label.setText(text)
+
+
+# 主窗口
+def setup_file_logging(path=os.path.join('friction_results', 'logs', 'friction_tool.log'),
+                       max_bytes=5 * 1024 * 1024, backup_count=5):
+    """完整日志写入滚动文件：调用方只把记录放入队列，由 QueueListener 的后台线程写盘
+    :return: (logger, listener)，退出时需调用 listener.stop()
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    file_handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                                        encoding='utf-8')
+    file_handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    
+    logger = logging.getLogger('friction_tool')
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    return logger, listener
+
+
+# 标签页中的持久图表面板
+class PlotPanel(QWidget):
+    """画布和工具栏在第一次显示图表时才创建，之后一直复用；同类图表再次更新时
+    只替换数据并局部重绘，切换图表类型时才重建坐标轴"""
+    
+    def __init__(self, placeholder, parent=None, figsize=(12, 8)):
+        super().__init__(parent)
+        self.figsize = figsize
+        self.figure = None
+        self.canvas = None
+        self.toolbar = None
+        self.blit = None
+        self.chart = None
+        
+        # 提示标签
+        self.placeholder = QLabel(placeholder)
+        self.placeholder.setStyleSheet("color: #95a5a6; font-style: italic; padding: 20px;")
+        self.placeholder.setAlignment(Qt.AlignCenter)
+        
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.placeholder)
+    
+    def _create_canvas(self):
+        load_matplotlib()
+        self.figure = Figure(figsize=self.figsize)
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setMinimumHeight(int(self.figsize[1] * 70))
+        self.toolbar = NavigationToolbar(self.canvas, self)
+        self.blit = BlitManager(self.canvas)
+        self.layout().addWidget(self.toolbar)
+        self.layout().addWidget(self.canvas)
+    
+    def show_data(self, chart_class, data):
+        if self.canvas is None:
+            self._create_canvas()
+        full = type(self.chart) is not chart_class
+        if full:
+            self.figure.clear()
+            self.chart = chart_class(self.figure, animated=True)
+            self.blit.set_artists(self.chart.artists)
+        rescaled = self.chart.update(data)
+        if full:
+            self.figure.tight_layout()
+        
+        self.placeholder.hide()
+        self.toolbar.show()
+        self.canvas.show()
+        self.blit.update(full or rescaled)
+    
+    def clear(self):
+        self.chart = None
+        self.placeholder.show()
+        if self.canvas is None:
+            return
+        self.figure.clear()
+        self.blit.set_artists([])
+        self.toolbar.hide()
+        self.canvas.hide()
+
+
+class FrictionIdentifierApp(QMainWindow):
+    LOG_MAX_LINES = 5000  # 日志窗口最多保留的行数
+    
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("电机摩擦力参数自动识别工具 v2.0")
+        self.setMinimumSize(1300, 700)
+        
+        self.results = {}
+        self.identifier_thread = None
+        self.status_thread = None
+        self.history_rows = []
+        
+        # 日志：界面按固定频率批量刷新，完整日志由后台线程写入滚动文件
+        self.log_pending = collections.deque()
+        try:
+            self.file_logger, self.log_listener = setup_file_logging()
+        except Exception as e:
+            self.file_logger, self.log_listener = None, None
+            print(f"无法创建日志文件: {e}")
+        self.log_flush_timer = QTimer(self)
+        self.log_flush_timer.setInterval(100)
+        self.log_flush_timer.timeout.connect(self.flush_log)
+        self.log_flush_timer.start()
+        
+        # 电机状态显示按固定帧率从状态线程的缓冲区读取
+        self.status_count = 0
+        self.status_display_timer = QTimer(self)
+        self.status_display_timer.setInterval(100)
+        self.status_display_timer.timeout.connect(self.refresh_status_display)
+        self.status_display_timer.start()
+        
+        # 结果归档，历史记录页从其索引查询
+        try:
+            self.archive = ResultsArchive()
+        except Exception as e:
+            self.archive = None
+            print(f"无法打开结果归档: {e}")
+        
+        # 设置默认参数
+        self.default_params = {
+            'motor_type': "DM4310",
+            'node_id': 0x01,
+            'master_id': 0x11,
+            'com_port': 'COM5',
+            'baud_rate': 921600,
+            'viscous_coeff': 0.0001330964,
+            'inertia': 1.976204E-05,
+            'test_speeds': [0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 1.5, 2.0, -0.001, -0.005, -0.01, -0.05, -0.5, -1.0, -1.5, -2.0],
+            'duration': 5,
+            'settling_time': 0.5,
+            'torque_increment': 0.0001,
+            'max_torque': 0.5,
+            'static_method': 'ramp',
+            'coulomb_estimator': 'huber',
+            'outlier_k': 3.5,
+            'sample_rate': 100.0,
+            'map_positions': 8,
+            'thermal_duration': 3600.0,
+            'thermal_target_temp': 70.0,
+            'thermal_bin_width': 5.0,
+            'thermal_heat_time': 60.0,
+            'capture_log': True,  # 测试过程写入追加式采集日志，可在中断后恢复
+            'bus_capture': False  # 记录串口原始收发字节 (.dmcap)，用于复现现场问题
+        }
+        
+        self.setup_ui()
+        
+        # 设置初始状态显示
+        self.motor_status_widget.update_status({
+            'position': 0.0,
+            'velocity': 0.0,
+            'torque': 0.0,
+            't_mos': 0.0,
+            't_rotor': 0.0,
+            'status': 0,
+            'status_text': "未连接",
+            'status_icon': "❓",
+            'is_healthy': True,
+            'has_error': False
+        })
+    
+    def setup_ui(self):
+        # 中央小部件
+        central_widget = QWidget()
+        self.setCentralWidget(central_widget)
+        
+        # 主布局
+        main_layout = QVBoxLayout(central_widget)
+        main_layout.setContentsMargins(5, 5, 5, 5)
+        main_layout.setSpacing(5)
+
+        # 创建主标签页
+        self.main_tabs = QTabWidget()
+        main_layout.addWidget(self.main_tabs)
+        
+        # 第一个标签页：参数设置和控制
+        self.setup_control_tab()
+        
+        # 第二个标签页：库仑摩擦图表
+        self.setup_coulomb_tab()
+        
+        # 第三个标签页：静摩擦图表
+        self.setup_static_tab()
+        
+        # 第四个标签页：实时曲线
+        self.setup_live_tab()
+        
+        # 第五个标签页：历史记录
+        self.setup_history_tab()
+        
+        # 第六个标签页：多电机监控
+        self.setup_dashboard_tab()
+        
+        # 连接信号
+        self.check_motor_btn.clicked.connect(self.check_motor_status)
+        self.read_dyn_btn.clicked.connect(self.read_dynamics_from_motor)
+        self.discover_btn.clicked.connect(self.start_discovery)
+        self.start_coulomb_btn.clicked.connect(lambda: self.start_identification('coulomb'))
+        self.start_static_btn.clicked.connect(lambda: self.start_identification('static'))
+        self.start_comprehensive_btn.clicked.connect(lambda: self.start_identification('comprehensive'))
+        self.start_map_btn.clicked.connect(lambda: self.start_identification('static_map'))
+        self.start_thermal_btn.clicked.connect(lambda: self.start_identification('thermal'))
+        self.start_inertia_btn.clicked.connect(lambda: self.start_identification('inertia'))
+        self.start_batch_btn.clicked.connect(self.start_batch)
+        self.stop_btn.clicked.connect(self.stop_identification)
+        self.save_results_btn.clicked.connect(self.save_results)
+        self.load_results_btn.clicked.connect(self.load_results)
+        self.export_lut_btn.clicked.connect(self.export_compensation_table)
+        
+        # 初始日志
+        self.log("电机摩擦力参数自动识别工具 v2.0 已启动")
+        self.log("请先点击'检查电机状态'进行连接测试")
+    
+    def setup_control_tab(self):
+        """设置第一个标签页：参数设置和控制"""
+        control_tab = QWidget()
+        self.main_tabs.addTab(control_tab, "参数设置与控制")
+        
+        control_layout = QVBoxLayout(control_tab)
+        control_layout.setContentsMargins(5, 5, 5, 5)
+        control_layout.setSpacing(5)
+        
+        # 创建分割器
+        splitter = QSplitter(Qt.Vertical)
+        control_layout.addWidget(splitter)
+        
+        # 上半部分 - 参数设置和状态显示
+        top_widget = QWidget()
+        top_layout = QHBoxLayout(top_widget)
+        top_layout.setContentsMargins(2, 2, 2, 2)
+        top_layout.setSpacing(5)
+        
+        # 左侧 - 参数设置区域
+        left_widget = QWidget()
+        left_layout = QVBoxLayout(left_widget)
+        
+        param_group = QGroupBox("参数设置")
+        param_layout = QGridLayout()
+        
+        # 电机参数
+        motor_group = QGroupBox("电机参数")
+        motor_layout = QFormLayout()
+        
+        self.motor_type_combo = QComboBox()
+        motor_types = ["DM4310", "DM4340", "DM6006", "DM8006", "DM8009", "DM10010L", "DM10010"]
+        self.motor_type_combo.addItems(motor_types)
+        
+        self.node_id_edit = QLineEdit(hex(self.default_params['node_id']))
+        self.master_id_edit = QLineEdit(hex(self.default_params['master_id']))
+        self.com_port_edit = QLineEdit(self.default_params['com_port'])
+        self.baud_rate_edit = QLineEdit(str(self.default_params['baud_rate']))
+        
+        motor_layout.addRow("电机型号:", self.motor_type_combo)
+        motor_layout.addRow("节点ID(hex):", self.node_id_edit)
+        motor_layout.addRow("主控ID(hex):", self.master_id_edit)
+        motor_layout.addRow("串口:", self.com_port_edit)
+        motor_layout.addRow("波特率:", self.baud_rate_edit)
+        
+        # 自动搜索按钮
+        self.discover_btn = QPushButton("自动搜索")
+        self.discover_btn.setToolTip("扫描所有串口和电机ID 0x01-0x10，自动填写串口、波特率、ID 和型号")
+        self.discover_btn.setMinimumHeight(24)
+        motor_layout.addRow(self.discover_btn)
+        motor_group.setLayout(motor_layout)
+        
+        # 动力学参数
+        dynamics_group = QGroupBox("动力学参数")
+        dynamics_layout = QFormLayout()
+        
+        self.viscous_coeff_edit = QLineEdit(str(self.default_params['viscous_coeff']))
+        self.inertia_edit = QLineEdit(str(self.default_params['inertia']))
+
+        dynamics_layout.addRow("粘滞摩擦系数 [N·m·s/rad]:", self.viscous_coeff_edit)
+        dynamics_layout.addRow("转子惯量 [kg·m²]:", self.inertia_edit)
+        dynamics_group.setLayout(dynamics_layout)
+
+        # 自动读取按钮
+        self.read_dyn_btn = QPushButton("自动读取")
+        self.read_dyn_btn.setToolTip("从电机读取粘滞系数 (Damp) 与转动惯量 (Inertia)")
+        self.read_dyn_btn.setMinimumHeight(24)
+        dynamics_layout.addRow(self.read_dyn_btn)
+
+        dynamics_group.setLayout(dynamics_layout)
+
+        # 测试参数
+        test_group = QGroupBox("测试参数")
+        test_layout = QFormLayout()
+        
+        self.test_speeds_edit = QLineEdit(str(self.default_params['test_speeds']).replace('[', '').replace(']', ''))
+        self.duration_edit = QLineEdit(str(self.default_params['duration']))
+        self.settling_time_edit = QLineEdit(str(self.default_params['settling_time']))
+        self.torque_increment_edit = QLineEdit(str(self.default_params['torque_increment']))
+        self.max_torque_edit = QLineEdit(str(self.default_params['max_torque']))
+        self.static_method_combo = QComboBox()
+        self.static_method_combo.addItem("线性斜坡", 'ramp')
+        self.static_method_combo.addItem("粗扫+二分搜索", 'bisect')
+        self.static_method_combo.setCurrentIndex(self.static_method_combo.findData(self.default_params['static_method']))
+        self.static_method_combo.setToolTip("二分搜索：先粗扫找到区间，再二分到力矩增量精度，大电机上更快")
+        self.coulomb_estimator_combo = QComboBox()
+        self.coulomb_estimator_combo.addItem("Huber M 估计", 'huber')
+        self.coulomb_estimator_combo.addItem("中位数", 'median')
+        self.coulomb_estimator_combo.addItem("截尾均值 (10%)", 'trimmed')
+        self.coulomb_estimator_combo.addItem("均值", 'mean')
+        self.coulomb_estimator_combo.setCurrentIndex(self.coulomb_estimator_combo.findData(self.default_params['coulomb_estimator']))
+        self.coulomb_estimator_combo.setToolTip("每个速度平台的力矩估计方式，稳健估计受齿槽和错帧尖峰影响小，可缩短采集时间")
+        self.outlier_k_edit = QLineEdit(str(self.default_params['outlier_k']))
+        self.outlier_k_edit.setToolTip("偏离中位数超过 k 倍 MAD 标准差的采样视为离群并剔除，0 表示不剔除")
+        
+        test_layout.addRow("测试速度 [rad/s] (逗号分隔):", self.test_speeds_edit)
+        test_layout.addRow("数据采集时间 [s]:", self.duration_edit)
+        test_layout.addRow("速度稳定时间 [s]:", self.settling_time_edit)
+        test_layout.addRow("力矩增量 [N·m]:", self.torque_increment_edit)
+        test_layout.addRow("最大测试力矩 [N·m]:", self.max_torque_edit)
+        test_layout.addRow("静摩擦搜索方式:", self.static_method_combo)
+        test_layout.addRow("平台力矩估计:", self.coulomb_estimator_combo)
+        test_layout.addRow("离群剔除阈值 k:", self.outlier_k_edit)
+        self.map_positions_spin = QSpinBox()
+        self.map_positions_spin.setRange(2, 64)
+        self.map_positions_spin.setValue(self.default_params['map_positions'])
+        test_layout.addRow("角度映射位置数:", self.map_positions_spin)
+        self.thermal_duration_edit = QLineEdit(str(self.default_params['thermal_duration'] / 60.0))
+        self.thermal_target_temp_edit = QLineEdit(str(self.default_params['thermal_target_temp']))
+        self.thermal_bin_width_edit = QLineEdit(str(self.default_params['thermal_bin_width']))
+        self.thermal_heat_time_edit = QLineEdit(str(self.default_params['thermal_heat_time']))
+        test_layout.addRow("温升测试最长时间 [min]:", self.thermal_duration_edit)
+        test_layout.addRow("温升目标线圈温度 [℃]:", self.thermal_target_temp_edit)
+        test_layout.addRow("温度分箱宽度 [℃]:", self.thermal_bin_width_edit)
+        test_layout.addRow("每轮升温时间 [s]:", self.thermal_heat_time_edit)
+        test_group.setLayout(test_layout)
+        
+        # 补偿表导出
+        lut_group = QGroupBox("摩擦补偿表导出")
+        lut_layout = QFormLayout()
+        
+        self.lut_speed_max_spin = QDoubleSpinBox()
+        self.lut_speed_max_spin.setRange(0.01, 500.0)
+        self.lut_speed_max_spin.setDecimals(2)
+        self.lut_speed_max_spin.setValue(2.0)
+        self.lut_speed_points_spin = QSpinBox()
+        self.lut_speed_points_spin.setRange(3, 4097)
+        self.lut_speed_points_spin.setValue(129)
+        self.lut_angle_points_spin = QSpinBox()
+        self.lut_angle_points_spin.setRange(0, 256)
+        self.lut_angle_points_spin.setValue(32)
+        self.lut_angle_points_spin.setToolTip("0 表示只导出速度表；需要先做静摩擦角度映射")
+        self.export_lut_btn = QPushButton("导出补偿表")
+        self.export_lut_btn.setToolTip("导出 C 头文件、float32 二进制和 .npy")
+        
+        lut_layout.addRow("速度范围 ± [rad/s]:", self.lut_speed_max_spin)
+        lut_layout.addRow("速度点数:", self.lut_speed_points_spin)
+        lut_layout.addRow("角度点数:", self.lut_angle_points_spin)
+        lut_layout.addRow(self.export_lut_btn)
+        lut_group.setLayout(lut_layout)
+        
+        # 添加参数组到参数布局
+        param_layout.addWidget(motor_group, 0, 0)
+        param_layout.addWidget(dynamics_group, 0, 1)
+        param_layout.addWidget(test_group, 1, 0, 1, 2)
+        param_layout.addWidget(lut_group, 2, 0, 1, 2)
+        
+        param_group.setLayout(param_layout)
+        left_layout.addWidget(param_group)
+        
+        # 右侧 - 电机状态和控制
+        right_widget = QWidget()
+        right_layout = QVBoxLayout(right_widget)
+        
+        # 电机状态显示
+        self.motor_status_widget = MotorStatusWidget()
+        right_layout.addWidget(self.motor_status_widget)
+        
+        # 控制按钮区域（两列）
+        control_group = QGroupBox("控制面板，提示：让电机空载，并固定电机")
+        control_btn_layout = QGridLayout()
+        control_btn_layout.setContentsMargins(6, 6, 6, 6)
+        control_btn_layout.setHorizontalSpacing(8)
+        control_btn_layout.setVerticalSpacing(6)
+
+        # 电机检查按钮（整行占两列）
+        self.check_motor_btn = QPushButton("检查电机状态")
+        self.check_motor_btn.setMinimumHeight(30)
+        self.check_motor_btn.setStyleSheet(
+            "QPushButton { background-color: #4CAF50; color: white; font-weight: bold; font-size: 10px; }"
+            "QPushButton:hover { background-color: #45a049; }"
+        )
+        control_btn_layout.addWidget(self.check_motor_btn, 0, 0, 1, 2)
+
+        # 分隔线（整行占两列）
+        line1 = QFrame()
+        line1.setFrameShape(QFrame.HLine)
+        line1.setFrameShadow(QFrame.Sunken)
+        control_btn_layout.addWidget(line1, 1, 0, 1, 2)
+
+        # 功能按钮（两列排布）
+        self.start_coulomb_btn = QPushButton("识别库仑摩擦")
+        self.start_static_btn = QPushButton("识别静摩擦")
+        self.start_comprehensive_btn = QPushButton("全面识别")
+        self.start_map_btn = QPushButton("静摩擦角度映射")
+        self.start_map_btn.setToolTip("在一整圈内多个位置测量正反向静摩擦，生成角度查找表")
+        self.start_thermal_btn = QPushButton("温升摩擦测试")
+        self.start_thermal_btn.setToolTip("电机升温过程中循环识别摩擦，拟合摩擦-温度关系")
+        self.start_inertia_btn = QPushButton("惯量辨识")
+        self.start_inertia_btn.setToolTip("正反向速度阶跃激励，扣除摩擦后由力矩和加速度回归转子惯量")
+        self.stop_btn = QPushButton("停止")
+        self.save_results_btn = QPushButton("保存结果")
+        self.load_results_btn = QPushButton("加载结果")
+
+        for btn in [self.start_coulomb_btn, self.start_static_btn, self.start_comprehensive_btn,
+                    self.start_map_btn, self.start_thermal_btn, self.start_inertia_btn, self.stop_btn, self.save_results_btn,
+                    self.load_results_btn]:
+            btn.setMinimumHeight(25)
+
+        self.stop_btn.setEnabled(False)
+        self.stop_btn.setStyleSheet(
+            "QPushButton { background-color: #f44336; color: white; font-weight: bold; }"
+            "QPushButton:disabled { background-color: #cccccc; }"
+        )
+
+        # 网格位置：
+        # 第2行：库仑/静摩擦
+        control_btn_layout.addWidget(self.start_coulomb_btn,     2, 0)
+        control_btn_layout.addWidget(self.start_static_btn,      2, 1)
+        # 第3行：全面识别/停止
+        control_btn_layout.addWidget(self.start_comprehensive_btn, 3, 0)
+        control_btn_layout.addWidget(self.stop_btn,                3, 1)
+        # 第4行：扩展测试
+        control_btn_layout.addWidget(self.start_map_btn,         4, 0)
+        control_btn_layout.addWidget(self.start_thermal_btn,     4, 1)
+        control_btn_layout.addWidget(self.start_inertia_btn,     5, 0)
+        # 第6行：保存/加载
+        control_btn_layout.addWidget(self.save_results_btn,      6, 0)
+        control_btn_layout.addWidget(self.load_results_btn,      6, 1)
+
+        # 进度与状态（右侧进度条，左侧标签）
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_label = QLabel("就绪")
+        self.progress_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
+
+        control_btn_layout.addWidget(QLabel("进度:"), 7, 0, alignment=Qt.AlignRight | Qt.AlignVCenter)
+        control_btn_layout.addWidget(self.progress_bar, 7, 1)
+        control_btn_layout.addWidget(self.progress_label, 8, 0, 1, 2)
+
+        # 拉伸留白
+        control_btn_layout.setRowStretch(9, 1)
+
+        control_group.setLayout(control_btn_layout)
+        right_layout.addWidget(control_group)
+        
+        # 批量测试：同一次连接中依次运行多组参数
+        batch_group = QGroupBox("批量测试")
+        batch_layout = QGridLayout()
+        self.batch_spec_edit = QPlainTextEdit()
+        self.batch_spec_edit.setPlaceholderText("每行一组参数覆盖，留空则重复当前参数\n"
+                                                "例: test_speeds=0.5,1,2; duration=1")
+        self.batch_spec_edit.setMaximumHeight(70)
+        self.batch_repeats_spin = QSpinBox()
+        self.batch_repeats_spin.setRange(1, 100)
+        self.batch_repeats_spin.setValue(3)
+        self.batch_type_combo = QComboBox()
+        self.batch_type_combo.addItem("库仑摩擦", 'coulomb')
+        self.batch_type_combo.addItem("静摩擦", 'static')
+        self.batch_type_combo.addItem("全面识别", 'comprehensive')
+        self.start_batch_btn = QPushButton("开始批量测试")
+        self.start_batch_btn.setMinimumHeight(25)
+        batch_layout.addWidget(self.batch_spec_edit, 0, 0, 1, 4)
+        batch_layout.addWidget(QLabel("重复:"), 1, 0)
+        batch_layout.addWidget(self.batch_repeats_spin, 1, 1)
+        batch_layout.addWidget(self.batch_type_combo, 1, 2, 1, 2)
+        batch_layout.addWidget(self.start_batch_btn, 2, 0, 1, 4)
+        batch_group.setLayout(batch_layout)
+        right_layout.addWidget(batch_group)
+        
+        # 添加左右部分到顶部布局
+        top_layout.addWidget(left_widget, 7)
+        top_layout.addWidget(right_widget, 3)
+        
+        # 下半部分 - 子标签页（日志和结果）
+        bottom_widget = QWidget()
+        bottom_layout = QVBoxLayout(bottom_widget)
+       
+        self.sub_tabs = QTabWidget()
+        
+        # 日志标签页
+        self.log_tab = QWidget()
+        log_layout = QVBoxLayout(self.log_tab)
+        self.log_text = QPlainTextEdit()
+        self.log_text.setReadOnly(True)
+        self.log_text.setMaximumHeight(200)  # 限制高度
+        self.log_text.setMaximumBlockCount(self.LOG_MAX_LINES)  # 超出后丢弃最早的行，完整日志见日志文件
+        log_layout.addWidget(self.log_text)
+        
+        # 结果标签页
+        self.results_tab = QWidget()
+        results_layout = QVBoxLayout(self.results_tab)
+        self.results_table = QTableWidget(0, 2)
+        self.results_table.setHorizontalHeaderLabels(["参数 / Parameter", "值 / Value"])
+        self.results_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.results_table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        results_layout.addWidget(self.results_table)
+        
+        # 添加子标签页
+        self.sub_tabs.addTab(self.log_tab, "日志")
+        self.sub_tabs.addTab(self.results_tab, "结果")
+        
+        bottom_layout.addWidget(self.sub_tabs)
+        
+        # 添加上下部分到分割器
+        splitter.addWidget(top_widget)
+        splitter.addWidget(bottom_widget)
+        splitter.setSizes([600, 300])
+    
+    def setup_coulomb_tab(self):
+        """设置第二个标签页：库仑摩擦图表"""
+        coulomb_tab = QWidget()
+        self.main_tabs.addTab(coulomb_tab, "库仑摩擦图表")
+        
+        coulomb_layout = QVBoxLayout(coulomb_tab)
+        coulomb_layout.setContentsMargins(5, 5, 5, 5)
+        
+        # 添加标题和说明
+        title_label = QLabel("库仑摩擦力矩识别结果")
+        title_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #2c3e50; padding: 10px;")
+        title_label.setAlignment(Qt.AlignCenter)
+        coulomb_layout.addWidget(title_label)
+        
+        desc_label = QLabel("库仑摩擦是物体在相对运动时产生的摩擦阻力，与运动方向相反，大小基本恒定。\n本测试通过不同速度下的力矩测量来识别正负方向的库仑摩擦力矩。")
+        desc_label.setStyleSheet("color: #7f8c8d; padding: 5px; font-size: 11px;")
+        desc_label.setAlignment(Qt.AlignCenter)
+        coulomb_layout.addWidget(desc_label)
+        
+        # 创建滚动区域用于图表，画布只创建一次，之后原地更新
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        self.coulomb_panel = PlotPanel("请先运行库仑摩擦识别测试以显示图表")
+        scroll_area.setWidget(self.coulomb_panel)
+        coulomb_layout.addWidget(scroll_area)
+    
+    def setup_static_tab(self):
+        """设置第三个标签页：静摩擦图表"""
+        static_tab = QWidget()
+        self.main_tabs.addTab(static_tab, "静摩擦图表")
+        
+        static_layout = QVBoxLayout(static_tab)
+        static_layout.setContentsMargins(5, 5, 5, 5)
+        
+        # 添加标题和说明
+        title_label = QLabel("静摩擦力矩识别结果")
+        title_label.setStyleSheet("font-size: 16px; font-weight: bold; color: #2c3e50; padding: 10px;")
+        title_label.setAlignment(Qt.AlignCenter)
+        static_layout.addWidget(title_label)
+        
+        desc_label = QLabel("静摩擦是物体由静止状态开始运动时需要克服的最大摩擦阻力。\n本测试通过逐渐增加力矩直到电机开始转动来识别静摩擦的脱离力矩。")
+        desc_label.setStyleSheet("color: #7f8c8d; padding: 5px; font-size: 11px;")
+        desc_label.setAlignment(Qt.AlignCenter)
+        static_layout.addWidget(desc_label)
+        
+        # 创建滚动区域用于图表，画布只创建一次，之后原地更新
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        self.static_panel = PlotPanel("请先运行静摩擦识别测试以显示图表", figsize=(12, 10))
+        scroll_area.setWidget(self.static_panel)
+        static_layout.addWidget(scroll_area)
+    
+    def check_motor_status(self):
+        """检查电机状态"""
+        if self.status_thread and self.status_thread.isRunning():
+            self.log("停止实时状态更新...")
+            self.status_thread.stop()
+            self.check_motor_btn.setText("检查电机状态")
+            self.check_motor_btn.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; font-size: 12px; } QPushButton:hover { background-color: #45a049; }")
+            return
+            
+        params = self.get_params_from_ui()
+        if params is None:
+            return
+        self.stop_dashboard()
+            
+        self.log("\n开始检查电机状态...")
+        
+        try:
+            # 临时连接以检查电机
+            motor_type_dict = {
+                "DM4310": DM_Motor_Type.DM4310,
+                "DM4340": DM_Motor_Type.DM4340,
+                "DM6006": DM_Motor_Type.DM6006,
+                "DM8006": DM_Motor_Type.DM8006,
+                "DM8009": DM_Motor_Type.DM8009,
+                "DM10010L": DM_Motor_Type.DM10010L,
+                "DM10010": DM_Motor_Type.DM10010,
+            }
+            
+            motor_type = motor_type_dict.get(params['motor_type'], DM_Motor_Type.DM4310)
+            
+            motor = Motor(motor_type, params['node_id'], params['master_id'])
+            serial_device = serial.Serial(params['com_port'], params['baud_rate'], timeout=0.5)
+            motor_control = MotorControl(serial_device)
+            motor_control.addMotor(motor)
+            
+            self.log(f"连接成功: {params['com_port']} @ {params['baud_rate']} bps")
+            
+            # 读取电机信息
+            self.log("\n读取电机参数...")
+            motor_info = {
+                '软件版本': motor_control.read_motor_param(motor, DM_variable.sub_ver),
+                '控制模式': motor_control.read_motor_param(motor, DM_variable.CTRL_MODE),
+                '电机ID': motor_control.read_motor_param(motor, DM_variable.ESC_ID),
+                '主控ID': motor_control.read_motor_param(motor, DM_variable.MST_ID),
+                '减速比': motor_control.read_motor_param(motor, DM_variable.Gr),
+                '最大位置': motor_control.read_motor_param(motor, DM_variable.PMAX),
+                '最大速度': motor_control.read_motor_param(motor, DM_variable.VMAX),
+                '最大扭矩': motor_control.read_motor_param(motor, DM_variable.TMAX),
+            }
+            
+            # 控制模式映射
+            control_mode_map = {
+                1: "MIT模式",
+                2: "位置速度模式",
+                3: "速度模式",
+                4: "力位混合模式"
+            }
+            
+            self.log("\n=== 电机信息 ===")
+            for key, value in motor_info.items():
+                if key == '控制模式':
+                    mode_text = control_mode_map.get(value, f"未知模式({value})")
+                    self.log(f"{key}: {mode_text}")
+                else:
+                    self.log(f"{key}: {value}")
+            
+            # 获取实时状态
+            motor_control.refresh_motor_status(motor)
+            current_pos = motor.getPosition()
+            current_vel = motor.getVelocity()
+            current_torque = motor.getTorque()
+            t_mos = motor.getT_MOS() if hasattr(motor, 'getT_MOS') else 0.0
+            t_rotor = motor.getT_Rotor() if hasattr(motor, 'getT_Rotor') else 0.0
+            
+            self.log("\n=== 实时状态 ===")
+            self.log(f"位置: {current_pos:.3f} rad")
+            self.log(f"速度: {current_vel:.3f} rad/s")
+            self.log(f"扭矩: {current_torque:.3f} N·m")
+            self.log(f"MOS温度: {t_mos:.1f} ℃")
+            self.log(f"线圈温度: {t_rotor:.1f} ℃")
+            
+            # 判断电机状态
+            is_enabled = abs(current_vel) > 0.001 or abs(current_torque) > 0.001
+            has_temp_warning = t_mos > 60 or t_rotor > 80
+            
+            if has_temp_warning:
+                self.log("电机状态: ⚠️ 温度警告")
+            elif is_enabled:
+                self.log("电机状态: ✅ 运行中")
+            else:
+                self.log("电机状态: ⭕ 待机")
+            
+            # 更新初始状态显示
+            initial_status = {
+                'position': current_pos,
+                'velocity': current_vel,
+                'torque': current_torque,
+                't_mos': t_mos,
+                't_rotor': t_rotor,
+                'status': 1 if is_enabled else 0,
+                'status_text': "运行中" if is_enabled else "待机",
+                'status_icon': "✅" if is_enabled else "⭕",
+                'is_healthy': not has_temp_warning,
+                'has_error': False
+            }
+            self.motor_status_widget.update_status(initial_status)
+            
+            # 关闭临时连接
+            serial_device.close()
+            
+            # 启动实时状态监控线程
+            self.status_thread = MotorStatusThread(params)
+            self.status_thread.log_message.connect(self.log)
+            self.status_thread.start()
+            
+            self.check_motor_btn.setText("停止状态监控")
+            self.check_motor_btn.setStyleSheet("QPushButton { background-color: #f44336; color: white; font-weight: bold; font-size: 12px; } QPushButton:hover { background-color: #da190b; }")
+            
+            self.log("\n电机检查完成，已启动实时状态监控")
+            
+        except Exception as e:
+            self.log(f"电机检查失败: {str(e)}")
+            self.log("请检查连接参数是否正确")
+    
+    def get_params_from_ui(self):
+        """从UI控件获取参数"""
+        try:
+            # 解析测试速度
+            test_speeds_str = self.test_speeds_edit.text().strip()
+            test_speeds = [float(x.strip()) for x in test_speeds_str.split(',')]
+            
+            # 解析电机ID (十六进制)
+            node_id_str = self.node_id_edit.text().strip()
+            if node_id_str.startswith('0x'):
+                node_id = int(node_id_str, 16)
+            else:
+                node_id = int(node_id_str, 16) if all(c in '0123456789abcdefABCDEF' for c in node_id_str) else int(node_id_str)
+                
+            master_id_str = self.master_id_edit.text().strip()
+            if master_id_str.startswith('0x'):
+                master_id = int(master_id_str, 16)
+            else:
+                master_id = int(master_id_str, 16) if all(c in '0123456789abcdefABCDEF' for c in master_id_str) else int(master_id_str)
+            
+            params = {
+                'motor_type': self.motor_type_combo.currentText(),
+                'node_id': node_id,
+                'master_id': master_id,
+                'com_port': self.com_port_edit.text().strip(),
+                'baud_rate': int(self.baud_rate_edit.text().strip()),
+                'viscous_coeff': float(self.viscous_coeff_edit.text().strip()),
+                'inertia': float(self.inertia_edit.text().strip()),
+                'test_speeds': test_speeds,
+                'duration': float(self.duration_edit.text().strip()),
+                'settling_time': float(self.settling_time_edit.text().strip()),
+                'torque_increment': float(self.torque_increment_edit.text().strip()),
+                'max_torque': float(self.max_torque_edit.text().strip()),
+                'static_method': self.static_method_combo.currentData(),
+                'coulomb_estimator': self.coulomb_estimator_combo.currentData(),
+                'outlier_k': float(self.outlier_k_edit.text().strip()),
+                'sample_rate': self.default_params['sample_rate'],
+                'map_positions': self.map_positions_spin.value(),
+                'thermal_duration': float(self.thermal_duration_edit.text().strip()) * 60.0,
+                'thermal_target_temp': float(self.thermal_target_temp_edit.text().strip()),
+                'thermal_bin_width': float(self.thermal_bin_width_edit.text().strip()),
+                'thermal_heat_time': float(self.thermal_heat_time_edit.text().strip()),
+                'capture_log': self.default_params['capture_log'],
+                'bus_capture': self.default_params['bus_capture']
+            }
+            
+            return params
+        except Exception as e:
+            self.log(f"参数解析错误: {str(e)}")
+            return None
+    def start_discovery(self):
+        """后台扫描串口和电机ID，扫描期间释放串口"""
+        if self.identifier_thread is not None and self.identifier_thread.isRunning():
+            self.log("识别测试进行中，无法搜索电机")
+            return
+        if self.status_thread and self.status_thread.isRunning():
+            self.check_motor_status()  # 停止单电机监控，释放串口
+        self.stop_dashboard()
+        
+        # 当前填写的波特率优先尝试
+        baud_rates = [921600]
+        try:
+            baud_rate = int(self.baud_rate_edit.text().strip())
+            if baud_rate != 921600:
+                baud_rates.insert(0, baud_rate)
+        except ValueError:
+            pass
+        
+        self.log("\n正在搜索电机...")
+        self.discover_btn.setEnabled(False)
+        self.discovery_thread = DiscoveryThread(baud_rates=tuple(baud_rates))
+        self.discovery_thread.log_message.connect(self.log)
+        self.discovery_thread.discovered.connect(self.on_motors_discovered)
+        self.discovery_thread.start()
+    
+    def on_motors_discovered(self, motors):
+        """显示搜索结果，多台电机时让用户选择要填入的一台"""
+        self.discover_btn.setEnabled(True)
+        if not motors:
+            self.log("未发现电机，请检查接线、供电和 USB-CAN 适配器")
+            return
+        
+        items = []
+        for motor in motors:
+            items.append(f"{motor['com_port']} @ {motor['baud_rate']}  节点 {hex(motor['node_id'])} / "
+                         f"主控 {hex(motor['master_id'])}  {motor['motor_type'] or '未知型号'}  "
+                         f"固件 {motor['sw_ver']}.{motor['sub_ver']}  SN {motor['sn']}")
+        for item in items:
+            self.log(f"  {item}")
+        
+        index = 0
+        if len(motors) > 1:
+            item, ok = QInputDialog.getItem(self, "选择电机", "发现多台电机，请选择：", items, 0, False)
+            if not ok:
+                return
+            index = items.index(item)
+        
+        motor = motors[index]
+        self.com_port_edit.setText(motor['com_port'])
+        self.baud_rate_edit.setText(str(motor['baud_rate']))
+        self.node_id_edit.setText(hex(motor['node_id']))
+        self.master_id_edit.setText(hex(motor['master_id']))
+        if motor['motor_type'] and self.motor_type_combo.findText(motor['motor_type']) >= 0:
+            self.motor_type_combo.setCurrentText(motor['motor_type'])
+        self.log(f"已填入: {items[index]}")
+    
+    def read_dynamics_from_motor(self):
+        """从电机读取粘滞系数(Damp)与转动惯量(Inertia)，并回填到动力学参数。
+           若实时状态监控占用串口，则临时暂停监控，读取完成后自动恢复。"""
+        ser = None
+        was_monitoring = False
+        try:
+            # 如果正在监控，占用着串口 => 暂停
+            if self.status_thread and self.status_thread.isRunning():
+                was_monitoring = True
+                self.log("检测到实时状态监控占用串口，正在暂时暂停监控以读取参数...")
+                self.status_thread.stop()
+                self.check_motor_btn.setText("检查电机状态")
+                self.check_motor_btn.setStyleSheet(
+                    "QPushButton { background-color: #4CAF50; color: white; font-weight: bold; font-size: 12px; } "
+                    "QPushButton:hover { background-color: #45a049; }"
+                )
+
+            # 解析必要连接参数（只解析连接必需项，避免其它字段出错）
+            motor_type_text = self.motor_type_combo.currentText().strip()
+            node_id_str = self.node_id_edit.text().strip()
+            master_id_str = self.master_id_edit.text().strip()
+            com_port = self.com_port_edit.text().strip()
+            baud_rate = int(self.baud_rate_edit.text().strip())
+
+            def _parse_id(s: str) -> int:
+                if s.startswith(("0x", "0X")):
+                    return int(s, 16)
+            # 仅包含十六进制字符也按16进制解析，否则按10进制
+                return int(s, 16) if all(c in "0123456789abcdefABCDEF" for c in s) else int(s)
+
+            node_id = _parse_id(node_id_str)
+            master_id = _parse_id(master_id_str)
+
+            motor_type_map = {
+                "DM4310": DM_Motor_Type.DM4310,
+                "DM4340": DM_Motor_Type.DM4340,
+                "DM6006": DM_Motor_Type.DM6006,
+                "DM8006": DM_Motor_Type.DM8006,
+                "DM8009": DM_Motor_Type.DM8009,
+                "DM10010L": DM_Motor_Type.DM10010L,
+                "DM10010": DM_Motor_Type.DM10010,
+            }
+            motor_type = motor_type_map.get(motor_type_text, DM_Motor_Type.DM4310)
+
+            self.log("正在读取电机动力学参数 (Damp / Inertia)...")
+
+            # 独立短连接，读取后立刻关闭，避免长期占用
+            ser = serial.Serial(com_port, baud_rate, timeout=0.5)
+            mc = MotorControl(ser)
+            motor = Motor(motor_type, node_id, master_id)
+            mc.addMotor(motor)
+
+            # 直接读寄存器
+            damp = mc.read_motor_param(motor, DM_variable.Damp)
+            inertia = mc.read_motor_param(motor, DM_variable.Inertia)
+
+            # 回填界面（存在才写）
+            if damp is not None:
+                self.viscous_coeff_edit.setText(f"{float(damp):.10g}")
+            if inertia is not None:
+                self.inertia_edit.setText(f"{float(inertia):.10g}")
+
+            self.log(f"读取完成：Damp={damp if damp is not None else 'None'}，Inertia={inertia if inertia is not None else 'None'}")
+
+        except Exception as e:
+            self.log(f"读取动力学参数失败：{e}")
+            QMessageBox.warning(self, "读取失败", f"读取电机动力学参数失败：\n{e}")
+        finally:
+            # 确保串口关闭
+            try:
+                if ser and ser.is_open:
+                    ser.close()
+            except:
+                pass
+
+            # 如之前在监控，自动恢复监控
+            if was_monitoring:
+                try:
+                    params = self.get_params_from_ui()
+                    if params:
+                        self.status_thread = MotorStatusThread(params)
+                        self.status_thread.log_message.connect(self.log)
+                        self.status_thread.start()
+                        self.check_motor_btn.setText("停止状态监控")
+                        self.check_motor_btn.setStyleSheet(
+                            "QPushButton { background-color: #f44336; color: white; font-weight: bold; font-size: 12px; } "
+                            "QPushButton:hover { background-color: #da190b; }"
+                        )
+                        self.log("已恢复实时状态监控。")
+                    else:
+                        self.log("未能恢复状态监控：参数解析失败。")
+                except Exception as re:
+                    self.log(f"恢复状态监控失败：{re}")
+    
+    def refresh_status_display(self):
+        """定时器回调：显示状态线程的最新状态和统计量"""
+        thread = self.status_thread
+        if thread is None or not thread.isRunning():
+            return
+        if thread.error is not None:
+            self.motor_status_widget.show_error()
+            return
+        count, data = thread.samples.snapshot()
+        if count == self.status_count:
+            return
+        self.status_count = count
+        self.motor_status_widget.update_samples(data)
+    
+    def setup_live_tab(self):
+        """设置第四个标签页：测试过程中的实时曲线"""
+        live_tab = QWidget()
+        self.live_tab_index = self.main_tabs.addTab(live_tab, "实时曲线")
+        
+        live_layout = QVBoxLayout(live_tab)
+        live_layout.setContentsMargins(5, 5, 5, 5)
+        self.live_panel = PlotPanel("测试开始后在此显示实时力矩/速度/位置曲线", figsize=(12, 9))
+        live_layout.addWidget(self.live_panel)
+        
+        # 按显示帧率从工作线程的环形缓冲区取数据
+        self.live_count = 0
+        self.live_timer = QTimer(self)
+        self.live_timer.setInterval(33)  # 约30fps
+        self.live_timer.timeout.connect(self.refresh_live_plot)
+    
+    def refresh_live_plot(self):
+        """定时器回调：有新采样时更新实时曲线"""
+        if self.identifier_thread is None:
+            return
+        count, data = self.identifier_thread.live_buffer.snapshot()
+        if count == self.live_count:
+            return
+        self.live_count = count
+        self.live_panel.show_data(LiveChart, data)
+    
+    def setup_dashboard_tab(self):
+        """设置第六个标签页：同一总线上多台电机的状态总览"""
+        self.dashboard = MotorDashboardWidget()
+        self.main_tabs.addTab(self.dashboard, "多电机监控")
+        self.dashboard_thread = None
+        self.dashboard.start_btn.clicked.connect(self.toggle_dashboard)
+        
+        self.dashboard_timer = QTimer(self)
+        self.dashboard_timer.setInterval(100)
+        self.dashboard_timer.timeout.connect(lambda: self.dashboard.refresh(self.dashboard_thread))
+    
+    def toggle_dashboard(self):
+        """开始/停止多电机监控，与单电机监控和识别测试共用串口，不能同时运行"""
+        if self.dashboard_thread is not None and self.dashboard_thread.isRunning():
+            self.stop_dashboard()
+            return
+        if self.identifier_thread is not None and self.identifier_thread.isRunning():
+            self.log("识别测试进行中，无法开始多电机监控")
+            return
+        params = self.get_params_from_ui()
+        if params is None:
+            return
+        try:
+            motor_ids = parse_motor_ids(self.dashboard.ids_edit.text(),
+                                        master_offset=params['master_id'] - params['node_id'])
+        except ValueError as e:
+            self.log(f"电机ID列表解析错误: {str(e)}")
+            return
+        if not motor_ids:
+            self.log("请填写要监控的电机ID")
+            return
+        
+        if self.status_thread and self.status_thread.isRunning():
+            self.check_motor_status()  # 停止单电机监控，释放串口
+        
+        self.dashboard_thread = MultiMotorStatusThread(params, motor_ids, max_hz=self.dashboard.max_hz_spin.value())
+        self.dashboard_thread.log_message.connect(self.log)
+        self.dashboard.set_motors(motor_ids)
+        self.dashboard_thread.start()
+        self.dashboard_timer.start()
+        self.dashboard.start_btn.setText("停止监控")
+        self.log(f"开始多电机监控: {len(motor_ids)} 台电机，每台最高 {self.dashboard_thread.max_rate:.0f} Hz")
+    
+    def stop_dashboard(self):
+        if self.dashboard_thread is None or not self.dashboard_thread.isRunning():
+            return
+        self.dashboard_thread.stop()
+        self.dashboard_timer.stop()
+        self.dashboard.start_btn.setText("开始监控")
+        self.log("多电机监控已停止")
+    
+    def setup_history_tab(self):
+        """设置第五个标签页：历史记录（查询归档索引，按需加载原始数据）"""
+        history_tab = QWidget()
+        self.main_tabs.addTab(history_tab, "历史记录")
+        
+        history_layout = QVBoxLayout(history_tab)
+        history_layout.setContentsMargins(5, 5, 5, 5)
+        
+        # 筛选条件
+        filter_layout = QHBoxLayout()
+        self.history_sn_combo = QComboBox()
+        self.history_type_combo = QComboBox()
+        self.history_test_combo = QComboBox()
+        self.history_since_edit = QLineEdit()
+        self.history_since_edit.setPlaceholderText("起始日期 YYYY-MM-DD")
+        self.history_until_edit = QLineEdit()
+        self.history_until_edit.setPlaceholderText("结束日期 YYYY-MM-DD")
+        self.history_refresh_btn = QPushButton("查询")
+        for label, widget in (("序列号:", self.history_sn_combo), ("型号:", self.history_type_combo),
+                              ("测试:", self.history_test_combo), ("从:", self.history_since_edit),
+                              ("到:", self.history_until_edit)):
+            filter_layout.addWidget(QLabel(label))
+            filter_layout.addWidget(widget)
+        filter_layout.addWidget(self.history_refresh_btn)
+        history_layout.addLayout(filter_layout)
+        
+        splitter = QSplitter(Qt.Vertical)
+        history_layout.addWidget(splitter)
+        
+        # 运行列表
+        self.history_columns = [
+            ('timestamp', "时间"), ('motor_sn', "序列号"), ('motor_type', "型号"), ('node_id', "节点"),
+            ('test_type', "测试"), ('coulomb_friction', "库仑 [N·m]"),
+            ('static_friction_pos', "静摩擦+ [N·m]"), ('static_friction_neg', "静摩擦- [N·m]"),
+        ]
+        self.history_table = QTableWidget(0, len(self.history_columns))
+        self.history_table.setHorizontalHeaderLabels([label for _, label in self.history_columns])
+        self.history_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.history_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.history_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        splitter.addWidget(self.history_table)
+        
+        # 对比图
+        compare_widget = QWidget()
+        compare_layout = QVBoxLayout(compare_widget)
+        compare_layout.setContentsMargins(0, 0, 0, 0)
+        button_layout = QHBoxLayout()
+        self.history_load_btn = QPushButton("加载所选")
+        self.history_compare_btn = QPushButton("对比所选")
+        self.history_count_label = QLabel("")
+        button_layout.addWidget(self.history_load_btn)
+        button_layout.addWidget(self.history_compare_btn)
+        button_layout.addStretch()
+        button_layout.addWidget(self.history_count_label)
+        compare_layout.addLayout(button_layout)
+        # 对比图画布在第一次对比时创建
+        self.history_compare_layout = compare_layout
+        self.history_figure = None
+        self.history_canvas = None
+        splitter.addWidget(compare_widget)
+        
+        self.history_refresh_btn.clicked.connect(self.refresh_history)
+        self.history_load_btn.clicked.connect(self.load_history_run)
+        self.history_compare_btn.clicked.connect(self.compare_history_runs)
+        self.refresh_history_filters()
+        self.refresh_history()
+    
+    def refresh_history_filters(self):
+        """根据归档索引刷新筛选下拉框"""
+        if self.archive is None:
+            return
+        for combo, column in ((self.history_sn_combo, 'motor_sn'), (self.history_type_combo, 'motor_type'),
+                              (self.history_test_combo, 'test_type')):
+            current = combo.currentData()
+            combo.clear()
+            combo.addItem("全部", None)
+            for value in self.archive.distinct(column):
+                combo.addItem(str(value), value)
+            index = combo.findData(current)
+            combo.setCurrentIndex(max(index, 0))
+    
+    def refresh_history(self):
+        """按筛选条件查询归档并填充运行列表"""
+        if self.archive is None:
+            return
+        try:
+            self.history_rows = self.archive.query(
+                motor_sn=self.history_sn_combo.currentData(),
+                motor_type=self.history_type_combo.currentData(),
+                test_type=self.history_test_combo.currentData(),
+                since=self.history_since_edit.text().strip() or None,
+                until=self.history_until_edit.text().strip() or None)
+        except Exception as e:
+            self.log(f"查询历史记录失败: {str(e)}")
+            return
+        
+        self.history_table.setUpdatesEnabled(False)
+        self.history_table.setRowCount(len(self.history_rows))
+        for row, run in enumerate(self.history_rows):
+            for col, (key, _) in enumerate(self.history_columns):
+                value = run[key]
+                if value is None:
+                    text = "-"
+                elif isinstance(value, float):
+                    text = f"{value:.6f}"
+                elif key == 'timestamp':
+                    text = value[:19].replace('T', ' ')
+                else:
+                    text = str(value)
+                self.history_table.setItem(row, col, QTableWidgetItem(text))
+        self.history_table.setUpdatesEnabled(True)
+        self.history_count_label.setText(f"共 {len(self.history_rows)} 次运行")
+    
+    def _selected_history_runs(self):
+        rows = sorted({index.row() for index in self.history_table.selectedIndexes()})
+        return [self.history_rows[row] for row in rows]
+    
+    def load_history_run(self):
+        """把选中的一次运行加载为当前结果"""
+        runs = self._selected_history_runs()
+        if not runs:
+            self.log("请先在历史记录中选择一次运行")
+            return
+        try:
+            self.results = self.archive.load(runs[0]['id'])
+            self.update_results(self.results)
+            self.log(f"已加载历史运行: {runs[0]['run_dir']}")
+        except Exception as e:
+            self.log(f"加载历史运行失败: {str(e)}")
+    
+    def compare_history_runs(self):
+        """对比选中运行的库仑摩擦曲线和摩擦参数"""
+        runs = self._selected_history_runs()
+        if not runs:
+            self.log("请先在历史记录中选择要对比的运行")
+            return
+        
+        if self.history_canvas is None:
+            load_matplotlib()
+            self.history_figure = Figure(figsize=(12, 5))
+            self.history_canvas = FigureCanvas(self.history_figure)
+            self.history_compare_layout.addWidget(NavigationToolbar(self.history_canvas, self))
+            self.history_compare_layout.addWidget(self.history_canvas)
+        
+        fig = self.history_figure
+        fig.clear()
+        ax_curve = fig.add_subplot(1, 2, 1)
+        ax_bar = fig.add_subplot(1, 2, 2)
+        
+        labels = []
+        for run in runs:
+            label = f"{run['timestamp'][:16].replace('T', ' ')} #{run['motor_sn'] or '-'}"
+            labels.append(label)
+            try:
+                results = self.archive.load(run['id'])
+            except Exception as e:
+                self.log(f"读取 {run['run_dir']} 失败: {str(e)}")
+                continue
+            if 'coulomb_raw_data' in results:
+                raw = results['coulomb_raw_data']
+                order = np.argsort(raw['speeds'])
+                ax_curve.plot(np.asarray(raw['speeds'])[order], np.asarray(raw['torques'])[order],
+                              'o-', markersize=4, label=label)
+        ax_curve.set_xlabel('角速度 [rad/s]')
+        ax_curve.set_ylabel('力矩 [N·m]')
+        ax_curve.set_title('库仑摩擦曲线')
+        ax_curve.grid(True, alpha=0.3)
+        if ax_curve.lines:
+            ax_curve.legend(fontsize=8)
+        
+        keys = [('coulomb_friction', '库仑'), ('static_friction_pos', '静摩擦+'), ('static_friction_neg', '静摩擦-')]
+        x = np.arange(len(keys))
+        width = 0.8 / len(runs)
+        for i, (run, label) in enumerate(zip(runs, labels)):
+            values = [run[key] if run[key] is not None else np.nan for key, _ in keys]
+            ax_bar.bar(x + (i - (len(runs) - 1) / 2) * width, values, width, label=label)
+        ax_bar.set_xticks(x)
+        ax_bar.set_xticklabels([name for _, name in keys])
+        ax_bar.set_ylabel('力矩 [N·m]')
+        ax_bar.set_title('摩擦参数对比')
+        ax_bar.grid(True, axis='y', alpha=0.3)
+        ax_bar.legend(fontsize=8)
+        
+        fig.tight_layout()
+        self.history_canvas.draw_idle()
+    
+    def archive_results(self, results):
+        """测试完成后自动归档"""
+        if self.archive is None:
+            return
+        try:
+            run_id = self.archive.add(results)
+            self.log(f"结果已归档 (编号 {run_id})")
+            self.refresh_history_filters()
+            self.refresh_history()
+        except Exception as e:
+            self.log(f"归档结果失败: {str(e)}")
+    
+    def start_batch(self):
+        """解析批量配置并开始批量测试"""
+        try:
+            params = self.get_params_from_ui()
+            if params is None:
+                return
+            batch = parse_batch_spec(self.batch_spec_edit.toPlainText(), params, self.batch_repeats_spin.value())
+        except ValueError as e:
+            self.log(f"批量配置错误: {str(e)}")
+            return
+        self.start_identification(self.batch_type_combo.currentData(), batch=batch)
+    
+    def start_identification(self, test_type, batch=None):
+        """开始识别过程
+        :param batch: 批量测试配置，见 parse_batch_spec；为 None 时只运行一次
+        """
+        # 停止状态监控
+        if self.status_thread and self.status_thread.isRunning():
+            self.status_thread.stop()
+            self.check_motor_btn.setText("检查电机状态")
+            self.check_motor_btn.setStyleSheet("QPushButton { background-color: #4CAF50; color: white; font-weight: bold; font-size: 12px; } QPushButton:hover { background-color: #45a049; }")
+        self.stop_dashboard()
+            
+        if self.identifier_thread is not None and self.identifier_thread.isRunning():
+            self.log("已有识别进程在运行，请等待完成或停止")
+            return
+        
+        # 获取参数
+        params = self.get_params_from_ui()
+        if params is None:
+            return
+        if batch:
+            params['batch'] = batch
+        
+        # 创建工作线程
+        self.identifier_thread = FrictionIdentifierThread(params, test_type)
+        
+        # 连接信号
+        self.identifier_thread.update_progress.connect(self.update_progress)
+        self.identifier_thread.update_plot.connect(self.update_plot)
+        self.identifier_thread.update_results.connect(self.update_results)
+        self.identifier_thread.update_results.connect(self.archive_results)
+        self.identifier_thread.log_message.connect(self.log)
+        self.identifier_thread.test_completed.connect(self.on_test_completed)
+        
+        # 更新UI状态
+        self.check_motor_btn.setEnabled(False)
+        self.start_coulomb_btn.setEnabled(False)
+        self.start_static_btn.setEnabled(False)
+        self.start_comprehensive_btn.setEnabled(False)
+        self.start_map_btn.setEnabled(False)
+        self.start_thermal_btn.setEnabled(False)
+        self.start_inertia_btn.setEnabled(False)
+        self.start_batch_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.save_results_btn.setEnabled(False)
+        self.load_results_btn.setEnabled(False)
+        
+        # 清除之前的图表
+        self.clear_plots()
+        self.live_panel.clear()
+        self.live_count = 0
+        self.live_timer.start()
+        self.main_tabs.setCurrentIndex(self.live_tab_index)
+        
+        # 开始线程
+        if batch:
+            self.log(f"开始 {test_type} 批量测试，共 {len(batch)} 次运行...")
+        else:
+            self.log(f"开始 {test_type} 摩擦识别过程...")
+        self.identifier_thread.start()
+    
+    def stop_identification(self):
+        """停止识别过程"""
+        if self.identifier_thread is not None and self.identifier_thread.isRunning():
+            self.log("正在停止识别过程...")
+            self.identifier_thread.running = False
+            self.identifier_thread.wait(2000)  # 等待线程结束
+            self.on_test_completed()
+    
+    def on_test_completed(self):
+        """测试完成处理"""
+        self.live_timer.stop()
+        self.refresh_live_plot()
+        
+        # 更新UI状态
+        self.check_motor_btn.setEnabled(True)
+        self.start_coulomb_btn.setEnabled(True)
+        self.start_static_btn.setEnabled(True)
+        self.start_comprehensive_btn.setEnabled(True)
+        self.start_map_btn.setEnabled(True)
+        self.start_thermal_btn.setEnabled(True)
+        self.start_inertia_btn.setEnabled(True)
+        self.start_batch_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.save_results_btn.setEnabled(True)
+        self.load_results_btn.setEnabled(True)
+    
+    def update_progress(self, value, status):
+        """更新进度条"""
+        self.progress_bar.setValue(value)
+        self.progress_label.setText(status)
+    
+    def update_plot(self, data, plot_type):
+        """把工作线程发来的绘图数据画到对应标签页的持久画布上"""
+        if plot_type == 'coulomb_friction':
+            self.coulomb_panel.show_data(CoulombChart, data)
+            self.main_tabs.setCurrentIndex(1)  # 切换到库仑摩擦标签页
+        
+        elif plot_type == 'thermal':
+            self.coulomb_panel.show_data(ThermalChart, data)
+            self.main_tabs.setCurrentIndex(1)
+        
+        elif plot_type == 'inertia':
+            self.coulomb_panel.show_data(InertiaChart, data)
+            self.main_tabs.setCurrentIndex(1)
+        
+        elif plot_type == 'static_friction_map':
+            self.static_panel.show_data(StaticMapChart, data)
+            self.main_tabs.setCurrentIndex(2)  # 切换到静摩擦标签页
+        
+        elif plot_type.startswith('static_friction'):
+            self.static_panel.show_data(StaticTestChart, data)
+            self.main_tabs.setCurrentIndex(2)
+    
+    def clear_plots(self):
+        """清除图表"""
+        self.coulomb_panel.clear()
+        self.static_panel.clear()
+    
+    def update_results(self, results):
+        """更新结果表格"""
+        self.results = results
+        self.results_table.setRowCount(0)  # 清空表格
+        confidence = results.get('confidence', {})
+        
+        def _value(key):
+            """数值后附自助法置信区间"""
+            text = f"{results[key]:.6f}"
+            if key in confidence:
+                text += f"  [{confidence[key]['low']:.6f}, {confidence[key]['high']:.6f}]"
+            return text
+        
+        # 填充结果表格
+        row = 0
+        
+        # 添加库仑摩擦结果
+        if 'coulomb_friction' in results:
+            self.add_result_row("库仑摩擦力矩 / Coulomb Friction Torque [N·m]", _value('coulomb_friction'))
+            if 'coulomb_friction_pos' in results:
+                self.add_result_row("正向库仑摩擦 / Positive Coulomb Friction [N·m]", _value('coulomb_friction_pos'))
+            if 'coulomb_friction_neg' in results:
+                self.add_result_row("负向库仑摩擦 / Negative Coulomb Friction [N·m]", _value('coulomb_friction_neg'))
+        
+        # 添加力矩纹波主峰
+        for spectrum in results.get('coulomb_ripple', {}).values():
+            text = f"RMS {spectrum['rms']:.6f}"
+            if spectrum['peaks']:
+                freq, order, amplitude = spectrum['peaks'][0]
+                text += f", {freq:.2f} Hz" + (f" (×{order:.1f})" if order is not None else "") + f" {amplitude:.6f}"
+            self.add_result_row(f"力矩纹波 @ {spectrum['speed']:.3f} rad/s / Torque Ripple [N·m]", text)
+        
+        # 添加静摩擦结果
+        if 'static_friction' in results and results['static_friction'] is not None:
+            self.add_result_row("静摩擦力矩 / Static Friction Torque [N·m]", _value('static_friction'))
+            if 'static_friction_pos' in results and results['static_friction_pos'] is not None:
+                self.add_result_row("正向静摩擦 / Positive Static Friction [N·m]", _value('static_friction_pos'))
+            if 'static_friction_neg' in results and results['static_friction_neg'] is not None:
+                self.add_result_row("负向静摩擦 / Negative Static Friction [N·m]", _value('static_friction_neg'))
+        
+        # 添加静摩擦角度映射结果
+        if 'static_friction_map' in results:
+            static_map = results['static_friction_map']
+            for angle, t_pos, t_neg in zip(static_map['angles'], static_map['pos'], static_map['neg']):
+                t_pos_text = f"{t_pos:.6f}" if t_pos is not None else "-"
+                t_neg_text = f"{t_neg:.6f}" if t_neg is not None else "-"
+                self.add_result_row(f"静摩擦 @ {np.degrees(angle):.1f}° / Static Friction (+/-) [N·m]",
+                                    f"{t_pos_text} / {t_neg_text}")
+        
+        # 添加温升测试结果
+        if 'thermal' in results:
+            thermal = results['thermal']
+            self.add_result_row("温升测试轮数 / Thermal Cycles", str(thermal['n_cycles']))
+            for name, label in (('coulomb', "库仑摩擦温度系数 / Coulomb Temp. Coeff. [N·m/℃]"),
+                                ('static', "静摩擦温度系数 / Static Temp. Coeff. [N·m/℃]")):
+                if name in thermal['fit']:
+                    self.add_result_row(label, f"{thermal['fit'][name]['slope']:.8f}")
+        
+        # 添加已知参数
+        self.add_result_row("粘滞摩擦系数 / Viscous Friction Coefficient [N·m·s/rad]", f"{results['viscous_friction']:.10f}")
+        self.add_result_row("转子惯量 / Rotor Inertia [kg·m²]", f"{results['inertia']:.10f}")
+        if 'inertia_fit' in results:
+            fit = results['inertia_fit']
+            self.add_result_row("惯量辨识原设定 / Prior Inertia [kg·m²]", f"{fit['prior']:.10f}")
+            self.add_result_row("惯量拟合优度 / Inertia Fit R²", f"{fit['r2']:.4f}" if fit['r2'] is not None else "-")
+            self.add_result_row("激励中库仑摩擦 (+/-) / Coulomb During Excitation [N·m]",
+                                f"{fit['coulomb_pos']:.6f} / {fit['coulomb_neg']:.6f}")
+        
+        # 切换到结果标签页
+        self.sub_tabs.setCurrentWidget(self.results_tab)
+    
+    def add_result_row(self, name, value):
+        """向结果表格添加一行"""
+        row = self.results_table.rowCount()
+        self.results_table.insertRow(row)
+        self.results_table.setItem(row, 0, QTableWidgetItem(name))
+        self.results_table.setItem(row, 1, QTableWidgetItem(value))
+    
+    def save_results(self):
+        """保存结果到文件"""
+        if not self.results:
+            self.log("没有可保存的结果")
+            return
+        
+        try:
+            # 确保目录存在
+            if not os.path.exists('friction_results'):
+                os.makedirs('friction_results')
+            
+            # 使用文件对话框选择保存类型
+            options = QFileDialog.Options()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            
+            # 提供多种保存格式选择
+            filename, file_type = QFileDialog.getSaveFileName(
+                self, "保存识别结果", 
+                os.path.join('friction_results', f"friction_params_{timestamp}"),
+                "文本文件 (*.txt);;JSON文件 (*.json);;所有文件 (*)", 
+                options=options)
+            
+            if not filename:
+                return
+            
+            # 保留测试时间戳（与归档副本一致，便于去重），另记保存时间
+            self.results['saved_at'] = datetime.now().isoformat()
+            
+            if filename.endswith('.txt') or file_type.startswith("文本文件"):
+                # 保存为可读的txt格式
+                self.save_results_as_txt(filename)
+            else:
+                # 保存为JSON格式
+                self.save_results_as_json(filename)
+            
+            self.log(f"结果已保存到: {filename}")
+            
+        except Exception as e:
+            self.log(f"保存结果失败: {str(e)}")
+    
+    def save_results_as_txt(self, filename):
+        """保存结果为txt格式（中英文对照）"""
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write("=" * 80 + "\n")
+            f.write("电机摩擦力参数识别结果 / Motor Friction Parameter Identification Results\n")
+            f.write("=" * 80 + "\n\n")
+            
+            # 测试信息
+            f.write("测试信息 / Test Information:\n")
+            f.write("-" * 50 + "\n")
+            f.write(f"测试时间 / Test Time: {self.results.get('timestamp', 'Unknown')}\n")
+            if 'saved_at' in self.results:
+                f.write(f"保存时间 / Saved At: {self.results['saved_at']}\n")
+            if 'motor_info' in self.results:
+                motor_info = self.results['motor_info']
+                f.write(f"电机版本 / Motor Version: {motor_info.get('sub_ver', 'Unknown')}\n")
+                f.write(f"最大扭矩 / Max Torque: {motor_info.get('max_torque', 'Unknown')} N·m\n")
+                f.write(f"减速比 / Gear Ratio: {motor_info.get('gear_ratio', 'Unknown')}\n")
+            f.write("\n")
+            
+            # 摩擦参数结果
+            f.write("摩擦参数结果 / Friction Parameter Results:\n")
+            f.write("-" * 50 + "\n")
+            
+            # 库仑摩擦
+            if 'coulomb_friction' in self.results:
+                f.write(f"平均库仑摩擦力矩 / Average Coulomb Friction Torque: {self.results['coulomb_friction']:.6f} N·m\n")
+                if 'coulomb_friction_pos' in self.results:
+                    f.write(f"  正向库仑摩擦 / Positive Direction: {self.results['coulomb_friction_pos']:.6f} N·m\n")
+                if 'coulomb_friction_neg' in self.results:
+                    f.write(f"  负向库仑摩擦 / Negative Direction: {self.results['coulomb_friction_neg']:.6f} N·m\n")
+                f.write("\n")
+            
+            # 静摩擦
+            if 'static_friction' in self.results and self.results['static_friction'] is not None:
+                f.write(f"平均静摩擦力矩 / Average Static Friction Torque: {self.results['static_friction']:.6f} N·m\n")
+                if 'static_friction_pos' in self.results and self.results['static_friction_pos'] is not None:
+                    f.write(f"  正向静摩擦 / Positive Direction: {self.results['static_friction_pos']:.6f} N·m\n")
+                if 'static_friction_neg' in self.results and self.results['static_friction_neg'] is not None:
+                    f.write(f"  负向静摩擦 / Negative Direction: {self.results['static_friction_neg']:.6f} N·m\n")
+                f.write("\n")
+            
+            # 静摩擦角度映射
+            if 'static_friction_map' in self.results:
+                static_map = self.results['static_friction_map']
+                f.write("静摩擦角度映射 / Static Friction vs. Rotor Angle:\n")
+                f.write(f"{'角度 / Angle [°]':>18}{'正向 / Pos [N·m]':>20}{'负向 / Neg [N·m]':>20}\n")
+                for angle, t_pos, t_neg in zip(static_map['angles'], static_map['pos'], static_map['neg']):
+                    t_pos_text = f"{t_pos:.6f}" if t_pos is not None else "-"
+                    t_neg_text = f"{t_neg:.6f}" if t_neg is not None else "-"
+                    f.write(f"{np.degrees(angle):>18.1f}{t_pos_text:>20}{t_neg_text:>20}\n")
+                f.write("\n")
+            
+            # 温升测试
+            if 'thermal' in self.results:
+                thermal = self.results['thermal']
+                f.write("摩擦-温度特性 / Friction vs. Rotor Temperature:\n")
+                f.write(f"  测试轮数 / Cycles: {thermal['n_cycles']}, 原始数据 / Raw Data: {thermal['stream_file']}\n")
+                for name, fit in thermal['fit'].items():
+                    f.write(f"  {name}: {fit['intercept']:.6f} + {fit['slope']:.8f} * T  N·m\n")
+                f.write(f"{'温度 / Temp [℃]':>18}{'次数 / N':>10}{'库仑 / Coulomb':>18}{'静摩擦 / Static':>18}\n")
+                for k, temp in enumerate(thermal['bin_temps']):
+                    coulomb = thermal['bins']['coulomb'][k]
+                    static = thermal['bins']['static'][k]
+                    coulomb_text = f"{coulomb:.6f}" if coulomb is not None else "-"
+                    static_text = f"{static:.6f}" if static is not None else "-"
+                    f.write(f"{temp:>18.1f}{thermal['bin_counts'][k]:>10}{coulomb_text:>18}{static_text:>18}\n")
+                f.write("\n")
+            
+            # 已知参数
+            f.write("已知参数 / Known Parameters:\n")
+            f.write("-" * 50 + "\n")
+            f.write(f"粘滞摩擦系数 / Viscous Friction Coefficient: {self.results['viscous_friction']:.10f} N·m·s/rad\n")
+            f.write(f"转子惯量 / Rotor Inertia: {self.results['inertia']:.10f} kg·m²\n")
+            if 'inertia_fit' in self.results:
+                fit = self.results['inertia_fit']
+                r2 = f"{fit['r2']:.4f}" if fit['r2'] is not None else "-"
+                f.write(f"  辨识值 / Identified ({fit['excitation']}), 原设定 / Prior: {fit['prior']:.10f} kg·m², R²: {r2}\n")
+            f.write("\n")
+            
+            # 测试数据统计（如果有的话）
+            if 'coulomb_raw_data' in self.results:
+                speeds = self.results['coulomb_raw_data']['speeds']
+                torques = self.results['coulomb_raw_data']['torques']
+                f.write("库仑摩擦测试数据统计 / Coulomb Friction Test Data Statistics:\n")
+                f.write("-" * 50 + "\n")
+                f.write(f"测试点数 / Number of Test Points: {len(speeds)}\n")
+                f.write(f"速度范围 / Velocity Range: {min(speeds):.3f} ~ {max(speeds):.3f} rad/s\n")
+                f.write(f"力矩范围 / Torque Range: {min(torques):.6f} ~ {max(torques):.6f} N·m\n")
+                f.write("\n")
+            
+            # 文件说明
+            f.write("文件说明 / File Description:\n")
+            f.write("-" * 50 + "\n")
+            f.write("本文件包含了电机摩擦力参数自动识别的完整结果。\n")
+            f.write("This file contains the complete results of automatic motor friction parameter identification.\n\n")
+            f.write("库仑摩擦 (Coulomb Friction): 运动过程中的干摩擦力矩，与运动方向相反\n")
+            f.write("静摩擦 (Static Friction): 物体从静止开始运动时需要克服的最大摩擦力矩\n")
+            f.write("粘滞摩擦 (Viscous Friction): 与速度成正比的摩擦阻力\n")
+            f.write("\n")
+            f.write("=" * 80 + "\n")
+    
+    def save_results_as_json(self, filename):
+        """保存结果为JSON格式，原始数据以列存 .npy 的形式保存在同名 _raw 目录"""
+        raw_dir = save_results_container(self.results, filename)
+        if raw_dir:
+            self.log(f"原始数据已保存到: {raw_dir}")
+        
+        # 同时保存一个最新结果的副本
+        latest_path = os.path.join('friction_results', 'latest_friction_params.json')
+        save_results_container(self.results, latest_path)
+    
+    def export_compensation_table(self):
+        """根据当前结果生成并导出摩擦补偿表，缺少的库仑摩擦或角度映射从归档中同一电机的运行补齐"""
+        if not self.results:
+            self.log("没有可用的识别结果，无法生成补偿表")
+            return
+        
+        try:
+            results, sources = complete_lut_results(self.results, self.archive,
+                                                    need_map=self.lut_angle_points_spin.value() > 0)
+            for what, run_id, timestamp in sources:
+                self.log(f"{what}取自归档运行 #{run_id} ({timestamp[:19].replace('T', ' ')})")
+            lut = build_friction_lut(
+                results,
+                speed_max=self.lut_speed_max_spin.value(),
+                n_speed=self.lut_speed_points_spin.value(),
+                n_angle=self.lut_angle_points_spin.value(),
+            )
+            if self.lut_angle_points_spin.value() > 0 and lut['angle_speed_table'] is None:
+                self.log("结果中没有静摩擦角度映射，只导出速度表")
+            
+            if not os.path.exists('friction_results'):
+                os.makedirs('friction_results')
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename, _ = QFileDialog.getSaveFileName(
+                self, "导出补偿表",
+                os.path.join('friction_results', f"friction_lut_{timestamp}.h"),
+                "C头文件 (*.h);;所有文件 (*)")
+            if not filename:
+                return
+            
+            files = export_friction_lut(lut, os.path.splitext(filename)[0])
+            total_bytes = sum(os.path.getsize(p) for p in files if p.endswith('.bin'))
+            self.log(f"补偿表已导出 ({total_bytes} 字节 float32):")
+            for path in files:
+                self.log(f"  {path}")
+        except Exception as e:
+            self.log(f"导出补偿表失败: {str(e)}")
+    
+    def load_results(self):
+        """从文件加载结果"""
+        try:
+            # 使用文件对话框
+            options = QFileDialog.Options()
+            filepath, _ = QFileDialog.getOpenFileName(
+                self, "加载识别结果", 
+                'friction_results',
+                "JSON文件 (*.json);;采集日志 (*.dmlog);;所有文件 (*)", options=options)
+            
+            if not filepath:
+                return
+            
+            if filepath.endswith('.dmlog'):
+                # 从中断测试的采集日志恢复
+                loaded_results = recover_capture_log(filepath)
+                self.log(f"从采集日志恢复了 {loaded_results['recovered_records']} 条记录")
+            else:
+                loaded_results = load_results_container(filepath)
+            
+            # 更新结果
+            self.results = loaded_results
+            self.update_results(loaded_results)
+            
+            # 显示日志
+            self.log(f"成功加载结果: {filepath}")
+            
+            # 根据内容重建可能的图表
+            if 'coulomb_raw_data' in loaded_results:
+                try:
+                    self.coulomb_panel.show_data(CoulombChart, {
+                        'speeds': np.asarray(loaded_results['coulomb_raw_data']['speeds']),
+                        'torques': np.asarray(loaded_results['coulomb_raw_data']['torques']),
+                        'coulomb_pos': loaded_results.get('coulomb_friction_pos', 0),
+                        'coulomb_neg': loaded_results.get('coulomb_friction_neg', 0),
+                        'viscous_coeff': loaded_results.get('viscous_friction', 0),
+                        'title': '电机库仑摩擦力矩识别结果 (已加载)',
+                    })
+                except Exception as e:
+                    self.log(f"重建库仑摩擦图表失败: {str(e)}")
+            
+        except Exception as e:
+            self.log(f"加载结果失败: {str(e)}")
+    
+    def log(self, message):
+        """记录一条日志：先放入待显示队列，由定时器批量刷新到界面，同时异步写入滚动日志文件"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        line = f"[{timestamp}] {message}"
+        self.log_pending.append(line)
+        if self.file_logger is not None:
+            self.file_logger.info(message)
+    
+    def flush_log(self):
+        """定时把积攒的日志一次性写入日志窗口"""
+        if not self.log_pending:
+            return
+        lines = list(self.log_pending)
+        self.log_pending.clear()
+        scrollbar = self.log_text.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+        self.log_text.appendPlainText("\n".join(lines[-self.LOG_MAX_LINES:]))
+        # 用户向上翻看时不强制滚动到底部
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+    
+    def closeEvent(self, event):
+        """窗口关闭事件"""
+        # 停止状态监控线程
+        if self.status_thread and self.status_thread.isRunning():
+            self.status_thread.stop()
+        self.stop_dashboard()
+            
+        # 检查是否有线程在运行
+        if self.identifier_thread is not None and self.identifier_thread.isRunning():
+            reply = QMessageBox.question(self, '确认退出', 
+                "识别过程正在进行中，确定要退出吗？",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            
+            if reply == QMessageBox.Yes:
+                self.stop_identification()
+                event.accept()
+            else:
+                event.ignore()
+        else:
+            event.accept()
+        
+        # 退出前写完剩余日志
+        if event.isAccepted() and self.log_listener is not None:
+            self.log_listener.stop()
+
+
+if __name__ == "__main__":
+    # 命令行恢复中断测试: python damiao_motor_friction_detection.py --recover capture_xxx.dmlog [输出.json]
+    if len(sys.argv) >= 3 and sys.argv[1] == '--recover':
+        log_path = sys.argv[2]
+        out_path = sys.argv[3] if len(sys.argv) >= 4 else os.path.splitext(log_path)[0] + '_recovered.json'
+        recovered = recover_capture_log(log_path)
+        save_results_container(recovered, out_path)
+        print(f"已恢复 {recovered['recovered_records']} 条记录 -> {out_path}")
+        for key in ('coulomb_friction', 'static_friction_pos', 'static_friction_neg'):
+            if key in recovered:
+                print(f"  {key}: {recovered[key]:.5f} N·m")
+        sys.exit(0)
+    
+    app = QApplication(sys.argv)
+    
+    # 设置应用程序样式
+    app.setStyle('Fusion')
+    
+    # 设置应用程序样式表
+    app.setStyleSheet("""
+        QMainWindow {
+            background-color: #f5f5f5;
+        }
+        QGroupBox {
+            font-weight: bold;
+            border: 2px solid #cccccc;
+            border-radius: 5px;
+            margin-top: 1ex;
+            padding-top: 10px;
+        }
+        QGroupBox::title {
+            subcontrol-origin: margin;
+            left: 10px;
+            padding: 0 5px;
+        }
+        QTabWidget::pane {
+            border: 1px solid #cccccc;
+            background-color: white;
+        }
+        QTabBar::tab {
+            background-color: #e1e1e1;
+            border: 1px solid #cccccc;
+            padding: 8px 12px;
+            margin-right: 2px;
+        }
+        QTabBar::tab:selected {
+            background-color: white;
+            border-bottom-color: white;
+        }
+        QPushButton {
+            background-color: #2980b9;
+            color: white;
+            border: none;
+            padding: 8px 16px;
+            border-radius: 4px;
+            font-weight: bold;
+        }
+        QPushButton:hover {
+            background-color: #3498db;
+        }
+        QPushButton:pressed {
+            background-color: #21618c;
+        }
+        QPushButton:disabled {
+            background-color: #bdc3c7;
+            color: #7f8c8d;
+        }
+    """)
+    
+    # 创建并显示主窗口
+    window = FrictionIdentifierApp()
+    window.show()
+    
+    # 启动耗时基准: python damiao_motor_friction_detection.py --startup-benchmark
+    # 事件循环处理完第一次绘制后打印耗时并退出
+    if '--startup-benchmark' in sys.argv:
+        def report_startup():
+            print(f"启动耗时: {(time.perf_counter() - _T_IMPORT) * 1000:.0f} ms "
+                  f"(matplotlib {'已' if 'matplotlib' in sys.modules else '未'}加载)")
+            window.close()
+        QTimer.singleShot(0, report_startup)
+    
+    sys.exit(app.exec_())
+
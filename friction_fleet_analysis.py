@@ -0,0 +1,285 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+摩擦参数批量趋势分析
+
+扫描目录树下所有识别结果 JSON（save_results_as_json 保存的文件以及 friction_results/archive
+下的归档），按电机型号统计库仑/静摩擦分布，用中位数绝对偏差(MAD)标记离群电机，输出文本、CSV 和图表报告。
+每次测试都会自动归档，手动保存的同一次运行按 (时间戳, 序列号, 测试类型) 去重，只统计一次。
+解析 JSON 的工作由进程池分块并行完成，主进程只做汇总。
+
+用法:
+    python friction_fleet_analysis.py [结果目录] [--out 报告目录] [--workers N] [--mad-k 3.5] [--no-plot]
+"""
+import os
+import sys
+import csv
+import json
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+import numpy as np
+
+# 参与统计的结果字段
+METRICS = [
+    ('coulomb_friction', '库仑摩擦'),
+    ('coulomb_friction_pos', '正向库仑摩擦'),
+    ('coulomb_friction_neg', '负向库仑摩擦'),
+    ('static_friction', '静摩擦'),
+    ('static_friction_pos', '正向静摩擦'),
+    ('static_friction_neg', '负向静摩擦'),
+]
+INFO_FIELDS = ['path', 'motor_type', 'motor_sn', 'node_id', 'test_type', 'timestamp']
+
+# 与结果无关的 JSON（最新结果副本与归档中的运行重复）
+SKIP_FILES = {'latest_friction_params.json'}
+# 非单次识别结果的 JSON：批量测试统计
+SKIP_PREFIXES = ('batch_',)
+
+
+def find_result_files(root):
+    """递归查找结果 JSON，跳过原始数据目录"""
+    stack = [root]
+    while stack:
+        try:
+            entries = list(os.scandir(stack.pop()))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if not entry.name.endswith('_raw'):
+                    stack.append(entry.path)
+            elif (entry.name.endswith('.json') and entry.name not in SKIP_FILES
+                  and not entry.name.startswith(SKIP_PREFIXES)):
+                yield entry.path
+
+
+def _parse_chunk(paths):
+    """工作进程：解析一批结果文件，只返回索引字段和标量结果"""
+    rows = []
+    for path in paths:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                results = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if not isinstance(results, dict) or not any(key in results for key, _ in METRICS):
+            continue
+        params = results.get('params', {})
+        sn = results.get('motor_info', {}).get('sn')
+        row = [
+            path,
+            params.get('motor_type') or 'unknown',
+            str(sn) if sn is not None else '',
+            params.get('node_id'),
+            results.get('test_type') or '',
+            results.get('timestamp') or '',
+        ]
+        for key, _ in METRICS:
+            value = results.get(key)
+            row.append(float(value) if isinstance(value, (int, float)) else np.nan)
+        rows.append(row)
+    return rows
+
+
+_ARCHIVE_DIR = os.sep + 'archive' + os.sep
+
+
+def scan_results(root, workers=None, chunk_size=256):
+    """并行解析 root 下的结果文件
+    :return: (扫描文件数, 信息列表, 指标数组 shape=(N, len(METRICS)))
+    """
+    paths = list(find_result_files(root))
+    chunks = [paths[i:i + chunk_size] for i in range(0, len(paths), chunk_size)]
+    if len(chunks) <= 1 or workers == 1:
+        parsed = list(map(_parse_chunk, chunks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(_parse_chunk, chunks))
+    
+    # 手动保存和自动归档是同一次运行的两份副本，按 (时间戳, 序列号, 测试类型) 去重，优先保留归档
+    rows = sorted((row for rows in parsed for row in rows), key=lambda row: _ARCHIVE_DIR not in row[0])
+    seen = set()
+    info = []
+    values = []
+    for row in rows:
+        path, _, sn, _, test_type, timestamp = row[:len(INFO_FIELDS)]
+        if timestamp:
+            key = (timestamp, sn, test_type)
+            if key in seen:
+                continue
+            seen.add(key)
+        info.append(row[:len(INFO_FIELDS)])
+        values.append(row[len(INFO_FIELDS):])
+    values = np.asarray(values, dtype=float).reshape(-1, len(METRICS))
+    return len(paths), info, values
+
+
+def robust_outliers(values, groups, mad_k=3.5):
+    """按组计算修正 z 分数 |x - 中位数| / (1.4826·MAD)，超过 mad_k 记为离群
+    :param values: shape=(N, M) 指标数组，nan 表示缺失
+    :param groups: shape=(N,) 分组编号
+    :return: (z 分数数组, 离群掩码)
+    """
+    z = np.full(values.shape, np.nan)
+    for g in np.unique(groups):
+        members = groups == g
+        block = values[members]
+        median = np.nanmedian(block, axis=0) if len(block) else np.nan
+        mad = 1.4826 * np.nanmedian(np.abs(block - median), axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z[members] = np.where(mad > 0, np.abs(block - median) / mad, 0.0)
+    with np.errstate(invalid='ignore'):
+        outliers = z > mad_k
+    return z, outliers
+
+
+def summarize(values, groups, group_names):
+    """每个型号每个指标的分布统计"""
+    summary = {}
+    for g, name in enumerate(group_names):
+        block = values[groups == g]
+        stats = {}
+        for m, (key, _) in enumerate(METRICS):
+            column = block[:, m]
+            column = column[np.isfinite(column)]
+            if not len(column):
+                continue
+            p5, p25, p50, p75, p95 = np.percentile(column, [5, 25, 50, 75, 95])
+            stats[key] = {
+                'n': int(len(column)), 'mean': float(np.mean(column)), 'std': float(np.std(column)),
+                'min': float(np.min(column)), 'p5': float(p5), 'p25': float(p25), 'median': float(p50),
+                'p75': float(p75), 'p95': float(p95), 'max': float(np.max(column)),
+            }
+        summary[name] = {'runs': int(np.count_nonzero(groups == g)), 'metrics': stats}
+    return summary
+
+
+def write_report(out_dir, root, n_files, info, values, group_names, groups, summary, z, outliers, mad_k, plot=True):
+    """写出 summary.txt / summary.json / runs.csv / outliers.csv 以及分布图"""
+    if not os.path.exists(out_dir):
+        os.makedirs(out_dir)
+
+    # 全部运行，附带修正 z 分数
+    with open(os.path.join(out_dir, 'runs.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(INFO_FIELDS + [key for key, _ in METRICS] + [f"z_{key}" for key, _ in METRICS] + ['outlier'])
+        for row, vals, zs, flags in zip(info, values, z, outliers):
+            writer.writerow(row + [f"{v:.6g}" if np.isfinite(v) else '' for v in vals]
+                            + [f"{v:.2f}" if np.isfinite(v) else '' for v in zs] + [int(flags.any())])
+
+    # 离群项，每个离群指标一行
+    outlier_rows = []
+    for i, j in zip(*np.nonzero(outliers)):
+        outlier_rows.append(info[i] + [METRICS[j][0], values[i, j], z[i, j]])
+    outlier_rows.sort(key=lambda r: -r[-1])
+    with open(os.path.join(out_dir, 'outliers.csv'), 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(INFO_FIELDS + ['metric', 'value', 'z'])
+        for row in outlier_rows:
+            writer.writerow(row[:-2] + [f"{row[-2]:.6g}", f"{row[-1]:.2f}"])
+
+    with open(os.path.join(out_dir, 'summary.json'), 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=4, ensure_ascii=False)
+
+    lines = [
+        "摩擦参数批量趋势分析报告",
+        "=" * 60,
+        f"生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+        f"结果目录: {os.path.abspath(root)}",
+        f"扫描文件: {n_files}，有效结果: {len(info)}",
+        f"离群判据: 修正 z 分数 > {mad_k} (按型号计算)",
+        "",
+    ]
+    for name in group_names:
+        group = summary[name]
+        lines.append(f"[{name}] 共 {group['runs']} 次运行")
+        lines.append(f"  {'指标':<12}{'数量':>6}{'均值':>12}{'标准差':>12}{'P5':>12}{'中位数':>12}{'P95':>12}")
+        for key, label in METRICS:
+            if key not in group['metrics']:
+                continue
+            s = group['metrics'][key]
+            lines.append(f"  {label:<12}{s['n']:>6}{s['mean']:>12.5f}{s['std']:>12.5f}"
+                         f"{s['p5']:>12.5f}{s['median']:>12.5f}{s['p95']:>12.5f}")
+        lines.append("")
+    lines.append(f"离群项: {len(outlier_rows)} 个（涉及 {int(np.count_nonzero(outliers.any(axis=1)))} 次运行）")
+    for row in outlier_rows[:50]:
+        path, motor_type, sn = row[0], row[1], row[2]
+        lines.append(f"  {motor_type} SN={sn or '-'} {row[-3]}={row[-2]:.5f} z={row[-1]:.1f}  {path}")
+    if len(outlier_rows) > 50:
+        lines.append("  ... 其余见 outliers.csv")
+
+    with open(os.path.join(out_dir, 'summary.txt'), 'w', encoding='utf-8') as f:
+        f.write("\n".join(lines) + "\n")
+
+    if plot and len(info):
+        plot_distributions(os.path.join(out_dir, 'distributions.png'), values, groups, group_names, outliers)
+    return lines
+
+
+def plot_distributions(path, values, groups, group_names, outliers):
+    """每个指标一幅箱线图，按型号分组，离群点标红"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    matplotlib.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']
+    matplotlib.rcParams['axes.unicode_minus'] = False
+
+    fig, axes = plt.subplots(2, 3, figsize=(18, 10))
+    for ax, m, (key, label) in zip(axes.flat, range(len(METRICS)), METRICS):
+        data = []
+        for g in range(len(group_names)):
+            column = values[groups == g, m]
+            data.append(column[np.isfinite(column)])
+        ax.boxplot(data, showfliers=False)
+        for g in range(len(group_names)):
+            members = np.flatnonzero(groups == g)
+            column = values[members, m]
+            flags = outliers[members, m]
+            jitter = g + 1 + 0.08 * np.random.default_rng(g).standard_normal(len(column))
+            ax.scatter(jitter[~flags], column[~flags], s=4, alpha=0.3, color='#2980b9')
+            ax.scatter(jitter[flags], column[flags], s=12, color='#e74c3c')
+        ax.set_xticks(range(1, len(group_names) + 1))
+        ax.set_xticklabels(group_names, rotation=30)
+        ax.set_title(label)
+        ax.set_ylabel('力矩 [N·m]')
+        ax.grid(True, axis='y', alpha=0.3)
+    fig.suptitle('各型号摩擦参数分布（红点为离群）', fontsize=16, fontweight='bold')
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="摩擦参数批量趋势分析")
+    parser.add_argument('root', nargs='?', default='friction_results', help="结果目录（递归扫描）")
+    parser.add_argument('--out', default=None, help="报告输出目录，默认 <结果目录>/fleet_report_<时间>")
+    parser.add_argument('--workers', type=int, default=None, help="解析进程数，默认 CPU 核数")
+    parser.add_argument('--mad-k', type=float, default=3.5, help="离群判据：修正 z 分数阈值")
+    parser.add_argument('--no-plot', action='store_true', help="不生成分布图")
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.root):
+        print(f"结果目录不存在: {args.root}")
+        return 1
+
+    n_files, info, values = scan_results(args.root, workers=args.workers)
+    if not info:
+        print(f"{args.root} 下没有找到识别结果")
+        return 1
+
+    group_names, groups = np.unique([row[1] for row in info], return_inverse=True)
+    group_names = [str(name) for name in group_names]
+    summary = summarize(values, groups, group_names)
+    z, outliers = robust_outliers(values, groups, args.mad_k)
+
+    out_dir = args.out or os.path.join(args.root, f"fleet_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    lines = write_report(out_dir, args.root, n_files, info, values, group_names, groups,
+                         summary, z, outliers, args.mad_k, plot=not args.no_plot)
+    print("\n".join(lines[:40]))
+    print(f"\n报告已保存到: {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())